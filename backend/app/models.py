@@ -72,6 +72,30 @@ class Contest(Base):
         CheckConstraint('prize_pool_usd >= 0', name='ck_prize_pool_nonnegative'),
     )
 
+class ContestRoiRollup(Base):
+    """Contest results per week, contest type, game type, entry-fee bucket and lineup; maintained by ContestAnalyticsService"""
+    __tablename__ = "contest_roi_rollups"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    week_id = Column(Integer, ForeignKey("weeks.id"), nullable=False)
+    contest_type = Column(String(50), nullable=False, default="")  # contest_type.code, '' when unknown
+    game_type = Column(String(50), nullable=False, default="")  # game_type.code
+    fee_bucket = Column(String(20), nullable=False, default="")  # entry fee range label, e.g. '$5.01-$25'
+    lineup_id = Column(String(50), nullable=False, default="")  # '' when the entry has no lineup
+    
+    entries = Column(Integer, nullable=False, default=0)
+    cashes = Column(Integer, nullable=False, default=0)  # entries with any winnings
+    entry_fees = Column(Numeric(14, 2), nullable=False, default=0)
+    winnings = Column(Numeric(14, 2), nullable=False, default=0)  # cash + ticket winnings
+    net_profit = Column(Numeric(14, 2), nullable=False, default=0)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    __table_args__ = (
+        Index('ux_contest_roi_rollups_grain', 'week_id', 'contest_type', 'game_type', 'fee_bucket', 'lineup_id', unique=True),
+    )
+
 class Team(Base):
     __tablename__ = "teams"
     
@@ -426,6 +450,32 @@ class PlayerPropBet(Base):
     # Indexes for common lookup patterns
     __table_args__ = (
         Index('ux_prop_bets_unique_new', 'week_id', 'game_id', 'bookmaker', 'market', 'outcome_name', 'playerDkId', unique=True),
+        Index('idx_player_prop_bets_player_result', 'playerDkId', 'result_status'),
+    )
+
+class PlayerPropHitRate(Base):
+    """Prop results per player, market, bookmaker and week; maintained by PlayerPropsScoringService"""
+    __tablename__ = "player_prop_hit_rates"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    week_id = Column(Integer, ForeignKey("weeks.id"), nullable=False)
+    playerDkId = Column(Integer, ForeignKey("players.playerDkId"), nullable=False)
+    market = Column(String(100), nullable=False, default="")  # '' when the prop has no market
+    bookmaker = Column(String(100), nullable=False, default="")  # '' when the prop has no bookmaker
+    
+    total_props = Column(Integer, nullable=False, default=0)
+    scored_props = Column(Integer, nullable=False, default=0)
+    hits = Column(Integer, nullable=False, default=0)
+    misses = Column(Integer, nullable=False, default=0)
+    pushes = Column(Integer, nullable=False, default=0)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    __table_args__ = (
+        Index('ux_prop_hit_rates_week_player_market_bookmaker', 'week_id', 'playerDkId', 'market', 'bookmaker', unique=True),
+        Index('idx_prop_hit_rates_player_week', 'playerDkId', 'week_id'),
+        Index('idx_prop_hit_rates_market_week', 'market', 'week_id'),
     )
 
 class DKContestDetail(Base):
@@ -562,6 +612,7 @@ class ContestRosterDetails(Base):
     enter_key = Column(BigInteger, nullable=False)  # Entry key from DraftKings
     username = Column(String(255), nullable=False)  # Opponent username
     contest_json = Column(JSON)  # Complete contest and roster data as JSON
+    contest_json_hash = Column(String(64))  # SHA-256 of contest_json (without saved_at); unchanged rosters are not rewritten
     fantasy_points = Column(Float, nullable=False)  # Total fantasy points scored
     
     # Player positions and scores
@@ -611,6 +662,36 @@ class ContestRosterDetails(Base):
     )
 
 
+class ContestRosterPlayer(Base):
+    """One player slot of an opponent roster, resolved to playerDkId when the roster is saved"""
+    __tablename__ = "contest_roster_players"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    roster_id = Column(Integer, ForeignKey("contest_roster_details.id", ondelete="CASCADE"), nullable=False)
+    contest_id = Column(BigInteger, nullable=False)  # Contest ID from DraftKings
+    enter_key = Column(BigInteger, nullable=False)  # Entry key from DraftKings
+    week_id = Column(Integer, ForeignKey("weeks.id"))  # Week of the draft group; null if the draft group is unknown
+    draftgroup = Column(Integer)  # Draft Group ID
+    slot = Column(Integer, nullable=False)  # Position of the player in the roster (0-8)
+    roster_position = Column(String(10))  # 'QB', 'RB', 'WR', 'TE', 'FLEX', 'DST'
+    playerDkId = Column(Integer, ForeignKey("players.playerDkId"))  # Null when the player could not be resolved
+    draftable_id = Column(String(50))  # DraftKings draftable ID from the Scores API
+    player_name = Column(String(255))  # Name as shown on the DraftKings scorecard
+    fantasy_points = Column(Float)  # Points the player scored for this roster
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    player = relationship("Player")
+    week = relationship("Week")
+
+    __table_args__ = (
+        Index('idx_contest_roster_players_roster_slot', 'roster_id', 'slot', unique=True),
+        Index('idx_contest_roster_players_week_player', 'week_id', 'playerDkId'),
+        Index('idx_contest_roster_players_player', 'playerDkId'),
+        Index('idx_contest_roster_players_contest', 'contest_id'),
+    )
+
+
 class ScrapedData(Base):
     """Model for storing scraped data from Firecrawl API"""
     __tablename__ = "scraped_data"
@@ -686,6 +767,29 @@ class ScrapingJobUrl(Base):
     )
 
 
+class ImportJob(Base):
+    """Durable state of a long-running background import; maintained by ImportJobStore"""
+    __tablename__ = "import_jobs"
+
+    id = Column(String(64), primary_key=True)  # import_id / backfill_id handed back to the client
+    job_type = Column(String(50), nullable=False)  # 'opponent-roster', 'nflverse-backfill'
+    status = Column(String(20), nullable=False, default="pending")  # pending, in_progress, completed, failed
+    message = Column(Text)
+    params = Column(JSON)  # request parameters, replayed when the job is resumed
+    progress = Column(JSON)  # counters, e.g. {"total": 10, "processed": 5, "successful": 4, "failed": 1}
+    checkpoint = Column(JSON)  # job-specific resume state, e.g. results of processed contests
+    results = Column(JSON)
+    started_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index('idx_import_jobs_type_status', 'job_type', 'status'),
+        Index('idx_import_jobs_completed_at', 'completed_at'),
+    )
+
+
 class TeamStats(Base):
     """Model for storing team statistics from NFLverse (both offensive and defensive)"""
     __tablename__ = "team_stats"
@@ -11,12 +11,29 @@ from app.schemas import (
     PlayerActuals as PlayerActualsSchema
 )
 from app.services.nflverse_service import NFLVerseService
+from app.services.nflverse_backfill import NFLVerseBackfillService
 from app.services.activity_logging import ActivityLoggingService
+from app.services.import_job_store import ImportJobStore
+from app.services.cache_service import player_game_log_cache
+from app.services.player_actuals import build_actuals_row, update_pool_entry_actuals
+from app.utils.bulk_upsert import bulk_upsert
 from sqlalchemy import and_, or_
 import time
 
 router = APIRouter(prefix="/api/actuals", tags=["actuals"])
 
+# import_jobs.job_type of NFLVerse backfills
+NFLVERSE_BACKFILL_JOB_TYPE = "nflverse-backfill"
+
+def parse_player_dk_id(value: Any) -> Optional[int]:
+    """Coerce a submitted playerDkId (int or numeric string) to int; None if missing or invalid"""
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
 @router.get("/weeks", response_model=List[Dict[str, Any]])
 async def get_weeks_for_actuals(db: Session = Depends(get_db)):
     """Get all weeks available for actuals import"""
@@ -39,7 +56,12 @@ async def import_matched_actuals(
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    """Import player actuals data with matched players"""
+    """
+    Import player actuals data with matched players
+    
+    All playerDkIds are validated with one IN query and the rows are written with one
+    INSERT ... ON CONFLICT (week_id, playerDkId) DO UPDATE per chunk.
+    """
     
     start_time = time.time()
     
@@ -67,111 +89,63 @@ async def import_matched_actuals(
     errors = []
     unmatched_players = []
     
+    # Validate every submitted playerDkId with a single IN query
+    submitted_ids = {parse_player_dk_id(p.get('playerDkId')) for p in matched_players} - {None}
+    known_ids = set()
+    if submitted_ids:
+        known_ids = {
+            player_dk_id for (player_dk_id,) in db.query(Player.playerDkId).filter(
+                Player.playerDkId.in_(list(submitted_ids))
+            ).all()
+        }
+    
+    rows = {}
     for player_data in matched_players:
         total_processed += 1
         
+        player_dk_id = parse_player_dk_id(player_data.get('playerDkId'))
+        if not player_dk_id or player_dk_id not in known_ids:
+            failed_matches += 1
+            unmatched_players.append({
+                "name": player_data.get('name', 'Unknown'),
+                "team": player_data.get('team', 'Unknown'),
+                "position": player_data.get('position', 'Unknown')
+            })
+            continue
+        
         try:
-            # Check if playerDkId is provided (already matched)
-            player_dk_id = player_data.get('playerDkId')
-            if not player_dk_id:
-                failed_matches += 1
-                unmatched_players.append({
-                    "name": player_data.get('name', 'Unknown'),
-                    "team": player_data.get('team', 'Unknown'),
-                    "position": player_data.get('position', 'Unknown')
-                })
-                continue
-            
-            # Verify player exists
-            player = db.query(Player).filter(Player.playerDkId == player_dk_id).first()
-            if not player:
-                failed_matches += 1
-                unmatched_players.append({
-                    "name": player_data.get('name', 'Unknown'),
-                    "team": player_data.get('team', 'Unknown'),
-                    "position": player_data.get('position', 'Unknown')
-                })
-                continue
-            
-            successful_matches += 1
-            
-            # Check if actuals already exist for this player and week
-            existing_actuals = db.query(PlayerActuals).filter(
-                and_(
-                    PlayerActuals.week_id == week_id,
-                    PlayerActuals.playerDkId == player.playerDkId
-                )
-            ).first()
-            
-            # Prepare actuals data - all numeric fields default to 0 for consistent sorting
-            actuals_data = {
-                "week_id": week_id,
-                "playerDkId": player.playerDkId,
-                "team": player_data.get('team', ''),
-                "position": player_data.get('position', ''),
-                "completions": float(player_data.get('completions', 0)) if player_data.get('completions') is not None else 0,
-                "attempts": float(player_data.get('attempts', 0)) if player_data.get('attempts') is not None else 0,
-                "pass_yds": float(player_data.get('pass_yds', 0)) if player_data.get('pass_yds') is not None else 0,
-                "pass_tds": float(player_data.get('pass_tds', 0)) if player_data.get('pass_tds') is not None else 0,
-                "interceptions": float(player_data.get('interceptions', 0)) if player_data.get('interceptions') is not None else 0,
-                "rush_att": float(player_data.get('rush_att', 0)) if player_data.get('rush_att') is not None else 0,
-                "rush_yds": float(player_data.get('rush_yds', 0)) if player_data.get('rush_yds') is not None else 0,
-                "rush_tds": float(player_data.get('rush_tds', 0)) if player_data.get('rush_tds') is not None else 0,
-                "rec_tgt": float(player_data.get('rec_tgt', 0)) if player_data.get('rec_tgt') is not None else 0,
-                "receptions": float(player_data.get('receptions', 0)) if player_data.get('receptions') is not None else 0,
-                "rec_yds": float(player_data.get('rec_yds', 0)) if player_data.get('rec_yds') is not None else 0,
-                "rec_tds": float(player_data.get('rec_tds', 0)) if player_data.get('rec_tds') is not None else 0,
-                "fumbles": float(player_data.get('fumbles', 0)) if player_data.get('fumbles') is not None else 0,
-                "fumbles_lost": float(player_data.get('fumbles_lost', 0)) if player_data.get('fumbles_lost') is not None else 0,
-                "total_tds": float(player_data.get('total_tds', 0)) if player_data.get('total_tds') is not None else 0,
-                "two_pt_md": float(player_data.get('two_pt_md', 0)) if player_data.get('two_pt_md') is not None else 0,
-                "two_pt_pass": float(player_data.get('two_pt_pass', 0)) if player_data.get('two_pt_pass') is not None else 0,
-                "dk_actuals": float(player_data.get('dk_actuals', 0)) if player_data.get('dk_actuals') is not None else 0,
-                "vbd": float(player_data.get('vbd', 0)) if player_data.get('vbd') is not None else 0,
-                "pos_rank": int(player_data.get('pos_rank', 0)) if player_data.get('pos_rank') is not None else 0,
-                "ov_rank": int(player_data.get('ov_rank', 0)) if player_data.get('ov_rank') is not None else 0
-            }
-            # Advanced fields default to 0
-            advanced_fields = [
-                'sacks_suffered','sack_yards_lost','sack_fumbles_lost','passing_air_yards',
-                'passing_yards_after_catch','passing_first_downs','passing_epa','passing_cpoe',
-                'pacr','rushing_first_downs','rushing_epa','receiving_air_yards',
-                'receiving_yards_after_catch','receiving_first_downs','receiving_epa','racr',
-                'target_share','air_yards_share','wopr'
-            ]
-            for f in advanced_fields:
-                actuals_data[f] = float(player_data.get(f, 0)) if player_data.get(f) is not None else 0.0
-            
-            if existing_actuals:
-                # Update existing actuals
-                for key, value in actuals_data.items():
-                    if key not in ['week_id', 'playerDkId']:  # Don't update these fields
-                        setattr(existing_actuals, key, value)
-                actuals_updated += 1
-            else:
-                # Create new actuals
-                new_actuals = PlayerActuals(**actuals_data)
-                db.add(new_actuals)
-                actuals_created += 1
-            
-            # Update player_pool_entries.actuals if player exists in pool for this week
-            pool_entries = db.query(PlayerPoolEntry).filter(
-                and_(
-                    PlayerPoolEntry.week_id == week_id,
-                    PlayerPoolEntry.playerDkId == player.playerDkId
-                )
-            ).all()
-            
-            for pool_entry in pool_entries:
-                pool_entry.actuals = actuals_data.get('dk_actuals', 0)
-                
+            actuals_data = build_actuals_row(week_id, player_dk_id, player_data)
         except Exception as e:
             failed_matches += 1
             errors.append(f"Error processing {player_data.get('name', 'Unknown')}: {str(e)}")
             continue
+        
+        successful_matches += 1
+        if player_dk_id in rows:
+            # Repeated player: the later row overwrites the earlier one
+            actuals_updated += 1
+        rows[player_dk_id] = actuals_data
     
     try:
+        if rows:
+            existing_ids = {
+                player_dk_id for (player_dk_id,) in db.query(PlayerActuals.playerDkId).filter(
+                    and_(
+                        PlayerActuals.week_id == week_id,
+                        PlayerActuals.playerDkId.in_(list(rows.keys()))
+                    )
+                ).all()
+            }
+            actuals_updated += len(existing_ids)
+            actuals_created += len(rows) - len(existing_ids)
+            
+            bulk_upsert(db, PlayerActuals, list(rows.values()), index_elements=['week_id', 'playerDkId'])
+            
+            # Update player_pool_entries.actuals for every pool entry of these players this week
+            update_pool_entry_actuals(db, week_id, rows.values())
+        
         db.commit()
+        player_game_log_cache.invalidate(year=week.year, player_ids=rows.keys())
         
         # Calculate duration
         duration_ms = int((time.time() - start_time) * 1000)
@@ -695,6 +669,184 @@ async def import_from_nflverse(
         raise HTTPException(status_code=500, detail=f"Error importing from NFLVerse: {str(e)}")
 
 
+@router.post("/backfill-nflverse")
+async def backfill_from_nflverse(
+    request_data: Dict[str, Any],
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """
+    Backfill games, team stats and player actuals from NFLVerse for a season range
+    
+    Runs in the background; each finished week is logged as an
+    "nflverse-backfill-import" activity and skipped by later runs when resume is true.
+    Progress is tracked in the import job store under the returned backfill_id.
+    
+    Request body:
+    {
+        "start_season": 2022,   # First NFL season year
+        "end_season": 2024,     # Last NFL season year (default: start_season)
+        "season_type": "REG",   # "REG", "POST", or "PRE"
+        "weeks": [1, 2],        # Optional week numbers (default: all weeks)
+        "datasets": ["games", "team_stats", "player_actuals"],  # Optional subset
+        "resume": true          # Skip weeks already backfilled
+    }
+    """
+    start_season = request_data.get('start_season')
+    end_season = request_data.get('end_season') or start_season
+    season_type = request_data.get('season_type', 'REG')
+    week_numbers = request_data.get('weeks')
+    resume = request_data.get('resume', True)
+    
+    if not start_season:
+        raise HTTPException(status_code=400, detail="start_season is required")
+    
+    service = NFLVerseBackfillService(db)
+    try:
+        if int(start_season) > int(end_season):
+            raise ValueError("start_season must not be after end_season")
+        datasets = NFLVerseBackfillService.validate_datasets(request_data.get('datasets'))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    weeks = service.get_target_weeks(start_season, end_season, week_numbers)
+    completed = service.get_completed_week_ids([w.id for w in weeks], datasets, season_type) if resume else set()
+    backfill_id = NFLVerseBackfillService.new_backfill_id()
+    ImportJobStore().create(
+        NFLVERSE_BACKFILL_JOB_TYPE,
+        job_id=backfill_id,
+        params={
+            "start_season": int(start_season),
+            "end_season": int(end_season),
+            "season_type": season_type,
+            "weeks": week_numbers,
+            "datasets": datasets,
+            "resume": resume
+        },
+        message=f"{len(weeks) - len(completed)} weeks pending"
+    )
+    
+    background_tasks.add_task(
+        run_nflverse_backfill_background,
+        backfill_id, int(start_season), int(end_season), season_type, week_numbers, datasets, resume
+    )
+    print(f"🚀 Started NFLVerse backfill {backfill_id} for {start_season}-{end_season} ({len(weeks) - len(completed)} weeks pending)")
+    
+    return {
+        "status": "started",
+        "backfill_id": backfill_id,
+        "datasets": datasets,
+        "weeks_total": len(weeks),
+        "weeks_pending": len(weeks) - len(completed),
+        "weeks_skipped": len(completed)
+    }
+
+@router.get("/backfill-nflverse/jobs/{backfill_id}")
+async def get_nflverse_backfill_job(backfill_id: str):
+    """Status, progress and summary of one NFLVerse backfill run"""
+    job = ImportJobStore().get(backfill_id)
+    if not job or job["job_type"] != NFLVERSE_BACKFILL_JOB_TYPE:
+        raise HTTPException(status_code=404, detail=f"Backfill {backfill_id} not found")
+    return job
+
+@router.post("/backfill-nflverse/jobs/{backfill_id}/resume")
+async def resume_nflverse_backfill(backfill_id: str, background_tasks: BackgroundTasks):
+    """
+    Resume a backfill that failed or was interrupted by a restart
+    
+    Weeks completed before the interruption are skipped; the run keeps its backfill_id.
+    """
+    job_store = ImportJobStore()
+    job = job_store.get(backfill_id)
+    if not job or job["job_type"] != NFLVERSE_BACKFILL_JOB_TYPE:
+        raise HTTPException(status_code=404, detail=f"Backfill {backfill_id} not found")
+    # Check and mark the job running in one UPDATE so a concurrent resume request is rejected
+    if not job_store.claim(backfill_id, message="Resume requested"):
+        raise HTTPException(status_code=409, detail=f"Backfill {backfill_id} is {job['status']} and cannot be resumed")
+    
+    params = job["params"]
+    background_tasks.add_task(
+        run_nflverse_backfill_background,
+        backfill_id, params["start_season"], params["end_season"], params["season_type"],
+        params.get("weeks"), params["datasets"], True
+    )
+    print(f"🔁 Resuming NFLVerse backfill {backfill_id}")
+    
+    return {"status": "resumed", "backfill_id": backfill_id}
+
+@router.get("/backfill-nflverse/status")
+async def get_nflverse_backfill_status(
+    start_season: int,
+    end_season: Optional[int] = None,
+    season_type: str = "REG",
+    db: Session = Depends(get_db)
+):
+    """Per-week completion of NFLVerse backfills for a season range"""
+    weeks = NFLVerseBackfillService(db).get_status(start_season, end_season or start_season, season_type)
+    return {
+        "weeks_total": len(weeks),
+        "weeks_completed": sum(1 for w in weeks if w["completed"]),
+        "weeks": weeks
+    }
+
+def run_nflverse_backfill_background(
+    backfill_id: str,
+    start_season: int,
+    end_season: int,
+    season_type: str,
+    week_numbers: Optional[List[int]],
+    datasets: List[str],
+    resume: bool
+):
+    """Background task running an NFLVerse backfill in its own database session"""
+    from app.database import SessionLocal
+    
+    job_store = ImportJobStore()
+    job = job_store.get(backfill_id)
+    completed_week_ids = list((job["checkpoint"] if job else {}).get("completed_week_ids", []))
+    progress = {"total": 0, "processed": 0, "successful": 0, "failed": 0}
+    
+    def record_week(week_result: Dict[str, Any]):
+        progress.update(total=week_result["total"], processed=week_result["index"])
+        if week_result["status"] == "completed":
+            progress["successful"] += 1
+            completed_week_ids.append(week_result["week_id"])
+        else:
+            progress["failed"] += 1
+        job_store.update(
+            backfill_id,
+            message=f"{week_result['season']} week {week_result['week_number']} {week_result['status']}",
+            progress=progress,
+            checkpoint={"completed_week_ids": completed_week_ids}
+        )
+    
+    db = SessionLocal()
+    try:
+        job_store.start(backfill_id)
+        # Loading the season frames and matching players can outlast the stale window
+        with job_store.heartbeat(backfill_id):
+            summary = NFLVerseBackfillService(db, progress=record_week).run(
+                start_season, end_season,
+                season_type=season_type,
+                week_numbers=week_numbers,
+                datasets=datasets,
+                resume=resume,
+                backfill_id=backfill_id
+            )
+        message = (f"{summary['weeks_completed']} weeks completed, "
+                   f"{summary['weeks_failed']} failed, {summary['weeks_skipped']} skipped")
+        job_store.complete(backfill_id, message, progress=progress, results=summary)
+        print(f"✅ NFLVerse backfill {backfill_id} finished: {message}")
+    except Exception as e:
+        try:
+            job_store.fail(backfill_id, f"Backfill failed: {e}")
+        except Exception as store_error:
+            print(f"⚠️ Failed to record backfill failure: {store_error}")
+        print(f"❌ NFLVerse backfill {backfill_id} failed: {e}")
+    finally:
+        db.close()
+
+
 # Background task function for scoring props after actuals import
 async def score_props_after_actuals_import_background(week_id: int, actuals_count: int):
     """
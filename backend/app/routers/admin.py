@@ -9,9 +9,10 @@ Provides administrative functionality including:
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from ..database import get_db
+from ..models import Week, PlayerPropBet
 from ..services.player_props_scoring_service import PlayerPropsScoringService
 from ..services.activity_logging import ActivityLoggingService
 
@@ -47,6 +48,44 @@ async def score_week_props(
         raise HTTPException(status_code=500, detail=f"Failed to start scoring: {str(e)}")
 
 
+@router.post("/score-props")
+async def score_props_bulk(
+    request_data: Dict[str, Any],
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Rescore props for many weeks in one pass.
+    
+    Request body (one of):
+    {
+        "week_ids": [1, 2, 3],  // Specific week IDs
+        "season": 2024,         // Every week of a season
+        "all_weeks": true       // Every week with props
+    }
+    """
+    week_ids = request_data.get('week_ids')
+    season = request_data.get('season')
+    all_weeks = request_data.get('all_weeks', False)
+    
+    if not week_ids and not season and not all_weeks:
+        raise HTTPException(status_code=400, detail="Must specify week_ids, season or all_weeks=true")
+    
+    if season and not week_ids:
+        week_ids = [week_id for (week_id,) in db.query(Week.id).filter(Week.year == season).all()]
+        if not week_ids:
+            raise HTTPException(status_code=404, detail=f"No weeks found for season {season}")
+    
+    # Run scoring in background to avoid timeout
+    background_tasks.add_task(score_props_bulk_background, None if all_weeks and not week_ids else week_ids)
+    
+    return {
+        "success": True,
+        "message": f"Started scoring props for {'all weeks' if all_weeks and not week_ids else f'{len(week_ids)} weeks'}",
+        "week_ids": week_ids
+    }
+
+
 @router.post("/score-player-props/{player_id}/{week_id}")
 async def score_player_props(
     player_id: int,
@@ -126,6 +165,38 @@ async def get_player_hit_percentage(
         raise HTTPException(status_code=500, detail=f"Failed to calculate hit percentage: {str(e)}")
 
 
+@router.post("/refresh-prop-hit-rates")
+async def refresh_prop_hit_rates(
+    request_data: Optional[Dict[str, Any]] = None,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Rebuild the player prop hit-rate aggregates.
+    
+    Request body (optional):
+    {
+        "week_ids": [1, 2, 3]  // Default: every week with props
+    }
+    """
+    try:
+        week_ids = (request_data or {}).get('week_ids')
+        if not week_ids:
+            week_ids = [week_id for (week_id,) in db.query(PlayerPropBet.week_id).distinct().all()]
+        
+        rows = PlayerPropsScoringService(db).refresh_hit_rates(week_ids)
+        db.commit()
+        
+        return {
+            "success": True,
+            "weeks_refreshed": len(week_ids),
+            "aggregate_rows": rows
+        }
+    
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to refresh hit rates: {str(e)}")
+
+
 # Background task functions
 async def score_week_props_background(week_id: int, db: Session):
     """
@@ -175,6 +246,48 @@ async def score_week_props_background(week_id: int, db: Session):
             pass  # Don't fail on logging errors
 
 
+def score_props_bulk_background(week_ids: Optional[List[int]]):
+    """
+    Background task to score props for many weeks with one scoring pass.
+    """
+    from ..database import SessionLocal
+    
+    db = SessionLocal()
+    try:
+        scoring_service = PlayerPropsScoringService(db)
+        activity_service = ActivityLoggingService(db)
+        
+        # Score every week at once
+        week_stats = scoring_service.score_weeks_props(week_ids)
+        
+        # Log the activity per week
+        for week_id, stats in week_stats.items():
+            activity_service.log_activity(
+                action="props-scoring",
+                file_type="API",
+                week_id=week_id,
+                records_updated=stats['scored_props'],
+                operation_status="completed",
+                details={
+                    "total_props": stats['total_props'],
+                    "hits": stats['hits'],
+                    "misses": stats['misses'],
+                    "pushes": stats['pushes'],
+                    "players_with_actuals": stats['players_with_actuals'],
+                    "players_missing_actuals": stats['players_missing_actuals'],
+                    "bulk_weeks": len(week_stats)
+                }
+            )
+        
+        print(f"✅ Background bulk scoring completed for {len(week_stats)} weeks: "
+              f"{sum(stats['scored_props'] for stats in week_stats.values())} props scored")
+        
+    except Exception as e:
+        print(f"❌ Background bulk scoring failed: {e}")
+    finally:
+        db.close()
+
+
 async def score_player_props_background(player_id: int, week_id: int, db: Session):
     """
     Background task to score props for a specific player.
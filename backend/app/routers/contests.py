@@ -4,6 +4,7 @@ Handles endpoints for importing DraftKings contest results from CSV with a revie
 """
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
+from sqlalchemy import or_, update
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Set
 from datetime import datetime
@@ -11,15 +12,24 @@ from zoneinfo import ZoneInfo
 import csv
 import io
 import re
+import time
 from datetime import datetime as _dt
 
 from app.database import get_db
 from app.models import Week, Sport, GameType, Contest, Lineup, ContestType, DKContestDetail
 from app.services.activity_logging import ActivityLoggingService
+from app.services.contest_analytics_service import ContestAnalyticsService
+from app.services.draftkings_import import DRAFTKINGS_API_BASE_URL, draftkings_rate_limiter
+from app.services.http_client import create_async_client, gather_bounded, request_with_retry
+from app.utils.bulk_upsert import bulk_upsert_counts, chunked, dialect_insert
 import httpx
 
 router = APIRouter(tags=["contests"])
 
+# Max contest details fetched from DK at once, and how long a 404 is remembered
+DK_CONTEST_FETCH_CONCURRENCY = 8
+DK_CONTEST_NOT_FOUND_TTL_SECONDS = 6 * 60 * 60
+
 
 def _normalize_attr_key(key: Any) -> str:
     try:
@@ -135,124 +145,349 @@ def _get_stripped(row: dict, header_map: dict, names: List[str]) -> str:
     return ""
 
 
-async def _ensure_dk_contest_details(db: Session, contest_ids: Set[str]):
-    """Ensure dk_contest_detail has rows for contest_ids by calling DK API for missing ones."""
+class DKContestNotFoundCache:
+    """
+    Remembers contest ids the DK API answered with 404 so re-uploads of the same
+    history do not ask for them again until the entry expires.
+    """
+
+    def __init__(self, ttl_seconds: int = DK_CONTEST_NOT_FOUND_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._expires: Dict[str, float] = {}
+
+    def contains(self, contest_id: str) -> bool:
+        expires = self._expires.get(contest_id)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            self._expires.pop(contest_id, None)
+            return False
+        return True
+
+    def add(self, contest_id: str) -> None:
+        self._expires[contest_id] = time.monotonic() + self.ttl_seconds
+
+    def clear(self) -> None:
+        self._expires.clear()
+
+
+# Global negative cache; requests are short-lived so state lives at module level
+dk_contest_not_found_cache = DKContestNotFoundCache()
+
+
+def _parse_dk_datetime(value: str):
+    if not value:
+        return None
+    try:
+        s = value.strip().replace('Z', '+00:00')
+        if '.' in s:
+            left, right = s.split('.', 1)
+            # split on timezone sign if present
+            tz_sign = '+' if '+' in right else ('-' if '-' in right else None)
+            if tz_sign:
+                frac, tz = right.split(tz_sign, 1)
+                if len(frac) > 6:
+                    frac = frac[:6]
+                s = f"{left}.{frac}{tz_sign}{tz}"
+            else:
+                frac = right
+                if len(frac) > 6:
+                    frac = frac[:6]
+                s = f"{left}.{frac}"
+        return _dt.fromisoformat(s)
+    except Exception:
+        return None
+
+
+def _build_dk_contest_detail_row(
+    cid: str,
+    detail: Dict[str, Any],
+    sport_code_to_id: Dict[str, int],
+    ctype_code_to_id: Dict[str, int],
+) -> Dict[str, Any]:
+    """Map a DK contestDetail payload to a dk_contest_detail row"""
+    entry_fee = detail.get("entryFee")
+    max_entries = detail.get("maximumEntries")
+    total_payouts = detail.get("totalPayouts")
+    attributes = detail.get("attributes") or {}
+
+    # Detect contest type from attributes (handle variant keys/casing)
+    inferred_code = None
+    if _is_h2h_from_attributes(attributes):
+        inferred_code = "H2H"
+    else:
+        at_norm = { _normalize_attr_key(k): str(v).lower() for k, v in (attributes or {}).items() }
+        if at_norm.get("isfiftyfifty") == "true":
+            inferred_code = "50/50"
+        elif at_norm.get("isdoubleup") == "true":
+            inferred_code = "DoubleUp"
+        elif at_norm.get("istournament") == "true":
+            inferred_code = "Tournament"
+    contest_type_id = ctype_code_to_id.get(inferred_code) if inferred_code else None
+
+    # Rake
+    rake_percentage = None
+    try:
+        if max_entries and entry_fee and total_payouts and float(total_payouts) != 0:
+            calculated_rake = ((float(max_entries) * float(entry_fee)) - float(total_payouts)) / float(total_payouts)
+            rake_percentage = round(calculated_rake * 100, 2)  # Convert to percentage
+    except Exception as e:
+        print(f"Rake calculation error for {cid}: {e}")
+        rake_percentage = None
+
+    return {
+        "contest_id": str(cid),
+        "name": detail.get("name"),
+        "sport_id": sport_code_to_id.get(str(detail.get("sport") or "").upper()),
+        "contest_type_id": contest_type_id,
+        "summary": detail.get("contestSummary"),
+        "draftGroupId": detail.get("draftGroupId"),
+        "payoutDescription": (detail.get("payoutDescriptions") or {}).get("Cash") or detail.get("PayoutDescription"),
+        "rake_percentage": rake_percentage,
+        "total_payouts": total_payouts,
+        "is_guaranteed": bool(detail.get("isGuaranteed")),
+        "is_private": bool(detail.get("isPrivate")),
+        "is_cashprize_only": bool(detail.get("IsCashPrizeOnly") or detail.get("isCashPrizeOnly")),
+        "entry_fee": entry_fee,
+        "entries": detail.get("entries"),
+        "max_entries": max_entries,
+        "max_entries_per_user": detail.get("maximumEntriesPerUser"),
+        "contest_state": detail.get("contestState") or detail.get("contestStateDetail"),
+        "contest_start_time": _parse_dk_datetime(detail.get("contestStartTime")),
+        "attributes": attributes,
+    }
+
+
+async def _fetch_dk_contest_detail(client: httpx.AsyncClient, cid: str) -> Dict[str, Any] | None:
+    """Fetch one contest's detail from the DK API; None when DK does not know the contest"""
+    url = f"{DRAFTKINGS_API_BASE_URL}/contests/v1/contests/{cid}?format=json"
+    resp = await request_with_retry(
+        client, "GET", url,
+        rate_limiter=draftkings_rate_limiter(),
+        headers={"Accept": "application/json"},
+    )
+    if resp.status_code == 404:
+        dk_contest_not_found_cache.add(cid)
+        return None
+    resp.raise_for_status()
+    return (resp.json() or {}).get("contestDetail", {})
+
+
+async def _ensure_dk_contest_details(
+    db: Session,
+    contest_ids: Set[str],
+    max_concurrency: int = DK_CONTEST_FETCH_CONCURRENCY,
+):
+    """
+    Ensure dk_contest_detail has rows for contest_ids by calling DK API for missing ones.
+
+    Missing contests are fetched concurrently through the shared DraftKings rate limiter,
+    contests DK answered with 404 are skipped until their negative-cache entry expires,
+    and fetched details are written in chunked bulk inserts. A chunk that fails is
+    retried one contest at a time so only the bad rows are skipped.
+    """
     if not contest_ids:
         return
     existing_ids = {
         r[0] for r in db.query(DKContestDetail.contest_id).filter(DKContestDetail.contest_id.in_(list(contest_ids))).all()
     }
-    missing = [cid for cid in contest_ids if cid and cid not in existing_ids]
+    missing = sorted(
+        cid for cid in contest_ids
+        if cid and cid not in existing_ids and not dk_contest_not_found_cache.contains(cid)
+    )
     if not missing:
         return
 
     # Lookups
     sport_code_to_id = {s.code.upper(): s.sport_id for s in db.query(Sport).all()}
-    from app.models import ContestType as ContestTypeModel
-    ctype_code_to_id = {c.code: c.contest_type_id for c in db.query(ContestTypeModel).all()}
+    ctype_code_to_id = {c.code: c.contest_type_id for c in db.query(ContestType).all()}
 
-    def _parse_dt(value: str):
-        if not value:
-            return None
+    async with create_async_client(timeout=10) as client:
+        fetched = await gather_bounded(
+            missing,
+            lambda cid: _fetch_dk_contest_detail(client, cid),
+            max_concurrency
+        )
+
+    rows = []
+    for cid, detail in zip(missing, fetched):
+        if isinstance(detail, Exception):
+            print(f"⚠️ Failed to fetch DK contest detail for {cid}: {detail}")
+            continue
+        if not detail:
+            continue
         try:
-            s = value.strip().replace('Z', '+00:00')
-            if '.' in s:
-                left, right = s.split('.', 1)
-                # split on timezone sign if present
-                tz_sign = '+' if '+' in right else ('-' if '-' in right else None)
-                if tz_sign:
-                    frac, tz = right.split(tz_sign, 1)
-                    if len(frac) > 6:
-                        frac = frac[:6]
-                    s = f"{left}.{frac}{tz_sign}{tz}"
-                else:
-                    frac = right
-                    if len(frac) > 6:
-                        frac = frac[:6]
-                    s = f"{left}.{frac}"
-            return _dt.fromisoformat(s)
-        except Exception:
-            return None
+            rows.append(_build_dk_contest_detail_row(cid, detail, sport_code_to_id, ctype_code_to_id))
+        except Exception as e:
+            print(f"⚠️ Failed to parse DK contest detail for {cid}: {e}")
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        for cid in missing:
-            try:
-                url = f"https://api.draftkings.com/contests/v1/contests/{cid}?format=json"
-                resp = await client.get(url, headers={"Accept": "application/json"})
-                resp.raise_for_status()
-                detail = (resp.json() or {}).get("contestDetail", {})
-                if not detail:
-                    continue
-
-                name = detail.get("name")
-                sport_id = sport_code_to_id.get(str(detail.get("sport") or "").upper())
-                draft_group_id = detail.get("draftGroupId")
-                payout_desc = (detail.get("payoutDescriptions") or {}).get("Cash") or detail.get("PayoutDescription")
-                total_payouts = detail.get("totalPayouts")
-                is_guaranteed = bool(detail.get("isGuaranteed"))
-                is_private = bool(detail.get("isPrivate"))
-                is_cashprize_only = bool(detail.get("IsCashPrizeOnly") or detail.get("isCashPrizeOnly"))
-                entry_fee = detail.get("entryFee")
-                entries = detail.get("entries")
-                max_entries = detail.get("maximumEntries")
-                max_entries_per_user = detail.get("maximumEntriesPerUser")
-                contest_state = detail.get("contestState") or detail.get("contestStateDetail")
-                cstart_raw = detail.get("contestStartTime")
-                cstart = _parse_dt(cstart_raw)
-                summary = detail.get("contestSummary")
-                attributes = detail.get("attributes") or {}
-
-                # Detect contest type from attributes (handle variant keys/casing)
-                inferred_code = None
-                if _is_h2h_from_attributes(attributes):
-                    inferred_code = "H2H"
-                else:
-                    at_norm = { _normalize_attr_key(k): str(v).lower() for k, v in (attributes or {}).items() }
-                    if at_norm.get("isfiftyfifty") == "true":
-                        inferred_code = "50/50"
-                    elif at_norm.get("isdoubleup") == "true":
-                        inferred_code = "DoubleUp"
-                    elif at_norm.get("istournament") == "true":
-                        inferred_code = "Tournament"
-                contest_type_id = ctype_code_to_id.get(inferred_code) if inferred_code else None
-
-                # Rake
-                rake_percentage = None
+    if not rows:
+        return
+    for chunk in chunked(rows):
+        try:
+            with db.begin_nested():
+                _insert_dk_contest_details(db, chunk)
+        except Exception as e:
+            # Retry the chunk row by row so one bad contest does not drop the others
+            print(f"⚠️ Failed to store DK contest detail batch, retrying per contest: {e}")
+            for row in chunk:
                 try:
-                    if max_entries and entry_fee and total_payouts and float(total_payouts) != 0:
-                        calculated_rake = ((float(max_entries) * float(entry_fee)) - float(total_payouts)) / float(total_payouts)
-                        rake_percentage = round(calculated_rake * 100, 2)  # Convert to percentage
-                except Exception as e:
-                    print(f"Rake calculation error for {cid}: {e}")
-                    rake_percentage = None
-
-                row = DKContestDetail(
-                    contest_id=str(cid),
-                    name=name,
-                    sport_id=sport_id,
-                    contest_type_id=contest_type_id,
-                    summary=summary,
-                    draftGroupId=draft_group_id,
-                    payoutDescription=payout_desc,
-                    rake_percentage=rake_percentage,
-                    total_payouts=total_payouts,
-                    is_guaranteed=is_guaranteed,
-                    is_private=is_private,
-                    is_cashprize_only=is_cashprize_only,
-                    entry_fee=entry_fee,
-                    entries=entries,
-                    max_entries=max_entries,
-                    max_entries_per_user=max_entries_per_user,
-                    contest_state=contest_state,
-                    contest_start_time=cstart,
-                    attributes=attributes,
-                )
-                db.add(row)
-                db.commit()
-            except Exception:
-                db.rollback()
+                    with db.begin_nested():
+                        _insert_dk_contest_details(db, [row])
+                except Exception as row_error:
+                    print(f"⚠️ Failed to store DK contest detail for {row['contest_id']}: {row_error}")
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ Failed to store DK contest details: {e}")
+
+
+def _insert_dk_contest_details(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Insert dk_contest_detail rows, keeping rows written concurrently by another upload"""
+    db.execute(
+        dialect_insert(db, DKContestDetail).values(list(rows))
+        .on_conflict_do_nothing(index_elements=["contest_id"])
+    )
+
+
+def _commit_contest_rows(db: Session, week_id: int, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Write staged contest rows with chunked INSERT ... ON CONFLICT (entry_key) DO UPDATE.
+
+    Sport, game type, contest type, DK detail and lineup lookups are each loaded once for
+    the whole batch. Entries repeated in the batch keep their last row. Lineups of the
+    written entries are marked submitted in one UPDATE. Does not commit.
+
+    Returns:
+        Dict with created/updated counts, errors, the contest rows written and the
+        week ids whose rollups need refreshing
+    """
+    code_to_sport: Dict[str, int] = {s.code.upper(): s.sport_id for s in db.query(Sport).all()}
+    code_to_game_type: Dict[str, int] = {g.code: g.game_type_id for g in db.query(GameType).all()}
+    code_to_contest_type: Dict[str, int] = {c.code: c.contest_type_id for c in db.query(ContestType).all()}
+    h2h_type_id = code_to_contest_type.get("H2H")
+
+    contest_ids = {str(r.get("contest_id")) for r in rows if r.get("contest_id")}
+    dk_detail_map = {
+        contest_id: (contest_type_id, attributes)
+        for contest_id, contest_type_id, attributes in db.query(
+            DKContestDetail.contest_id, DKContestDetail.contest_type_id, DKContestDetail.attributes
+        ).filter(DKContestDetail.contest_id.in_(contest_ids))
+    } if contest_ids else {}
+
+    lineup_ids = {str(r.get("lineup_id")) for r in rows if r.get("lineup_id")}
+    known_lineups = {
+        lineup_id for (lineup_id,) in db.query(Lineup.id).filter(Lineup.id.in_(lineup_ids))
+    } if lineup_ids else set()
+
+    errors: List[str] = []
+    duplicates = 0
+    contest_rows: Dict[int, Dict[str, Any]] = {}
+    for r in rows:
+        try:
+            entry_key = int(r.get("entry_key")) if r.get("entry_key") is not None else 0
+            contest_id = int(r.get("contest_id")) if r.get("contest_id") is not None else 0
+            if entry_key <= 0:
+                errors.append("Missing or invalid entry_key")
+                continue
+            sport_id = code_to_sport.get(str(r.get("sport_code", "")).upper())
+            game_type_id = code_to_game_type.get(str(r.get("game_type_code", "Classic")))
+
+            # Get contest_type_id and opponent from dk_contest_detail
+            contest_type_id = None
+            contest_opponent = None
+            dk_detail = dk_detail_map.get(str(contest_id))
+            if dk_detail:
+                contest_type_id, attributes = dk_detail
+                # Extract opponent from attributes if it's H2H
+                if contest_type_id == h2h_type_id or _is_h2h_from_attributes(attributes):
+                    contest_opponent = _extract_h2h_opponent(attributes)
+
+            # Fallback to CSV contest_type_code if no DK detail
+            if not contest_type_id and r.get("contest_type_code"):
+                contest_type_id = code_to_contest_type.get(str(r.get("contest_type_code")))
+            if not sport_id:
+                errors.append(f"Entry {entry_key}: Unknown sport code '{r.get('sport_code')}'")
+                continue
+            if not game_type_id:
+                errors.append(f"Entry {entry_key}: Unknown game type '{r.get('game_type_code')}'")
+                continue
+            lineup_id = r.get("lineup_id") or None
+            if lineup_id and str(lineup_id) not in known_lineups:
+                errors.append(f"Entry {entry_key}: Unknown lineup '{lineup_id}'")
                 continue
 
+            contest_date_utc = r.get("contest_date_utc")
+            if isinstance(contest_date_utc, str):
+                contest_date_utc = datetime.fromisoformat(contest_date_utc).astimezone(ZoneInfo("UTC"))
+
+            net_profit = float(r.get("winnings_non_ticket") or 0) + float(r.get("winnings_ticket") or 0) - float(r.get("entry_fee_usd") or 0)
+            result_flag = 1 if ((r.get("winnings_non_ticket") or 0) > 0 or (r.get("winnings_ticket") or 0) > 0) else 0
+            if entry_key in contest_rows:
+                duplicates += 1
+            contest_rows[entry_key] = {
+                "entry_key": entry_key,
+                "contest_id": contest_id,
+                "week_id": week_id,
+                "sport_id": sport_id,
+                "lineup_id": lineup_id,
+                "game_type_id": game_type_id,
+                "contest_type_id": contest_type_id,
+                "contest_description": r.get("contest_description"),
+                "contest_opponent": contest_opponent or r.get("contest_opponent"),
+                "contest_date_utc": contest_date_utc,
+                "contest_place": r.get("contest_place"),
+                "contest_points": r.get("contest_points"),
+                "winnings_non_ticket": r.get("winnings_non_ticket"),
+                "winnings_ticket": r.get("winnings_ticket"),
+                "contest_entries": r.get("contest_entries"),
+                "places_paid": r.get("places_paid"),
+                "entry_fee_usd": r.get("entry_fee_usd"),
+                "prize_pool_usd": r.get("prize_pool_usd"),
+                "net_profit_usd": net_profit,
+                "result": bool(result_flag),
+            }
+        except Exception as e:
+            errors.append(f"Entry {r.get('entry_key')}: {str(e)}")
+
+    written = list(contest_rows.values())
+
+    # Weeks these entries belonged to before the write, so moved entries leave their old week's rollups too
+    week_ids = {week_id}
+    entry_keys = list(contest_rows.keys())
+    for chunk in chunked(entry_keys):
+        week_ids.update(
+            previous_week for (previous_week,) in
+            db.query(Contest.week_id).filter(Contest.entry_key.in_(chunk)).distinct()
+            if previous_week is not None
+        )
+
+    created, updated = bulk_upsert_counts(db, Contest, written, index_elements=["entry_key"])
+    # Repeated entries in the batch count as updates of the first one
+    updated += duplicates
+
+    # Mark lineups used by these entries as submitted
+    submitted_lineups = {row["lineup_id"] for row in written if row["lineup_id"]}
+    if submitted_lineups:
+        db.execute(
+            update(Lineup)
+            .where(Lineup.id.in_(submitted_lineups), or_(Lineup.status.is_(None), Lineup.status != 'submitted'))
+            .values(status='submitted')
+        )
+
+    return {"created": created, "updated": updated, "errors": errors, "rows": written, "week_ids": sorted(week_ids)}
+
+
+def _refresh_contest_rollups(db: Session, week_ids: List[int]) -> None:
+    """Keep the contest ROI rollups in step with the weeks an import touched"""
+    try:
+        ContestAnalyticsService(db).refresh_weeks(week_ids)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ Failed to refresh contest ROI rollups for weeks {week_ids}: {e}")
+
 
 @router.get("/weeks")
 async def get_active_completed_weeks(db: Session = Depends(get_db)):
@@ -438,112 +673,14 @@ async def parse_contests_csv(
             print(f"Error extracting opponent names: {e}")
 
         # Now automatically commit the data (simpler flow for user)
-        # This mirrors the logic from /commit endpoint
-        code_to_sport: Dict[str, int] = {s.code.upper(): s.sport_id for s in db.query(Sport).all()}
-        code_to_game_type: Dict[str, int] = {g.code: g.game_type_id for g in db.query(GameType).all()}
-        code_to_contest_type = {c.code: c.contest_type_id for c in db.query(ContestTypeModel).all()}
-        
-        created = 0
-        updated = 0
-        errors: List[str] = []
-        cache: Dict[int, Contest] = {}
-        
-        for r in staged:
-            try:
-                entry_key = int(r.get("entry_key")) if r.get("entry_key") is not None else 0
-                contest_id = int(r.get("contest_id")) if r.get("contest_id") is not None else 0
-                if entry_key <= 0:
-                    errors.append("Missing or invalid entry_key")
-                    continue
-                sport_id = code_to_sport.get(str(r.get("sport_code", "")).upper())
-                game_type_id = code_to_game_type.get(str(r.get("game_type_code", "Classic")))
-                
-                # Get contest_type_id and opponent from dk_contest_detail
-                contest_type_id = None
-                contest_opponent = None
-                dk_detail = dk_detail_map.get(str(contest_id))
-                if dk_detail:
-                    contest_type_id = dk_detail.contest_type_id
-                    # Extract opponent from attributes if it's H2H
-                    if dk_detail.contest_type_id == code_to_contest_type.get("H2H") or _is_h2h_from_attributes(dk_detail.attributes):
-                        contest_opponent = _extract_h2h_opponent(dk_detail.attributes)
-                
-                # Fallback to CSV contest_type_code if no DK detail
-                if not contest_type_id and r.get("contest_type_code"):
-                    contest_type_id = code_to_contest_type.get(str(r.get("contest_type_code")))
-                if not sport_id:
-                    errors.append(f"Entry {entry_key}: Unknown sport code '{r.get('sport_code')}'")
-                    continue
-                if not game_type_id:
-                    errors.append(f"Entry {entry_key}: Unknown game type '{r.get('game_type_code')}'")
-                    continue
-                
-                net_profit = float(r.get("winnings_non_ticket") or 0) + float(r.get("winnings_ticket") or 0) - float(r.get("entry_fee_usd") or 0)
-                result_flag = 1 if ((r.get("winnings_non_ticket") or 0) > 0 or (r.get("winnings_ticket") or 0) > 0) else 0
-                # Prefer cached (created earlier in this batch), then DB lookup
-                existing = cache.get(entry_key) or db.query(Contest).filter(Contest.entry_key == entry_key).first()
-                if existing:
-                    existing.week_id = week_id
-                    existing.sport_id = sport_id
-                    existing.lineup_id = r.get("lineup_id")
-                    existing.game_type_id = game_type_id
-                    existing.contest_type_id = contest_type_id
-                    existing.contest_id = contest_id
-                    existing.contest_description = r.get("contest_description")
-                    existing.contest_opponent = contest_opponent or r.get("contest_opponent")
-                    existing.contest_date_utc = r.get("contest_date_utc")
-                    existing.contest_place = r.get("contest_place")
-                    existing.contest_points = r.get("contest_points")
-                    existing.winnings_non_ticket = r.get("winnings_non_ticket")
-                    existing.winnings_ticket = r.get("winnings_ticket")
-                    existing.contest_entries = r.get("contest_entries")
-                    existing.places_paid = r.get("places_paid")
-                    existing.entry_fee_usd = r.get("entry_fee_usd")
-                    existing.prize_pool_usd = r.get("prize_pool_usd")
-                    existing.net_profit_usd = net_profit
-                    existing.result = bool(result_flag)
-                    updated += 1
-                else:
-                    obj = Contest(
-                        entry_key=entry_key,
-                        contest_id=contest_id,
-                        week_id=week_id,
-                        sport_id=sport_id,
-                        lineup_id=r.get("lineup_id"),
-                        game_type_id=game_type_id,
-                        contest_type_id=contest_type_id,
-                        contest_description=r.get("contest_description"),
-                        contest_opponent=contest_opponent or r.get("contest_opponent"),
-                        contest_date_utc=r.get("contest_date_utc"),
-                        contest_place=r.get("contest_place"),
-                        contest_points=r.get("contest_points"),
-                        winnings_non_ticket=r.get("winnings_non_ticket"),
-                        winnings_ticket=r.get("winnings_ticket"),
-                        contest_entries=r.get("contest_entries"),
-                        places_paid=r.get("places_paid"),
-                        entry_fee_usd=r.get("entry_fee_usd"),
-                        prize_pool_usd=r.get("prize_pool_usd"),
-                        net_profit_usd=net_profit,
-                        result=bool(result_flag),
-                    )
-                    db.add(obj)
-                    # Flush so subsequent iterations can see this row
-                    db.flush()
-                    cache[entry_key] = obj
-                    created += 1
-                # If lineup_id is provided, update lineup status to 'submitted'
-                try:
-                    lineup_id_val = r.get("lineup_id")
-                    if lineup_id_val:
-                        lineup_obj = db.query(Lineup).filter(Lineup.id == lineup_id_val).first()
-                        if lineup_obj and lineup_obj.status != 'submitted':
-                            lineup_obj.status = 'submitted'
-                except Exception:
-                    pass
-            except Exception as e:
-                errors.append(f"Entry {r.get('entry_key')}: {str(e)}")
+        # This uses the same bulk write as the /commit endpoint
+        result = _commit_contest_rows(db, week_id, staged)
+        created = result["created"]
+        updated = result["updated"]
+        errors: List[str] = result["errors"]
         
         db.commit()
+        _refresh_contest_rollups(db, result["week_ids"])
         
         # Calculate duration
         end_time = time.perf_counter()
@@ -629,133 +766,21 @@ async def commit_contests(payload: Dict[str, Any], request: Request, db: Session
         if not week:
             raise HTTPException(status_code=404, detail=f"Week {week_id} not found")
 
-        # Build lookup maps
-        code_to_sport: Dict[str, int] = {s.code.upper(): s.sport_id for s in db.query(Sport).all()}
-        code_to_game_type: Dict[str, int] = {g.code: g.game_type_id for g in db.query(GameType).all()}
-        # contest_type is in models module; import lazily to avoid circular import at top
-        from app.models import ContestType as ContestTypeModel
-        code_to_contest_type: Dict[str, int] = {c.code: c.contest_type_id for c in db.query(ContestTypeModel).all()}
-        
-        # Build DK contest detail lookup map
-        contest_ids = [str(r.get("contest_id")) for r in rows if r.get("contest_id")]
         # Ensure DK details exist for all contest_ids (auto-fetch from DK API if missing)
+        contest_ids = [str(r.get("contest_id")) for r in rows if r.get("contest_id")]
         try:
             await _ensure_dk_contest_details(db, set(contest_ids))
         except Exception:
             # proceed even if ensure fails; fallback logic will still use CSV data
             pass
-        dk_details = db.query(DKContestDetail).filter(DKContestDetail.contest_id.in_(contest_ids)).all()
-        dk_detail_map = {d.contest_id: d for d in dk_details}
 
-        created = 0
-        updated = 0
-        errors: List[str] = []
-        cache: Dict[int, Contest] = {}
-
-        for r in rows:
-            try:
-                entry_key = int(r.get("entry_key")) if r.get("entry_key") is not None else 0
-                contest_id = int(r.get("contest_id")) if r.get("contest_id") is not None else 0
-                if entry_key <= 0:
-                    errors.append("Missing or invalid entry_key")
-                    continue
-                sport_id = code_to_sport.get(str(r.get("sport_code", "")).upper())
-                game_type_id = code_to_game_type.get(str(r.get("game_type_code", "Classic")))
-                
-                # Get contest_type_id and opponent from dk_contest_detail
-                contest_type_id = None
-                contest_opponent = None
-                dk_detail = dk_detail_map.get(str(contest_id))
-                if dk_detail:
-                    contest_type_id = dk_detail.contest_type_id
-                    # Extract opponent from attributes if it's H2H
-                    if dk_detail.contest_type_id == code_to_contest_type.get("H2H") or _is_h2h_from_attributes(dk_detail.attributes):
-                        contest_opponent = _extract_h2h_opponent(dk_detail.attributes)
-                
-                # Fallback to CSV contest_type_code if no DK detail
-                if not contest_type_id and r.get("contest_type_code"):
-                    contest_type_id = code_to_contest_type.get(str(r.get("contest_type_code")))
-                if not sport_id:
-                    errors.append(f"Entry {entry_key}: Unknown sport code '{r.get('sport_code')}'")
-                    continue
-                if not game_type_id:
-                    errors.append(f"Entry {entry_key}: Unknown game type '{r.get('game_type_code')}'")
-                    continue
-
-                net_profit = float(r.get("winnings_non_ticket") or 0) + float(r.get("winnings_ticket") or 0) - float(r.get("entry_fee_usd") or 0)
-                result_flag = 1 if ((r.get("winnings_non_ticket") or 0) > 0 or (r.get("winnings_ticket") or 0) > 0) else 0
-                # Prefer cached (created earlier in this batch), then DB lookup
-                existing = cache.get(entry_key) or db.query(Contest).filter(Contest.entry_key == entry_key).first()
-                if existing:
-                    existing.week_id = week_id
-                    existing.sport_id = sport_id
-                    existing.lineup_id = r.get("lineup_id")
-                    existing.game_type_id = game_type_id
-                    existing.contest_type_id = contest_type_id
-                    existing.contest_id = contest_id
-                    existing.contest_description = r.get("contest_description")
-                    existing.contest_opponent = contest_opponent or r.get("contest_opponent")
-                    existing.contest_date_utc = datetime.fromisoformat(r.get("contest_date_utc")).astimezone(ZoneInfo("UTC"))
-                    existing.contest_place = r.get("contest_place")
-                    existing.contest_points = r.get("contest_points")
-                    existing.winnings_non_ticket = r.get("winnings_non_ticket")
-                    existing.winnings_ticket = r.get("winnings_ticket")
-                    existing.contest_entries = r.get("contest_entries")
-                    existing.places_paid = r.get("places_paid")
-                    existing.entry_fee_usd = r.get("entry_fee_usd")
-                    existing.prize_pool_usd = r.get("prize_pool_usd")
-                    existing.net_profit_usd = net_profit
-                    existing.result = bool(result_flag)
-                    updated += 1
-                else:
-                    obj = Contest(
-                        entry_key=entry_key,
-                        contest_id=contest_id,
-                        week_id=week_id,
-                        sport_id=sport_id,
-                        lineup_id=r.get("lineup_id"),
-                        game_type_id=game_type_id,
-                        contest_type_id=contest_type_id,
-                        contest_description=r.get("contest_description"),
-                        contest_opponent=contest_opponent or r.get("contest_opponent"),
-                        contest_date_utc=datetime.fromisoformat(r.get("contest_date_utc")).astimezone(ZoneInfo("UTC")),
-                        contest_place=r.get("contest_place"),
-                        contest_points=r.get("contest_points"),
-                        winnings_non_ticket=r.get("winnings_non_ticket"),
-                        winnings_ticket=r.get("winnings_ticket"),
-                        contest_entries=r.get("contest_entries"),
-                        places_paid=r.get("places_paid"),
-                        entry_fee_usd=r.get("entry_fee_usd"),
-                        prize_pool_usd=r.get("prize_pool_usd"),
-                        net_profit_usd=net_profit,
-                        result=bool(result_flag),
-                    )
-                    db.add(obj)
-                    # Flush so subsequent iterations can see this row
-                    db.flush()
-                    cache[entry_key] = obj
-                    created += 1
-                # If lineup_id is provided, update lineup status to 'submitted'. If H2H, set contest_opponent from DK attributes if available
-                try:
-                    lineup_id_val = r.get("lineup_id")
-                    if lineup_id_val:
-                        lineup_obj = db.query(Lineup).filter(Lineup.id == lineup_id_val).first()
-                        if lineup_obj and lineup_obj.status != 'submitted':
-                            lineup_obj.status = 'submitted'
-                    # If H2H per DK detail attributes, parse opponent
-                    if contest_id:
-                        dk = db.query(DKContestDetail).filter(DKContestDetail.contest_id == str(contest_id)).first()
-                        if dk and dk.attributes:
-                            if _is_h2h_from_attributes(dk.attributes):
-                                opp = _extract_h2h_opponent(dk.attributes)
-                                if opp:
-                                    (existing if existing else obj).contest_opponent = opp
-                except Exception:
-                    pass
-            except Exception as e:
-                errors.append(f"Entry {r.get('entry_key')}: {str(e)}")
+        result = _commit_contest_rows(db, week_id, rows)
+        created = result["created"]
+        updated = result["updated"]
+        errors: List[str] = result["errors"]
 
         db.commit()
+        _refresh_contest_rollups(db, result["week_ids"])
 
         # Log activity using ActivityLoggingService
         service = ActivityLoggingService(db)
@@ -870,3 +895,38 @@ async def list_contest_types(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+
+
+@router.get("/analytics/dashboard")
+async def get_contest_dashboard(
+    season: int | None = None,
+    week_id: int | None = None,
+    contest_type: str | None = None,
+    game_type: str | None = None,
+    db: Session = Depends(get_db),
+):
+    """Contest ROI totals and breakdowns by week, contest type, game type, entry-fee bucket and lineup."""
+    try:
+        service = ContestAnalyticsService(db)
+        return service.get_dashboard(
+            season=season,
+            week_ids=[week_id] if week_id is not None else None,
+            contest_type=contest_type,
+            game_type=game_type,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/analytics/refresh")
+async def refresh_contest_rollups(payload: Dict[str, Any] | None = None, db: Session = Depends(get_db)):
+    """Rebuild contest ROI rollups for the given week_ids, or for every week when none are given."""
+    try:
+        week_ids = (payload or {}).get("week_ids")
+        service = ContestAnalyticsService(db)
+        rows = service.refresh_weeks(week_ids) if week_ids else service.refresh_all()
+        db.commit()
+        return {"success": True, "rollup_rows": rows, "week_ids": week_ids or "all"}
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
@@ -4,7 +4,7 @@ Handles API endpoints for importing player pool data from DraftKings
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Request
-from app.schemas import DraftKingsImportRequest, DraftKingsImportResponse, RecentActivity
+from app.schemas import DraftKingsImportRequest, DraftKingsImportResponse, DraftKingsBatchImportRequest, DraftKingsBatchImportResponse, RecentActivity
 from app.services.draftkings_import import DraftKingsImportService
 from app.models import RecentActivity
 from app.database import get_db
@@ -56,7 +56,7 @@ async def import_player_pool(request: DraftKingsImportRequest, http_request: Req
         
         service = DraftKingsImportService(db)
         
-        result = await service.import_player_pool(request.week_id, request.draft_group)
+        result = await service.import_player_pool(request.week_id, request.draft_group, force_refresh=request.force_refresh)
         
         # Calculate duration for logging
         end_time = time.perf_counter()
@@ -86,6 +86,7 @@ async def import_player_pool(request: DraftKingsImportRequest, http_request: Req
                     "players_updated": result.players_updated,
                     "entries_added": result.entries_added,
                     "entries_updated": result.entries_updated,
+                    "unchanged_skipped": result.unchanged_skipped,
                     "total_processed": result.total_processed
                 },
                 ip_address=client_ip,
@@ -149,6 +150,75 @@ async def import_player_pool(request: DraftKingsImportRequest, http_request: Req
             }
         )
 
+@router.post("/import/batch", response_model=DraftKingsBatchImportResponse)
+async def import_player_pools(request: DraftKingsBatchImportRequest, http_request: Request, db: Session = Depends(get_db)):
+    """Import several draft groups for one week concurrently, writing shared players once"""
+    import time
+    import logging
+    logger = logging.getLogger(__name__)
+    start_time = time.perf_counter()
+    
+    client_ip = http_request.client.host if http_request.client else None
+    user_agent = http_request.headers.get("user-agent")
+    
+    try:
+        service = DraftKingsImportService(db)
+        result = await service.import_player_pools(
+            request.week_id,
+            request.draft_groups,
+            main_draftgroup=request.main_draftgroup,
+            max_concurrency=request.max_concurrency,
+            force_refresh=request.force_refresh
+        )
+    except Exception as e:
+        logger.error(f"Batch import failed: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Batch import failed",
+                "message": str(e),
+                "duration_ms": int((time.perf_counter() - start_time) * 1000)
+            }
+        )
+    
+    duration_ms = int((time.perf_counter() - start_time) * 1000)
+    
+    # Log one activity per draft group so the Recent Activity view stays per slate
+    from app.services.activity_logging import ActivityLoggingService
+    try:
+        service_logger = ActivityLoggingService(db)
+        for draft_group, group_result in result.draft_groups.items():
+            service_logger.log_import_activity(
+                import_type="player-pool",
+                file_type="API",
+                week_id=request.week_id,
+                records_added=group_result.entries_added,
+                records_updated=group_result.entries_updated,
+                records_skipped=group_result.entries_skipped,
+                records_failed=0,
+                file_name=None,
+                import_source="draftkings",
+                draft_group=draft_group,
+                operation_status="failed" if group_result.errors else "completed",
+                duration_ms=duration_ms,
+                errors=group_result.errors,
+                details={
+                    "batch": True,
+                    "batch_draft_groups": list(result.draft_groups.keys()),
+                    "entries_added": group_result.entries_added,
+                    "entries_updated": group_result.entries_updated,
+                    "unchanged_skipped": group_result.unchanged_skipped,
+                    "total_processed": group_result.total_processed
+                },
+                ip_address=client_ip,
+                user_agent=user_agent
+            )
+        logger.info(f"✅ Batch import completed in {duration_ms}ms: {result.unique_players} unique players across {len(result.draft_groups)} draft groups")
+    except Exception as log_error:
+        logger.error(f"Failed to log activity: {log_error}")
+    
+    return result
+
 @router.get("/activity")
 async def get_recent_activity(limit: int = 20, db: Session = Depends(get_db)):
     """Get recent import/export activity"""
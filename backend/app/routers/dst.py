@@ -6,11 +6,12 @@ Handles DST-specific endpoints for lineup analysis and performance tracking.
 
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from app.database import get_db
-from app.models import Lineup, Player, PlayerPoolEntry, TeamStats, Team, Week
+from app.models import Game, Lineup, Player, PlayerPoolEntry, TeamStats, Team, Week
 from app.schemas import Lineup as LineupSchema
 from app.services.dk_defense_scoring_service import DKDefenseScoringService
+from app.services.nflverse_service import NFLVerseService
 from sqlalchemy import and_, or_
 
 router = APIRouter(prefix="/api/dst", tags=["dst"])
@@ -41,6 +42,138 @@ class DSTActuals:
         self.lineup_name = lineup_name
 
 
+def load_dst_actuals(
+    db: Session,
+    players: List[Player],
+    week_ids: Optional[List[int]] = None
+) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """
+    Load DST actuals for many players and weeks with one joined query.
+    
+    With week_ids, every (player, week) pair is returned; pairs without team stats
+    carry zeros and data_available False. Without week_ids, every week that has team
+    stats for a player's team is returned.
+    
+    Players whose team is not in the teams table are left out.
+    
+    Returns:
+        Dict keyed by (playerDkId, week_id) with the same fields as
+        /player/{player_id}/week/{week_id}/actuals plus week_number and year
+    """
+    teams = db.query(Team).filter(Team.abbreviation.in_({p.team for p in players})).all() if players else []
+    teams_by_id = {team.id: team for team in teams}
+    team_ids_by_abbreviation = {team.abbreviation: team.id for team in teams}
+    players_by_team_id: Dict[int, List[Player]] = {}
+    for player in players:
+        team_id = team_ids_by_abbreviation.get(player.team)
+        if team_id is not None:
+            players_by_team_id.setdefault(team_id, []).append(player)
+    if not players_by_team_id or (week_ids is not None and not week_ids):
+        return {}
+    
+    if week_ids is not None:
+        # Every team/week pair, with or without team stats
+        query = db.query(Team.id, Week, TeamStats, Game).select_from(Team).join(
+            Week, Week.id.in_(week_ids)
+        ).outerjoin(
+            TeamStats, and_(TeamStats.team_id == Team.id, TeamStats.week_id == Week.id)
+        ).outerjoin(
+            Game, and_(Game.team_id == Team.id, Game.week_id == Week.id)
+        ).filter(Team.id.in_(list(players_by_team_id)))
+    else:
+        # Only weeks with team stats
+        query = db.query(TeamStats.team_id, Week, TeamStats, Game).select_from(TeamStats).join(
+            Week, Week.id == TeamStats.week_id
+        ).outerjoin(
+            Game, and_(Game.team_id == TeamStats.team_id, Game.week_id == TeamStats.week_id)
+        ).filter(TeamStats.team_id.in_(list(players_by_team_id)))
+    
+    actuals = {}
+    for team_id, week, team_stats, game in query.all():
+        for player in players_by_team_id[team_id]:
+            entry = _dst_actuals_entry(player, teams_by_id[team_id], week.id, team_stats, game)
+            entry["week_number"] = week.week_number
+            entry["year"] = week.year
+            actuals[(player.playerDkId, week.id)] = entry
+    return actuals
+
+
+def _dst_actuals_entry(
+    player: Player,
+    team: Team,
+    week_id: int,
+    team_stats: Optional[TeamStats],
+    game: Optional[Game]
+) -> Dict[str, Any]:
+    """DST actuals for one player and week from its team stats and game rows"""
+    # Get points allowed from games table
+    points_allowed = NFLVerseService.points_allowed_from_game(game)
+    
+    if team_stats:
+        # Calculate DK defense score
+        stats_dict = {
+            'def_sacks': float(team_stats.def_sacks or 0),
+            'def_interceptions': float(team_stats.def_interceptions or 0),
+            'fumble_recovery_opp': float(team_stats.fumble_recovery_opp or 0),
+            'def_tds': float(team_stats.def_tds or 0),
+            'special_teams_tds': float(team_stats.special_teams_tds or 0),
+            'def_safeties': float(team_stats.def_safeties or 0),
+            'blocked_kicks': float(getattr(team_stats, 'blocked_kicks', 0) or 0)
+        }
+        
+        dk_defense_score = DKDefenseScoringService.calculate_defense_score_from_dict(
+            stats_dict, points_allowed
+        )
+        
+        individual_stats = {
+            'sacks': team_stats.def_sacks or 0,
+            'interceptions': team_stats.def_interceptions or 0,
+            'fumble_recoveries': team_stats.fumble_recovery_opp or 0,
+            'defensive_tds': team_stats.def_tds or 0,
+            'special_teams_tds': team_stats.special_teams_tds or 0,
+            'safeties': team_stats.def_safeties or 0,
+            'blocked_kicks': getattr(team_stats, 'blocked_kicks', 0) or 0
+        }
+    else:
+        # No team stats available - return zeros
+        dk_defense_score = 0.0
+        individual_stats = {
+            'sacks': 0,
+            'interceptions': 0,
+            'fumble_recoveries': 0,
+            'defensive_tds': 0,
+            'special_teams_tds': 0,
+            'safeties': 0,
+            'blocked_kicks': 0
+        }
+    
+    return {
+        "player_id": player.playerDkId,
+        "player_name": player.displayName,
+        "team_abbreviation": team.abbreviation,
+        "team_full_name": team.full_name,
+        "week_id": week_id,
+        "dk_defense_score": dk_defense_score,
+        "points_allowed": points_allowed,
+        "individual_stats": individual_stats,
+        "data_available": team_stats is not None
+    }
+
+
+def _lineup_dst_entry(lineup: Lineup, dst_actuals: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "lineup_id": lineup.id,
+        "lineup_name": lineup.name,
+        "player_id": dst_actuals['player_id'],
+        "player_name": dst_actuals['player_name'],
+        "team_abbreviation": dst_actuals['team_abbreviation'],
+        "team_full_name": dst_actuals['team_full_name'],
+        "dk_defense_score": dst_actuals['dk_defense_score'],
+        "points_allowed": dst_actuals['points_allowed'],
+        "individual_stats": dst_actuals['individual_stats']
+    }
+
+
 @router.get("/lineup/{lineup_id}/actuals", response_model=List[Dict[str, Any]])
 async def get_dst_actuals_for_lineup(
     lineup_id: int,
@@ -58,38 +191,42 @@ async def get_dst_actuals_for_lineup(
         if not lineup:
             raise HTTPException(status_code=404, detail="Lineup not found")
         
-        # Get DST players from the lineup
-        dst_players = []
-        
-        # Check slots for DST players
-        if lineup.slots and 'DST' in lineup.slots:
-            dst_player_id = lineup.slots['DST']
-            if dst_player_id:
-                # Get player details
-                player = db.query(Player).filter(Player.playerDkId == dst_player_id).first()
-                if player and player.position == 'DST':
-                    dst_actuals = await get_dst_actuals_for_player(
-                        dst_player_id, lineup.week_id, db
-                    )
-                    if dst_actuals:
-                        dst_players.append({
-                            "lineup_id": lineup_id,
-                            "lineup_name": lineup.name,
-                            "player_id": dst_actuals['player_id'],
-                            "player_name": dst_actuals['player_name'],
-                            "team_abbreviation": dst_actuals['team_abbreviation'],
-                            "team_full_name": dst_actuals['team_full_name'],
-                            "dk_defense_score": dst_actuals['dk_defense_score'],
-                            "points_allowed": dst_actuals['points_allowed'],
-                            "individual_stats": dst_actuals['individual_stats']
-                        })
-        
-        return dst_players
+        return _load_lineup_dst_actuals(db, [lineup], lineup.week_id).get(lineup.id, [])
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching DST actuals: {str(e)}")
 
 
+def _load_lineup_dst_actuals(
+    db: Session,
+    lineups: List[Lineup],
+    week_id: int
+) -> Dict[Any, List[Dict[str, Any]]]:
+    """DST actuals per lineup id for lineups of one week, loaded with one batch"""
+    dst_ids_by_lineup = {
+        lineup.id: lineup.slots['DST']
+        for lineup in lineups
+        if lineup.slots and lineup.slots.get('DST')
+    }
+    if not dst_ids_by_lineup:
+        return {}
+    
+    players = db.query(Player).filter(
+        and_(
+            Player.playerDkId.in_(set(dst_ids_by_lineup.values())),
+            Player.position == 'DST'
+        )
+    ).all()
+    actuals = load_dst_actuals(db, players, [week_id])
+    
+    lineup_actuals = {}
+    for lineup in lineups:
+        dst_actuals = actuals.get((dst_ids_by_lineup.get(lineup.id), week_id))
+        if dst_actuals:
+            lineup_actuals[lineup.id] = [_lineup_dst_entry(lineup, dst_actuals)]
+    return lineup_actuals
+
+
 @router.get("/player/{player_id}/week/{week_id}/actuals", response_model=Dict[str, Any])
 async def get_dst_actuals_for_player(
     player_id: int,
@@ -111,74 +248,15 @@ async def get_dst_actuals_for_player(
         if player.position != 'DST':
             raise HTTPException(status_code=400, detail="Player is not a DST player")
         
-        # Get team details first
-        team = db.query(Team).filter(Team.abbreviation == player.team).first()
-        if not team:
-            raise HTTPException(status_code=404, detail="Team not found")
-        
-        # Get team stats for the player's team and week
-        team_stats = db.query(TeamStats).filter(
-            and_(
-                TeamStats.week_id == week_id,
-                TeamStats.team_id == team.id
-            )
-        ).first()
-        
-        # Get points allowed from games table
-        from app.services.nflverse_service import NFLVerseService
-        points_allowed = NFLVerseService.get_points_allowed_for_team(
-            db, team.id, week_id
-        )
-        
-        if team_stats:
-            # Calculate DK defense score
-            stats_dict = {
-                'def_sacks': float(team_stats.def_sacks or 0),
-                'def_interceptions': float(team_stats.def_interceptions or 0),
-                'fumble_recovery_opp': float(team_stats.fumble_recovery_opp or 0),
-                'def_tds': float(team_stats.def_tds or 0),
-                'special_teams_tds': float(team_stats.special_teams_tds or 0),
-                'def_safeties': float(team_stats.def_safeties or 0),
-                'blocked_kicks': float(getattr(team_stats, 'blocked_kicks', 0) or 0)
-            }
-            
-            dk_defense_score = DKDefenseScoringService.calculate_defense_score_from_dict(
-                stats_dict, points_allowed
-            )
-            
-            individual_stats = {
-                'sacks': team_stats.def_sacks or 0,
-                'interceptions': team_stats.def_interceptions or 0,
-                'fumble_recoveries': team_stats.fumble_recovery_opp or 0,
-                'defensive_tds': team_stats.def_tds or 0,
-                'special_teams_tds': team_stats.special_teams_tds or 0,
-                'safeties': team_stats.def_safeties or 0,
-                'blocked_kicks': getattr(team_stats, 'blocked_kicks', 0) or 0
-            }
-        else:
-            # No team stats available - return zeros
-            dk_defense_score = 0.0
-            individual_stats = {
-                'sacks': 0,
-                'interceptions': 0,
-                'fumble_recoveries': 0,
-                'defensive_tds': 0,
-                'special_teams_tds': 0,
-                'safeties': 0,
-                'blocked_kicks': 0
-            }
+        actuals = load_dst_actuals(db, [player], [week_id]).get((player_id, week_id))
+        if not actuals:
+            # Unknown team, or no week with this id
+            team = db.query(Team).filter(Team.abbreviation == player.team).first()
+            if not team:
+                raise HTTPException(status_code=404, detail="Team not found")
+            actuals = _dst_actuals_entry(player, team, week_id, None, None)
         
-        return {
-            "player_id": player_id,
-            "player_name": player.displayName,
-            "team_abbreviation": team.abbreviation,
-            "team_full_name": team.full_name,
-            "week_id": week_id,
-            "dk_defense_score": dk_defense_score,
-            "points_allowed": points_allowed,
-            "individual_stats": individual_stats,
-            "data_available": team_stats is not None
-        }
+        return actuals
         
     except HTTPException:
         raise
@@ -200,13 +278,12 @@ async def get_all_dst_actuals_for_week(
         # Get all DST players
         dst_players = db.query(Player).filter(Player.position == 'DST').all()
         
-        dst_actuals = []
-        for player in dst_players:
-            actuals = await get_dst_actuals_for_player(player.playerDkId, week_id, db)
-            if actuals:
-                dst_actuals.append(actuals)
-        
-        return dst_actuals
+        actuals = load_dst_actuals(db, dst_players, [week_id])
+        return [
+            actuals[(player.playerDkId, week_id)]
+            for player in dst_players
+            if (player.playerDkId, week_id) in actuals
+        ]
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching DST actuals: {str(e)}")
@@ -226,12 +303,12 @@ async def get_lineup_dst_performance_for_week(
     try:
         # Get all lineups for the week
         lineups = db.query(Lineup).filter(Lineup.week_id == week_id).all()
+        lineup_actuals = _load_lineup_dst_actuals(db, lineups, week_id)
         
         lineup_dst_performance = []
         
         for lineup in lineups:
-            # Get DST actuals for this lineup
-            dst_actuals = await get_dst_actuals_for_lineup(lineup.id, db)
+            dst_actuals = lineup_actuals.get(lineup.id)
             
             if dst_actuals:
                 total_dst_score = sum(dst['dk_defense_score'] for dst in dst_actuals)
@@ -265,32 +342,23 @@ async def get_dst_player_performance_history(
         if not player or player.position != 'DST':
             raise HTTPException(status_code=400, detail="Player is not a DST player")
         
-        # Get team details
-        team = db.query(Team).filter(Team.abbreviation == player.team).first()
-        if not team:
+        # Every week with team stats for this player's team, joined to its game and week
+        actuals = load_dst_actuals(db, [player])
+        if not actuals and not db.query(Team.id).filter(Team.abbreviation == player.team).first():
             raise HTTPException(status_code=404, detail="Team not found")
         
-        # Get all weeks with team stats for this player's team
-        team_stats_weeks = db.query(TeamStats.week_id).filter(
-            TeamStats.team_id == team.id
-        ).distinct().all()
-        
-        performance_history = []
-        
-        for (week_id,) in team_stats_weeks:
-            actuals = await get_dst_actuals_for_player(player_id, week_id, db)
-            if actuals:
-                # Get week details
-                week = db.query(Week).filter(Week.id == week_id).first()
-                performance_history.append({
-                    "week_id": week_id,
-                    "week_number": week.week_number if week else None,
-                    "year": week.year if week else None,
-                    "dk_defense_score": actuals['dk_defense_score'],
-                    "points_allowed": actuals['points_allowed'],
-                    "individual_stats": actuals['individual_stats'],
-                    "data_available": actuals['data_available']
-                })
+        performance_history = [
+            {
+                "week_id": week_actuals['week_id'],
+                "week_number": week_actuals['week_number'],
+                "year": week_actuals['year'],
+                "dk_defense_score": week_actuals['dk_defense_score'],
+                "points_allowed": week_actuals['points_allowed'],
+                "individual_stats": week_actuals['individual_stats'],
+                "data_available": week_actuals['data_available']
+            }
+            for week_actuals in actuals.values()
+        ]
         
         # Sort by week
         performance_history.sort(key=lambda x: (x.get('year', 0), x.get('week_number', 0)))
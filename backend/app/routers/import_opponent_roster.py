@@ -5,22 +5,32 @@ API endpoints for importing opponent rosters from DraftKings H2H contests
 
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, status
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
-import uuid
 
 from app.database import get_db
 from app.services.draftkings_leaderboard import DraftKingsLeaderboardService
 from app.services.draftkings_scores import DraftKingsScoresService
 from app.services.contest_details import ContestDetailsService
+from app.services.http_client import gather_bounded
+from app.services.import_job_store import ImportJobStore
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/import-opponent-roster", tags=["import-opponent-roster"])
 
+# Contests fetched from DraftKings at once; the shared rate limiter caps the request rate
+OPPONENT_ROSTER_IMPORT_CONCURRENCY = 8
+
+# Fetched rosters are saved in batches of this size with one upsert each
+OPPONENT_ROSTER_SAVE_BATCH_SIZE = 25
+
+# import_jobs.job_type of opponent roster imports
+OPPONENT_ROSTER_JOB_TYPE = "opponent-roster"
+
 # Response schemas
 class ImportStatusResponse(BaseModel):
     """Response schema for import status"""
@@ -53,6 +63,11 @@ class ImportRequest(BaseModel):
     week_id: str = Field(..., description="Week ID to import contests for")
     max_contests: Optional[int] = Field(50, description="Maximum number of contests to process")
     force_refresh: Optional[bool] = Field(False, description="Force refresh even if data exists")
+    max_concurrency: Optional[int] = Field(
+        OPPONENT_ROSTER_IMPORT_CONCURRENCY,
+        ge=1,
+        description="Maximum number of contests fetched from DraftKings at once"
+    )
 
 class ImportResponse(BaseModel):
     """Response schema for import request"""
@@ -70,218 +85,263 @@ class OpponentRosterResult(BaseModel):
     fantasy_points: Optional[float] = None
     roster_data: Optional[Dict[str, Any]] = None
 
-# In-memory storage for import status (in production, use Redis or database)
-import_status_storage: Dict[str, ImportStatusResponse] = {}
+class PlayerFieldOwnership(BaseModel):
+    """Realized ownership of one player across opponent rosters"""
+    playerDkId: int
+    name: Optional[str] = None
+    position: Optional[str] = None
+    team: Optional[str] = None
+    rosters: int
+    ownership: float  # percent of the week's opponent rosters
+    projected_ownership: Optional[float] = None  # from the player pool
+    ownership_delta: Optional[float] = None  # ownership - projected_ownership
+    fantasy_points: Optional[float] = None
+
+class FieldOwnershipResponse(BaseModel):
+    """Response schema for field ownership"""
+    week_id: int
+    total_rosters: int
+    unresolved_players: int
+    players: List[PlayerFieldOwnership]
+
+def _status_response(job: Dict[str, Any]) -> ImportStatusResponse:
+    return ImportStatusResponse(
+        import_id=job['id'],
+        status=job['status'],
+        message=job['message'] or '',
+        progress=job['progress'],
+        results=job['results'],
+        created_at=job['created_at'],
+        updated_at=job['updated_at'] or job['created_at']
+    )
+
+def _build_contest_data(contest: Dict[str, Any]) -> Dict[str, Any]:
+    """Contest data in the shape ContestDetailsService expects"""
+    return {
+        'contest_id': contest['contest_id'],
+        'draft_group_id': contest['draft_group_id'],
+        'opponent': {
+            'entry_key': contest['opponent_entry_key'],
+            'username': contest['opponent_username'],
+            'fantasy_points': contest['opponent_fantasy_points'],
+            'rank': contest['opponent_rank']
+        }
+    }
+
+def _build_minimal_roster_data(contest: Dict[str, Any], contest_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Roster data built from contest info alone, used when the Scores API gives us nothing"""
+    return {
+        'roster_data': {
+            'username': contest['opponent_username'],
+            'fantasy_points': contest['opponent_fantasy_points'],
+            'contest_id': contest['contest_id'],
+            'draft_group_id': contest['draft_group_id'],
+            'entry_key': contest['opponent_entry_key'],
+            'rank': contest['opponent_rank'],
+            'description': contest['contest_description'],
+            'date_utc': contest['contest_date_utc'],
+            'players': [],  # Empty since we don't have detailed roster data
+            'note': 'Limited data (API requires authentication)'
+        },
+        'contest_data': contest_data
+    }
+
+async def fetch_opponent_roster(
+    scores_service: DraftKingsScoresService,
+    contest: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Fetch an opponent's roster from the DraftKings Scores API
+    
+    Falls back to minimal roster data built from the contest info when the API call fails.
+    
+    Returns:
+        Dict with 'contest_data' and 'roster_data' ready for save_opponent_rosters
+    """
+    contest_data = _build_contest_data(contest)
+    
+    logger.info(f"Fetching roster data for contest {contest['contest_id']}, opponent {contest['opponent_username']}")
+    try:
+        roster_response = await scores_service.get_roster(contest['draft_group_id'], contest['opponent_entry_key'])
+    except Exception as e:
+        logger.warning(f"Failed to get roster data for contest {contest['contest_id']}: {e}")
+        return {
+            'contest_data': contest_data,
+            'roster_data': _build_minimal_roster_data(contest, contest_data)
+        }
+    
+    return {
+        'contest_data': contest_data,
+        'roster_data': {
+            'roster_data': roster_response.get('roster_data', {}),
+            'contest_data': contest_data
+        }
+    }
 
 async def process_opponent_roster_import(
     import_id: str,
     week_id: str,
     max_contests: int,
-    force_refresh: bool
+    force_refresh: bool,
+    max_concurrency: int = OPPONENT_ROSTER_IMPORT_CONCURRENCY
 ):
     """
     Background task to process opponent roster import
     
+    Stored rosters are looked up for every contest in one query up front, then up to
+    max_concurrency contests are fetched from DraftKings at once. Both DraftKings services
+    share one connection pool and the process-wide DraftKings rate limiter. Fetched rosters
+    are saved in batches of OPPONENT_ROSTER_SAVE_BATCH_SIZE, one at a time on the import's
+    database session.
+    
+    Progress and the result of every processed contest are checkpointed in the import job
+    store, so running the task again for the same import_id skips contests that were
+    already processed.
+    
     Args:
         import_id: Unique identifier for this import operation
         week_id: Week ID to import contests for
         max_contests: Maximum number of contests to process
         force_refresh: Whether to force refresh existing data
+        max_concurrency: Maximum number of contests fetched at once
     """
     try:
         logger.info(f"Starting opponent roster import {import_id} for week {week_id}")
         
+        job_store = ImportJobStore()
+        job = job_store.get(import_id)
+        
+        # Results of contests processed before a restart, keyed by contest_id
+        processed_results: Dict[str, Dict[str, Any]] = dict(
+            (job['checkpoint'] if job else {}).get('processed', {})
+        )
+        
         # Update status to in_progress
-        if import_id in import_status_storage:
-            import_status_storage[import_id].status = "in_progress"
-            import_status_storage[import_id].updated_at = datetime.now(timezone.utc)
+        job_store.start(import_id, message=(
+            f"Resuming import after {len(processed_results)} processed contests"
+            if processed_results else "Import in progress"
+        ))
         
         # Get database session
         db = next(get_db())
         contest_service = ContestDetailsService(db)
         
-        # Initialize services
+        # Initialize services; the scores service reuses the leaderboard service's client
         async with DraftKingsLeaderboardService() as leaderboard_service:
-            async with DraftKingsScoresService() as scores_service:
+            async with DraftKingsScoresService(client=leaderboard_service.session) as scores_service:
                 
                 # Step 1: Get H2H contests for the week
                 logger.info(f"Fetching H2H contests for week {week_id}")
-                contests = await get_h2h_contests_for_week(week_id, leaderboard_service)
+                contests = await get_h2h_contests_for_week(
+                    week_id,
+                    leaderboard_service,
+                    limit=max_contests,
+                    max_concurrency=max_concurrency,
+                    skip_contest_ids=set(processed_results)
+                )
                 
-                if not contests:
+                if not contests and not processed_results:
                     raise Exception(f"No H2H contests found for week {week_id}")
                 
-                # Limit contests if specified
-                if max_contests and len(contests) > max_contests:
-                    contests = contests[:max_contests]
+                total_contests = len(contests) + len(processed_results)
+                progress = {
+                    'total': total_contests,
+                    'processed': len(processed_results),
+                    'successful': sum(1 for r in processed_results.values() if r['success']),
+                    'failed': sum(1 for r in processed_results.values() if not r['success'])
+                }
+                results: List[Optional[Dict[str, Any]]] = [None] * len(contests)
                 
-                total_contests = len(contests)
-                processed = 0
-                successful = 0
-                failed = 0
-                results = []
+                logger.info(f"Processing {len(contests)} H2H contests ({len(processed_results)} already processed)")
                 
-                logger.info(f"Processing {total_contests} H2H contests")
+                # Step 2: Look up rosters we already have (unless force_refresh) in one query
+                existing_rosters = {}
+                if not force_refresh:
+                    existing_rosters = await contest_service.get_opponent_rosters(
+                        (contest['contest_id'], contest['opponent_entry_key']) for contest in contests
+                    )
                 
-                # Step 2: Process each contest
-                for contest in contests:
-                    try:
-                        processed += 1
+                def record_result(index: int, result: Dict[str, Any]):
+                    results[index] = result
+                    progress['processed'] += 1
+                    progress['successful' if result['success'] else 'failed'] += 1
+                    
+                    # Checkpoint the result without the roster payload, then update progress
+                    processed_results[str(result['contest_id'])] = {
+                        key: value for key, value in result.items() if key != 'roster_data'
+                    }
+                    job_store.update(
+                        import_id,
+                        progress=progress,
+                        checkpoint={'processed': processed_results}
+                    )
+                
+                # The session is not safe for concurrent use, so saves are serialized
+                save_lock = asyncio.Lock()
+                pending_saves: List[Tuple[int, Dict[str, Any], Dict[str, Any]]] = []
+                
+                async def flush_saves():
+                    async with save_lock:
+                        batch = list(pending_saves)
+                        pending_saves.clear()
+                        if not batch:
+                            return
+                        try:
+                            save_results = await contest_service.save_opponent_rosters([
+                                (fetched['contest_data'], fetched['roster_data'])
+                                for _, _, fetched in batch
+                            ])
+                        except Exception as e:
+                            save_results = [{'success': False, 'error': str(e)}] * len(batch)
                         
-                        # Check if we already have this opponent's roster (unless force_refresh)
-                        if not force_refresh:
-                            existing = await contest_service.get_opponent_roster(
-                                contest['contest_id'], 
-                                contest['opponent_entry_key']
-                            )
-                            if existing:
-                                logger.info(f"Skipping existing roster for contest {contest['contest_id']}")
-                                results.append({
+                        for (index, contest, _), save_result in zip(batch, save_results):
+                            if save_result['success']:
+                                record_result(index, {
                                     'contest_id': contest['contest_id'],
                                     'opponent_username': contest['opponent_username'],
                                     'success': True,
-                                    'message': 'Roster already exists (skipped)',
-                                    'fantasy_points': existing['fantasy_points'],
-                                    'roster_data': existing
+                                    'message': save_result['message'],
+                                    'fantasy_points': save_result['fantasy_points'],
+                                    'roster_data': save_result
                                 })
-                                successful += 1
-                                continue
-                        
-                        # Try to get real roster data from DraftKings API
-                        logger.info(f"Fetching roster data for contest {contest['contest_id']}, opponent {contest['opponent_username']}")
-                        
-                        try:
-                            # Get detailed roster data from DraftKings Scores API
-                            roster_data = await scores_service.get_roster(contest['draft_group_id'], contest['opponent_entry_key'])
-                            
-                            if roster_data.get('success'):
-                                # Format data according to ContestDetailsService expectations
-                                contest_data = {
-                                    'contest_id': contest['contest_id'],
-                                    'draft_group_id': contest['draft_group_id'],
-                                    'opponent': {
-                                        'entry_key': contest['opponent_entry_key'],
-                                        'username': contest['opponent_username'],
-                                        'fantasy_points': contest['opponent_fantasy_points'],
-                                        'rank': contest['opponent_rank']
-                                    }
-                                }
-                                
-                                # Use real roster data from API
-                                roster_data = {
-                                    'roster_data': roster_data.get('roster_data', {}),
-                                    'contest_data': contest_data
-                                }
+                                logger.info(f"Successfully saved roster for contest {contest['contest_id']}")
                             else:
-                                # API call failed, create minimal data from contest info
-                                logger.warning(f"Failed to get roster data for contest {contest['contest_id']}: {roster_data.get('error', 'Unknown error')}")
-                                
-                                contest_data = {
+                                record_result(index, {
                                     'contest_id': contest['contest_id'],
-                                    'draft_group_id': contest['draft_group_id'],
-                                    'opponent': {
-                                        'entry_key': contest['opponent_entry_key'],
-                                        'username': contest['opponent_username'],
-                                        'fantasy_points': contest['opponent_fantasy_points'],
-                                        'rank': contest['opponent_rank']
-                                    }
-                                }
-                                
-                                # Create minimal roster data
-                                roster_data = {
-                                    'roster_data': {
-                                        'username': contest['opponent_username'],
-                                        'fantasy_points': contest['opponent_fantasy_points'],
-                                        'contest_id': contest['contest_id'],
-                                        'draft_group_id': contest['draft_group_id'],
-                                        'entry_key': contest['opponent_entry_key'],
-                                        'rank': contest['opponent_rank'],
-                                        'description': contest['contest_description'],
-                                        'date_utc': contest['contest_date_utc'],
-                                        'players': [],  # Empty since we don't have detailed roster data
-                                        'note': 'Limited data (API requires authentication)'
-                                    },
-                                    'contest_data': contest_data
-                                }
-                                
-                        except Exception as e:
-                            logger.error(f"Error fetching roster data for contest {contest['contest_id']}: {e}")
-                            
-                            # Create minimal data from contest info
-                            contest_data = {
-                                'contest_id': contest['contest_id'],
-                                'draft_group_id': contest['draft_group_id'],
-                                'opponent': {
-                                    'entry_key': contest['opponent_entry_key'],
-                                    'username': contest['opponent_username'],
-                                    'fantasy_points': contest['opponent_fantasy_points'],
-                                    'rank': contest['opponent_rank']
-                                }
-                            }
-                            
-                            # Create minimal roster data
-                            roster_data = {
-                                'roster_data': {
-                                    'username': contest['opponent_username'],
-                                    'fantasy_points': contest['opponent_fantasy_points'],
-                                    'contest_id': contest['contest_id'],
-                                    'draft_group_id': contest['draft_group_id'],
-                                    'entry_key': contest['opponent_entry_key'],
-                                    'rank': contest['opponent_rank'],
-                                    'description': contest['contest_description'],
-                                    'date_utc': contest['contest_date_utc'],
-                                    'players': [],  # Empty since we don't have detailed roster data
-                                    'note': 'Limited data (API requires authentication)'
-                                },
-                                'contest_data': contest_data
-                            }
-                        
-                        # Save opponent roster
-                        save_result = await contest_service.save_opponent_roster(contest_data, roster_data)
-                        
-                        if save_result['success']:
-                            successful += 1
-                            results.append({
+                                    'opponent_username': contest['opponent_username'],
+                                    'success': False,
+                                    'message': save_result.get('error', 'Unknown error'),
+                                    'fantasy_points': None,
+                                    'roster_data': None
+                                })
+                                logger.error(f"Failed to save roster for contest {contest['contest_id']}: {save_result.get('error')}")
+                
+                # Step 3: Fetch each contest's opponent roster and queue it for saving
+                async def import_contest(item):
+                    index, contest = item
+                    try:
+                        existing = existing_rosters.get(
+                            (str(contest['contest_id']), str(contest['opponent_entry_key']))
+                        )
+                        if existing:
+                            logger.info(f"Skipping existing roster for contest {contest['contest_id']}")
+                            record_result(index, {
                                 'contest_id': contest['contest_id'],
                                 'opponent_username': contest['opponent_username'],
                                 'success': True,
-                                'message': save_result['message'],
-                                'fantasy_points': save_result['fantasy_points'],
-                                'roster_data': save_result
+                                'message': 'Roster already exists (skipped)',
+                                'fantasy_points': existing['fantasy_points'],
+                                'roster_data': existing
                             })
-                            logger.info(f"Successfully saved roster for contest {contest['contest_id']}")
-                        else:
-                            failed += 1
-                            results.append({
-                                'contest_id': contest['contest_id'],
-                                'opponent_username': contest['opponent_username'],
-                                'success': False,
-                                'message': save_result.get('error', 'Unknown error'),
-                                'fantasy_points': None,
-                                'roster_data': None
-                            })
-                            logger.error(f"Failed to save roster for contest {contest['contest_id']}: {save_result.get('error')}")
-                        
-                        # Update progress
-                        if import_id in import_status_storage:
-                            import_status_storage[import_id].progress = {
-                                'total': total_contests,
-                                'processed': processed,
-                                'successful': successful,
-                                'failed': failed
-                            }
-                            import_status_storage[import_id].updated_at = datetime.now(timezone.utc)
+                            return
                         
-                        # Small delay to avoid overwhelming the API
-                        await asyncio.sleep(0.5)
+                        fetched = await fetch_opponent_roster(scores_service, contest)
                         
                     except Exception as e:
-                        processed += 1
-                        failed += 1
                         error_msg = str(e)
                         logger.error(f"Error processing contest {contest['contest_id']}: {error_msg}")
                         
-                        results.append({
+                        record_result(index, {
                             'contest_id': contest['contest_id'],
                             'opponent_username': contest.get('opponent_username', 'unknown'),
                             'success': False,
@@ -289,23 +349,30 @@ async def process_opponent_roster_import(
                             'fantasy_points': None,
                             'roster_data': None
                         })
-                        
-                        # Update progress
-                        if import_id in import_status_storage:
-                            import_status_storage[import_id].progress = {
-                                'total': total_contests,
-                                'processed': processed,
-                                'successful': successful,
-                                'failed': failed
-                            }
-                            import_status_storage[import_id].updated_at = datetime.now(timezone.utc)
+                        return
+                    
+                    pending_saves.append((index, contest, fetched))
+                    if len(pending_saves) >= OPPONENT_ROSTER_SAVE_BATCH_SIZE:
+                        await flush_saves()
                 
-                # Update final status
-                if import_id in import_status_storage:
-                    import_status_storage[import_id].status = "completed"
-                    import_status_storage[import_id].message = f"Import completed: {successful} successful, {failed} failed"
-                    import_status_storage[import_id].results = results
-                    import_status_storage[import_id].updated_at = datetime.now(timezone.utc)
+                await gather_bounded(list(enumerate(contests)), import_contest, max_concurrency)
+                await flush_saves()
+                
+                successful = progress['successful']
+                failed = progress['failed']
+                
+                # Update final status; contests from before a restart keep their checkpointed result
+                new_contest_ids = {str(contest['contest_id']) for contest in contests}
+                earlier_results = [
+                    result for contest_id, result in processed_results.items()
+                    if contest_id not in new_contest_ids
+                ]
+                job_store.complete(
+                    import_id,
+                    f"Import completed: {successful} successful, {failed} failed",
+                    progress=progress,
+                    results=earlier_results + results
+                )
                 
                 logger.info(f"Import {import_id} completed: {successful} successful, {failed} failed")
                 
@@ -313,18 +380,29 @@ async def process_opponent_roster_import(
         error_msg = f"Import failed: {str(e)}"
         logger.error(f"Import {import_id} failed: {error_msg}")
         
-        if import_id in import_status_storage:
-            import_status_storage[import_id].status = "failed"
-            import_status_storage[import_id].message = error_msg
-            import_status_storage[import_id].updated_at = datetime.now(timezone.utc)
+        try:
+            ImportJobStore().fail(import_id, error_msg)
+        except Exception as store_error:
+            logger.error(f"Failed to record failure of import {import_id}: {store_error}")
 
-async def get_h2h_contests_for_week(week_id: str, leaderboard_service: DraftKingsLeaderboardService) -> List[Dict[str, Any]]:
+async def get_h2h_contests_for_week(
+    week_id: str,
+    leaderboard_service: DraftKingsLeaderboardService,
+    limit: Optional[int] = None,
+    max_concurrency: int = OPPONENT_ROSTER_IMPORT_CONCURRENCY,
+    skip_contest_ids: Optional[Set[str]] = None
+) -> List[Dict[str, Any]]:
     """
     Get H2H contests for a specific week
     
+    Leaderboards for the contests are fetched concurrently through the leaderboard service.
+    
     Args:
         week_id: Week ID to fetch contests for
         leaderboard_service: DraftKings leaderboard service
+        limit: Maximum number of contests to return (most recent first)
+        max_concurrency: Maximum number of leaderboards fetched at once
+        skip_contest_ids: Contests to leave out after the limit is applied (already processed)
         
     Returns:
         List of contest information dictionaries
@@ -352,47 +430,39 @@ async def get_h2h_contests_for_week(week_id: str, leaderboard_service: DraftKing
         
         result = db.execute(query, {'week_number': week_number})
         contests = result.fetchall()
+        if limit:
+            contests = contests[:limit]
+        if skip_contest_ids:
+            contests = [contest for contest in contests if str(contest.contest_id) not in skip_contest_ids]
+        
+        # Try to get real leaderboard data from DraftKings API first
+        leaderboards = await gather_bounded(
+            [str(contest.contest_id) for contest in contests],
+            leaderboard_service.get_leaderboard,
+            max_concurrency
+        )
         
         h2h_contests = []
         
-        for contest in contests:
+        for contest, leaderboard_data in zip(contests, leaderboards):
             contest_id_str = str(contest.contest_id)
             
-            # Try to get real leaderboard data from DraftKings API first
-            try:
-                leaderboard_data = await leaderboard_service.get_leaderboard(contest_id_str)
-                
-                if leaderboard_data.get('success'):
-                    opponent = leaderboard_data.get('opponent', {})
-                    h2h_contests.append({
-                        'contest_id': contest_id_str,
-                        'draft_group_id': contest.entry_key,
-                        'opponent_username': opponent.get('username', contest.contest_opponent),
-                        'opponent_entry_key': str(opponent.get('entry_key', contest.entry_key)),
-                        'opponent_fantasy_points': opponent.get('fantasy_points', 0),
-                        'opponent_rank': opponent.get('rank', 1),
-                        'contest_description': contest.contest_description,
-                        'contest_date_utc': contest.contest_date_utc.isoformat() if contest.contest_date_utc else None,
-                        'note': 'Real API data'
-                    })
-                else:
-                    # API call failed, use database data as fallback
-                    logger.warning(f"API call failed for contest {contest_id_str}: {leaderboard_data.get('error', 'Unknown error')}")
-                    h2h_contests.append({
-                        'contest_id': contest_id_str,
-                        'draft_group_id': contest.entry_key,
-                        'opponent_username': contest.contest_opponent,
-                        'opponent_entry_key': str(contest.entry_key),
-                        'opponent_fantasy_points': 0,  # We don't have opponent points in database
-                        'opponent_rank': 1,
-                        'contest_description': contest.contest_description,
-                        'contest_date_utc': contest.contest_date_utc.isoformat() if contest.contest_date_utc else None,
-                        'note': 'Database data (API requires authentication)'
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Error fetching leaderboard for contest {contest_id_str}: {e}")
-                # Use database data as fallback
+            if not isinstance(leaderboard_data, Exception):
+                opponent = leaderboard_data.get('opponent', {})
+                h2h_contests.append({
+                    'contest_id': contest_id_str,
+                    'draft_group_id': leaderboard_data.get('draft_group_id') or contest.entry_key,
+                    'opponent_username': opponent.get('username', contest.contest_opponent),
+                    'opponent_entry_key': str(opponent.get('entry_key', contest.entry_key)),
+                    'opponent_fantasy_points': opponent.get('fantasy_points', 0),
+                    'opponent_rank': opponent.get('rank', 1),
+                    'contest_description': contest.contest_description,
+                    'contest_date_utc': contest.contest_date_utc.isoformat() if contest.contest_date_utc else None,
+                    'note': 'Real API data'
+                })
+            else:
+                # API call failed, use database data as fallback
+                logger.warning(f"API call failed for contest {contest_id_str}: {leaderboard_data}")
                 h2h_contests.append({
                     'contest_id': contest_id_str,
                     'draft_group_id': contest.entry_key,
@@ -436,19 +506,18 @@ async def import_opponent_rosters(
         ImportResponse with import_id and status
     """
     try:
-        # Generate unique import ID
-        import_id = str(uuid.uuid4())
-        
-        # Initialize status tracking
-        import_status_storage[import_id] = ImportStatusResponse(
-            import_id=import_id,
-            status="pending",
-            message="Import request received, starting background processing...",
-            progress=None,
-            results=None,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+        # Initialize status tracking; the parameters are kept so the import can be resumed
+        job = ImportJobStore().create(
+            OPPONENT_ROSTER_JOB_TYPE,
+            params={
+                'week_id': request.week_id,
+                'max_contests': request.max_contests,
+                'force_refresh': request.force_refresh,
+                'max_concurrency': request.max_concurrency or OPPONENT_ROSTER_IMPORT_CONCURRENCY
+            },
+            message="Import request received, starting background processing..."
         )
+        import_id = job['id']
         
         # Start background task
         background_tasks.add_task(
@@ -456,7 +525,8 @@ async def import_opponent_rosters(
             import_id,
             request.week_id,
             request.max_contests,
-            request.force_refresh
+            request.force_refresh,
+            request.max_concurrency or OPPONENT_ROSTER_IMPORT_CONCURRENCY
         )
         
         logger.info(f"Started opponent roster import {import_id} for week {request.week_id}")
@@ -531,13 +601,14 @@ async def get_import_status(import_id: str):
         ImportStatusResponse with current status and progress
     """
     try:
-        if import_id not in import_status_storage:
+        job = ImportJobStore().get(import_id)
+        if not job or job['job_type'] != OPPONENT_ROSTER_JOB_TYPE:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Import {import_id} not found"
             )
         
-        return import_status_storage[import_id]
+        return _status_response(job)
         
     except HTTPException:
         raise
@@ -548,6 +619,68 @@ async def get_import_status(import_id: str):
             detail=f"Failed to fetch import status: {str(e)}"
         )
 
+@router.post("/resume/{import_id}", response_model=ImportResponse, status_code=status.HTTP_202_ACCEPTED)
+async def resume_opponent_roster_import(
+    import_id: str,
+    background_tasks: BackgroundTasks
+):
+    """
+    Resume an opponent roster import that failed or was interrupted by a restart
+    
+    Contests already processed by the import are skipped. An import that is still
+    running (updated recently) or has completed cannot be resumed.
+    
+    Args:
+        import_id: Unique identifier for the import operation
+        background_tasks: FastAPI background tasks
+        
+    Returns:
+        ImportResponse with the same import_id
+    """
+    try:
+        job_store = ImportJobStore()
+        job = job_store.get(import_id)
+        if not job or job['job_type'] != OPPONENT_ROSTER_JOB_TYPE:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Import {import_id} not found"
+            )
+        params = job['params']
+        processed = len(job['checkpoint'].get('processed', {}))
+        # Check and mark the job running in one UPDATE so a concurrent resume request is rejected
+        if not job_store.claim(import_id, message=f"Resume requested after {processed} processed contests"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Import {import_id} is {job['status']} and cannot be resumed"
+            )
+        
+        background_tasks.add_task(
+            process_opponent_roster_import,
+            import_id,
+            params['week_id'],
+            params.get('max_contests'),
+            params.get('force_refresh', False),
+            params.get('max_concurrency') or OPPONENT_ROSTER_IMPORT_CONCURRENCY
+        )
+        
+        logger.info(f"Resuming opponent roster import {import_id} for week {params['week_id']}")
+        
+        return ImportResponse(
+            import_id=import_id,
+            message=f"Import resumed for week {params['week_id']}; {processed} contests already processed.",
+            status="pending",
+            estimated_contests=params.get('max_contests') or 50
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error resuming opponent roster import {import_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to resume import: {str(e)}"
+        )
+
 @router.get("/rosters/{contest_id}", response_model=List[Dict[str, Any]])
 async def get_contest_rosters(
     contest_id: str,
@@ -614,6 +747,74 @@ async def delete_opponent_roster(
             detail=f"Failed to delete roster: {str(e)}"
         )
 
+@router.get("/ownership/{week_id}", response_model=FieldOwnershipResponse)
+async def get_field_ownership(
+    week_id: int,
+    position: Optional[str] = None,
+    contest_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get realized field ownership per player for a week from imported opponent rosters
+    
+    Args:
+        week_id: Week ID (weeks.id)
+        position: Only return players at this position
+        contest_id: Only count rosters from this contest
+        db: Database session
+        
+    Returns:
+        FieldOwnershipResponse with players sorted by ownership
+    """
+    try:
+        contest_service = ContestDetailsService(db)
+        return await contest_service.get_field_ownership(week_id, position=position, contest_id=contest_id)
+        
+    except Exception as e:
+        logger.error(f"Error fetching field ownership for week {week_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch field ownership: {str(e)}"
+        )
+
+@router.post("/roster-players/rebuild", status_code=status.HTTP_200_OK)
+async def rebuild_roster_players(
+    contest_id: Optional[int] = None,
+    missing_only: bool = True,
+    db: Session = Depends(get_db)
+):
+    """
+    Rebuild the per-player rows of saved opponent rosters
+    
+    Backfills rosters saved before players were normalized and re-resolves players
+    once the player pool of a draft group has been imported (missing_only=false).
+    
+    Args:
+        contest_id: Only rebuild rosters of this contest
+        missing_only: Only rebuild rosters without player rows
+        db: Database session
+        
+    Returns:
+        Number of rosters and player rows written
+    """
+    try:
+        contest_service = ContestDetailsService(db)
+        result = await contest_service.rebuild_roster_players(
+            contest_ids=[contest_id] if contest_id is not None else None,
+            missing_only=missing_only
+        )
+        return {
+            "message": f"Rebuilt {result['players']} player rows for {result['rosters']} rosters",
+            **result
+        }
+        
+    except Exception as e:
+        logger.error(f"Error rebuilding roster players: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to rebuild roster players: {str(e)}"
+        )
+
 # Test endpoint for development
 @router.get("/test", status_code=status.HTTP_200_OK)
 async def test_import_router():
@@ -626,6 +827,7 @@ async def test_import_router():
             "POST /api/import-opponent-roster/ - Start import",
             "GET /api/import-opponent-roster/contests/{week_id} - Get H2H contests",
             "GET /api/import-opponent-roster/status/{import_id} - Check import status",
+            "POST /api/import-opponent-roster/resume/{import_id} - Resume a failed or interrupted import",
             "GET /api/import-opponent-roster/rosters/{contest_id} - Get contest rosters",
             "DELETE /api/import-opponent-roster/rosters/{contest_id}/{entry_key} - Delete roster"
         ],
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
+from typing import Optional
 
 from app.database import get_db
 from app.models import Player, Week, PlayerPropBet, Game, WeeklyPlayerSummary, PlayerPoolEntry
+from app.services.player_props_scoring_service import PlayerPropsScoringService
 
 router = APIRouter()
 
@@ -148,3 +150,28 @@ def get_player_props_for_leaderboard(
         print(f"Error in player props leaderboard: {e}")
         # Return empty array instead of failing
         return []
+
+@router.get("/player-props/hit-rates")
+def get_player_prop_hit_rates(
+    weeks_back: Optional[int] = Query(None, description="Only count the most recent N weeks"),
+    market: str = Query("all", description="Market type or 'all'"),
+    bookmaker: str = Query("all", description="Bookmaker name or 'all'"),
+    position: str = Query("all", description="Player position or 'all'"),
+    min_scored: int = Query(1, ge=1, description="Minimum number of scored props"),
+    limit: Optional[int] = Query(100, ge=1, description="Maximum number of players"),
+    db: Session = Depends(get_db)
+):
+    """
+    Player prop hit-rate leaderboard, read from the maintained hit-rate aggregates.
+    """
+    try:
+        return PlayerPropsScoringService(db).get_hit_rate_leaderboard(
+            weeks_back=weeks_back,
+            market=None if market == "all" else market,
+            bookmaker=None if bookmaker == "all" else bookmaker,
+            position=None if position == "all" else position,
+            min_scored=min_scored,
+            limit=limit
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get hit-rate leaderboard: {str(e)}")
@@ -5,14 +5,15 @@ from sqlalchemy import and_
 from typing import List, Optional
 import uuid
 import csv
-import io
 import json
 import subprocess
 import tempfile
 import os
+import logging
 
 from app.database import get_db
 from app.models import Lineup, Week, PlayerPoolEntry, Player, WeeklyPlayerSummary
+from app.services.lineup_export import LineupExportService, DK_CLASSIC_HEADER
 from app.schemas import (
     LineupCreate, LineupUpdate, Lineup as LineupSchema,
     LineupListResponse, LineupValidationRequest, LineupValidationResponse,
@@ -20,6 +21,7 @@ from app.schemas import (
 )
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Lineup CRUD operations
 @router.post("", response_model=LineupSchema)
@@ -133,116 +135,38 @@ def delete_lineup(lineup_id: str, db: Session = Depends(get_db)):
 def export_lineup_csv(lineup_id: str, db: Session = Depends(get_db)):
     """Export a lineup to CSV format with DraftKings contest entry format including draftableId"""
     try:
-        # Use raw SQL to avoid SQLAlchemy JSON parsing issues
-        from sqlalchemy import text
-        
-        # Get the lineup using raw SQL
-        result = db.execute(text("SELECT id, name, week_id, slots FROM lineups WHERE id = :lineup_id"), 
-                           {"lineup_id": lineup_id})
-        lineup_row = result.fetchone()
-        
-        if not lineup_row:
+        export_service = LineupExportService(db)
+        lineups = export_service.get_lineups(lineup_id=lineup_id)
+        if not lineups:
             raise HTTPException(status_code=404, detail="Lineup not found")
-        
-        lineup_id, name, week_id, slots = lineup_row
-        
-        # slots is already a dictionary from the JSON column type
-        if not isinstance(slots, dict):
+        lineup = lineups[0]
+        if not isinstance(lineup.slots, dict):
             raise HTTPException(status_code=400, detail="Invalid lineup slots format")
-        
-        # Get the week using raw SQL
-        week_result = db.execute(text("SELECT week_number, year FROM weeks WHERE id = :week_id"), 
-                                {"week_id": week_id})
-        week_row = week_result.fetchone()
-        
-        if not week_row:
+
+        week = db.query(Week.week_number, Week.year).filter(Week.id == lineup.week_id).first()
+        if not week:
             raise HTTPException(status_code=404, detail="Week not found")
-        
-        week_number, year = week_row
-        
-        # Get player pool entries for this week to access draftableId
-        pool_result = db.execute(text('SELECT "playerDkId", "draftableId" FROM player_pool_entries WHERE week_id = :week_id'), 
-                                {"week_id": week_id})
-        pool_entries = pool_result.fetchall()
-        
-        # Create a mapping of playerDkId to draftableId
-        player_to_draftable = {entry[0]: entry[1] for entry in pool_entries}
-        
-        # Create CSV content
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Create header row with only the slots that have players
-        header = []
-        data_row = []
-        
-        # Direct mapping from database slot names to DraftKings format
-        # The database has: QB, RB1, RB2, WR1, WR2, WR3, TE, FLEX, DST
-        # DraftKings expects: QB, RB, RB, WR, WR, WR, TE, FLEX, DST
-        
-        # Process each database slot and map to DraftKings format
-        for db_slot_name, player_dk_id in slots.items():
-            if player_dk_id:  # Only process slots that have players
-                # Map database slot names to DraftKings format
-                if db_slot_name == 'RB1':
-                    dk_slot_name = 'RB'
-                elif db_slot_name == 'RB2':
-                    dk_slot_name = 'RB'
-                elif db_slot_name == 'WR1':
-                    dk_slot_name = 'WR'
-                elif db_slot_name == 'WR2':
-                    dk_slot_name = 'WR'
-                elif db_slot_name == 'WR3':
-                    dk_slot_name = 'WR'
-                elif db_slot_name in ['QB', 'TE', 'FLEX', 'DST']:
-                    dk_slot_name = db_slot_name
-                else:
-                    continue  # Skip unknown slots
-                
-                header.append(dk_slot_name)
-                # Use draftableId if available, otherwise use playerDkId as fallback
-                draftable_id = player_to_draftable.get(player_dk_id)
-                if draftable_id is None or draftable_id == '':
-                    draftable_id = str(player_dk_id)  # Fallback to playerDkId
-                data_row.append(draftable_id)
-        
-        # Write the CSV content
-        writer.writerow(header)
-        writer.writerow(data_row)
-        
-        # Debug: print what we're writing
-        print(f"Debug - Header: {header}")
-        print(f"Debug - Data row: {data_row}")
-        print(f"Debug - Slots: {slots}")
-        print(f"Debug - Player mapping: {player_to_draftable}")
-        
-        # Update lineup status to exported
-        try:
-            lineup_obj = db.query(Lineup).filter(Lineup.id == lineup_id).first()
-            if lineup_obj and lineup_obj.status != 'exported':
-                lineup_obj.status = 'exported'
-                db.commit()
-        except Exception:
-            pass
 
-        # Prepare response
-        output.seek(0)
-        csv_content = output.getvalue()
-        
-        # Create filename
-        filename = f"lineup_{name.replace(' ', '_')}_week{week_number}_{year}.csv"
-        
-        from fastapi.responses import Response
-        
-        return Response(
-            content=csv_content.encode('utf-8'),
+        # Only the slots that have players go into the file
+        row = export_service.lineup_row(lineup, export_service.get_draftable_ids(lineups))
+        filled = [i for i, draftable_id in enumerate(row) if draftable_id]
+        header = [DK_CLASSIC_HEADER[i] for i in filled]
+        row = [row[i] for i in filled]
+
+        export_service.mark_exported([lineup.id])
+        db.commit()
+
+        filename = f"lineup_{lineup.name.replace(' ', '_')}_week{week.week_number}_{week.year}.csv"
+        return StreamingResponse(
+            export_service.stream_csv(header, [row]),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename=\"{filename}\""}
         )
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
+        db.rollback()
         logger.error(f"Error exporting lineup {lineup_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
@@ -253,147 +177,36 @@ def export_all_lineups_csv(
 ):
     """Export all lineups for a week to CSV format with DraftKings contest entry format"""
     try:
-        from sqlalchemy import text
-        
-        # Build query to get lineups
-        if week_id:
-            result = db.execute(text("SELECT id, name, week_id, slots FROM lineups WHERE week_id = :week_id"), 
-                               {"week_id": week_id})
-        else:
-            result = db.execute(text("SELECT id, name, week_id, slots FROM lineups"))
-        
-        lineups = result.fetchall()
-        
+        export_service = LineupExportService(db)
+        lineups = export_service.get_lineups(week_id=week_id)
         if not lineups:
             raise HTTPException(status_code=404, detail="No lineups found")
-        
-        # Get week info for filename
+
         week_info = ""
         if week_id:
-            week_result = db.execute(text("SELECT week_number, year FROM weeks WHERE id = :week_id"), 
-                                    {"week_id": week_id})
-            week_row = week_result.fetchone()
-            if week_row:
-                week_number, year = week_row
-                week_info = f"_week{week_number}_{year}"
-        
-        # Get player pool entries for all weeks to access draftableId
-        pool_result = db.execute(text('SELECT week_id, "playerDkId", "draftableId" FROM player_pool_entries'))
-        pool_entries = pool_result.fetchall()
-        
-        # Create a mapping of (week_id, playerDkId) to draftableId
-        player_to_draftable = {}
-        for entry in pool_entries:
-            key = (entry[0], entry[1])  # week_id, playerDkId
-            player_to_draftable[key] = entry[2]  # draftableId
-        
-        # Create CSV content
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Create header row
-        header = ['QB', 'RB', 'RB', 'WR', 'WR', 'WR', 'TE', 'FLEX', 'DST']
-        writer.writerow(header)
-        
-        # Process each lineup
-        for lineup_id, name, week_id, slots in lineups:
-            try:
-                # slots is already a dictionary from the JSON column type
-                if not isinstance(slots, dict):
-                    print(f"Invalid slots format for lineup {lineup_id}: {slots}")
-                    continue
-                
-                # Create data row for this lineup
-                data_row = []
-                
-                # Process each database slot and map to DraftKings format
-                for db_slot_name, player_dk_id in slots.items():
-                    if player_dk_id:  # Only process slots that have players
-                        # Map database slot names to DraftKings format
-                        if db_slot_name == 'RB1':
-                            dk_slot_name = 'RB'
-                        elif db_slot_name == 'RB2':
-                            dk_slot_name = 'RB'
-                        elif db_slot_name == 'WR1':
-                            dk_slot_name = 'WR'
-                        elif db_slot_name == 'WR2':
-                            dk_slot_name = 'WR'
-                        elif db_slot_name == 'WR3':
-                            dk_slot_name = 'WR'
-                        elif db_slot_name in ['QB', 'TE', 'FLEX', 'DST']:
-                            dk_slot_name = db_slot_name
-                        else:
-                            continue  # Skip unknown slots
-                        
-                        # Use draftableId if available, otherwise use playerDkId as fallback
-                        draftable_id = player_to_draftable.get((week_id, player_dk_id))
-                        if draftable_id is None or draftable_id == '':
-                            draftable_id = str(player_dk_id)  # Fallback to playerDkId
-                        
-                        # Add to the appropriate position in the row
-                        if dk_slot_name == 'QB':
-                            data_row.insert(0, draftable_id)  # QB is first
-                        elif dk_slot_name == 'RB':
-                            if 'RB' not in [slot for slot in data_row if slot.startswith('RB')]:
-                                data_row.append(draftable_id)  # First RB
-                            else:
-                                data_row.append(draftable_id)  # Second RB
-                        elif dk_slot_name == 'WR':
-                            if 'WR' not in [slot for slot in data_row if slot.startswith('WR')]:
-                                data_row.append(draftable_id)  # First WR
-                            elif len([slot for slot in data_row if slot.startswith('WR')]) == 1:
-                                data_row.append(draftable_id)  # Second WR
-                            else:
-                                data_row.append(draftable_id)  # Third WR
-                        elif dk_slot_name == 'TE':
-                            data_row.append(draftable_id)
-                        elif dk_slot_name == 'FLEX':
-                            data_row.append(draftable_id)
-                        elif dk_slot_name == 'DST':
-                            data_row.append(draftable_id)
-                
-                # Ensure we have exactly 9 positions filled
-                while len(data_row) < 9:
-                    data_row.append('')  # Fill empty slots
-                
-                # Write the row
-                writer.writerow(data_row)
-                
-            except Exception as e:
-                print(f"Error processing lineup {lineup_id}: {str(e)}")
-                # Write empty row for this lineup
-                writer.writerow([''] * 9)
-                continue
-        
-        # Update status to exported for included lineups
-        try:
-            from sqlalchemy import text
-            if week_id:
-                db.execute(text("UPDATE lineups SET status = 'exported' WHERE week_id = :week_id"), {"week_id": week_id})
-            else:
-                db.execute(text("UPDATE lineups SET status = 'exported'"))
-            db.commit()
-        except Exception:
-            pass
+            week = db.query(Week.week_number, Week.year).filter(Week.id == week_id).first()
+            if week:
+                week_info = f"_week{week.week_number}_{week.year}"
+
+        draftable_ids = export_service.get_draftable_ids(lineups)
+        rows = [export_service.lineup_row(lineup, draftable_ids) for lineup in lineups]
+
+        # Mark exactly the exported lineups before streaming, so the UPDATE is
+        # committed while the session is still open
+        export_service.mark_exported([lineup.id for lineup in lineups])
+        db.commit()
 
-        # Prepare response
-        output.seek(0)
-        csv_content = output.getvalue()
-        
-        # Create filename
         filename = f"all_lineups{week_info}.csv"
-        
-        from fastapi.responses import Response
-        
-        return Response(
-            content=csv_content.encode('utf-8'),
+        return StreamingResponse(
+            export_service.stream_csv(DK_CLASSIC_HEADER, rows),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename=\"{filename}\""}
         )
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
+        db.rollback()
         logger.error(f"Error exporting all lineups: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
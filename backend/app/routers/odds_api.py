@@ -1,27 +1,73 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import httpx
 import os
 from app.database import get_db
 from app.models import Team, Game, Player, PlayerPropBet, PlayerNameAlias
 from app.schemas import TeamCreate, TeamUpdate
 from app.services.activity_logging import ActivityLoggingService
+from app.services.http_client import create_async_client, gather_bounded, get_rate_limiter, request_with_retry
+from app.services.player_props_scoring_service import PlayerPropsScoringService
+from app.utils.bulk_upsert import bulk_upsert, bulk_upsert_counts
+from app.utils.name_normalization import normalize_for_matching
 from datetime import datetime
 from urllib.parse import urlencode
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, update
 
 router = APIRouter(prefix="/api/odds-api", tags=["odds-api"])
 
-# Odds-API base URL
-ODDS_API_BASE_URL = "https://api.the-odds-api.com/v4"
+# Odds-API base URL (override to point imports at a local mock server)
+ODDS_API_BASE_URL = os.getenv("ODDS_API_BASE_URL", "https://api.the-odds-api.com/v4")
+
+# Requests per second shared by every Odds-API call in the process, and max events fetched at once
+ODDS_API_RATE_LIMIT = float(os.getenv("ODDS_API_RATE_LIMIT", "5"))
+ODDS_API_RATE_BURST = int(os.getenv("ODDS_API_RATE_BURST", "10"))
+DEFAULT_EVENT_FETCH_CONCURRENCY = int(os.getenv("ODDS_API_FETCH_CONCURRENCY", "8"))
 
 class OddsApiService:
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.api_key = os.getenv("ODDS_API_KEY")
         if not self.api_key:
             raise ValueError("ODDS_API_KEY environment variable is required")
         self.base_url = ODDS_API_BASE_URL
+        self.client = client
+        self.rate_limiter = get_rate_limiter("odds-api", ODDS_API_RATE_LIMIT, ODDS_API_RATE_BURST)
+        self._owns_client = False
+
+    async def __aenter__(self) -> "OddsApiService":
+        """Open one pooled client that every request made inside the block reuses"""
+        if self.client is None:
+            self.client = create_async_client()
+            self._owns_client = True
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._owns_client and self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            self._owns_client = False
+
+    async def _get_json(self, url: str, params: Dict[str, Any], description: str) -> Any:
+        """GET an Odds-API endpoint through the shared rate limiter, retrying transient failures"""
+        try:
+            if self.client is None:
+                async with create_async_client() as client:
+                    response = await request_with_retry(client, "GET", url, rate_limiter=self.rate_limiter, params=params)
+            else:
+                response = await request_with_retry(self.client, "GET", url, rate_limiter=self.rate_limiter, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise HTTPException(
+                status_code=e.response.status_code,
+                detail=f"Odds-API request failed: {e.response.text}"
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to fetch {description}: {str(e)}"
+            )
     
     def american_to_decimal(self, american_odds: float) -> float:
         """Convert American odds to decimal odds"""
@@ -50,21 +96,7 @@ class OddsApiService:
             "apiKey": self.api_key
         }
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise HTTPException(
-                    status_code=e.response.status_code,
-                    detail=f"Odds-API request failed: {e.response.text}"
-                )
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to fetch participants: {str(e)}"
-                )
+        return await self._get_json(url, params, "participants")
     
     async def get_events(self, sport: str, commence_time_from: str = None, commence_time_to: str = None, 
                         regions: str = "us", markets: str = "h2h,spreads,totals", 
@@ -95,21 +127,7 @@ class OddsApiService:
                 commence_time_to = commence_time_to + 'Z'
             params["commenceTimeTo"] = commence_time_to
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise HTTPException(
-                    status_code=e.response.status_code,
-                    detail=f"Odds-API request failed: {e.response.text}"
-                )
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to fetch events: {str(e)}"
-                )
+        return await self._get_json(url, params, "events")
     
     async def get_odds(self, sport: str, commence_time_from: str = None, commence_time_to: str = None, 
                       regions: str = "us", markets: str = "h2h,spreads,totals", 
@@ -142,21 +160,7 @@ class OddsApiService:
                 commence_time_to = commence_time_to + 'Z'
             params["commenceTimeTo"] = commence_time_to
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise HTTPException(
-                    status_code=e.response.status_code,
-                    detail=f"Odds-API request failed: {e.response.text}"
-                )
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to fetch odds: {str(e)}"
-                )
+        return await self._get_json(url, params, "odds")
 
     async def get_event_odds(self, sport: str, event_id: str, markets: str, regions: str = "us") -> Dict[str, Any]:
         """Fetch odds for a specific event (game) and markets from Odds-API"""
@@ -168,21 +172,104 @@ class OddsApiService:
             "oddsFormat": "american",
             "dateFormat": "iso",
         }
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise HTTPException(
-                    status_code=e.response.status_code,
-                    detail=f"Odds-API request failed: {e.response.text}"
-                )
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to fetch event odds: {str(e)}"
-                )
+        return await self._get_json(url, params, "event odds")
+
+# Conflict target (ux_prop_bets_unique_new) and refreshed columns for player prop upserts
+PROP_UNIQUE_COLUMNS = ("week_id", "game_id", "bookmaker", "market", "outcome_name", "playerDkId")
+PROP_UPDATE_COLUMNS = (
+    "outcome_description", "outcome_price", "outcome_point", "outcome_likelihood",
+    "last_prop_update", "updated_by",
+)
+
+def _parse_first_last(name: str) -> tuple[str, str]:
+    cleaned = normalize_for_matching(name)
+    tokens = [t for t in cleaned.split() if t]
+    if len(tokens) == 0:
+        return "", ""
+    if len(tokens) == 1:
+        return tokens[0], ""
+    return tokens[0], " ".join(tokens[1:])
+
+def _find_prop_player_fuzzy(db: Session, name: str) -> Optional[Player]:
+    """Relaxed fallbacks for a prop player name that has no exact match"""
+    name_normalized = normalize_for_matching(name)
+    first, last = _parse_first_last(name)
+
+    # Relaxed matching by last name contains and first name initial
+    if last:
+        first_initial = first[:1].lower() if first else None
+        query = db.query(Player).filter(func.lower(Player.lastName).like(f"%{last.lower()}%"))
+        if first_initial:
+            query = query.filter(func.lower(Player.firstName).like(f"{first_initial}%"))
+        player = query.first()
+        if player:
+            return player
+
+    # shortName match if available
+    player = db.query(Player).filter(Player.shortName.ilike(f"%{name_normalized}%")).first()
+    if player:
+        return player
+
+    # Contains on displayName
+    player = db.query(Player).filter(Player.displayName.ilike(f"%{name_normalized}%")).first()
+    if player:
+        return player
+
+    # Alias matching as final fallback
+    return db.query(Player).join(PlayerNameAlias).filter(
+        func.lower(PlayerNameAlias.alias_name) == name.strip().lower()
+    ).first()
+
+def resolve_prop_players(db: Session, names: List[str]) -> Dict[str, Optional[Player]]:
+    """
+    Resolve Odds-API outcome descriptions (player full names) to Players in one batch.
+
+    Exact canonical/normalized display name and first/last name matches are answered from
+    a single query for every name; only names that miss all of them fall back to the
+    per-name fuzzy lookups.
+    """
+    names = list(dict.fromkeys(name for name in names if name))
+    if not names:
+        return {}
+
+    parsed = {name: _parse_first_last(name) for name in names}
+    lowered = {name.strip().lower() for name in names}
+    normalized = {normalize_for_matching(name) for name in names}
+    last_names = {last for _, last in parsed.values() if last}
+    candidates = db.query(Player).filter(
+        or_(
+            func.lower(Player.displayName).in_(lowered),
+            Player.normalized_display_name.in_(normalized),
+            func.lower(Player.lastName).in_({last.lower() for last in last_names}),
+            Player.normalized_last_name.in_({normalize_for_matching(last) for last in last_names}),
+        )
+    ).order_by(Player.playerDkId).all()
+
+    by_display: Dict[str, Player] = {}
+    by_normalized: Dict[str, Player] = {}
+    by_first_last: Dict[tuple, Player] = {}
+    by_normalized_first_last: Dict[tuple, Player] = {}
+    for p in candidates:
+        if p.displayName:
+            by_display.setdefault(p.displayName.lower(), p)
+        if p.normalized_display_name:
+            by_normalized.setdefault(p.normalized_display_name, p)
+        if p.firstName and p.lastName:
+            by_first_last.setdefault((p.firstName.lower(), p.lastName.lower()), p)
+        if p.normalized_first_name and p.normalized_last_name:
+            by_normalized_first_last.setdefault((p.normalized_first_name, p.normalized_last_name), p)
+
+    resolved: Dict[str, Optional[Player]] = {}
+    for name in names:
+        first, last = parsed[name]
+        player = by_display.get(name.strip().lower()) or by_normalized.get(normalize_for_matching(name))
+        if not player and first and last:
+            player = (
+                by_first_last.get((first.lower(), last.lower()))
+                or by_normalized_first_last.get((normalize_for_matching(first), normalize_for_matching(last)))
+            )
+        resolved[name] = player or _find_prop_player_fuzzy(db, name)
+    return resolved
 
 @router.post("/participants/{sport}")
 async def import_participants(
@@ -346,20 +433,42 @@ async def import_events(
         games_updated = 0
         errors = []
         
+        # Preload teams and the week's games once instead of querying per event
+        teams_by_name: Dict[str, Team] = {}
+        for team in db.query(Team).order_by(Team.id):
+            teams_by_name.setdefault(team.full_name, team)
+        existing_team_ids = {
+            team_id for (team_id,) in db.query(Game.team_id).filter(Game.week_id == week_id)
+        }
+        
+        # One row per team for the week; both sides of every event are upserted together
+        game_rows: Dict[int, Dict[str, Any]] = {}
+        
+        def stage_game(team_id: int, opponent_team_id: int, homeoraway: str, commence_time: datetime, event_id: str) -> None:
+            nonlocal games_created, games_updated
+            if team_id in existing_team_ids or team_id in game_rows:
+                games_updated += 1
+            else:
+                games_created += 1
+            now = datetime.utcnow()
+            game_rows[team_id] = {
+                "week_id": week_id,
+                "team_id": team_id,
+                "opponent_team_id": opponent_team_id,
+                "homeoraway": homeoraway,
+                "start_time": commence_time,
+                "odds_api_gameid": event_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+        
         for event in events:
             try:
                 # Parse the commence_time
                 commence_time = datetime.fromisoformat(event["commence_time"].replace('Z', '+00:00'))
                 
-                # Find home team
-                home_team = db.query(Team).filter(
-                    Team.full_name == event["home_team"]
-                ).first()
-                
-                # Find away team
-                away_team = db.query(Team).filter(
-                    Team.full_name == event["away_team"]
-                ).first()
+                home_team = teams_by_name.get(event["home_team"])
+                away_team = teams_by_name.get(event["away_team"])
                 
                 if not home_team:
                     errors.append(f"Home team '{event['home_team']}' not found in teams table")
@@ -369,67 +478,21 @@ async def import_events(
                     errors.append(f"Away team '{event['away_team']}' not found in teams table")
                     continue
                 
-                # Create/update home team game record
-                home_game = db.query(Game).filter(
-                    Game.week_id == week_id,
-                    Game.team_id == home_team.id
-                ).first()
-                
-                if home_game:
-                    # Update existing home game
-                    home_game.opponent_team_id = away_team.id
-                    home_game.homeoraway = "H"
-                    home_game.start_time = commence_time
-                    home_game.odds_api_gameid = event["id"]
-                    home_game.updated_at = datetime.utcnow()
-                    games_updated += 1
-                else:
-                    # Create new home game
-                    new_home_game = Game(
-                        week_id=week_id,
-                        team_id=home_team.id,
-                        opponent_team_id=away_team.id,
-                        homeoraway="H",
-                        start_time=commence_time,
-                        odds_api_gameid=event["id"],
-                        created_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
-                    )
-                    db.add(new_home_game)
-                    games_created += 1
-                
-                # Create/update away team game record
-                away_game = db.query(Game).filter(
-                    Game.week_id == week_id,
-                    Game.team_id == away_team.id
-                ).first()
-                
-                if away_game:
-                    # Update existing away game
-                    away_game.opponent_team_id = home_team.id
-                    away_game.homeoraway = "A"
-                    away_game.start_time = commence_time
-                    away_game.odds_api_gameid = event["id"]
-                    away_game.updated_at = datetime.utcnow()
-                    games_updated += 1
-                else:
-                    # Create new away game
-                    new_away_game = Game(
-                        week_id=week_id,
-                        team_id=away_team.id,
-                        opponent_team_id=home_team.id,
-                        homeoraway="A",
-                        start_time=commence_time,
-                        odds_api_gameid=event["id"],
-                        created_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
-                    )
-                    db.add(new_away_game)
-                    games_created += 1
+                # Create/update home and away team game records
+                stage_game(home_team.id, away_team.id, "H", commence_time, event["id"])
+                stage_game(away_team.id, home_team.id, "A", commence_time, event["id"])
                     
             except Exception as e:
                 errors.append(f"Failed to process event {event.get('id', 'Unknown')}: {str(e)}")
         
+        bulk_upsert(
+            db,
+            Game,
+            list(game_rows.values()),
+            index_elements=["week_id", "team_id"],
+            update_columns=["opponent_team_id", "homeoraway", "start_time", "odds_api_gameid"],
+        )
+        
         # Commit all changes
         db.commit()
         
@@ -553,15 +616,33 @@ async def import_odds(
         games_updated = 0
         errors = []
         
+        # Preload the week's games for these events and their team names once
+        event_ids = [event["id"] for event in odds_data if event.get("id")]
+        games_by_event: Dict[str, List[Dict[str, Any]]] = {}
+        for row in db.query(
+            Game.id, Game.team_id, Game.odds_api_gameid,
+            Game.money_line, Game.proj_spread, Game.proj_total, Game.implied_team_total
+        ).filter(
+            Game.week_id == week_id,
+            Game.odds_api_gameid.in_(event_ids)
+        ).order_by(Game.id):
+            games_by_event.setdefault(row.odds_api_gameid, []).append(dict(row._mapping))
+        team_names = {
+            team_id: full_name
+            for team_id, full_name in db.query(Team.id, Team.full_name).filter(
+                Team.id.in_({game["team_id"] for games in games_by_event.values() for game in games})
+            )
+        }
+        
+        # New line values per game id, written in one bulk UPDATE after processing
+        game_updates: Dict[int, Dict[str, Any]] = {}
+        
         for event in odds_data:
             try:
                 event_id = event["id"]
                 
                 # Find games with this odds_api_gameid
-                games = db.query(Game).filter(
-                    Game.odds_api_gameid == event_id,
-                    Game.week_id == week_id
-                ).all()
+                games = games_by_event.get(event_id, [])
                 
                 print(f"DEBUG: Found {len(games)} games for event ID {event_id}")
                 
@@ -597,33 +678,39 @@ async def import_odds(
                 # Process each game record
                 for game in games:
                     try:
+                        team_name = team_names.get(game["team_id"])
+                        values = game_updates.get(game["id"]) or {
+                            "money_line": game["money_line"],
+                            "proj_spread": game["proj_spread"],
+                            "proj_total": game["proj_total"],
+                            "implied_team_total": game["implied_team_total"],
+                        }
+                        
                         # Update money line from h2h data
                         if h2h_data and h2h_data.get("outcomes"):
                             for outcome in h2h_data["outcomes"]:
                                 # Find the team name that matches this game's team
-                                team = db.query(Team).filter(Team.id == game.team_id).first()
-                                if team and team.full_name == outcome["name"]:
+                                if team_name and team_name == outcome["name"]:
                                     price = outcome["price"]
                                     # Convert American odds to decimal if needed
                                     if odds_format == "american":
                                         converted_price = odds_service.american_to_decimal(price)
-                                        game.money_line = converted_price
-                                        print(f"DEBUG: Updated {team.full_name} money line: {price} (American) -> {converted_price} (Decimal)")
+                                        values["money_line"] = converted_price
+                                        print(f"DEBUG: Updated {team_name} money line: {price} (American) -> {converted_price} (Decimal)")
                                     else:
-                                        game.money_line = price
-                                        print(f"DEBUG: Updated {team.full_name} money line: {price} (Decimal)")
+                                        values["money_line"] = price
+                                        print(f"DEBUG: Updated {team_name} money line: {price} (Decimal)")
                                     break
                         
                         # Update spread from spreads data
                         if spreads_data and spreads_data.get("outcomes"):
                             for outcome in spreads_data["outcomes"]:
                                 # Find the team name that matches this game's team
-                                team = db.query(Team).filter(Team.id == game.team_id).first()
-                                if team and team.full_name == outcome["name"]:
+                                if team_name and team_name == outcome["name"]:
                                     # Handle negative spreads properly
                                     spread_value = outcome.get("point")
                                     if spread_value is not None:
-                                        game.proj_spread = spread_value
+                                        values["proj_spread"] = spread_value
                                     break
                         
                         # Update total from totals data (same for both teams)
@@ -632,22 +719,27 @@ async def import_odds(
                                 if outcome["name"] == "Over":
                                     total_value = outcome.get("point")
                                     if total_value is not None:
-                                        game.proj_total = total_value
+                                        values["proj_total"] = total_value
                                     break
                         
                         # Calculate implied team total: (proj_total / 2) - (proj_spread / 2)
-                        if game.proj_total is not None and game.proj_spread is not None:
-                            game.implied_team_total = (game.proj_total / 2) - (game.proj_spread / 2)
+                        if values["proj_total"] is not None and values["proj_spread"] is not None:
+                            values["implied_team_total"] = (values["proj_total"] / 2) - (values["proj_spread"] / 2)
                         
-                        game.updated_at = datetime.utcnow()
+                        values["updated_at"] = datetime.utcnow()
+                        game_updates[game["id"]] = {"id": game["id"], **values}
                         games_updated += 1
                         
                     except Exception as e:
-                        errors.append(f"Failed to update game {game.id}: {str(e)}")
+                        errors.append(f"Failed to update game {game['id']}: {str(e)}")
                         
             except Exception as e:
                 errors.append(f"Failed to process event {event.get('id', 'Unknown')}: {str(e)}")
         
+        # Apply every spread, total and money line change in one bulk UPDATE by primary key
+        if game_updates:
+            db.execute(update(Game), list(game_updates.values()))
+        
         # Commit all changes
         db.commit()
         
@@ -750,6 +842,7 @@ async def import_player_props(
     regions = request.get("regions", "us")
     event_id = request.get("event_id")  # odds_api_gameid, optional when 'All'
     bookmakers = request.get("bookmakers", "all")  # 'all' or specific key like 'fanduel'
+    max_concurrency = int(request.get("max_concurrency") or DEFAULT_EVENT_FETCH_CONCURRENCY)
 
     if not week_id:
         raise HTTPException(status_code=400, detail="week_id is required")
@@ -787,117 +880,41 @@ async def import_player_props(
         unmatched_players: List[str] = []
         api_requests: List[Dict[str, Any]] = []
 
-        # Helper to normalize and resolve Player by full name (robust)
-        def normalize_token(token: str) -> str:
-            return token.replace("'", "").replace("-", " ").strip()
-
-        def normalize_name(name: str) -> str:
-            from app.utils.name_normalization import normalize_for_matching
-            return normalize_for_matching(name)
-
-        def parse_first_last(name: str) -> tuple[str, str]:
-            cleaned = normalize_name(name)
-            tokens = [t for t in cleaned.split() if t]
-            if len(tokens) == 0:
-                return "", ""
-            if len(tokens) == 1:
-                return tokens[0], ""
-            return tokens[0], " ".join(tokens[1:])
-
-        def find_player_by_name(name: str) -> Player | None:
-            if not name:
-                return None
-            
-            # Normalize the incoming name
-            name_normalized = normalize_name(name)
-            
-            # 1. Try exact canonical displayName match
-            player = db.query(Player).filter(func.lower(Player.displayName) == name.strip().lower()).first()
-            if player:
-                return player
-            
-            # 2. Try exact normalized displayName match
-            player = db.query(Player).filter(Player.normalized_display_name == name_normalized).first()
-            if player:
-                return player
-
-            first, last = parse_first_last(name)
-            if first and last:
-                # 3. Try exact canonical first/last match
-                player = db.query(Player).filter(
-                    and_(func.lower(Player.firstName) == first.lower(), func.lower(Player.lastName) == last.lower())
-                ).first()
-                if player:
-                    return player
-                
-                # 4. Try exact normalized first/last match
-                first_normalized = normalize_name(first)
-                last_normalized = normalize_name(last)
-                player = db.query(Player).filter(
-                    and_(Player.normalized_first_name == first_normalized, Player.normalized_last_name == last_normalized)
-                ).first()
-                if player:
-                    return player
-                
-                # 5. Try suffix-agnostic matching
-                suffix_agnostic_candidates = db.query(Player).filter(
-                    and_(
-                        Player.normalized_first_name == first_normalized,
-                        Player.normalized_last_name == last_normalized,
-                    )
-                ).all()
-                
-                if len(suffix_agnostic_candidates) == 1:
-                    return suffix_agnostic_candidates[0]
-
-            # 6. Try relaxed matching by last name contains and first name initial
-            if last:
-                first_initial = first[:1].lower() if first else None
-                query = db.query(Player).filter(func.lower(Player.lastName).like(f"%{last.lower()}%"))
-                if first_initial:
-                    query = query.filter(func.lower(Player.firstName).like(f"{first_initial}%"))
-                player = query.first()
-                if player:
-                    return player
-
-            # 7. Try shortName match if available
-            player = db.query(Player).filter(Player.shortName.ilike(f"%{name_normalized}%")).first()
-            if player:
-                return player
+        # Request all selected markets for an event in one API call (comma-delimited)
+        markets_param = ",".join(market_list)
+        market_set = set(market_list)
+        for eid in event_ids:
+            # Record the exact request for observability
+            req_url = f"{odds_service.base_url}/sports/{sport}/events/{eid}/odds"
+            req_params = {
+                "apiKey": odds_service.api_key,
+                "regions": regions,
+                "markets": markets_param,
+                "oddsFormat": "american",
+                "dateFormat": "iso",
+            }
+            api_requests.append({
+                "event_id": eid,
+                "url": req_url,
+                "params": req_params,
+                "full_url": f"{req_url}?{urlencode(req_params)}"
+            })
 
-            # 8. Final fallback: contains on displayName
-            player = db.query(Player).filter(Player.displayName.ilike(f"%{name_normalized}%")).first()
-            if player:
-                return player
-            
-            # 9. Alias matching as final fallback
-            player = db.query(Player).join(PlayerNameAlias).filter(
-                func.lower(PlayerNameAlias.alias_name) == name.strip().lower()
-            ).first()
-            return player
+        # Fetch every event concurrently over one pooled client; the shared rate limiter
+        # keeps the burst under the Odds-API limit and throttled calls are retried
+        async with odds_service:
+            fetched = await gather_bounded(
+                event_ids,
+                lambda eid: odds_service.get_event_odds(sport=sport, event_id=eid, markets=markets_param, regions=regions),
+                max_concurrency
+            )
 
-        # Iterate over each event and request all selected markets in one API call (comma-delimited)
-        for eid in event_ids:
+        # Collect the Over outcomes to import from every response, in event order
+        outcomes: List[Dict[str, Any]] = []
+        for eid, event_odds in zip(event_ids, fetched):
             try:
-                markets_param = ",".join(market_list)
-                market_set = set(market_list)
-                # Record the exact request for observability
-                req_url = f"{odds_service.base_url}/sports/{sport}/events/{eid}/odds"
-                req_params = {
-                    "apiKey": odds_service.api_key,
-                    "regions": regions,
-                    "markets": markets_param,
-                    "oddsFormat": "american",
-                    "dateFormat": "iso",
-                }
-                api_requests.append({
-                    "event_id": eid,
-                    "url": req_url,
-                    "params": req_params,
-                    "full_url": f"{req_url}?{urlencode(req_params)}"
-                })
-
-                event_odds = await odds_service.get_event_odds(sport=sport, event_id=eid, markets=markets_param, regions=regions)
+                if isinstance(event_odds, Exception):
+                    raise event_odds
 
                 # Basic validation
                 if not event_odds or not event_odds.get("bookmakers"):
@@ -921,92 +938,105 @@ async def import_player_props(
                                 last_update_dt = None
 
                         for outcome in mk.get("outcomes", []):
-                            try:
-                                outcome_name = outcome.get("name")
-                                outcome_description = outcome.get("description")  # player name
-                                outcome_price = outcome.get("price")
-                                outcome_point = outcome.get("point")
-
-                                # Skip Under bets - only import Over bets
-                                if outcome_name and outcome_name.lower() == "under":
-                                    continue
-
-                                # Add bookmaker-specific outcome_point filtering for player_tds_over
-                                if mk_key == "player_tds_over" and outcome_name == "Over":
-                                    if bookmaker.get("key") == "betonlineag" and outcome_point != 0.5:
-                                        continue
-                                    elif bookmaker.get("key") == "draftkings" and outcome_point != 1.5:
-                                        continue
+                            outcome_name = outcome.get("name")
+                            outcome_point = outcome.get("point")
 
-                                player_obj = find_player_by_name(outcome_description) if outcome_description else None
+                            # Skip Under bets - only import Over bets
+                            if outcome_name and outcome_name.lower() == "under":
+                                continue
 
-                                if not player_obj:
-                                    unmatched_players.append(outcome_description or "<unknown>")
+                            # Add bookmaker-specific outcome_point filtering for player_tds_over
+                            if mk_key == "player_tds_over" and outcome_name == "Over":
+                                if bookmaker.get("key") == "betonlineag" and outcome_point != 0.5:
                                     continue
-
-                                # Map event id back to the corresponding Game row for this week
-                                game_row = db.query(Game).filter(
-                                    Game.week_id == week_id,
-                                    Game.odds_api_gameid == eid
-                                ).first()
-                                if not game_row:
-                                    errors.append(f"No game row found for event {eid} (player {outcome_description})")
+                                elif bookmaker.get("key") == "draftkings" and outcome_point != 1.5:
                                     continue
 
-                                # Upsert: unique on (week_id, game_id, bookmaker, market, outcome_name, playerDkId)
-                                existing = db.query(PlayerPropBet).filter(
-                                    and_(
-                                        PlayerPropBet.week_id == week_id,
-                                        PlayerPropBet.game_id == game_row.id,
-                                        PlayerPropBet.bookmaker == bookmaker.get("key"),
-                                        PlayerPropBet.market == mk_key,
-                                        PlayerPropBet.outcome_name == outcome_name,
-                                        PlayerPropBet.playerDkId == player_obj.playerDkId,
-                                    )
-                                ).first()
-
-                                if existing:
-                                    existing.outcome_description = outcome_description
-                                    existing.outcome_price = outcome_price
-                                    existing.outcome_point = outcome_point
-                                    existing.outcome_likelihood = odds_service.calculate_outcome_likelihood(outcome_price)
-                                    existing.last_prop_update = last_update_dt
-                                    existing.updated_by = "API"
-                                    existing.updated_at = datetime.utcnow()
-                                    total_updated += 1
-                                else:
-                                    prop = PlayerPropBet(
-                                        week_id=week_id,
-                                        game_id=game_row.id,
-                                        bookmaker=bookmaker.get("key"),
-                                        market=mk_key,
-                                        outcome_name=outcome_name,
-                                        outcome_description=outcome_description,
-                                        playerDkId=player_obj.playerDkId,
-                                        outcome_price=outcome_price,
-                                        outcome_point=outcome_point,
-                                        outcome_likelihood=odds_service.calculate_outcome_likelihood(outcome_price),
-                                        updated_by="API",
-                                        last_prop_update=last_update_dt,
-                                    )
-                                    db.add(prop)
-                                    total_created += 1
-                            except Exception as e:
-                                errors.append(f"Failed to process outcome for event {eid}: {str(e)}")
+                            outcomes.append({
+                                "event_id": eid,
+                                "bookmaker": bookmaker.get("key"),
+                                "market": mk_key,
+                                "outcome_name": outcome_name,
+                                "outcome_description": outcome.get("description"),  # player name
+                                "outcome_price": outcome.get("price"),
+                                "outcome_point": outcome_point,
+                                "last_prop_update": last_update_dt,
+                            })
             except HTTPException:
                 raise
             except Exception as e:
                 errors.append(f"Failed to process event {eid}: {str(e)}")
 
+        # Resolve every player name and event once instead of per outcome
+        players_by_name = resolve_prop_players(db, [o["outcome_description"] for o in outcomes if o["outcome_description"]])
+        game_ids_by_event: Dict[str, int] = {}
+        for game_id, odds_api_gameid in db.query(Game.id, Game.odds_api_gameid).filter(
+            Game.week_id == week_id,
+            Game.odds_api_gameid.in_(event_ids)
+        ).order_by(Game.id):
+            game_ids_by_event.setdefault(odds_api_gameid, game_id)
+
+        # Upsert: unique on (week_id, game_id, bookmaker, market, outcome_name, playerDkId)
+        prop_rows: Dict[tuple, Dict[str, Any]] = {}
+        for outcome in outcomes:
+            try:
+                outcome_description = outcome["outcome_description"]
+                player_obj = players_by_name.get(outcome_description) if outcome_description else None
+                if not player_obj:
+                    unmatched_players.append(outcome_description or "<unknown>")
+                    continue
+
+                # Map event id back to the corresponding Game row for this week
+                game_id = game_ids_by_event.get(outcome["event_id"])
+                if game_id is None:
+                    errors.append(f"No game row found for event {outcome['event_id']} (player {outcome_description})")
+                    continue
+
+                row = {
+                    "week_id": week_id,
+                    "game_id": game_id,
+                    "bookmaker": outcome["bookmaker"],
+                    "market": outcome["market"],
+                    "outcome_name": outcome["outcome_name"],
+                    "outcome_description": outcome_description,
+                    "playerDkId": player_obj.playerDkId,
+                    "outcome_price": outcome["outcome_price"],
+                    "outcome_point": outcome["outcome_point"],
+                    "outcome_likelihood": odds_service.calculate_outcome_likelihood(outcome["outcome_price"]),
+                    "updated_by": "API",
+                    "last_prop_update": outcome["last_prop_update"],
+                }
+                # Same prop listed twice in the feed; the later outcome wins
+                prop_rows[tuple(row[column] for column in PROP_UNIQUE_COLUMNS)] = row
+            except Exception as e:
+                errors.append(f"Failed to process outcome for event {outcome['event_id']}: {str(e)}")
+
+        if prop_rows:
+            # Counts reflect the rows actually written, not the outcomes in the feed
+            total_created, total_updated = bulk_upsert_counts(
+                db,
+                PlayerPropBet,
+                list(prop_rows.values()),
+                index_elements=PROP_UNIQUE_COLUMNS,
+                update_columns=PROP_UPDATE_COLUMNS,
+            )
+
         # Commit all changes
         db.commit()
 
+        # Keep the prop hit-rate aggregates in step with the week's props
+        try:
+            PlayerPropsScoringService(db).refresh_hit_rates([week_id])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️ Failed to refresh prop hit rates for week {week_id}: {e}")
+
         # Calculate duration
         end_time = time.perf_counter()
         duration_ms = int((end_time - start_time) * 1000)
 
         # Log activity using ActivityLoggingService
-        markets_param = ",".join(market_list)
         try:
             service = ActivityLoggingService(db)
             service.log_import_activity(
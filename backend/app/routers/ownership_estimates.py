@@ -4,6 +4,7 @@ from typing import List, Optional
 from app.database import get_db
 from app.models import OwnershipEstimate
 from app.schemas import OwnershipEstimate as OwnershipEstimateSchema, OwnershipEstimateCreate, OwnershipEstimateUpdate
+from app.services.weekly_summary_service import WeeklySummaryService
 from sqlalchemy import and_
 
 router = APIRouter(prefix="/api/ownership-estimates", tags=["ownership-estimates"])
@@ -55,6 +56,7 @@ def create_ownership_estimate(
     db_estimate = OwnershipEstimate(**estimate.dict())
     db.add(db_estimate)
     db.commit()
+    WeeklySummaryService.refresh_players(db, db_estimate.week_id, [db_estimate.playerDkId])
     db.refresh(db_estimate)
     return db_estimate
 
@@ -70,10 +72,15 @@ def update_ownership_estimate(
     if not estimate:
         raise HTTPException(status_code=404, detail="Ownership estimate not found")
     
+    previous_key = (estimate.week_id, estimate.playerDkId)
     for field, value in estimate_update.dict(exclude_unset=True).items():
         setattr(estimate, field, value)
     
     db.commit()
+    WeeklySummaryService.refresh_players(db, estimate.week_id, [estimate.playerDkId])
+    if previous_key != (estimate.week_id, estimate.playerDkId):
+        # The estimate moved to another player or week; the old summary row loses it
+        WeeklySummaryService.refresh_players(db, previous_key[0], [previous_key[1]])
     db.refresh(estimate)
     return estimate
 
@@ -88,8 +95,10 @@ def delete_ownership_estimate(
     if not estimate:
         raise HTTPException(status_code=404, detail="Ownership estimate not found")
     
+    week_id, player_dk_id = estimate.week_id, estimate.playerDkId
     db.delete(estimate)
     db.commit()
+    WeeklySummaryService.refresh_players(db, week_id, [player_dk_id])
     return {"message": "Ownership estimate deleted successfully"}
 
 @router.get("/week/{week_id}/player/{player_id}", response_model=List[OwnershipEstimateSchema])
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, select
 from typing import List, Optional
 import uuid
 
@@ -15,6 +15,8 @@ from app.schemas import (
     ProjectionsVsActualsResponse, ProjectionsVsActualsData
 )
 from typing import Dict, Any
+from app.services.weekly_summary_service import WeeklySummaryService
+from app.services.cache_service import player_game_log_cache
 
 router = APIRouter()
 
@@ -779,6 +781,13 @@ def create_bulk_player_pool_entries(
     
     db.commit()
     
+    # Salary/OPRK may have changed, so recompute summary rows for the touched players
+    touched_by_week: Dict[int, set] = {}
+    for entry in entries:
+        touched_by_week.setdefault(entry.week_id, set()).add(entry.playerDkId)
+    for week_id, player_dk_ids in touched_by_week.items():
+        WeeklySummaryService.refresh_players(db, week_id, player_dk_ids)
+    
     # Refresh all entries to get updated data
     for entry in created_entries:
         db.refresh(entry)
@@ -888,159 +897,155 @@ async def get_player_game_log(
     year: int, 
     db: Session = Depends(get_db)
 ):
-    """Get player's game log for a specific year with fantasy points, salary, and game details"""
+    """
+    Get player's game log for a specific year with fantasy points, salary, and game details
+    
+    The season is loaded with one query joining completed weeks to the player's actuals,
+    game, opponent, salary and weekly summary (OPRK). Results are cached per
+    (player, year) until actuals for that year are imported.
+    """
+    cached = player_game_log_cache.get(player_id, year)
+    if cached is not None:
+        return cached
     
     # Verify player exists
     player = db.query(Player).filter(Player.playerDkId == player_id).first()
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     
-    # Get completed weeks for the year
-    weeks = db.query(Week).filter(
+    opponent_alias = aliased(Team)
+    team_id = select(Team.id).where(Team.abbreviation == player.team).scalar_subquery()
+    # First pool entry of the week, as the per-week lookup returned
+    salary = select(PlayerPoolEntry.salary).where(
+        and_(
+            PlayerPoolEntry.playerDkId == player_id,
+            PlayerPoolEntry.week_id == Week.id
+        )
+    ).order_by(PlayerPoolEntry.id).limit(1).correlate(Week).scalar_subquery()
+    
+    rows = db.query(
+        Week.week_number,
+        PlayerActuals,
+        Game,
+        opponent_alias.abbreviation.label('opponent'),
+        salary.label('salary'),
+        WeeklyPlayerSummary.oprk_value,
+        WeeklyPlayerSummary.oprk_quality
+    ).select_from(Week).outerjoin(
+        PlayerActuals, and_(PlayerActuals.week_id == Week.id, PlayerActuals.playerDkId == player_id)
+    ).outerjoin(
+        Game, and_(Game.week_id == Week.id, Game.team_id == team_id)
+    ).outerjoin(
+        opponent_alias, Game.opponent_team_id == opponent_alias.id
+    ).outerjoin(
+        WeeklyPlayerSummary, and_(WeeklyPlayerSummary.week_id == Week.id, WeeklyPlayerSummary.playerDkId == player_id)
+    ).filter(
         and_(
             Week.year == year,
             Week.status == "Completed"
         )
     ).order_by(Week.week_number.desc()).all()
     
-    if not weeks:
+    if not rows:
         return {"game_log": [], "year": year, "player": player.displayName}
     
-    # Create aliases for team joins
-    team_alias = aliased(Team)
-    opponent_alias = aliased(Team)
+    game_log = [_game_log_entry(player, row) for row in rows]
     
-    game_log = []
+    response = {
+        "game_log": game_log,
+        "year": year,
+        "player": player.displayName,
+        "position": player.position
+    }
+    player_game_log_cache.set(player_id, year, response)
+    return response
+
+def _game_log_entry(player: Player, row) -> Dict[str, Any]:
+    """Game log entry for one week of get_player_game_log"""
+    actuals = row.PlayerActuals
+    game_obj = row.Game
+    
+    # Build game log entry
+    game_log_entry = {
+        "week": row.week_number,
+        "fantasy_points": actuals.dk_actuals if actuals else 0,
+        "salary": row.salary or 0,
+        "opponent": None,
+        "home_or_away": None,
+        "result": None,
+        "oprk": {
+            "value": row.oprk_value,
+            "quality": row.oprk_quality
+        },
+        "passing": None,
+        "rushing": None,
+        "receiving": None
+    }
     
-    for week in weeks:
-        # Get player actuals for this week
-        actuals = db.query(PlayerActuals).filter(
-            and_(
-                PlayerActuals.playerDkId == player_id,
-                PlayerActuals.week_id == week.id
-            )
-        ).first()
-        
-        # Get game data for this week
-        game = db.query(Game, team_alias, opponent_alias).join(
-            team_alias, Game.team_id == team_alias.id
-        ).outerjoin(
-            opponent_alias, Game.opponent_team_id == opponent_alias.id
-        ).filter(
-            and_(
-                Game.week_id == week.id,
-                team_alias.abbreviation == player.team
-            )
-        ).first()
-        
-        # Get salary from player pool entry
-        pool_entry = db.query(PlayerPoolEntry).filter(
-            and_(
-                PlayerPoolEntry.playerDkId == player_id,
-                PlayerPoolEntry.week_id == week.id
-            )
-        ).first()
+    # Add game details if available
+    if game_obj:
+        game_log_entry["opponent"] = row.opponent or "BYE"
+        game_log_entry["home_or_away"] = game_obj.homeoraway
         
-        # Extract OPRK from draftStatAttributes
-        oprk_value = None
-        oprk_quality = None
-        if pool_entry and pool_entry.draftStatAttributes:
-            draft_stats = pool_entry.draftStatAttributes
-            if isinstance(draft_stats, list):
-                oprk_attr = next((attr for attr in draft_stats if attr.get('id') == -2), None)
-                if oprk_attr:
-                    oprk_value = oprk_attr.get('value')
-                    oprk_quality = oprk_attr.get('quality')
-        
-        # Build game log entry
-        game_log_entry = {
-            "week": week.week_number,
-            "fantasy_points": actuals.dk_actuals if actuals else 0,
-            "salary": pool_entry.salary if pool_entry else 0,
-            "opponent": None,
-            "home_or_away": None,
-            "result": None,
-            "oprk": {
-                "value": oprk_value,
-                "quality": oprk_quality
-            },
-            "passing": None,
-            "rushing": None,
-            "receiving": None
-        }
-        
-        # Add game details if available
-        if game:
-            game_obj, team, opponent = game
-            game_log_entry["opponent"] = opponent.abbreviation if opponent else "BYE"
-            game_log_entry["home_or_away"] = game_obj.homeoraway
+        # Determine result based on actual game scores
+        if game_obj.away_score is not None and game_obj.home_score is not None:
+            # Determine if this team won or lost
+            if game_obj.homeoraway == 'H':
+                # Home team
+                team_score = game_obj.home_score
+                opponent_score = game_obj.away_score
+            elif game_obj.homeoraway == 'A':
+                # Away team
+                team_score = game_obj.away_score
+                opponent_score = game_obj.home_score
+            else:
+                # Neutral site - use the scores as they are stored
+                team_score = game_obj.home_score if game_obj.homeoraway == 'H' else game_obj.away_score
+                opponent_score = game_obj.away_score if game_obj.homeoraway == 'H' else game_obj.home_score
             
-            # Determine result based on actual game scores
-            if game_obj.away_score is not None and game_obj.home_score is not None:
-                # Determine if this team won or lost
-                if game_obj.homeoraway == 'H':
-                    # Home team
-                    team_score = game_obj.home_score
-                    opponent_score = game_obj.away_score
-                elif game_obj.homeoraway == 'A':
-                    # Away team
-                    team_score = game_obj.away_score
-                    opponent_score = game_obj.home_score
-                else:
-                    # Neutral site - use the scores as they are stored
-                    team_score = game_obj.home_score if game_obj.homeoraway == 'H' else game_obj.away_score
-                    opponent_score = game_obj.away_score if game_obj.homeoraway == 'H' else game_obj.home_score
-                
-                # Determine win/loss and format result
-                if team_score > opponent_score:
-                    result = f"W {team_score}-{opponent_score}"
-                elif team_score < opponent_score:
-                    result = f"L {team_score}-{opponent_score}"
-                else:
-                    result = f"T {team_score}-{opponent_score}"
-                
-                game_log_entry["result"] = result
+            # Determine win/loss and format result
+            if team_score > opponent_score:
+                result = f"W {team_score}-{opponent_score}"
+            elif team_score < opponent_score:
+                result = f"L {team_score}-{opponent_score}"
             else:
-                # No score data available yet
-                game_log_entry["result"] = "NA"
-        
-        # Add actuals data if available
-        if actuals:
-            # Passing stats (for QBs)
-            if player.position == "QB":
-                game_log_entry["passing"] = {
-                    "completions": actuals.completions or 0,
-                    "attempts": actuals.attempts or 0,
-                    "yards": actuals.pass_yds or 0,
-                    "touchdowns": actuals.pass_tds or 0,
-                    "interceptions": actuals.interceptions or 0
-                }
+                result = f"T {team_score}-{opponent_score}"
             
-            # Rushing stats (for all positions)
-            game_log_entry["rushing"] = {
-                "attempts": actuals.rush_att or 0,
-                "yards": actuals.rush_yds or 0,
-                "touchdowns": actuals.rush_tds or 0,
-                "fumbles": actuals.fumbles_lost or 0
+            game_log_entry["result"] = result
+        else:
+            # No score data available yet
+            game_log_entry["result"] = "NA"
+    
+    # Add actuals data if available
+    if actuals:
+        # Passing stats (for QBs)
+        if player.position == "QB":
+            game_log_entry["passing"] = {
+                "completions": actuals.completions or 0,
+                "attempts": actuals.attempts or 0,
+                "yards": actuals.pass_yds or 0,
+                "touchdowns": actuals.pass_tds or 0,
+                "interceptions": actuals.interceptions or 0
             }
-            
-            # Receiving stats (for RB, WR, TE)
-            if player.position in ["RB", "WR", "TE"]:
-                game_log_entry["receiving"] = {
-                    "targets": actuals.rec_tgt or 0,
-                    "receptions": actuals.receptions or 0,
-                    "yards": actuals.rec_yds or 0,
-                    "touchdowns": actuals.rec_tds or 0
-                }
         
-        game_log.append(game_log_entry)
+        # Rushing stats (for all positions)
+        game_log_entry["rushing"] = {
+            "attempts": actuals.rush_att or 0,
+            "yards": actuals.rush_yds or 0,
+            "touchdowns": actuals.rush_tds or 0,
+            "fumbles": actuals.fumbles_lost or 0
+        }
+        
+        # Receiving stats (for RB, WR, TE)
+        if player.position in ["RB", "WR", "TE"]:
+            game_log_entry["receiving"] = {
+                "targets": actuals.rec_tgt or 0,
+                "receptions": actuals.receptions or 0,
+                "yards": actuals.rec_yds or 0,
+                "touchdowns": actuals.rec_tds or 0
+            }
     
-    return {
-        "game_log": game_log,
-        "year": year,
-        "player": player.displayName,
-        "position": player.position
-    }
+    return game_log_entry
 
 @router.get("/{player_id}/projections-vs-actuals", response_model=ProjectionsVsActualsResponse)
 async def get_player_projections_vs_actuals(
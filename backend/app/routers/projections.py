@@ -5,8 +5,8 @@ Handles API endpoints for importing player projections from CSV files
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from typing import List, Dict, Any
+from sqlalchemy import and_, bindparam, func, or_, update, insert
+from typing import List, Dict, Any, Iterable, Iterator, TextIO, Tuple
 import csv
 import io
 import json
@@ -20,10 +20,14 @@ from app.models import Player, Team, PlayerPoolEntry, Week, Projection, PlayerNa
 from app.schemas import ProjectionImportRequest, ProjectionImportResponse, ProjectionCreate
 from app.services.activity_logging import ActivityLoggingService
 from app.services.weekly_summary_service import WeeklySummaryService
+from app.utils.bulk_upsert import bulk_upsert
 from app.utils.name_normalization import normalize_for_matching
 
 router = APIRouter(prefix="/api/projections", tags=["projections"])
 
+# Rows per name-resolution batch and per bulk write statement during CSV imports
+IMPORT_CHUNK_SIZE = 500
+
 # File logger for import debug
 _log_file = Path(__file__).resolve().parents[2] / "server.log"
 _logger = logging.getLogger("projection_import_debug")
@@ -87,19 +91,12 @@ async def import_projections(
     if not week:
         raise HTTPException(status_code=404, detail=f"Week {week_id} not found")
     
-    # Read CSV content
+    # Stream the CSV straight from the spooled upload instead of reading it into memory
+    csv_stream = io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')
     try:
-        content = await file.read()
-        csv_text = content.decode('utf-8')
-        print(f"DEBUG: CSV file read successfully, size: {len(csv_text)} characters")
-        print(f"DEBUG: First 200 characters: {csv_text[:200]}")
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
-    
-    # Parse CSV
-    try:
-        csv_data = parse_csv_data(csv_text, projection_source)
+        csv_data = iter_projection_rows(csv_stream, projection_source)
     except Exception as e:
+        csv_stream.detach()
         raise HTTPException(status_code=400, detail=f"Error parsing CSV: {str(e)}")
     
     # Process projections
@@ -115,6 +112,10 @@ async def import_projections(
         log_import_activity(db, week_id, file.filename, result, projection_source, duration_ms=duration_ms, client_ip=client_ip, user_agent=user_agent)
         
         return result
+    except (ValueError, UnicodeDecodeError) as e:
+        # Malformed rows surface while the stream is being consumed
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Error parsing CSV: {str(e)}")
     except Exception as e:
         # Calculate duration even for failed imports
         end_time = time.perf_counter()
@@ -146,6 +147,8 @@ async def import_projections(
             print(f"⚠️ Failed to log error activity: {log_error}")
         
         raise HTTPException(status_code=500, detail=f"Error processing projections: {str(e)}")
+    finally:
+        csv_stream.detach()
 
 @router.post("/import-ownership", response_model=ProjectionImportResponse)
 async def import_ownership_projections(
@@ -175,19 +178,12 @@ async def import_ownership_projections(
     if not week:
         raise HTTPException(status_code=404, detail=f"Week {week_id} not found")
     
-    # Read CSV content
+    # Stream the CSV straight from the spooled upload; utf-8-sig handles a BOM
+    csv_stream = io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')
     try:
-        content = await file.read()
-        csv_text = content.decode('utf-8-sig')  # Handle BOM
-        print(f"DEBUG: CSV file read successfully, size: {len(csv_text)} characters")
-        print(f"DEBUG: First 200 characters: {csv_text[:200]}")
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
-    
-    # Parse CSV
-    try:
-        csv_data = parse_ownership_csv_data(csv_text, projection_source)
+        csv_data = iter_ownership_rows(csv_stream, projection_source)
     except Exception as e:
+        csv_stream.detach()
         raise HTTPException(status_code=400, detail=f"Error parsing CSV: {str(e)}")
     
     # Process ownership projections
@@ -203,6 +199,10 @@ async def import_ownership_projections(
         log_import_activity(db, week_id, file.filename, result, projection_source, is_ownership=True, duration_ms=duration_ms, client_ip=client_ip, user_agent=user_agent)
         
         return result
+    except (ValueError, UnicodeDecodeError) as e:
+        # Malformed rows surface while the stream is being consumed
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Error parsing CSV: {str(e)}")
     except Exception as e:
         # Calculate duration even for failed imports
         end_time = time.perf_counter()
@@ -234,10 +234,23 @@ async def import_ownership_projections(
             print(f"⚠️ Failed to log error activity: {log_error}")
         
         raise HTTPException(status_code=500, detail=f"Error processing ownership projections: {str(e)}")
+    finally:
+        csv_stream.detach()
 
 def parse_csv_data(csv_text: str, projection_source: str) -> List[Dict[str, Any]]:
     """Parse CSV using DictReader and map only the required columns robustly."""
-    reader = csv.DictReader(io.StringIO(csv_text))
+    players = list(iter_projection_rows(io.StringIO(csv_text), projection_source))
+    _logger.debug(f"Successfully parsed {len(players)} players from CSV (DictReader)")
+    if len(players) > 0:
+        _logger.debug(f"First player example: {players[0]}")
+    return players
+
+def iter_projection_rows(stream: TextIO, projection_source: str) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse a projections CSV stream, yielding one player dict per row.
+    The header is validated immediately; rows are read lazily as the caller iterates.
+    """
+    reader = csv.DictReader(stream)
     if not reader.fieldnames:
         raise ValueError("CSV has no header row")
 
@@ -252,7 +265,9 @@ def parse_csv_data(csv_text: str, projection_source: str) -> List[Dict[str, Any]
                 return (row.get(real) or '').strip()
         return ''
 
-    players: List[Dict[str, Any]] = []
+    return _projection_rows(reader, get_val, projection_source)
+
+def _projection_rows(reader: csv.DictReader, get_val, projection_source: str) -> Iterator[Dict[str, Any]]:
     for i, row in enumerate(reader, start=1):
         name = get_val(row, ['player'])
         position = get_val(row, ['pos', 'position']).upper()
@@ -305,14 +320,7 @@ def parse_csv_data(csv_text: str, projection_source: str) -> List[Dict[str, Any]
             print(f"DEBUG: {msg}")
             _logger.debug(msg)
 
-        players.append(player)
-
-    print(f"DEBUG: Successfully parsed {len(players)} players from CSV (DictReader)")
-    _logger.debug(f"Successfully parsed {len(players)} players from CSV (DictReader)")
-    if len(players) > 0:
-        print(f"DEBUG: First player example: {players[0]}")
-        _logger.debug(f"First player example: {players[0]}")
-    return players
+        yield player
 
 def find_column_index(headers: List[str], possible_names: List[str]) -> int:
     """Find the index of a column by checking multiple possible names"""
@@ -483,6 +491,14 @@ def find_player_match(db: Session, name: str, team: str, position: str) -> tuple
             for p in exact_normalized_no_team_list
         ]
 
+    return _find_fuzzy_player_match(db, name, team, position)
+
+def _find_fuzzy_player_match(db: Session, name: str, team: str, position: str) -> tuple[Player | None, str, list[dict]]:
+    """Matching steps 5-10 of find_player_match, used once exact name matches have failed."""
+    position_upper = position.upper()
+    team_upper = (team or '').upper()
+    name_normalized = normalize_for_matching(name)
+
     # 5. Partial canonical match with name and position
     partial_canonical_list = db.query(Player).filter(
         and_(
@@ -633,6 +649,81 @@ def find_player_match(db: Session, name: str, team: str, position: str) -> tuple
 
     return None, 'none', []
 
+def _candidate_dicts(players: List[Player]) -> list[dict]:
+    return [
+        {
+            'playerDkId': p.playerDkId,
+            'name': p.displayName,
+            'position': p.position,
+            'team': p.team,
+        }
+        for p in players
+    ]
+
+def resolve_player_matches(db: Session, keys: Iterable[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], tuple[Player | None, str, list[dict]]]:
+    """
+    Resolve a batch of (name, team, position) keys with the same rules as find_player_match.
+
+    Exact canonical/normalized matches (steps 1-4) are answered from a single IN query for the
+    whole batch; only names that miss there fall back to the per-name fuzzy steps.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+
+    lowered = {name.lower() for name, _, _ in keys}
+    normalized = {normalize_for_matching(name) for name, _, _ in keys}
+    candidates = db.query(Player).filter(
+        or_(
+            func.lower(Player.displayName).in_(lowered),
+            Player.normalized_display_name.in_(normalized),
+        )
+    ).order_by(Player.playerDkId).all()
+
+    by_display: Dict[str, List[Player]] = {}
+    by_normalized: Dict[str, List[Player]] = {}
+    for p in candidates:
+        if p.displayName:
+            by_display.setdefault(p.displayName.lower(), []).append(p)
+        if p.normalized_display_name:
+            by_normalized.setdefault(p.normalized_display_name, []).append(p)
+
+    results = {}
+    for key in keys:
+        name, team, position = key
+        position_upper = position.upper()
+        team_upper = (team or '').upper()
+
+        def _filter(players: List[Player], with_team: bool) -> List[Player]:
+            return [
+                p for p in players
+                if (p.position or '').upper() == position_upper
+                and (not with_team or (p.team or '').upper() == team_upper)
+            ]
+
+        # Steps 1-4 of find_player_match, in the same order
+        steps = []
+        display_players = by_display.get(name.lower(), [])
+        normalized_players = by_normalized.get(normalize_for_matching(name), [])
+        if team_upper:
+            steps.append((_filter(display_players, True), 'exact', 'ambiguous_exact_with_team'))
+        steps.append((_filter(display_players, False), 'exact_no_team', 'ambiguous_exact_no_team'))
+        if team_upper:
+            steps.append((_filter(normalized_players, True), 'exact_normalized', 'ambiguous_exact_normalized_with_team'))
+        steps.append((_filter(normalized_players, False), 'exact_normalized_no_team', 'ambiguous_exact_normalized_no_team'))
+
+        for matches, confidence, ambiguous_confidence in steps:
+            if len(matches) == 1:
+                results[key] = (matches[0], confidence, [])
+                break
+            if len(matches) > 1:
+                results[key] = (None, ambiguous_confidence, _candidate_dicts(matches))
+                break
+        else:
+            results[key] = _find_fuzzy_player_match(db, name, team, position)
+
+    return results
+
 def process_matched_players(db: Session, week_id: int, projection_source: str, matched_players: List[Dict[str, Any]]) -> ProjectionImportResponse:
     """Process pre-matched players directly"""
     total_processed = len(matched_players)
@@ -777,6 +868,9 @@ def process_matched_players(db: Session, week_id: int, projection_source: str, m
     
     print(f"DEBUG: Import complete - Created: {projections_created}, Updated: {projections_updated}, Pool updated: {player_pool_updated}")
     
+    # Only the players in this import need their summary rows recomputed
+    refresh_weekly_summary(db, week_id, processed_players, errors)
+    
     return ProjectionImportResponse(
         total_processed=total_processed,
         successful_matches=successful_matches,
@@ -788,9 +882,57 @@ def process_matched_players(db: Session, week_id: int, projection_source: str, m
         unmatched_players=unmatched_players
     )
 
-def process_projections(db: Session, week_id: int, projection_source: str, csv_data: List[Dict[str, Any]]) -> ProjectionImportResponse:
-    """Process projections and update database"""
-    total_processed = len(csv_data)
+def _iter_chunks(rows: Iterable[Dict[str, Any]], size: int = IMPORT_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Group a (possibly lazy) row iterable into lists of at most size rows."""
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _update_pool_entries(db: Session, week_id: int, updates: Dict[int, Dict[str, Any]]) -> int:
+    """
+    Apply per-player column values to every pool entry of the week with one executemany UPDATE.
+    A None value keeps the existing column value. Returns the number of pool entries touched.
+    """
+    if not updates:
+        return 0
+
+    table = PlayerPoolEntry.__table__
+    columns = list(next(iter(updates.values())).keys())
+    stmt = update(table).where(
+        and_(
+            table.c.week_id == bindparam('_week_id'),
+            table.c.playerDkId == bindparam('_player_dk_id'),
+        )
+    ).values({
+        column: func.coalesce(bindparam(f'_{column}', type_=table.c[column].type), table.c[column])
+        for column in columns
+    })
+    db.execute(stmt, [
+        {'_week_id': week_id, '_player_dk_id': player_dk_id, **{f'_{c}': values.get(c) for c in columns}}
+        for player_dk_id, values in updates.items()
+    ])
+
+    return db.query(func.count(PlayerPoolEntry.id)).filter(
+        and_(
+            PlayerPoolEntry.week_id == week_id,
+            PlayerPoolEntry.playerDkId.in_(list(updates.keys()))
+        )
+    ).scalar() or 0
+
+def process_projections(db: Session, week_id: int, projection_source: str, csv_data: Iterable[Dict[str, Any]]) -> ProjectionImportResponse:
+    """
+    Process projections and update database
+
+    Rows are consumed in chunks so memory stays bounded for large files: each chunk's names
+    are resolved in one batch, projections are written with one INSERT ... ON CONFLICT and the
+    matching pool entries with one executemany UPDATE.
+    """
+    total_processed = 0
     successful_matches = 0
     failed_matches = 0
     projections_created = 0
@@ -798,25 +940,23 @@ def process_projections(db: Session, week_id: int, projection_source: str, csv_d
     player_pool_updated = 0
     errors = []
     unmatched_players = []
+    touched_player_ids = set()
     
-    print(f"DEBUG: Processing {total_processed} players for week {week_id}")
+    _logger.debug(f"Processing projections for week {week_id} in chunks of {IMPORT_CHUNK_SIZE}")
     
-    for i, player_data in enumerate(csv_data):
-        try:
-            # Find matching player
-            matched_player, match_confidence, candidates = find_player_match(
-                db,
-                player_data['name'],
-                player_data.get('team', ''),
-                player_data['position']
-            )
-            
-            if i < 3:  # Debug first 3 players
-                print(f"DEBUG: Player {i+1}: {player_data['name']} ({player_data['team']}, {player_data['position']}) -> {match_confidence}")
-                if matched_player:
-                    print(f"DEBUG: Matched to: {matched_player.displayName} ({matched_player.team}, {matched_player.position})")
-                else:
-                    print(f"DEBUG: No match found")
+    for chunk in _iter_chunks(csv_data, IMPORT_CHUNK_SIZE):
+        total_processed += len(chunk)
+        matches = resolve_player_matches(
+            db, [(row['name'], row.get('team', ''), row['position']) for row in chunk]
+        )
+        
+        # Last row wins when a player appears more than once, same as sequential updates
+        matched_rows: Dict[int, Dict[str, Any]] = {}
+        duplicate_rows = 0
+        for player_data in chunk:
+            matched_player, match_confidence, candidates = matches[
+                (player_data['name'], player_data.get('team', ''), player_data['position'])
+            ]
             
             if match_confidence.startswith('ambiguous'):
                 failed_matches += 1
@@ -837,75 +977,64 @@ def process_projections(db: Session, week_id: int, projection_source: str, csv_d
                 continue
             
             successful_matches += 1
-            
-            # Create or update projection
-            existing_projection = db.query(Projection).filter(
-                and_(
-                    Projection.week_id == week_id,
-                    Projection.playerDkId == matched_player.playerDkId,
-                    Projection.source == projection_source
-                )
-            ).first()
-            
-            # Minimal mapping per spec: map Projections -> pprProjections and include Actuals
-            projection_data = {
-                'week_id': week_id,
-                'playerDkId': matched_player.playerDkId,
-                'position': player_data['position'],
-                'pprProjections': player_data.get('pprProjections'),
-                'actuals': player_data.get('actuals'),
-                'source': projection_source,
-            }
-            
-            if existing_projection:
-                if i < 3:
-                    msg = (
-                        f"Upsert(existing) {matched_player.displayName} src='{projection_source}' prev_ppr={getattr(existing_projection, 'pprProjections', None)} new_ppr={projection_data['pprProjections']}"
-                    )
-                    print(f"DEBUG: {msg}")
-                    _logger.debug(msg)
-                # Update only position, pprProjections, and actuals
-                existing_projection.position = projection_data['position']
-                existing_projection.pprProjections = projection_data['pprProjections']
-                if projection_data.get('actuals') is not None:
-                    try:
-                        existing_projection.actuals = float(projection_data['actuals'])
-                    except Exception:
-                        pass
-                # Explicitly set updated_at timestamp
-                existing_projection.updated_at = datetime.utcnow()
-                projections_updated += 1
-            else:
-                # Create new projection with minimal fields
-                if i < 3:
-                    msg = (
-                        f"Upsert(create) {matched_player.displayName} src='{projection_source}' new_ppr={projection_data['pprProjections']}"
-                    )
-                    print(f"DEBUG: {msg}")
-                    _logger.debug(msg)
-                new_projection = Projection(**projection_data)
-                db.add(new_projection)
-                projections_created += 1
-            
-            # Update ALL player pool entries for this player in this week
-            pool_entries = db.query(PlayerPoolEntry).filter(
-                and_(
-                    PlayerPoolEntry.week_id == week_id,
-                    PlayerPoolEntry.playerDkId == matched_player.playerDkId
+            if matched_player.playerDkId in matched_rows:
+                duplicate_rows += 1
+            matched_rows[matched_player.playerDkId] = player_data
+        
+        if not matched_rows:
+            continue
+        
+        player_ids = list(matched_rows.keys())
+        try:
+            with db.begin_nested():
+                existing_ids = {
+                    pid for (pid,) in db.query(Projection.playerDkId).filter(
+                        and_(
+                            Projection.week_id == week_id,
+                            Projection.source == projection_source,
+                            Projection.playerDkId.in_(player_ids)
+                        )
+                    ).all()
+                }
+                
+                # Minimal mapping per spec: map Projections -> pprProjections and include Actuals
+                bulk_upsert(
+                    db,
+                    Projection,
+                    [
+                        {
+                            'week_id': week_id,
+                            'playerDkId': pid,
+                            'position': row['position'],
+                            'pprProjections': row.get('pprProjections'),
+                            'actuals': _safe_float(row.get('actuals')),
+                            'source': projection_source,
+                        }
+                        for pid, row in matched_rows.items()
+                    ],
+                    index_elements=['week_id', 'playerDkId', 'source'],
+                    update_columns=['position', 'pprProjections', 'actuals'],
                 )
-            ).all()
-            
-            for pool_entry in pool_entries:
-                pool_entry.projectedPoints = player_data['selected_projection']
-                try:
-                    pool_entry.actuals = float(player_data.get('actuals')) if player_data.get('actuals') is not None else pool_entry.actuals
-                except Exception:
-                    pass
-                player_pool_updated += 1
-            
+                
+                # Update ALL player pool entries for these players in this week
+                player_pool_updated += _update_pool_entries(db, week_id, {
+                    pid: {
+                        'projectedPoints': row['selected_projection'],
+                        'actuals': _safe_float(row.get('actuals')),
+                    }
+                    for pid, row in matched_rows.items()
+                })
         except Exception as e:
-            errors.append(f"Error processing {player_data['name']}: {str(e)}")
-            failed_matches += 1
+            errors.append(f"Error processing rows {total_processed - len(chunk) + 1}-{total_processed}: {str(e)}")
+            failed_matches += len(matched_rows) + duplicate_rows
+            successful_matches -= len(matched_rows) + duplicate_rows
+            continue
+        
+        created = len(player_ids) - len(existing_ids)
+        projections_created += created
+        projections_updated += len(existing_ids) + duplicate_rows
+        touched_player_ids.update(player_ids)
+        _logger.debug(f"Chunk done - {total_processed} rows read, {projections_created} created, {projections_updated} updated")
     
     # Commit all changes
     try:
@@ -914,6 +1043,8 @@ def process_projections(db: Session, week_id: int, projection_source: str, csv_d
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     
+    refresh_weekly_summary(db, week_id, touched_player_ids, errors)
+    
     return ProjectionImportResponse(
         total_processed=total_processed,
         successful_matches=successful_matches,
@@ -925,6 +1056,19 @@ def process_projections(db: Session, week_id: int, projection_source: str, csv_d
         unmatched_players=unmatched_players
     )
 
+def refresh_weekly_summary(db: Session, week_id: int, player_dk_ids: set, errors: List[str]) -> None:
+    """Recompute weekly summary rows for the players an import touched"""
+    if not player_dk_ids:
+        return
+    try:
+        count = WeeklySummaryService.refresh_players(db, week_id, player_dk_ids)
+        _logger.debug(f"Weekly summary refreshed for {count} players")
+    except Exception as e:
+        db.rollback()
+        _logger.warning(f"Weekly summary update failed: {str(e)}")
+        # Don't fail the entire import if weekly summary update fails
+        errors.append(f"Weekly summary update failed: {str(e)}")
+
 def log_import_activity(db: Session, week_id: int, filename: str, result: ProjectionImportResponse, projection_source: str = "Custom Projections", is_ownership: bool = False, duration_ms: int = None, client_ip: str = None, user_agent: str = None):
     """Log import activity to recent_activity table using ActivityLoggingService"""
     try:
@@ -1004,7 +1148,16 @@ async def get_recent_activity(limit: int = 20, db: Session = Depends(get_db)):
 
 def parse_ownership_csv_data(csv_text: str, projection_source: str) -> List[Dict[str, Any]]:
     """Parse ownership CSV data, extracting only PLAYER and RST% columns"""
-    reader = csv.DictReader(io.StringIO(csv_text))
+    players = list(iter_ownership_rows(io.StringIO(csv_text), projection_source))
+    _logger.debug(f"Parsed {len(players)} ownership records")
+    return players
+
+def iter_ownership_rows(stream: TextIO, projection_source: str) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse an ownership CSV stream (PLAYER and RST% columns), yielding one dict per row.
+    The header is validated immediately; rows are read lazily as the caller iterates.
+    """
+    reader = csv.DictReader(stream)
     if not reader.fieldnames:
         raise ValueError("CSV has no header row")
 
@@ -1031,7 +1184,9 @@ def parse_ownership_csv_data(csv_text: str, projection_source: str) -> List[Dict
                     return (row.get(original_header) or '').strip()
         return ''
 
-    players: List[Dict[str, Any]] = []
+    return _ownership_rows(reader, get_val, projection_source)
+
+def _ownership_rows(reader: csv.DictReader, get_val, projection_source: str) -> Iterator[Dict[str, Any]]:
     for i, row in enumerate(reader, start=1):
         name = get_val(row, ['player', 'PLAYER'])
         position = get_val(row, ['pos', 'POS', 'position', 'POSITION'])
@@ -1064,103 +1219,51 @@ def parse_ownership_csv_data(csv_text: str, projection_source: str) -> List[Dict
             print(f"DEBUG: Skipping row {i+1} - invalid ownership value '{ownership_raw}' for {name}")
             continue
 
-        players.append({
+        yield {
             'name': name,
             'position': position,
             'team': team,
             'ownership': ownership,
             'source': projection_source
-        })
+        }
 
-    print(f"DEBUG: Parsed {len(players)} ownership records")
-    return players
+def process_ownership_projections(db: Session, week_id: int, projection_source: str, csv_data: Iterable[Dict[str, Any]]) -> ProjectionImportResponse:
+    """
+    Process ownership projections and update player_pool_entries table
 
-def process_ownership_projections(db: Session, week_id: int, projection_source: str, csv_data: List[Dict[str, Any]]) -> ProjectionImportResponse:
-    """Process ownership projections and update player_pool_entries table"""
+    Rows are consumed in chunks: names are resolved per batch, estimates are written with one
+    bulk UPDATE and one bulk INSERT per chunk, and pool entry ownership with one executemany UPDATE.
+    """
     
-    total_processed = len(csv_data)
+    total_processed = 0
     successful_matches = 0
     failed_matches = 0
     ownership_updated = 0
     ownership_created = 0
     errors = []
     unmatched_players = []
+    touched_player_ids = set()
 
-    print(f"DEBUG: Processing {total_processed} ownership records for week {week_id}")
+    _logger.debug(f"Processing ownership records for week {week_id} in chunks of {IMPORT_CHUNK_SIZE}")
+
+    for chunk in _iter_chunks(csv_data, IMPORT_CHUNK_SIZE):
+        total_processed += len(chunk)
+        matches = resolve_player_matches(
+            db, [(row['name'], row.get('team', ''), row.get('position', '')) for row in chunk]
+        )
+
+        matched_rows: Dict[int, Dict[str, Any]] = {}
+        duplicate_rows = 0
+        for player_data in chunk:
+            matched_player, confidence, possible_matches = matches[
+                (player_data['name'], player_data.get('team', ''), player_data.get('position', ''))
+            ]
 
-    for i, player_data in enumerate(csv_data):
-        try:
-            # Use existing player matching service with team and position context
-            matched_player, confidence, possible_matches = find_player_match(
-                db, player_data['name'], player_data.get('team', ''), player_data.get('position', '')
-            )
-            
-            if i < 3:  # Debug first few matches
-                print(f"DEBUG: Matching '{player_data['name']}' ({player_data.get('team', '')}, {player_data.get('position', '')}) -> {confidence}")
-                if matched_player:
-                    print(f"DEBUG: Matched to {matched_player.displayName} ({matched_player.team}, {matched_player.position})")
-                else:
-                    print(f"DEBUG: No match found")
-                    if possible_matches:
-                        print(f"DEBUG: Possible matches: {[m['name'] for m in possible_matches]}")
-            
             if matched_player:
                 successful_matches += 1
-                
-                try:
-                    # Create ownership estimate instead of updating pool entry
-                    ownership_estimate = OwnershipEstimate(
-                        week_id=week_id,
-                        playerDkId=matched_player.playerDkId,
-                        source=projection_source,
-                        ownership=player_data['ownership'],
-                        draftGroup=None  # Not slate-specific
-                    )
-                    
-                    # Upsert ownership estimate
-                    existing_estimate = db.query(OwnershipEstimate).filter(
-                        and_(
-                            OwnershipEstimate.week_id == week_id,
-                            OwnershipEstimate.playerDkId == matched_player.playerDkId,
-                            OwnershipEstimate.source == projection_source,
-                            OwnershipEstimate.draftGroup.is_(None)
-                        )
-                    ).first()
-                    
-                    if existing_estimate:
-                        existing_estimate.ownership = player_data['ownership']
-                        ownership_updated += 1
-                        
-                        if i < 3:
-                            print(f"DEBUG: Updated ownership estimate for {matched_player.displayName}: {player_data['ownership']}%")
-                    else:
-                        db.add(ownership_estimate)
-                        ownership_created += 1
-                        
-                        if i < 3:
-                            print(f"DEBUG: Created new ownership estimate for {matched_player.displayName}: {player_data['ownership']}%")
-                    
-                    # Update player_pool_entries.ownership for all slates this week
-                    pool_entries = db.query(PlayerPoolEntry).filter(
-                        and_(
-                            PlayerPoolEntry.week_id == week_id,
-                            PlayerPoolEntry.playerDkId == matched_player.playerDkId
-                        )
-                    ).all()
-                    
-                    for pool_entry in pool_entries:
-                        pool_entry.ownership = player_data['ownership']
-                    
-                    if i < 3 and pool_entries:
-                        print(f"DEBUG: Updated {len(pool_entries)} pool entries with ownership for {matched_player.displayName}")
-                            
-                except Exception as e:
-                    print(f"DEBUG: Error creating ownership estimate for {matched_player.displayName}: {str(e)}")
-                    # Rollback the current transaction and continue with next record
-                    db.rollback()
-                    failed_matches += 1
-                    errors.append(f"Error processing {player_data['name']}: {str(e)}")
-                    continue
+                if matched_player.playerDkId in matched_rows:
+                    duplicate_rows += 1
+                matched_rows[matched_player.playerDkId] = player_data
             else:
                 failed_matches += 1
                 unmatched_players.append({
@@ -1171,32 +1274,61 @@ def process_ownership_projections(db: Session, week_id: int, projection_source:
                     'match_confidence': confidence,
                     'possible_matches': possible_matches
                 })
-                
-                if i < 3:
-                    print(f"DEBUG: No match found for {player_data['name']} (confidence: {confidence})")
-                    
+
+        if not matched_rows:
+            continue
+
+        player_ids = list(matched_rows.keys())
+        try:
+            with db.begin_nested():
+                # Estimates from CSV are not slate-specific (draftgroup NULL). NULLs never collide in
+                # the unique index, so ON CONFLICT can't be used; split into bulk update + bulk insert.
+                existing = dict(db.query(OwnershipEstimate.playerDkId, OwnershipEstimate.id).filter(
+                    and_(
+                        OwnershipEstimate.week_id == week_id,
+                        OwnershipEstimate.source == projection_source,
+                        OwnershipEstimate.draftGroup.is_(None),
+                        OwnershipEstimate.playerDkId.in_(player_ids)
+                    )
+                ).all())
+
+                updates = [
+                    {'id': existing[pid], 'ownership': row['ownership']}
+                    for pid, row in matched_rows.items() if pid in existing
+                ]
+                inserts = [
+                    {
+                        'week_id': week_id,
+                        'playerDkId': pid,
+                        'source': projection_source,
+                        'ownership': row['ownership'],
+                        'draftGroup': None,
+                    }
+                    for pid, row in matched_rows.items() if pid not in existing
+                ]
+                if updates:
+                    db.execute(update(OwnershipEstimate), updates)
+                if inserts:
+                    db.execute(insert(OwnershipEstimate), inserts)
+
+                # Update player_pool_entries.ownership for all slates this week
+                _update_pool_entries(db, week_id, {
+                    pid: {'ownership': row['ownership']} for pid, row in matched_rows.items()
+                })
         except Exception as e:
-            failed_matches += 1
-            error_msg = f"Error processing {player_data['name']}: {str(e)}"
-            errors.append(error_msg)
-            print(f"DEBUG: {error_msg}")
+            errors.append(f"Error processing rows {total_processed - len(chunk) + 1}-{total_processed}: {str(e)}")
+            failed_matches += len(matched_rows) + duplicate_rows
+            successful_matches -= len(matched_rows) + duplicate_rows
+            continue
+
+        ownership_created += len(inserts)
+        ownership_updated += len(updates) + duplicate_rows
+        touched_player_ids.update(player_ids)
 
     # Commit all changes
     try:
         db.commit()
         print(f"DEBUG: Successfully committed ownership updates")
-        
-        # Update weekly summary after ownership changes
-        if successful_matches > 0:
-            print(f"DEBUG: Updating weekly summary for week {week_id}")
-            try:
-                WeeklySummaryService.populate_weekly_summary(db, week_id)
-                print(f"DEBUG: Weekly summary updated")
-            except Exception as e:
-                print(f"DEBUG: Warning - Weekly summary update failed: {str(e)}")
-                # Don't fail the entire import if weekly summary update fails
-                errors.append(f"Weekly summary update failed: {str(e)}")
-            
     except Exception as e:
         db.rollback()
         error_msg = f"Database commit failed: {str(e)}"
@@ -1204,6 +1336,9 @@ def process_ownership_projections(db: Session, week_id: int, projection_source:
         print(f"DEBUG: {error_msg}")
         raise
 
+    # Update weekly summary for just the players whose ownership changed
+    refresh_weekly_summary(db, week_id, touched_player_ids, errors)
+
     return ProjectionImportResponse(
         total_processed=total_processed,
         successful_matches=successful_matches,
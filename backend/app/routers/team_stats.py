@@ -12,7 +12,7 @@ from app.schemas import (
 from app.services.nflverse_service import NFLVerseService
 from app.services.activity_logging import ActivityLoggingService
 from app.services.dk_defense_scoring_service import DKDefenseScoringService
-from sqlalchemy import and_, func
+from sqlalchemy import and_
 import time
 
 router = APIRouter(prefix="/api/team-stats", tags=["team-stats"])
@@ -407,61 +407,27 @@ async def recalculate_dk_defense_scores(
     This is useful for backfilling historical data with the new scoring system.
     """
     try:
-        # Get all team stats for the week
-        team_stats_list = db.query(TeamStats).filter(TeamStats.week_id == week_id).all()
+        # One team stats/games join, vectorized scoring and one bulk update
+        results = DKDefenseScoringService.recalculate_week_scores(db, [week_id])
         
-        if not team_stats_list:
+        if week_id not in results:
             raise HTTPException(status_code=404, detail=f"No team stats found for week {week_id}")
         
-        updated_count = 0
-        errors = []
-        
-        for team_stats in team_stats_list:
-            try:
-                # Get points allowed from games table
-                points_allowed = NFLVerseService.get_points_allowed_for_team(
-                    db, team_stats.team_id, week_id
-                )
-                
-                # Create stats dictionary for scoring calculation
-                # Convert Decimal fields to float for compatibility
-                stats_dict = {
-                    'def_sacks': float(team_stats.def_sacks or 0),
-                    'def_interceptions': float(team_stats.def_interceptions or 0),
-                    'fumble_recovery_opp': float(team_stats.fumble_recovery_opp or 0),
-                    'def_tds': float(team_stats.def_tds or 0),
-                    'fumble_recovery_tds': float(team_stats.fumble_recovery_tds or 0),
-                    'special_teams_tds': float(team_stats.special_teams_tds or 0),
-                    'def_safeties': float(team_stats.def_safeties or 0),
-                }
-                
-                # Calculate new DK defense score
-                new_score = DKDefenseScoringService.calculate_defense_score_from_dict(
-                    stats_dict, points_allowed
-                )
-                
-                # Update the team stats record
-                team_stats.dk_defense_score = new_score
-                team_stats.points_allowed = points_allowed
-                
-                updated_count += 1
-                
-            except Exception as e:
-                errors.append(f"Error updating team {team_stats.team_id}: {str(e)}")
-                continue
-        
         # Commit all changes
         db.commit()
         
+        week_result = results[week_id]
         return {
             "status": "success",
             "week_id": week_id,
-            "total_teams": len(team_stats_list),
-            "updated_count": updated_count,
-            "errors": errors,
-            "message": f"Successfully recalculated DK defense scores for {updated_count} teams"
+            "total_teams": week_result['total_teams'],
+            "updated_count": week_result['updated_count'],
+            "errors": week_result['errors'],
+            "message": f"Successfully recalculated DK defense scores for {week_result['updated_count']} teams"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error recalculating DK scores: {str(e)}")
@@ -481,32 +447,27 @@ async def bulk_recalculate_dk_defense_scores(
         "dry_run": false        // Optional: preview without changes
     }
     """
+    week_ids = request_data.get('week_ids')
+    all_weeks = request_data.get('all_weeks', False)
+    dry_run = request_data.get('dry_run', False)
+    
+    if not week_ids and not all_weeks:
+        raise HTTPException(status_code=400, detail="Must specify either week_ids or all_weeks=true")
+    
     try:
-        week_ids = request_data.get('week_ids')
-        all_weeks = request_data.get('all_weeks', False)
-        dry_run = request_data.get('dry_run', False)
-        
-        if not week_ids and not all_weeks:
-            raise HTTPException(status_code=400, detail="Must specify either week_ids or all_weeks=true")
+        # Every requested week is recalculated from a single join and written in one bulk update
+        week_results = DKDefenseScoringService.recalculate_week_scores(
+            db, None if all_weeks else week_ids, dry_run=dry_run
+        )
+        if all_weeks:
+            week_ids = sorted(week_results.keys())
         
         results = []
         total_updated = 0
         total_errors = 0
-        
-        if all_weeks:
-            # Get all weeks with team stats data
-            weeks_query = db.query(
-                TeamStats.week_id,
-                func.count(TeamStats.id).label('team_count')
-            ).group_by(TeamStats.week_id).all()
-            
-            week_ids = [week_id for week_id, _ in weeks_query]
-        
         for week_id in week_ids:
-            # Get all team stats for this week
-            team_stats_list = db.query(TeamStats).filter(TeamStats.week_id == week_id).all()
-            
-            if not team_stats_list:
+            week_result = week_results.get(week_id)
+            if not week_result:
                 results.append({
                     'week_id': week_id,
                     'total_teams': 0,
@@ -516,52 +477,15 @@ async def bulk_recalculate_dk_defense_scores(
                 })
                 continue
             
-            week_updated = 0
-            week_errors = []
-            
-            for team_stats in team_stats_list:
-                try:
-                    # Get points allowed from games table
-                    points_allowed = NFLVerseService.get_points_allowed_for_team(
-                        db, team_stats.team_id, week_id
-                    )
-                    
-                    # Create stats dictionary for scoring calculation
-                    stats_dict = {
-                        'def_sacks': float(team_stats.def_sacks or 0),
-                        'def_interceptions': float(team_stats.def_interceptions or 0),
-                        'fumble_recovery_opp': float(team_stats.fumble_recovery_opp or 0),
-                        'def_tds': float(team_stats.def_tds or 0),
-                        'special_teams_tds': float(team_stats.special_teams_tds or 0),
-                        'def_safeties': float(team_stats.def_safeties or 0),
-                    }
-                    
-                    # Calculate new DK defense score
-                    new_score = DKDefenseScoringService.calculate_defense_score_from_dict(
-                        stats_dict, points_allowed
-                    )
-                    
-                    if not dry_run:
-                        # Update the team stats record
-                        team_stats.dk_defense_score = new_score
-                        team_stats.points_allowed = points_allowed
-                    
-                    week_updated += 1
-                    
-                except Exception as e:
-                    week_errors.append(f"Team {team_stats.team_id}: {str(e)}")
-                    continue
-            
             results.append({
                 'week_id': week_id,
-                'total_teams': len(team_stats_list),
-                'updated_count': week_updated,
-                'errors': week_errors,
-                'status': 'success' if not week_errors else 'partial_success'
+                'total_teams': week_result['total_teams'],
+                'updated_count': week_result['updated_count'],
+                'errors': week_result['errors'],
+                'status': 'success' if not week_result['errors'] else 'partial_success'
             })
-            
-            total_updated += week_updated
-            total_errors += len(week_errors)
+            total_updated += week_result['updated_count']
+            total_errors += len(week_result['errors'])
         
         if not dry_run:
             # Commit all changes
@@ -364,6 +364,7 @@ class QuickNote(BaseModel):
 class DraftKingsImportRequest(BaseModel):
     week_id: int = Field(..., description="Week ID from weeks table")
     draft_group: str = Field(..., description="Draft Group ID from DraftKings")
+    force_refresh: bool = Field(False, description="Process every draftable even if unchanged since the last import")
 
 class DraftKingsImportResponse(BaseModel):
     players_added: int = Field(..., ge=0, description="Number of new players added")
@@ -373,9 +374,29 @@ class DraftKingsImportResponse(BaseModel):
     entries_skipped: int = Field(..., ge=0, description="Number of entries skipped due to duplicates")
     auto_excluded_count: int = Field(..., ge=0, description="Number of players auto-excluded due to zero/null projections")
     status_updates: int = Field(..., ge=0, description="Number of player status updates applied")
+    unchanged_skipped: int = Field(0, ge=0, description="Number of draftables skipped because they are unchanged since the last import")
+    not_modified: bool = Field(False, description="True when the draft group was unchanged upstream and nothing was written")
     errors: List[str] = Field(default=[], description="List of error messages")
     total_processed: int = Field(..., ge=0, description="Total number of draftables processed")
 
+class DraftKingsBatchImportRequest(BaseModel):
+    week_id: int = Field(..., description="Week ID from weeks table")
+    draft_groups: List[str] = Field(..., min_length=1, description="Draft Group IDs from DraftKings")
+    main_draftgroup: Optional[str] = Field(None, description="Draft group used as the weekly summary baseline (defaults to the first draft group)")
+    max_concurrency: int = Field(4, ge=1, le=8, description="Maximum number of concurrent DraftKings requests")
+    force_refresh: bool = Field(False, description="Process every draftable even if unchanged since the last import")
+
+class DraftKingsBatchImportResponse(BaseModel):
+    players_added: int = Field(..., ge=0, description="Number of new players added across all draft groups")
+    players_updated: int = Field(..., ge=0, description="Number of existing players updated across all draft groups")
+    unique_players: int = Field(..., ge=0, description="Number of distinct players written (shared players count once)")
+    entries_added: int = Field(..., ge=0, description="Number of new player pool entries added")
+    entries_updated: int = Field(..., ge=0, description="Number of existing player pool entries updated")
+    entries_skipped: int = Field(..., ge=0, description="Number of entries skipped due to duplicates")
+    total_processed: int = Field(..., ge=0, description="Total number of draftables processed")
+    errors: List[str] = Field(default=[], description="List of error messages")
+    draft_groups: Dict[str, DraftKingsImportResponse] = Field(default={}, description="Per draft group import results")
+
 # Response schemas for common queries
 class PlayerListResponse(BaseModel):
     players: List[Player]
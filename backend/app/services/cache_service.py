@@ -4,7 +4,7 @@ Caching service for Player Profile data
 
 import json
 import hashlib
-from typing import Optional, Dict, Any
+from typing import Any, Dict, Iterable, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.database import get_db
@@ -82,3 +82,47 @@ class CacheService:
 
 # Global cache instance
 player_profile_cache = CacheService()
+
+
+class PlayerGameLogCache:
+    """
+    Player game logs per (playerDkId, year)
+
+    A season's game log only changes when actuals (or game results) are imported, so
+    entries live until an import invalidates them; the TTL is a backstop for other
+    edits such as salary or OPRK corrections.
+    """
+
+    def __init__(self, ttl_seconds: int = 30 * 60):
+        self._entries: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self._ttl = timedelta(seconds=ttl_seconds)
+
+    def get(self, player_id: int, year: int) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get((player_id, year))
+        if entry is None:
+            return None
+        if datetime.now() - entry['timestamp'] > self._ttl:
+            self._entries.pop((player_id, year), None)
+            return None
+        return entry['data']
+
+    def set(self, player_id: int, year: int, data: Dict[str, Any]) -> None:
+        self._entries[(player_id, year)] = {'data': data, 'timestamp': datetime.now()}
+
+    def invalidate(self, year: Optional[int] = None, player_ids: Optional[Iterable[int]] = None) -> None:
+        """Drop entries for a year and/or a set of players; no arguments drops everything"""
+        player_ids = set(player_ids) if player_ids is not None else None
+        for key in list(self._entries):
+            player_id, entry_year = key
+            if year is not None and entry_year != year:
+                continue
+            if player_ids is not None and player_id not in player_ids:
+                continue
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Global game log cache; routers and import services share it
+player_game_log_cache = PlayerGameLogCache()
@@ -0,0 +1,207 @@
+"""
+Contest Analytics Service
+
+Maintains pre-aggregated contest ROI rollups and answers dashboard queries from them.
+
+Features:
+- Rolls contest entries up by week, contest type, game type, entry-fee bucket and lineup
+- Refreshes only the weeks touched by a contest import
+- Season dashboards (totals plus a breakdown per dimension) from one query over the rollups
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from ..models import Contest, ContestRoiRollup, ContestType, GameType, Lineup, Week
+
+logger = logging.getLogger(__name__)
+
+# Upper bound (inclusive) of each entry-fee bucket; anything above the last is '$100+'
+FEE_BUCKETS = (
+    ("$0", 0),
+    ("$0.01-$1", 1),
+    ("$1.01-$5", 5),
+    ("$5.01-$25", 25),
+    ("$25.01-$100", 100),
+)
+TOP_FEE_BUCKET = "$100+"
+
+BREAKDOWNS = ("week", "contest_type", "game_type", "fee_bucket", "lineup")
+
+
+def fee_bucket_expr(entry_fee):
+    """SQL expression mapping an entry fee to its bucket label"""
+    return case(
+        *[(entry_fee <= upper, label) for label, upper in FEE_BUCKETS],
+        else_=TOP_FEE_BUCKET
+    )
+
+
+class ContestAnalyticsService:
+    """
+    Service to maintain contest ROI rollups and query contest performance.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def refresh_weeks(self, week_ids: Iterable[int]) -> int:
+        """
+        Rebuild the rollups for the given weeks from the contest table with one DELETE
+        and one INSERT ... SELECT. Does not commit.
+
+        Returns:
+            Number of rollup rows written
+        """
+        week_ids = sorted({week_id for week_id in week_ids if week_id is not None})
+        if not week_ids:
+            return 0
+
+        self.db.execute(delete(ContestRoiRollup).where(ContestRoiRollup.week_id.in_(week_ids)))
+        return self._insert_rollups(Contest.week_id.in_(week_ids))
+
+    def refresh_all(self) -> int:
+        """Rebuild every rollup row. Does not commit."""
+        self.db.execute(delete(ContestRoiRollup))
+        return self._insert_rollups(Contest.week_id.isnot(None))
+
+    def _insert_rollups(self, contest_filter) -> int:
+        contest_type = func.coalesce(ContestType.code, '')
+        game_type = func.coalesce(GameType.code, '')
+        fee_bucket = fee_bucket_expr(Contest.entry_fee_usd)
+        lineup_id = func.coalesce(Contest.lineup_id, '')
+        winnings = func.coalesce(Contest.winnings_non_ticket, 0) + func.coalesce(Contest.winnings_ticket, 0)
+
+        aggregates = select(
+            Contest.week_id,
+            contest_type,
+            game_type,
+            fee_bucket,
+            lineup_id,
+            func.count(Contest.entry_key),
+            func.sum(case((winnings > 0, 1), else_=0)),
+            func.coalesce(func.sum(Contest.entry_fee_usd), 0),
+            func.coalesce(func.sum(winnings), 0),
+            func.coalesce(func.sum(Contest.net_profit_usd), 0),
+        ).select_from(Contest).outerjoin(
+            ContestType, ContestType.contest_type_id == Contest.contest_type_id
+        ).outerjoin(
+            GameType, GameType.game_type_id == Contest.game_type_id
+        ).where(
+            contest_filter
+        ).group_by(
+            Contest.week_id, contest_type, game_type, fee_bucket, lineup_id
+        )
+        result = self.db.execute(
+            insert(ContestRoiRollup).from_select(
+                ['week_id', 'contest_type', 'game_type', 'fee_bucket', 'lineup_id',
+                 'entries', 'cashes', 'entry_fees', 'winnings', 'net_profit'],
+                aggregates
+            )
+        )
+        return result.rowcount or 0
+
+    def get_dashboard(
+        self,
+        season: Optional[int] = None,
+        week_ids: Optional[List[int]] = None,
+        contest_type: Optional[str] = None,
+        game_type: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Contest performance totals and breakdowns by week, contest type, game type,
+        entry-fee bucket and lineup, answered from a single query over the rollups.
+
+        Args:
+            season: Only include weeks of this NFL season
+            week_ids: Only include these weeks
+            contest_type: Only include this contest type code
+            game_type: Only include this game type code
+
+        Returns:
+            Dict with 'totals' and one list per breakdown, each item carrying entries,
+            cashes, entry_fees, winnings, net_profit, cash_rate and roi (percentages)
+        """
+        filters = []
+        if season is not None:
+            filters.append(Week.year == season)
+        if week_ids:
+            filters.append(ContestRoiRollup.week_id.in_(week_ids))
+        if contest_type is not None:
+            filters.append(ContestRoiRollup.contest_type == contest_type)
+        if game_type is not None:
+            filters.append(ContestRoiRollup.game_type == game_type)
+
+        rows = self.db.query(
+            ContestRoiRollup.week_id,
+            Week.year,
+            Week.week_number,
+            ContestRoiRollup.contest_type,
+            ContestRoiRollup.game_type,
+            ContestRoiRollup.fee_bucket,
+            ContestRoiRollup.lineup_id,
+            Lineup.name.label('lineup_name'),
+            ContestRoiRollup.entries,
+            ContestRoiRollup.cashes,
+            ContestRoiRollup.entry_fees,
+            ContestRoiRollup.winnings,
+            ContestRoiRollup.net_profit,
+        ).join(
+            Week, Week.id == ContestRoiRollup.week_id
+        ).outerjoin(
+            Lineup, Lineup.id == ContestRoiRollup.lineup_id
+        ).filter(and_(*filters)).all()
+
+        totals = self._empty_metrics()
+        groups: Dict[str, Dict[Any, Dict[str, Any]]] = {name: {} for name in BREAKDOWNS}
+        for row in rows:
+            keys = {
+                'week': (row.week_id, {'week_id': row.week_id, 'year': row.year, 'week_number': row.week_number}),
+                'contest_type': (row.contest_type, {'contest_type': row.contest_type or None}),
+                'game_type': (row.game_type, {'game_type': row.game_type or None}),
+                'fee_bucket': (row.fee_bucket, {'fee_bucket': row.fee_bucket}),
+                'lineup': (row.lineup_id, {'lineup_id': row.lineup_id or None, 'lineup_name': row.lineup_name}),
+            }
+            self._accumulate(totals, row)
+            for name, (key, labels) in keys.items():
+                group = groups[name].get(key)
+                if group is None:
+                    group = groups[name][key] = {**labels, **self._empty_metrics()}
+                self._accumulate(group, row)
+
+        fee_order = {label: index for index, (label, _) in enumerate(FEE_BUCKETS)}
+        fee_order[TOP_FEE_BUCKET] = len(FEE_BUCKETS)
+        return {
+            'totals': self._finish(totals),
+            'by_week': [self._finish(g) for g in sorted(groups['week'].values(), key=lambda g: (g['year'], g['week_number']))],
+            'by_contest_type': [self._finish(g) for g in sorted(groups['contest_type'].values(), key=lambda g: -g['entries'])],
+            'by_game_type': [self._finish(g) for g in sorted(groups['game_type'].values(), key=lambda g: -g['entries'])],
+            'by_fee_bucket': [self._finish(g) for g in sorted(groups['fee_bucket'].values(), key=lambda g: fee_order.get(g['fee_bucket'], 0))],
+            'by_lineup': [self._finish(g) for g in sorted(groups['lineup'].values(), key=lambda g: -g['net_profit'])],
+        }
+
+    @staticmethod
+    def _empty_metrics() -> Dict[str, Any]:
+        return {'entries': 0, 'cashes': 0, 'entry_fees': 0.0, 'winnings': 0.0, 'net_profit': 0.0}
+
+    @staticmethod
+    def _accumulate(metrics: Dict[str, Any], row) -> None:
+        metrics['entries'] += row.entries or 0
+        metrics['cashes'] += row.cashes or 0
+        metrics['entry_fees'] += float(row.entry_fees or 0)
+        metrics['winnings'] += float(row.winnings or 0)
+        metrics['net_profit'] += float(row.net_profit or 0)
+
+    @staticmethod
+    def _finish(metrics: Dict[str, Any]) -> Dict[str, Any]:
+        entries = metrics['entries']
+        fees = metrics['entry_fees']
+        metrics['entry_fees'] = round(fees, 2)
+        metrics['winnings'] = round(metrics['winnings'], 2)
+        metrics['net_profit'] = round(metrics['net_profit'], 2)
+        metrics['cash_rate'] = round(metrics['cashes'] / entries * 100, 2) if entries else 0.0
+        metrics['roi'] = round(metrics['net_profit'] / fees * 100, 2) if fees else 0.0
+        return metrics
@@ -1,18 +1,41 @@
 """
 Contest Details Service
-Handles saving opponent roster data to the contest_roster_details table
+Handles saving opponent roster data to the contest_roster_details table and its
+per-player rows in contest_roster_players
 """
 
+import hashlib
 import logging
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy import text
+from sqlalchemy import bindparam, delete, func, insert, text
 from datetime import datetime, timezone
 
+from app.models import Contest, ContestRosterDetails, ContestRosterPlayer, DraftGroup, Player, PlayerPoolEntry
+from app.utils.bulk_upsert import bulk_upsert, chunked
+from app.utils.name_normalization import normalize_for_matching
+
 logger = logging.getLogger(__name__)
 
+ROSTER_UNIQUE_COLUMNS = ('contest_id', 'enter_key')
+
+
+def contest_json_hash(payload: Dict[str, Any]) -> str:
+    """SHA-256 of a contest_json payload, independent of key order"""
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+def roster_players(contest_json: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Player scorecards of a stored roster, in roster order"""
+    if not isinstance(contest_json, dict):
+        return []
+    roster_data = contest_json.get('roster_data') or {}
+    roster_info = roster_data.get('roster_data') or {}
+    return [player for player in roster_info.get('players') or [] if isinstance(player, dict)]
+
 class ContestDetailsService:
     """Service for managing contest roster details in the database"""
     
@@ -33,72 +56,449 @@ class ContestDetailsService:
             
         Returns:
             Dict containing save result with success status and details
+        """
+        results = await self.save_opponent_rosters([(contest_data, roster_data)])
+        return results[0]
+    
+    async def save_opponent_rosters(
+        self,
+        rosters: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Save many opponent rosters with one upsert on (contest_id, enter_key)
+        
+        Stored rows are read once up front; rosters whose contest_json hash matches the
+        stored hash are skipped instead of rewriting the JSON. The rest are written with
+        INSERT ... ON CONFLICT DO UPDATE and committed together. If that statement fails,
+        the rosters are retried one at a time so a single bad row only fails itself.
+        When the same entry appears more than once, the last roster wins.
+        
+        Args:
+            rosters: (contest_data, roster_data) pairs as accepted by save_opponent_roster
             
-        Raises:
-            ValueError: If required fields are missing or invalid
-            IntegrityError: If database constraint violations occur
+        Returns:
+            One save result per roster, in input order, with action 'inserted',
+            'updated', 'unchanged' or 'failed'
         """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(rosters)
+        rows_by_key: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        indexes_by_key: Dict[Tuple[int, int], List[int]] = {}
+        
+        for index, (contest_data, roster_data) in enumerate(rosters):
+            try:
+                row = self._validate_and_prepare_data(contest_data, roster_data)
+            except ValueError as e:
+                logger.error(f"Validation error saving opponent roster: {e}")
+                results[index] = self._failed_result(f'Validation error: {str(e)}')
+                continue
+            key = (row['contest_id'], row['enter_key'])
+            rows_by_key[key] = row
+            indexes_by_key.setdefault(key, []).append(index)
+        
+        if not rows_by_key:
+            return results
+        
         try:
-            logger.info(f"Saving opponent roster for contest {contest_data.get('contest_id')}")
-            
-            # Validate and prepare data
-            validated_data = self._validate_and_prepare_data(contest_data, roster_data)
-            
-            # Check if record already exists
-            existing_record = await self._find_existing_record(
-                validated_data['contest_id'],
-                validated_data['enter_key']
-            )
-            
-            if existing_record:
-                # Update existing record
-                result = await self._update_existing_record(existing_record['id'], validated_data)
-                result['action'] = 'updated'
-                logger.info(f"Updated existing contest roster record ID: {existing_record['id']}")
+            existing = self._existing_roster_hashes(rows_by_key.keys())
+        except Exception as e:
+            logger.error(f"Unexpected error saving opponent rosters: {e}")
+            self.db.rollback()
+            for indexes in indexes_by_key.values():
+                for index in indexes:
+                    results[index] = self._failed_result(f'Unexpected error: {str(e)}')
+            return results
+        
+        actions: Dict[Tuple[int, int], str] = {}
+        changed_rows = []
+        for key, row in rows_by_key.items():
+            if key not in existing:
+                actions[key] = 'inserted'
+            elif existing[key][1] == row['contest_json_hash']:
+                actions[key] = 'unchanged'
+                continue
             else:
-                # Insert new record
-                result = await self._insert_new_record(validated_data)
-                result['action'] = 'inserted'
-                logger.info(f"Inserted new contest roster record ID: {result['id']}")
-            
-            # Commit the transaction
+                actions[key] = 'updated'
+            changed_rows.append(row)
+        
+        errors = self._upsert_rosters(changed_rows)
+        
+        # Ids of freshly inserted rows
+        inserted_keys = [key for key, action in actions.items() if action == 'inserted' and key not in errors]
+        if inserted_keys:
+            existing.update(self._existing_roster_hashes(inserted_keys))
+        
+        self._save_roster_players([
+            (existing[key][0], row) for key, row in rows_by_key.items()
+            if actions[key] != 'unchanged' and key not in errors and key in existing
+        ])
+        
+        for key, row in rows_by_key.items():
+            if key in errors:
+                result = self._failed_result(errors[key])
+            else:
+                action = actions[key]
+                result = {
+                    'success': True,
+                    'action': action,
+                    'id': existing.get(key, (None, None))[0],
+                    'contest_id': row['contest_id'],
+                    'enter_key': row['enter_key'],
+                    'username': row['username'],
+                    'fantasy_points': row['fantasy_points'],
+                    'message': (
+                        "Opponent roster unchanged (skipped)" if action == 'unchanged'
+                        else f"Successfully {action} opponent roster data"
+                    )
+                }
+            for index in indexes_by_key[key]:
+                results[index] = dict(result)
+        
+        return results
+    
+    def _existing_roster_hashes(
+        self,
+        keys: Iterable[Tuple[int, int]]
+    ) -> Dict[Tuple[int, int], Tuple[int, Optional[str]]]:
+        """Map (contest_id, enter_key) to (id, contest_json_hash) for stored rows"""
+        keys = set(keys)
+        existing = {}
+        for contest_ids in chunked(sorted({contest_id for contest_id, _ in keys})):
+            rows = self.db.query(
+                ContestRosterDetails.id,
+                ContestRosterDetails.contest_id,
+                ContestRosterDetails.enter_key,
+                ContestRosterDetails.contest_json_hash
+            ).filter(ContestRosterDetails.contest_id.in_(contest_ids)).all()
+            for row in rows:
+                key = (row.contest_id, row.enter_key)
+                if key in keys:
+                    existing[key] = (row.id, row.contest_json_hash)
+        return existing
+    
+    def _upsert_rosters(self, rows: List[Dict[str, Any]]) -> Dict[Tuple[int, int], str]:
+        """
+        Upsert rows and commit; falls back to one row per statement when the batch fails
+        
+        Returns:
+            Error message per (contest_id, enter_key) of rows that could not be saved
+        """
+        if not rows:
+            return {}
+        
+        update_columns = [
+            column for column in rows[0]
+            if column not in ROSTER_UNIQUE_COLUMNS and column != 'created_at'
+        ]
+        try:
+            bulk_upsert(self.db, ContestRosterDetails, rows, ROSTER_UNIQUE_COLUMNS, update_columns)
             self.db.commit()
-            
-            return {
-                'success': True,
-                'action': result['action'],
-                'id': result['id'],
-                'contest_id': validated_data['contest_id'],
-                'enter_key': validated_data['enter_key'],
-                'username': validated_data['username'],
-                'fantasy_points': validated_data['fantasy_points'],
-                'message': f"Successfully {result['action']} opponent roster data"
-            }
-            
-        except ValueError as e:
-            logger.error(f"Validation error saving opponent roster: {e}")
-            self.db.rollback()
-            return {
-                'success': False,
-                'error': f'Validation error: {str(e)}',
-                'action': 'failed'
-            }
-        except IntegrityError as e:
-            logger.error(f"Database integrity error saving opponent roster: {e}")
+            return {}
+        except Exception as e:
+            logger.warning(f"Batch save of {len(rows)} opponent rosters failed, saving one at a time: {e}")
             self.db.rollback()
-            return {
-                'success': False,
-                'error': f'Database integrity error: {str(e)}',
-                'action': 'failed'
-            }
+        
+        errors = {}
+        for row in rows:
+            try:
+                bulk_upsert(self.db, ContestRosterDetails, [row], ROSTER_UNIQUE_COLUMNS, update_columns)
+                self.db.commit()
+            except Exception as e:
+                logger.error(f"Error saving opponent roster for contest {row['contest_id']}: {e}")
+                self.db.rollback()
+                errors[(row['contest_id'], row['enter_key'])] = f'Database error: {str(e)}'
+        return errors
+    
+    def _save_roster_players(self, rosters: List[Tuple[int, Dict[str, Any]]]) -> int:
+        """
+        Replace the contest_roster_players rows of saved rosters and commit
+        
+        A failure here is logged and leaves the rosters themselves saved; their player
+        rows can be rebuilt later with rebuild_roster_players.
+        
+        Args:
+            rosters: (contest_roster_details.id, prepared roster row) pairs
+            
+        Returns:
+            Number of player rows written
+        """
+        if not rosters:
+            return 0
+        
+        try:
+            resolver = self._player_resolver(
+                {row['draftgroup'] for _, row in rosters},
+                {row['contest_id'] for _, row in rosters}
+            )
+            player_rows = []
+            for roster_id, row in rosters:
+                player_rows.extend(self._roster_player_rows(roster_id, row, resolver))
+            
+            unmatched = [
+                player_row for player_row in player_rows
+                if player_row['playerDkId'] is None and player_row['player_name']
+            ]
+            if unmatched:
+                by_name = self._resolve_unmatched_names(
+                    normalize_for_matching(player_row['player_name']) for player_row in unmatched
+                )
+                for player_row in unmatched:
+                    player_row['playerDkId'] = by_name.get(normalize_for_matching(player_row['player_name']))
+            
+            for roster_ids in chunked(sorted({roster_id for roster_id, _ in rosters})):
+                self.db.execute(delete(ContestRosterPlayer).where(ContestRosterPlayer.roster_id.in_(roster_ids)))
+            for chunk in chunked(player_rows):
+                self.db.execute(insert(ContestRosterPlayer), list(chunk))
+            self.db.commit()
+            return len(player_rows)
         except Exception as e:
-            logger.error(f"Unexpected error saving opponent roster: {e}")
+            logger.error(f"Error saving roster players for {len(rosters)} opponent rosters: {e}")
             self.db.rollback()
-            return {
-                'success': False,
-                'error': f'Unexpected error: {str(e)}',
-                'action': 'failed'
-            }
+            return 0
+    
+    def _player_resolver(
+        self,
+        draftgroups: Iterable[Optional[int]],
+        contest_ids: Iterable[int]
+    ) -> Dict[str, Any]:
+        """
+        Lookup tables for resolving roster scorecards to playerDkId and week
+        
+        Scorecards are matched on (draft group, draftable ID) against the player pool
+        first, then on normalized name within the draft group's pool, then on a unique
+        normalized display name across all players. The week comes from the draft
+        group, or from the user's own contest entry when the draft group is unknown.
+        """
+        draftgroups = sorted({draftgroup for draftgroup in draftgroups if draftgroup})
+        resolver = {'by_draftable': {}, 'by_name': {}, 'week_by_draftgroup': {}, 'week_by_contest': {}}
+        
+        for contest_chunk in chunked(sorted(set(contest_ids))):
+            for contest_id, week_id in self.db.query(Contest.contest_id, Contest.week_id).filter(
+                Contest.contest_id.in_(contest_chunk),
+                Contest.week_id.isnot(None)
+            ).all():
+                resolver['week_by_contest'].setdefault(contest_id, week_id)
+        
+        if not draftgroups:
+            return resolver
+        
+        for draftgroup, week_id in self.db.query(DraftGroup.draftGroup, DraftGroup.week_id).filter(
+            DraftGroup.draftGroup.in_(draftgroups)
+        ).all():
+            resolver['week_by_draftgroup'].setdefault(draftgroup, week_id)
+        
+        ambiguous = set()
+        pool = self.db.query(
+            PlayerPoolEntry.draftGroup,
+            PlayerPoolEntry.draftableId,
+            PlayerPoolEntry.week_id,
+            PlayerPoolEntry.playerDkId,
+            Player.displayName
+        ).join(
+            Player, Player.playerDkId == PlayerPoolEntry.playerDkId
+        ).filter(
+            PlayerPoolEntry.draftGroup.in_([str(draftgroup) for draftgroup in draftgroups])
+        ).all()
+        for entry in pool:
+            draftgroup = int(entry.draftGroup)
+            resolver['week_by_draftgroup'].setdefault(draftgroup, entry.week_id)
+            if entry.draftableId:
+                resolver['by_draftable'][(draftgroup, str(entry.draftableId))] = entry.playerDkId
+            name_key = (draftgroup, normalize_for_matching(entry.displayName))
+            if resolver['by_name'].get(name_key, entry.playerDkId) != entry.playerDkId:
+                ambiguous.add(name_key)
+            resolver['by_name'][name_key] = entry.playerDkId
+        for name_key in ambiguous:
+            del resolver['by_name'][name_key]
+        return resolver
+    
+    def _resolve_unmatched_names(self, names: Iterable[str]) -> Dict[str, int]:
+        """Map normalized names to playerDkId where exactly one player has that name"""
+        matches: Dict[str, List[int]] = {}
+        for chunk in chunked(sorted(set(names))):
+            for player_dk_id, name in self.db.query(Player.playerDkId, Player.normalized_display_name).filter(
+                Player.normalized_display_name.in_(chunk)
+            ).all():
+                matches.setdefault(name, []).append(player_dk_id)
+        return {name: ids[0] for name, ids in matches.items() if len(ids) == 1}
+    
+    def _roster_player_rows(
+        self,
+        roster_id: int,
+        row: Dict[str, Any],
+        resolver: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """contest_roster_players rows for one roster"""
+        draftgroup = row.get('draftgroup')
+        player_rows = []
+        for slot, player in enumerate(roster_players(row.get('contest_json'))):
+            draftable_id = player.get('draftable_id')
+            name = player.get('name') or None
+            player_dk_id = None
+            if draftable_id is not None:
+                player_dk_id = resolver['by_draftable'].get((draftgroup, str(draftable_id)))
+            if player_dk_id is None and name:
+                player_dk_id = resolver['by_name'].get((draftgroup, normalize_for_matching(name)))
+            score = player.get('score')
+            player_rows.append({
+                'roster_id': roster_id,
+                'contest_id': row['contest_id'],
+                'enter_key': row['enter_key'],
+                'week_id': resolver['week_by_draftgroup'].get(draftgroup) or resolver['week_by_contest'].get(row['contest_id']),
+                'draftgroup': draftgroup,
+                'slot': slot,
+                'roster_position': (player.get('position') or '').upper() or None,
+                'playerDkId': player_dk_id,
+                'draftable_id': str(draftable_id) if draftable_id is not None else None,
+                'player_name': name,
+                'fantasy_points': float(score) if score is not None else None
+            })
+        return player_rows
+    
+    async def rebuild_roster_players(
+        self,
+        contest_ids: Optional[List[int]] = None,
+        missing_only: bool = True,
+        batch_size: int = 200
+    ) -> Dict[str, int]:
+        """
+        Rebuild contest_roster_players from the stored contest_json of saved rosters
+        
+        Used to backfill rosters saved before the table existed and to re-resolve
+        players after the player pool for a draft group has been imported.
+        
+        Args:
+            contest_ids: Only rebuild rosters of these contests
+            missing_only: Only rebuild rosters that have no player rows yet
+            batch_size: Rosters loaded and written per batch
+            
+        Returns:
+            Dict with the number of rosters and player rows written
+        """
+        query = self.db.query(ContestRosterDetails.id)
+        if contest_ids:
+            query = query.filter(ContestRosterDetails.contest_id.in_(contest_ids))
+        if missing_only:
+            query = query.filter(~ContestRosterDetails.id.in_(
+                self.db.query(ContestRosterPlayer.roster_id).distinct()
+            ))
+        roster_ids = [roster_id for (roster_id,) in query.order_by(ContestRosterDetails.id).all()]
+        
+        rosters_written = 0
+        players_written = 0
+        for chunk in chunked(roster_ids, batch_size):
+            rows = self.db.query(
+                ContestRosterDetails.id,
+                ContestRosterDetails.contest_id,
+                ContestRosterDetails.enter_key,
+                ContestRosterDetails.draftgroup,
+                ContestRosterDetails.contest_json
+            ).filter(ContestRosterDetails.id.in_(chunk)).all()
+            rosters = [
+                (row.id, {
+                    'contest_id': row.contest_id,
+                    'enter_key': row.enter_key,
+                    'draftgroup': row.draftgroup,
+                    'contest_json': json.loads(row.contest_json) if isinstance(row.contest_json, str) else row.contest_json
+                })
+                for row in rows
+            ]
+            players_written += self._save_roster_players(rosters)
+            rosters_written += len(rosters)
+        
+        return {'rosters': rosters_written, 'players': players_written}
+    
+    async def get_field_ownership(
+        self,
+        week_id: int,
+        position: Optional[str] = None,
+        contest_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Realized ownership of each player across the opponent rosters of a week
+        
+        Ownership is the share of the week's opponent rosters that included the player,
+        counted with one group-by over contest_roster_players.
+        
+        Args:
+            week_id: Week to aggregate
+            position: Only return players at this position (QB, RB, WR, TE, DST)
+            contest_id: Only count rosters from this contest
+            
+        Returns:
+            Dict with 'total_rosters', 'unresolved_players' and 'players' sorted by
+            ownership; each player carries rosters, ownership (percent), average
+            fantasy_points and the projected ownership from the player pool
+        """
+        filters = [ContestRosterPlayer.week_id == week_id]
+        if contest_id is not None:
+            filters.append(ContestRosterPlayer.contest_id == contest_id)
+        
+        total_rosters, unresolved = self.db.query(
+            func.count(func.distinct(ContestRosterPlayer.roster_id)),
+            func.count(ContestRosterPlayer.id).filter(ContestRosterPlayer.playerDkId.is_(None))
+        ).filter(*filters).one()
+        
+        projected = self.db.query(
+            PlayerPoolEntry.playerDkId.label('playerDkId'),
+            func.max(PlayerPoolEntry.ownership).label('projected_ownership')
+        ).filter(
+            PlayerPoolEntry.week_id == week_id
+        ).group_by(PlayerPoolEntry.playerDkId).subquery()
+        
+        query = self.db.query(
+            ContestRosterPlayer.playerDkId,
+            Player.displayName,
+            Player.position,
+            Player.team,
+            func.count(func.distinct(ContestRosterPlayer.roster_id)).label('rosters'),
+            func.avg(ContestRosterPlayer.fantasy_points).label('fantasy_points'),
+            projected.c.projected_ownership
+        ).join(
+            Player, Player.playerDkId == ContestRosterPlayer.playerDkId
+        ).outerjoin(
+            projected, projected.c.playerDkId == ContestRosterPlayer.playerDkId
+        ).filter(*filters)
+        if position:
+            query = query.filter(Player.position == position.upper())
+        rows = query.group_by(
+            ContestRosterPlayer.playerDkId,
+            Player.displayName,
+            Player.position,
+            Player.team,
+            projected.c.projected_ownership
+        ).all()
+        
+        players = []
+        for row in rows:
+            ownership = round(row.rosters / total_rosters * 100, 2) if total_rosters else 0.0
+            projected_ownership = float(row.projected_ownership) if row.projected_ownership is not None else None
+            players.append({
+                'playerDkId': row.playerDkId,
+                'name': row.displayName,
+                'position': row.position,
+                'team': row.team,
+                'rosters': row.rosters,
+                'ownership': ownership,
+                'projected_ownership': projected_ownership,
+                'ownership_delta': round(ownership - projected_ownership, 2) if projected_ownership is not None else None,
+                'fantasy_points': round(row.fantasy_points, 2) if row.fantasy_points is not None else None
+            })
+        players.sort(key=lambda player: (-player['rosters'], player['name'] or ''))
+        
+        return {
+            'week_id': week_id,
+            'total_rosters': total_rosters,
+            'unresolved_players': unresolved,
+            'players': players
+        }
+    
+    @staticmethod
+    def _failed_result(error: str) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': error,
+            'action': 'failed'
+        }
     
     def _validate_and_prepare_data(
         self, 
@@ -142,12 +542,23 @@ class ContestDetailsService:
                 if roster_info.get(field) is None:
                     raise ValueError(f"Missing required field: {field}")
             
+            # JSON data for flexibility; the hash leaves out saved_at so an unchanged
+            # roster hashes the same on every import
+            contest_json = {
+                'contest_data': contest_data,
+                'roster_data': roster_data,
+                'opponent_info': opponent,
+                'source': 'draftkings_api'
+            }
+            contest_json_hash_value = contest_json_hash(contest_json)
+            contest_json['saved_at'] = datetime.now(timezone.utc).isoformat()
+            
             # Prepare data for database insertion
             prepared_data = {
                 # Core contest information
-                'draftgroup': draft_group_id,
-                'contest_id': contest_id,
-                'enter_key': opponent['entry_key'],
+                'draftgroup': int(draft_group_id),
+                'contest_id': int(contest_id),
+                'enter_key': int(opponent['entry_key']),
                 'username': roster_info['username'],
                 'fantasy_points': float(roster_info['fantasy_points']) if roster_info['fantasy_points'] else 0.0,
                 
@@ -171,14 +582,8 @@ class ContestDetailsService:
                 'dst_name': roster_info.get('dst_name'),
                 'dst_score': float(roster_info.get('dst_score', 0)) if roster_info.get('dst_score') else None,
                 
-                # JSON data for flexibility (serialize for PostgreSQL)
-                'contest_json': json.dumps({
-                    'contest_data': contest_data,
-                    'roster_data': roster_data,
-                    'opponent_info': opponent,
-                    'saved_at': datetime.now(timezone.utc).isoformat(),
-                    'source': 'draftkings_api'
-                }),
+                'contest_json': contest_json,
+                'contest_json_hash': contest_json_hash_value,
                 
                 # Timestamps
                 'created_at': datetime.now(timezone.utc),
@@ -191,21 +596,20 @@ class ContestDetailsService:
             logger.error(f"Error validating and preparing data: {e}")
             raise ValueError(f"Data validation failed: {str(e)}")
     
-    async def _find_existing_record(self, contest_id: str, enter_key: str) -> Optional[Dict[str, Any]]:
+    async def get_opponent_roster(self, contest_id: str, enter_key: str) -> Optional[Dict[str, Any]]:
         """
-        Find existing record by contest_id and enter_key
+        Retrieve opponent roster data by contest_id and enter_key
         
         Args:
             contest_id: Contest ID
             enter_key: Entry key
             
         Returns:
-            Dict with existing record data or None if not found
+            Dict with roster data or None if not found
         """
         try:
             query = text("""
-                SELECT id, contest_id, enter_key, username, fantasy_points, created_at, updated_at
-                FROM contest_roster_details 
+                SELECT * FROM contest_roster_details 
                 WHERE contest_id = :contest_id AND enter_key = :enter_key
             """)
             
@@ -215,139 +619,76 @@ class ContestDetailsService:
             }).fetchone()
             
             if result:
-                return {
-                    'id': result[0],
-                    'contest_id': result[1],
-                    'enter_key': result[2],
-                    'username': result[3],
-                    'fantasy_points': result[4],
-                    'created_at': result[5],
-                    'updated_at': result[6]
-                }
+                # Convert result to dict
+                data = dict(result._mapping)
+                
+                # Parse JSON data if it exists
+                if data.get('contest_json'):
+                    try:
+                        data['contest_json'] = json.loads(data['contest_json'])
+                    except (json.JSONDecodeError, TypeError):
+                        # Keep as string if parsing fails
+                        pass
+                
+                return data
             
             return None
             
         except Exception as e:
-            logger.error(f"Error finding existing record: {e}")
+            logger.error(f"Error retrieving opponent roster: {e}")
             return None
     
-    async def _insert_new_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Insert new record into contest_roster_details table
-        
-        Args:
-            data: Validated data for insertion
-            
-        Returns:
-            Dict with inserted record ID
-        """
-        try:
-            # Build INSERT query
-            columns = list(data.keys())
-            placeholders = [f":{col}" for col in columns]
-            
-            query = text(f"""
-                INSERT INTO contest_roster_details ({', '.join(columns)})
-                VALUES ({', '.join(placeholders)})
-                RETURNING id
-            """)
-            
-            result = self.db.execute(query, data).fetchone()
-            
-            return {
-                'id': result[0],
-                'success': True
-            }
-            
-        except Exception as e:
-            logger.error(f"Error inserting new record: {e}")
-            raise
-    
-    async def _update_existing_record(self, record_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_opponent_rosters(
+        self,
+        keys: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
         """
-        Update existing record in contest_roster_details table
+        Retrieve the stored opponent rosters for many (contest_id, enter_key) pairs
+        with a single query
         
         Args:
-            record_id: ID of existing record
-            data: Validated data for update
+            keys: (contest_id, enter_key) pairs to look up
             
         Returns:
-            Dict with updated record ID
+            Dict mapping (contest_id, enter_key) as strings to roster data; pairs
+            without a stored roster are left out
         """
-        try:
-            # Remove created_at from update data (don't update this)
-            update_data = {k: v for k, v in data.items() if k != 'created_at'}
-            
-            # Build UPDATE query
-            set_clauses = [f"{col} = :{col}" for col in update_data.keys()]
-            
-            query = text(f"""
-                UPDATE contest_roster_details 
-                SET {', '.join(set_clauses)}
-                WHERE id = :record_id
-                RETURNING id
-            """)
-            
-            update_data['record_id'] = record_id
-            result = self.db.execute(query, update_data).fetchone()
-            
-            return {
-                'id': result[0],
-                'success': True
-            }
-            
-        except Exception as e:
-            logger.error(f"Error updating existing record: {e}")
-            raise
-    
-    async def get_opponent_roster(self, contest_id: str, enter_key: str) -> Optional[Dict[str, Any]]:
-        """
-        Retrieve opponent roster data by contest_id and enter_key
+        wanted = {(str(contest_id), str(enter_key)) for contest_id, enter_key in keys}
+        if not wanted:
+            return {}
         
-        Args:
-            contest_id: Contest ID
-            enter_key: Entry key
-            
-        Returns:
-            Dict with roster data or None if not found
-        """
         try:
             query = text("""
                 SELECT * FROM contest_roster_details 
-                WHERE contest_id = :contest_id AND enter_key = :enter_key
-            """)
+                WHERE contest_id IN :contest_ids
+            """).bindparams(bindparam('contest_ids', expanding=True))
             
-            result = self.db.execute(query, {
-                'contest_id': contest_id,
-                'enter_key': enter_key
-            }).fetchone()
+            results = self.db.execute(query, {
+                'contest_ids': sorted({int(contest_id) for contest_id, _ in wanted})
+            }).fetchall()
             
-            if result:
-                # Convert result to dict
-                columns = ['id', 'draftgroup', 'contest_id', 'enter_key', 'username', 
-                          'contest_json', 'fantasy_points', 'qb_name', 'qb_score',
-                          'rb1_name', 'rb1_score', 'rb2_name', 'rb2_score',
-                          'wr1_name', 'wr1_score', 'wr2_name', 'wr2_score', 'wr3_name', 'wr3_score',
-                          'te_name', 'te_score', 'flex_name', 'flex_score', 'dst_name', 'dst_score',
-                          'created_at', 'updated_at']
-                
-                data = dict(zip(columns, result))
+            rosters = {}
+            for result in results:
+                data = dict(result._mapping)
+                key = (str(data['contest_id']), str(data['enter_key']))
+                if key not in wanted:
+                    continue
                 
                 # Parse JSON data if it exists
-                if data.get('contest_json'):
+                if isinstance(data.get('contest_json'), str):
                     try:
                         data['contest_json'] = json.loads(data['contest_json'])
-                    except (json.JSONDecodeError, TypeError):
+                    except json.JSONDecodeError:
                         # Keep as string if parsing fails
                         pass
                 
-                return data
+                rosters[key] = data
             
-            return None
+            return rosters
             
         except Exception as e:
-            logger.error(f"Error retrieving opponent roster: {e}")
-            return None
+            logger.error(f"Error retrieving opponent rosters: {e}")
+            return {}
     
     async def get_contest_rosters(self, contest_id: str) -> List[Dict[str, Any]]:
         """
@@ -369,15 +710,9 @@ class ContestDetailsService:
             results = self.db.execute(query, {'contest_id': contest_id}).fetchall()
             
             rosters = []
-            columns = ['id', 'draftgroup', 'contest_id', 'enter_key', 'username', 
-                      'contest_json', 'fantasy_points', 'qb_name', 'qb_score',
-                      'rb1_name', 'rb1_score', 'rb2_name', 'rb2_score',
-                      'wr1_name', 'wr1_score', 'wr2_name', 'wr2_score', 'wr3_name', 'wr3_score',
-                      'te_name', 'te_score', 'flex_name', 'flex_score', 'dst_name', 'dst_score',
-                      'created_at', 'updated_at']
             
             for result in results:
-                data = dict(zip(columns, result))
+                data = dict(result._mapping)
                 
                 # Parse JSON data if it exists
                 if data.get('contest_json'):
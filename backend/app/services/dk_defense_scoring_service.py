@@ -4,8 +4,11 @@ DK Defense Scoring Service
 Handles the calculation of DraftKings defense/special teams scoring based on NFLVerse team stats.
 """
 
-from typing import Optional
-from app.models import TeamStats
+from typing import Any, Dict, Iterable, Optional
+import polars as pl
+from sqlalchemy import and_, update
+from sqlalchemy.orm import Session
+from app.models import TeamStats, Game
 
 
 class DKDefenseScoringService:
@@ -132,6 +135,196 @@ class DKDefenseScoringService:
         
         return score
     
+    # (column, DK points per unit) in the same order calculate_defense_score_from_dict adds them
+    DEFENSE_SCORING_WEIGHTS = [
+        ('def_sacks', 1),
+        ('def_interceptions', 2),
+        ('fumble_recovery_opp', 2),
+        ('def_tds', 6),
+        ('fumble_recovery_tds', 6),
+        ('special_teams_tds', 6),
+        ('def_safeties', 2),
+        ('blocked_kicks', 2),
+    ]
+    
+    @staticmethod
+    def points_allowed_bonus_expr(points_allowed: pl.Expr) -> pl.Expr:
+        """
+        Polars expression equivalent of get_points_allowed_bonus.
+        
+        Args:
+            points_allowed: Expression for points scored against the defense (nulls count as 0)
+            
+        Returns:
+            Integer expression with the DraftKings points allowed bonus/penalty
+        """
+        points_allowed = points_allowed.fill_null(0)
+        return (
+            pl.when(points_allowed == 0).then(10)
+            .when((points_allowed >= 1) & (points_allowed <= 6)).then(7)
+            .when((points_allowed >= 7) & (points_allowed <= 13)).then(4)
+            .when((points_allowed >= 14) & (points_allowed <= 20)).then(1)
+            .when((points_allowed >= 21) & (points_allowed <= 27)).then(0)
+            .when((points_allowed >= 28) & (points_allowed <= 34)).then(-1)
+            .when(points_allowed >= 35).then(-4)
+            .otherwise(0)
+        )
+    
+    @staticmethod
+    def defense_score_expr(columns, points_allowed: pl.Expr) -> pl.Expr:
+        """
+        Polars expression equivalent of calculate_defense_score_from_dict.
+        
+        Args:
+            columns: Column names available in the frame (missing stat columns score 0)
+            points_allowed: Expression for points scored against the defense
+            
+        Returns:
+            Float expression with total DraftKings fantasy points for defense/special teams
+        """
+        available = set(columns)
+        score = pl.lit(0.0)
+        for column, weight in DKDefenseScoringService.DEFENSE_SCORING_WEIGHTS:
+            if column in available:
+                score = score + pl.col(column).cast(pl.Float64).fill_null(0) * weight
+        return score + DKDefenseScoringService.points_allowed_bonus_expr(points_allowed)
+    
+    @staticmethod
+    def calculate_defense_scores(
+        team_stats_df: pl.DataFrame,
+        points_allowed_column: str = 'points_allowed',
+        output_column: str = 'dk_defense_score'
+    ) -> pl.DataFrame:
+        """
+        Score every row of a team stats frame in one pass.
+        
+        Gives the same values as calling calculate_defense_score_from_dict per row.
+        
+        Args:
+            team_stats_df: Frame with TeamStats columns and a points allowed column
+            points_allowed_column: Column holding points scored against each defense
+            output_column: Name of the score column to add
+            
+        Returns:
+            team_stats_df with the score column added
+        """
+        points_allowed = pl.col(points_allowed_column) if points_allowed_column in team_stats_df.columns else pl.lit(0)
+        return team_stats_df.with_columns(
+            DKDefenseScoringService.defense_score_expr(team_stats_df.columns, points_allowed).alias(output_column)
+        )
+    
+    @staticmethod
+    def points_allowed_from_game_expr(homeoraway: pl.Expr, home_score: pl.Expr, away_score: pl.Expr) -> pl.Expr:
+        """
+        Polars expression equivalent of NFLVerseService.get_points_allowed_for_team over
+        joined game columns: home teams allowed the away score, everyone else the home score,
+        and 0 when there is no game or a score is missing.
+        """
+        return (
+            pl.when(home_score.is_not_null() & away_score.is_not_null())
+            .then(pl.when(homeoraway == 'H').then(away_score).otherwise(home_score))
+            .otherwise(0)
+            .cast(pl.Int64)
+        )
+    
+    @staticmethod
+    def recalculate_week_scores(
+        db: Session,
+        week_ids: Optional[Iterable[int]] = None,
+        dry_run: bool = False
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Recalculate points allowed and DK defense scores for every team in the given weeks.
+        
+        Team stats and their games are read with one LEFT JOIN and scores are computed in
+        one columnar pass. Each week is written back with one bulk UPDATE by primary key
+        inside its own savepoint, so a week that fails to write is reported without losing
+        the others. Does not commit.
+        
+        Args:
+            db: Database session
+            week_ids: Weeks to recalculate (default: every week with team stats)
+            dry_run: Compute scores without writing them
+            
+        Returns:
+            Dictionary of week_id -> {total_teams, updated_count, teams, errors}, where teams
+            lists team_id, old_score, new_score and points_allowed for each updated team and
+            errors lists the teams or week writes that failed
+        """
+        stat_columns = [
+            column for column, _ in DKDefenseScoringService.DEFENSE_SCORING_WEIGHTS
+            if column in TeamStats.__table__.c
+        ]
+        query = db.query(
+            TeamStats.id,
+            TeamStats.week_id,
+            TeamStats.team_id,
+            TeamStats.dk_defense_score,
+            *[getattr(TeamStats, column) for column in stat_columns],
+            Game.homeoraway,
+            Game.home_score,
+            Game.away_score
+        ).outerjoin(
+            Game,
+            and_(
+                Game.week_id == TeamStats.week_id,
+                Game.team_id == TeamStats.team_id
+            )
+        )
+        if week_ids is not None:
+            week_ids = list(week_ids)
+            if not week_ids:
+                return {}
+            query = query.filter(TeamStats.week_id.in_(week_ids))
+        rows = query.order_by(TeamStats.week_id, TeamStats.team_id).all()
+        if not rows:
+            return {}
+        
+        numeric_columns = ['dk_defense_score'] + stat_columns
+        schema = {
+            'id': pl.Int64, 'week_id': pl.Int64, 'team_id': pl.Int64,
+            **{column: pl.Float64 for column in numeric_columns},
+            'homeoraway': pl.Utf8, 'home_score': pl.Int64, 'away_score': pl.Int64,
+        }
+        
+        results: Dict[int, Dict[str, Any]] = {}
+        records = []
+        for row in rows:
+            week = results.setdefault(row.week_id, {'total_teams': 0, 'updated_count': 0, 'teams': [], 'errors': []})
+            week['total_teams'] += 1
+            try:
+                # Numeric columns come back as Decimal; convert once while building the frame
+                records.append(tuple(
+                    float(value) if name in numeric_columns and value is not None else value
+                    for name, value in zip(schema, row)
+                ))
+            except (TypeError, ValueError, ArithmeticError) as e:
+                week['errors'].append(f"Team {row.team_id}: {str(e)}")
+        
+        df = pl.DataFrame(records, schema=schema, orient='row').with_columns(
+            DKDefenseScoringService.points_allowed_from_game_expr(
+                pl.col('homeoraway'), pl.col('home_score'), pl.col('away_score')
+            ).alias('points_allowed')
+        ).rename({'dk_defense_score': 'old_score'})
+        df = DKDefenseScoringService.calculate_defense_scores(df, output_column='new_score')
+        
+        for (week_id,), week_df in df.group_by('week_id', maintain_order=True):
+            week = results[week_id]
+            if not dry_run:
+                try:
+                    with db.begin_nested():
+                        db.execute(update(TeamStats), [
+                            {'id': row_id, 'dk_defense_score': score, 'points_allowed': points_allowed}
+                            for row_id, score, points_allowed in week_df.select('id', 'new_score', 'points_allowed').iter_rows()
+                        ])
+                except Exception as e:
+                    week['errors'].append(f"Week {week_id}: update failed: {str(e)}")
+                    continue
+            for team in week_df.select('team_id', 'old_score', 'new_score', 'points_allowed').iter_rows(named=True):
+                week['updated_count'] += 1
+                week['teams'].append(team)
+        return results
+    
     @staticmethod
     def get_scoring_breakdown(team_stats: TeamStats, points_allowed: int) -> dict:
         """
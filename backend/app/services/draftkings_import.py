@@ -9,39 +9,121 @@ eligibilities.
 """
 
 import asyncio
+import hashlib
+import json
 import logging
-from typing import Dict, List, Optional, Tuple, Union
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import func
-import requests
+import httpx
 from datetime import datetime
 
 from app.models import Player, Team, PlayerPoolEntry
-from app.schemas import DraftKingsImportRequest, DraftKingsImportResponse
+from app.schemas import DraftKingsImportRequest, DraftKingsImportResponse, DraftKingsBatchImportResponse
 from app.services.activity_logging import ActivityLoggingService
+from app.services.http_client import AsyncRateLimiter, create_async_client, gather_bounded, get_rate_limiter
 from app.services.weekly_summary_service import WeeklySummaryService
 
 logger = logging.getLogger(__name__)
 
+# Max draft groups fetched at once in a batch import
+DEFAULT_FETCH_CONCURRENCY = 4
+
+DRAFTKINGS_API_BASE_URL = os.getenv("DRAFTKINGS_API_BASE_URL", "https://api.draftkings.com")
+
+# Requests per second shared by every DraftKings API caller in the process
+DRAFTKINGS_API_RATE_LIMIT = float(os.getenv("DRAFTKINGS_API_RATE_LIMIT", "10"))
+DRAFTKINGS_API_RATE_BURST = int(os.getenv("DRAFTKINGS_API_RATE_BURST", "20"))
+
+
+def draftkings_rate_limiter() -> AsyncRateLimiter:
+    """Process-wide token bucket for DraftKings API requests"""
+    return get_rate_limiter("draftkings", DRAFTKINGS_API_RATE_LIMIT, DRAFTKINGS_API_RATE_BURST)
+
+
+class DraftablesSnapshotCache:
+    """
+    Remembers the last successfully imported draftables response per draft group
+
+    Stores the upstream validators (ETag / Last-Modified), a hash of the raw response
+    body and a digest per draftable, so re-imports can send conditional requests and
+    only process draftables that actually changed since the last import.
+    """
+    
+    def __init__(self):
+        self._snapshots: Dict[str, Dict] = {}
+    
+    def get(self, week_id: int, draft_group: str) -> Optional[Dict]:
+        """Return the snapshot for a draft group if it was taken for the same week"""
+        snapshot = self._snapshots.get(str(draft_group))
+        if snapshot and snapshot['week_id'] == week_id:
+            return snapshot
+        return None
+    
+    def set(self, week_id: int, draft_group: str, etag: Optional[str], last_modified: Optional[str],
+            content_hash: str, digests: Dict[str, str]) -> None:
+        self._snapshots[str(draft_group)] = {
+            'week_id': week_id,
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_hash': content_hash,
+            'digests': digests,
+        }
+    
+    def invalidate(self, draft_group: str) -> None:
+        self._snapshots.pop(str(draft_group), None)
+    
+    def clear(self) -> None:
+        self._snapshots.clear()
+
+
+# Global snapshot cache; services are created per request so state lives at module level
+draftables_snapshot_cache = DraftablesSnapshotCache()
+
+
+def draftable_digest(draftable: Dict) -> str:
+    """Stable content digest for a single draftable"""
+    payload = json.dumps(draftable, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def draftable_key(draftable: Dict) -> str:
+    """Key a draftable by draftableId, falling back to player + position"""
+    draftable_id = draftable.get('draftableId')
+    if draftable_id is not None:
+        return str(draftable_id)
+    return f"{draftable.get('playerDkId')}:{draftable.get('position')}"
+
+
 class DraftKingsImportService:
     """Service for importing player pool data from DraftKings API"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, base_url: Optional[str] = None,
+                 snapshot_cache: Optional[DraftablesSnapshotCache] = None):
         self.db = db
-        self.base_url = "https://api.draftkings.com"
+        self.base_url = base_url or DRAFTKINGS_API_BASE_URL
         # Cache for team abbreviation -> id lookups to minimize DB hits
         self._team_abbrev_to_id_cache: Dict[str, Optional[int]] = {}
+        self._snapshot_cache = snapshot_cache if snapshot_cache is not None else draftables_snapshot_cache
+        # Snapshots fetched in this run, only remembered once the import commits
+        self._pending_snapshots: Dict[str, Dict] = {}
         
-    async def import_player_pool(self, week_id: int, draft_group: str, duration_ms: int = None) -> DraftKingsImportResponse:
+    async def import_player_pool(self, week_id: int, draft_group: str, duration_ms: int = None,
+                                 force_refresh: bool = False) -> DraftKingsImportResponse:
         """
         Import player pool from DraftKings API
+        
+        Unless force_refresh is set, only draftables that changed since the last import
+        of this draft group are processed.
         """
         try:
             logger.info(f"Starting DraftKings import for week_id={week_id}, draft_group={draft_group}")
+            self._prepare_snapshot(week_id, draft_group, force_refresh)
             
             # Fetch draftables from DraftKings API
-            draftables_data = await self._fetch_draftables(draft_group)
+            draftables_data = await self._fetch_draftables(draft_group, week_id=week_id)
             logger.info(f"Fetched {len(draftables_data.get('draftables', []))} draftables from DraftKings API")
             
             # Process draftables and upsert into database
@@ -53,31 +135,279 @@ class DraftKingsImportService:
         except Exception as e:
             logger.error(f"DraftKings import failed: {str(e)}")
             raise e
-    
-    async def _fetch_draftables(self, draft_group: str) -> Dict:
+
+    async def import_player_pools(
+        self,
+        week_id: int,
+        draft_groups: List[str],
+        main_draftgroup: Optional[str] = None,
+        max_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+        force_refresh: bool = False
+    ) -> DraftKingsBatchImportResponse:
         """
-        Fetch draftables data from DraftKings API
-        
-        Args:
-            draft_group: Draft Group ID
-            
-        Returns:
-            API response data
+        Import several draft groups for the same week in one pass
+
+        Draftables for every draft group are fetched concurrently over one pooled client
+        and parsed off the event loop. Players that appear in more than one draft group
+        (most of the main slate shows up again in early/late/showdown groups) are upserted
+        once, and everything is written in a single transaction.
         """
-        url = f"{self.base_url}/draftgroups/v1/draftgroups/{draft_group}/draftables"
-        
+        draft_groups = list(dict.fromkeys(str(group) for group in draft_groups))
+        main_draftgroup = main_draftgroup or draft_groups[0]
+        logger.info(f"Starting batch DraftKings import for week_id={week_id}, draft_groups={draft_groups}")
+
+        errors: List[str] = []
+        group_results: Dict[str, DraftKingsImportResponse] = {}
+        for draft_group in draft_groups:
+            self._prepare_snapshot(week_id, draft_group, force_refresh)
+
+        # Fetch every draft group concurrently over one connection pool
+        async with create_async_client() as client:
+            fetched = await gather_bounded(
+                draft_groups,
+                lambda group: self._fetch_draftables(group, client=client, week_id=week_id),
+                max_concurrency
+            )
+
+        # Parse off the event loop; extraction is pure CPU work over large payloads
+        parse_jobs = []
+        for draft_group, data in zip(draft_groups, fetched):
+            if isinstance(data, Exception):
+                errors.append(f"Draft group {draft_group}: {str(data)}")
+                group_results[draft_group] = self._empty_import_response([str(data)])
+                continue
+            if data.get('notModified'):
+                group_results[draft_group] = self._unchanged_import_response(week_id, draft_group)
+                continue
+            parse_jobs.append(asyncio.to_thread(self._extract_draftables, data, draft_group, week_id))
+        parsed = await asyncio.gather(*parse_jobs)
+
+        # Merge players across draft groups so shared players are written once
+        players: Dict[int, Dict] = {}
+        group_entries: Dict[str, Dict[int, Dict]] = {}
+        group_skipped: Dict[str, int] = {}
+        group_totals: Dict[str, int] = {}
+        group_unchanged: Dict[str, int] = {}
+        group_errors: Dict[str, List[str]] = {}
+        for draft_group, extracted, parse_errors, total, unchanged in parsed:
+            if parse_errors:
+                errors.extend(f"Draft group {draft_group}: {error}" for error in parse_errors)
+            group_errors[draft_group] = list(parse_errors)
+            entries: Dict[int, Dict] = {}
+            skipped = 0
+            for player_data in extracted:
+                player_dk_id = player_data['player']['playerDkId']
+                players.setdefault(player_dk_id, player_data['player'])
+                if player_dk_id in entries:
+                    # Same player listed at multiple positions (e.g. WR and FLEX)
+                    skipped += 1
+                    continue
+                entries[player_dk_id] = player_data['pool_entry']
+            group_entries[draft_group] = entries
+            group_skipped[draft_group] = skipped
+            group_totals[draft_group] = total
+            group_unchanged[draft_group] = unchanged
+            if not extracted:
+                if parse_errors:
+                    group_results[draft_group] = self._empty_import_response(parse_errors)
+                else:
+                    # Every draftable matched its previous digest
+                    self._commit_snapshot(draft_group)
+                    group_results[draft_group] = self._unchanged_import_response(week_id, draft_group)
+
+        players_added = 0
+        players_updated = 0
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"Successfully fetched data for Draft Group {draft_group}")
-            return data
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed for Draft Group {draft_group}: {str(e)}")
-            raise Exception(f"Failed to fetch data from DraftKings API: {str(e)}")
-    
+            # Preload existing rows so the upserts below don't issue per-player lookups
+            existing_players = self._load_existing_players(players.keys())
+            existing_entries = {
+                (entry.draftGroup, entry.playerDkId): entry
+                for entry in self.db.query(PlayerPoolEntry).filter(
+                    PlayerPoolEntry.week_id == week_id,
+                    PlayerPoolEntry.draftGroup.in_(list(group_entries.keys()))
+                ).all()
+            } if group_entries else {}
+
+            for player_dk_id, player_data in players.items():
+                player_result = self._upsert_player_in_transaction(player_data, existing_players)
+                if player_result == "added":
+                    players_added += 1
+                elif player_result == "updated":
+                    players_updated += 1
+
+            for draft_group, entries in group_entries.items():
+                if not entries:
+                    continue
+                added = updated = status_updates = auto_excluded = 0
+                unchanged = group_unchanged[draft_group]
+                skipped = group_skipped[draft_group]
+                for player_dk_id, pool_entry_data in entries.items():
+                    entry_result, status_was_updated = self._upsert_player_pool_entry_in_transaction(
+                        pool_entry_data, week_id, draft_group, player_dk_id, existing_entries
+                    )
+                    if pool_entry_data.get('auto_excluded', False):
+                        auto_excluded += 1
+                    if status_was_updated:
+                        status_updates += 1
+                    if entry_result == "added":
+                        added += 1
+                    elif entry_result == "updated":
+                        updated += 1
+                    else:
+                        skipped += 1
+                        error = f"Pool entry for player {player_dk_id} could not be written"
+                        group_errors[draft_group].append(error)
+                        errors.append(f"Draft group {draft_group}: {error}")
+
+                group_results[draft_group] = DraftKingsImportResponse(
+                    players_added=0,
+                    players_updated=0,
+                    entries_added=added,
+                    entries_updated=updated,
+                    entries_skipped=skipped,
+                    auto_excluded_count=auto_excluded,
+                    status_updates=status_updates,
+                    unchanged_skipped=unchanged,
+                    errors=group_errors[draft_group],
+                    total_processed=group_totals[draft_group]
+                )
+
+            self.db.commit()
+            for draft_group in group_entries:
+                if group_errors[draft_group]:
+                    self._discard_snapshot(draft_group)
+                else:
+                    self._commit_snapshot(draft_group)
+            logger.info(f"Batch import committed: {len(players)} unique players across {len(group_entries)} draft groups")
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Batch import transaction failed: {str(e)}")
+            raise e
+
+        # Weekly summary is refreshed once for the whole batch, limited to players whose draftables changed
+        if not players:
+            logger.info("No draftables changed in any draft group, skipping weekly summary update")
+        else:
+            try:
+                summary_count = WeeklySummaryService.refresh_players(self.db, week_id, players.keys(), main_draftgroup=main_draftgroup)
+                logger.info(f"Successfully updated {summary_count} weekly summary records")
+            except Exception as e:
+                logger.error(f"Failed to update weekly summary: {str(e)}")
+
+        return DraftKingsBatchImportResponse(
+            players_added=players_added,
+            players_updated=players_updated,
+            unique_players=len(players),
+            entries_added=sum(r.entries_added for r in group_results.values()),
+            entries_updated=sum(r.entries_updated for r in group_results.values()),
+            entries_skipped=sum(r.entries_skipped for r in group_results.values()),
+            total_processed=sum(group_totals.values()),
+            errors=errors,
+            draft_groups={group: group_results[group] for group in draft_groups if group in group_results}
+        )
+
+    def _extract_draftables(self, draftables_data: Dict, draft_group: str, week_id: int) -> Tuple[str, List[Dict], List[str], int, int]:
+        """
+        Extract player/pool entry data for every changed draftable in a draft group response
+        Returns: (draft_group, extracted rows, errors, total draftables, unchanged draftables)
+        """
+        draftables = draftables_data.get('draftables', [])
+        if not draftables:
+            return draft_group, [], ["No draftables found in API response"], 0, 0
+
+        # Same fail-fast salary check as the single draft group import
+        if not any(d.get('salary') is not None for d in draftables[:10]):
+            error_msg = f"Draft group {draft_group} has no salary data. This is likely a Full Slate before pricing is available."
+            return draft_group, [], [error_msg], len(draftables), 0
+
+        changed = self._select_changed_draftables(week_id, draft_group, draftables)
+        extracted = []
+        errors = []
+        for draftable in changed:
+            player_data = self._extract_player_data(draftable, draft_group)
+            if player_data:
+                extracted.append(player_data)
+            else:
+                errors.append(f"Failed to extract player data for draftable {draftable_key(draftable)} (player {draftable.get('playerDkId', 'unknown')})")
+        return draft_group, extracted, errors, len(draftables), len(draftables) - len(changed)
+
+    @staticmethod
+    def _empty_import_response(errors: List[str]) -> DraftKingsImportResponse:
+        return DraftKingsImportResponse(
+            players_added=0, players_updated=0, entries_added=0, entries_updated=0,
+            entries_skipped=0, auto_excluded_count=0, status_updates=0, errors=errors, total_processed=0
+        )
+
+    def _unchanged_import_response(self, week_id: int, draft_group: str) -> DraftKingsImportResponse:
+        """Response for a draft group whose draftables are identical to the last import"""
+        snapshot = self._snapshot_cache.get(week_id, draft_group)
+        unchanged = len(snapshot['digests']) if snapshot else 0
+        logger.info(f"Draft group {draft_group} unchanged since last import, skipping {unchanged} draftables")
+        return DraftKingsImportResponse(
+            players_added=0, players_updated=0, entries_added=0, entries_updated=0,
+            entries_skipped=0, auto_excluded_count=0, status_updates=0, unchanged_skipped=unchanged,
+            not_modified=True, errors=[], total_processed=unchanged
+        )
+
+    def _prepare_snapshot(self, week_id: int, draft_group: str, force_refresh: bool) -> None:
+        """
+        Drop the remembered snapshot when it can't be trusted: a forced refresh, or
+        the pool entries it describes are no longer in the database
+        """
+        if force_refresh:
+            self._snapshot_cache.invalidate(draft_group)
+            return
+        if self._snapshot_cache.get(week_id, draft_group) is None:
+            return
+        has_entries = self.db.query(PlayerPoolEntry.id).filter(
+            PlayerPoolEntry.week_id == week_id,
+            PlayerPoolEntry.draftGroup == str(draft_group)
+        ).first() is not None
+        if not has_entries:
+            logger.info(f"No pool entries found for draft group {draft_group}, ignoring cached draftables snapshot")
+            self._snapshot_cache.invalidate(draft_group)
+
+    def _select_changed_draftables(self, week_id: int, draft_group: str, draftables: List[Dict]) -> List[Dict]:
+        """
+        Return the draftables that changed since the last import of this draft group
+
+        Digests are compared per draftable, but a player is processed with all of their
+        draftables when any one of them changed, so the pool entry (built from the first
+        draftable of a player) stays consistent with a full import. Digests are computed
+        before extraction because _extract_player_data normalizes values in place.
+        """
+        digests = {draftable_key(d): draftable_digest(d) for d in draftables}
+        pending = self._pending_snapshots.setdefault(str(draft_group), {})
+        pending['digests'] = digests
+
+        snapshot = self._snapshot_cache.get(week_id, draft_group)
+        if not snapshot:
+            return draftables
+
+        previous = snapshot['digests']
+        changed_players = {
+            d.get('playerDkId') for d in draftables
+            if previous.get(draftable_key(d)) != digests[draftable_key(d)]
+        }
+        changed = [d for d in draftables if d.get('playerDkId') in changed_players]
+        logger.info(f"Draft group {draft_group}: {len(changed)}/{len(draftables)} draftables changed since last import")
+        return changed
+
+    def _commit_snapshot(self, draft_group: str) -> None:
+        """Remember the fetched snapshot once its draftables are safely in the database"""
+        pending = self._pending_snapshots.pop(str(draft_group), None)
+        if not pending or not all(key in pending for key in ('week_id', 'content_hash', 'digests')):
+            return
+        self._snapshot_cache.set(
+            pending['week_id'], draft_group, pending.get('etag'), pending.get('last_modified'),
+            pending['content_hash'], pending['digests']
+        )
+
+    def _discard_snapshot(self, draft_group: str) -> None:
+        """Forget a draft group's snapshot so draftables that failed are retried next time"""
+        self._pending_snapshots.pop(str(draft_group), None)
+        self._snapshot_cache.invalidate(draft_group)
+
     async def _process_draftables(self, draftables_data: dict, week_id: int, draft_group: str) -> DraftKingsImportResponse:
         """Process draftables data and upsert into database"""
         # Initialize counters
@@ -90,6 +420,9 @@ class DraftKingsImportService:
         status_updates = 0  # Counter for status field updates
         errors = []
         
+        if draftables_data.get('notModified'):
+            return self._unchanged_import_response(week_id, draft_group)
+        
         # Extract the draftables array from the response
         draftables = draftables_data.get('draftables', [])
         if not draftables:
@@ -112,6 +445,11 @@ class DraftKingsImportService:
                 entries_skipped=0, auto_excluded_count=0, status_updates=0, errors=errors, total_processed=0
             )
         
+        # Only process draftables that changed since the last import of this draft group
+        total_draftables = len(draftables)
+        draftables = self._select_changed_draftables(week_id, draft_group, draftables)
+        unchanged_skipped = total_draftables - len(draftables)
+        
         # Track processed players to avoid duplicates within this import
         processed_players = set()
         # Track players that were already processed in this import for better logging
@@ -121,14 +459,17 @@ class DraftKingsImportService:
         
         # Start a single transaction for the entire import
         try:
+            existing_players = self._load_existing_players(d.get('playerDkId') for d in draftables)
             logger.info(f"Processing {len(draftables)} draftables...")
             
             for i, draftable in enumerate(draftables):
                 try:
                     # Extract player data
-                    player_data = self._extract_player_data(draftable)
+                    player_data = self._extract_player_data(draftable, draft_group)
                     if not player_data:
-                        logger.warning(f"Failed to extract player data for draftable {i+1}/{len(draftables)}: {draftable.get('playerDkId', 'unknown')}")
+                        error_msg = f"Failed to extract player data for draftable {i+1}/{len(draftables)}: {draftable.get('playerDkId', 'unknown')}"
+                        errors.append(error_msg)
+                        logger.warning(error_msg)
                         continue
                     
                     player_dk_id = player_data['player']['playerDkId']
@@ -150,7 +491,7 @@ class DraftKingsImportService:
                         processed_players.add(player_dk_id)
                         
                         # Upsert player (without committing yet)
-                        player_result = self._upsert_player_in_transaction(player_data['player'])
+                        player_result = self._upsert_player_in_transaction(player_data['player'], existing_players)
                         
                         # Store the result for potential future duplicates
                         player_processing_results[player_dk_id] = {
@@ -210,6 +551,10 @@ class DraftKingsImportService:
             
             # Commit all changes at once
             self.db.commit()
+            if errors:
+                self._discard_snapshot(draft_group)
+            else:
+                self._commit_snapshot(draft_group)
             logger.info(f"Successfully committed import: {players_added} players added, {players_updated} updated, {entries_added} entries added, {entries_updated} updated")
             if status_updates > 0:
                 logger.info(f"Status updates applied to {status_updates} players")
@@ -219,14 +564,17 @@ class DraftKingsImportService:
             logger.info(f"Processed {len(processed_players)} unique players across {len(draftables)} draftables")
             
             # Update weekly summary after successful import
-            try:
-                logger.info(f"Updating weekly summary for week {week_id}")
-                summary_count = WeeklySummaryService.populate_weekly_summary(self.db, week_id, main_draftgroup=draft_group)
-                logger.info(f"Successfully updated {summary_count} weekly summary records")
-            except Exception as e:
-                logger.error(f"Failed to update weekly summary: {str(e)}")
-                # Don't fail the import if weekly summary update fails
-                # The import was successful, weekly summary is supplementary
+            if not draftables:
+                logger.info(f"No draftables changed for draft group {draft_group}, skipping weekly summary update")
+            else:
+                try:
+                    logger.info(f"Updating weekly summary for week {week_id}")
+                    summary_count = WeeklySummaryService.refresh_players(self.db, week_id, processed_players, main_draftgroup=draft_group)
+                    logger.info(f"Successfully updated {summary_count} weekly summary records")
+                except Exception as e:
+                    logger.error(f"Failed to update weekly summary: {str(e)}")
+                    # Don't fail the import if weekly summary update fails
+                    # The import was successful, weekly summary is supplementary
             
             # Log details about duplicate handling
             if len(draftables) > len(processed_players):
@@ -257,35 +605,74 @@ class DraftKingsImportService:
             entries_skipped=entries_skipped,
             auto_excluded_count=auto_excluded_count,
             status_updates=status_updates,
+            unchanged_skipped=unchanged_skipped,
             errors=errors,
-            total_processed=len(draftables)
+            total_processed=total_draftables
         )
     
-    async def _fetch_draftables(self, draft_group: str) -> Dict:
+    async def _fetch_draftables(self, draft_group: str, client: Optional[httpx.AsyncClient] = None,
+                                week_id: Optional[int] = None) -> Dict:
         """
         Fetch draftables data from DraftKings API
         
+        When week_id is given and this draft group was imported before, the request is
+        sent with If-None-Match / If-Modified-Since. A 304, or a body whose hash matches
+        the last import, returns {'draftables': [], 'notModified': True} without decoding.
+        
         Args:
             draft_group: Draft Group ID
+            client: Optional shared client; a short-lived one is created when omitted
+            week_id: Week being imported, enables conditional fetching
             
         Returns:
             API response data
         """
         url = f"{self.base_url}/draftgroups/v1/draftgroups/{draft_group}/draftables"
+        snapshot = self._snapshot_cache.get(week_id, draft_group) if week_id is not None else None
+        
+        headers = {}
+        if snapshot:
+            if snapshot.get('etag'):
+                headers['If-None-Match'] = snapshot['etag']
+            if snapshot.get('last_modified'):
+                headers['If-Modified-Since'] = snapshot['last_modified']
         
         try:
-            response = requests.get(url, timeout=30)
+            if client is None:
+                async with create_async_client() as own_client:
+                    response = await own_client.get(url, headers=headers)
+            else:
+                response = await client.get(url, headers=headers)
+            
+            if response.status_code == 304 and snapshot:
+                logger.info(f"Draft Group {draft_group} not modified upstream (304)")
+                return {'draftables': [], 'notModified': True}
             response.raise_for_status()
             
-            data = response.json()
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            if snapshot and snapshot['content_hash'] == content_hash:
+                logger.info(f"Draft Group {draft_group} response identical to last import")
+                return {'draftables': [], 'notModified': True}
+            
+            if week_id is not None:
+                pending = self._pending_snapshots.setdefault(str(draft_group), {})
+                pending.update({
+                    'week_id': week_id,
+                    'etag': response.headers.get('etag'),
+                    'last_modified': response.headers.get('last-modified'),
+                    'content_hash': content_hash,
+                })
+            
+            # Large slates are several MB of JSON; decode off the event loop
+            data = await asyncio.to_thread(response.json)
             logger.info(f"Successfully fetched data for Draft Group {draft_group}")
             return data
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"API request failed for Draft Group {draft_group}: {str(e)}")
             raise Exception(f"Failed to fetch data from DraftKings API: {str(e)}")
     
-    def _extract_player_data(self, draftable: Dict) -> Optional[Dict]:
+    def _extract_player_data(self, draftable: Dict, draft_group: Optional[str] = None) -> Optional[Dict]:
         """Extract player data from draftable"""
         try:
             # Handle nested objects and arrays properly
@@ -430,10 +817,23 @@ class DraftKingsImportService:
             logger.error(f"Error extracting player data from draftable: {str(e)}")
             return None
     
-    def _upsert_player_in_transaction(self, player_data: Dict) -> str:
+    def _load_existing_players(self, player_dk_ids: Iterable[Any]) -> Dict[int, Player]:
+        """playerDkId -> Player for the given ids, loaded with one query"""
+        player_dk_ids = {player_dk_id for player_dk_id in player_dk_ids if player_dk_id}
+        if not player_dk_ids:
+            return {}
+        return {
+            player.playerDkId: player
+            for player in self.db.query(Player).filter(Player.playerDkId.in_(player_dk_ids)).all()
+        }
+
+    def _upsert_player_in_transaction(self, player_data: Dict, existing_players: Optional[Dict[int, Player]] = None) -> str:
         """
         Upsert player record within a transaction (no commit)
         Returns: 'added' or 'updated'
+        
+        existing_players: optional preloaded playerDkId -> Player map; when given, no
+        per-player lookup query is issued and players added here are recorded in it
         """
         try:
             # Resolve team_id from team abbreviation (if available)
@@ -466,15 +866,18 @@ class DraftKingsImportService:
                 'playerImage160': player_data['playerImage160']
             }
             
-            # Check if player exists in database
-            existing_player = self.db.query(Player).filter(Player.playerDkId == player_fields['playerDkId']).first()
-            
-            # Also check if player is already in the current session (to prevent duplicates within same transaction)
-            session_players = [obj for obj in self.db.new if isinstance(obj, Player) and hasattr(obj, 'playerDkId') and obj.playerDkId == player_fields['playerDkId']]
-            
-            if session_players:
-                logger.warning(f"Player {player_fields['playerDkId']} already in current session, skipping duplicate")
-                return "skipped"
+            # Check if player exists in database, or was already added in this transaction
+            if existing_players is not None:
+                existing_player = existing_players.get(player_fields['playerDkId'])
+            else:
+                existing_player = self.db.get(Player, player_fields['playerDkId'])
+                
+                # Also check if player is already in the current session (to prevent duplicates within same transaction)
+                session_players = [obj for obj in self.db.new if isinstance(obj, Player) and hasattr(obj, 'playerDkId') and obj.playerDkId == player_fields['playerDkId']]
+                
+                if session_players:
+                    logger.warning(f"Player {player_fields['playerDkId']} already in current session, skipping duplicate")
+                    return "skipped"
             
             if existing_player:
                 # Update existing player - only update fields that might change
@@ -500,6 +903,8 @@ class DraftKingsImportService:
                 # Add new player
                 new_player = Player(**player_fields)
                 self.db.add(new_player)
+                if existing_players is not None:
+                    existing_players[new_player.playerDkId] = new_player
                 logger.debug(f"Added new player: {new_player.playerDkId} - {new_player.displayName}")
                 return "added"
                 
@@ -536,19 +941,26 @@ class DraftKingsImportService:
         pool_entry_data: Dict, 
         week_id: int, 
         draft_group: str,
-        player_dk_id: int
+        player_dk_id: int,
+        existing_entries: Optional[Dict[Tuple[str, int], PlayerPoolEntry]] = None
     ) -> Tuple[str, bool]:
         """
         Upsert player pool entry record within a transaction (no commit)
         Returns: ('added'/'updated'/'skipped', status_updated_boolean)
+        
+        existing_entries: optional preloaded (draftGroup, playerDkId) -> entry map for
+        the week; when given, no per-entry lookup query is issued
         """
         try:
             # Check if entry exists
-            existing_entry = self.db.query(PlayerPoolEntry).filter(
-                PlayerPoolEntry.week_id == week_id,
-                PlayerPoolEntry.draftGroup == draft_group,
-                PlayerPoolEntry.playerDkId == player_dk_id
-            ).first()
+            if existing_entries is not None:
+                existing_entry = existing_entries.get((draft_group, player_dk_id))
+            else:
+                existing_entry = self.db.query(PlayerPoolEntry).filter(
+                    PlayerPoolEntry.week_id == week_id,
+                    PlayerPoolEntry.draftGroup == draft_group,
+                    PlayerPoolEntry.playerDkId == player_dk_id
+                ).first()
             
             if existing_entry:
                 # Update existing entry - this handles cases where the same player appears
@@ -8,48 +8,49 @@ import logging
 from typing import Dict, List, Optional, Any
 import httpx
 from datetime import datetime
-import time
+
+from app.services.draftkings_import import DRAFTKINGS_API_BASE_URL, draftkings_rate_limiter
+from app.services.http_client import AsyncRateLimiter, create_async_client, gather_bounded, request_with_retry
 
 logger = logging.getLogger(__name__)
 
+# Requests in flight at once for batch fetches
+DEFAULT_BATCH_CONCURRENCY = 8
+
 class DraftKingsLeaderboardService:
     """Service for fetching leaderboard data from DraftKings API"""
     
-    def __init__(self):
-        self.base_url = "https://api.draftkings.com"
-        self.session = None
-        # Rate limiting: max 10 requests per second
-        self._last_request_time = 0
-        self._min_request_interval = 0.1  # 100ms between requests
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[AsyncRateLimiter] = None
+    ):
+        self.base_url = DRAFTKINGS_API_BASE_URL
+        self.session = client
+        # Token bucket shared with every other DraftKings API caller in the process
+        self.rate_limiter = rate_limiter or draftkings_rate_limiter()
+        self._owns_session = False
         
     async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = httpx.AsyncClient(
-            timeout=30.0,
-            headers={
-                'User-Agent': 'DFS-App/1.0',
-                'Accept': 'application/json',
-                'Accept-Encoding': 'gzip, deflate'
-            }
-        )
+        """Async context manager entry; reuses a client passed to the constructor"""
+        if self.session is None:
+            self.session = create_async_client(
+                headers={
+                    'User-Agent': 'DFS-App/1.0',
+                    'Accept': 'application/json',
+                    'Accept-Encoding': 'gzip, deflate'
+                }
+            )
+            self._owns_session = True
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.aclose()
+            self.session = None
+            self._owns_session = False
             
-    async def _rate_limit(self):
-        """Implement rate limiting between requests"""
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
-        
-        if time_since_last_request < self._min_request_interval:
-            sleep_time = self._min_request_interval - time_since_last_request
-            await asyncio.sleep(sleep_time)
-            
-        self._last_request_time = time.time()
-        
     async def get_leaderboard(self, contest_id: str) -> Dict[str, Any]:
         """
         Fetch leaderboard data for a specific contest
@@ -65,8 +66,6 @@ class DraftKingsLeaderboardService:
             ValueError: If contest data is invalid or no opponent found
         """
         try:
-            await self._rate_limit()
-            
             url = f"{self.base_url}/scores/v1/leaderboards/{contest_id}"
             params = {
                 'format': 'json'
@@ -77,7 +76,9 @@ class DraftKingsLeaderboardService:
             if not self.session:
                 raise RuntimeError("Service not initialized. Use async context manager.")
                 
-            response = await self.session.get(url, params=params)
+            response = await request_with_retry(
+                self.session, "GET", url, rate_limiter=self.rate_limiter, params=params
+            )
             
             # Try to parse response even if status is not 200
             try:
@@ -225,30 +226,38 @@ class DraftKingsLeaderboardService:
         
         return []
         
-    async def batch_get_leaderboards(self, contest_ids: List[str]) -> Dict[str, Any]:
+    async def batch_get_leaderboards(
+        self,
+        contest_ids: List[str],
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> Dict[str, Any]:
         """
-        Fetch leaderboard data for multiple contests with rate limiting
+        Fetch leaderboard data for multiple contests concurrently
+        
+        Requests share the DraftKings rate limiter, so at most max_concurrency are in
+        flight and the overall request rate stays within the API budget.
         
         Args:
             contest_ids: List of contest IDs to fetch
+            max_concurrency: Maximum number of requests in flight at once
             
         Returns:
             Dict mapping contest_id to leaderboard data or error
         """
-        results = {}
+        fetched = await gather_bounded(contest_ids, self.get_leaderboard, max_concurrency)
         
-        for contest_id in contest_ids:
-            try:
-                result = await self.get_leaderboard(contest_id)
+        results = {}
+        for contest_id, result in zip(contest_ids, fetched):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to fetch leaderboard for contest {contest_id}: {result}")
                 results[contest_id] = {
-                    'success': True,
-                    'data': result
+                    'success': False,
+                    'error': str(result)
                 }
-            except Exception as e:
-                logger.error(f"Failed to fetch leaderboard for contest {contest_id}: {e}")
+            else:
                 results[contest_id] = {
-                    'success': False,
-                    'error': str(e)
+                    'success': True,
+                    'data': result
                 }
         
         return results
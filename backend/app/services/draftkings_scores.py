@@ -8,48 +8,49 @@ import logging
 from typing import Dict, List, Optional, Any
 import httpx
 from datetime import datetime
-import time
+
+from app.services.draftkings_import import DRAFTKINGS_API_BASE_URL, draftkings_rate_limiter
+from app.services.http_client import AsyncRateLimiter, create_async_client, gather_bounded, request_with_retry
 
 logger = logging.getLogger(__name__)
 
+# Requests in flight at once for batch fetches
+DEFAULT_BATCH_CONCURRENCY = 8
+
 class DraftKingsScoresService:
     """Service for fetching roster data from DraftKings Scores API"""
     
-    def __init__(self):
-        self.base_url = "https://api.draftkings.com"
-        self.session = None
-        # Rate limiting: max 10 requests per second
-        self._last_request_time = 0
-        self._min_request_interval = 0.1  # 100ms between requests
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[AsyncRateLimiter] = None
+    ):
+        self.base_url = DRAFTKINGS_API_BASE_URL
+        self.session = client
+        # Token bucket shared with every other DraftKings API caller in the process
+        self.rate_limiter = rate_limiter or draftkings_rate_limiter()
+        self._owns_session = False
         
     async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = httpx.AsyncClient(
-            timeout=30.0,
-            headers={
-                'User-Agent': 'DFS-App/1.0',
-                'Accept': 'application/json',
-                'Accept-Encoding': 'gzip, deflate'
-            }
-        )
+        """Async context manager entry; reuses a client passed to the constructor"""
+        if self.session is None:
+            self.session = create_async_client(
+                headers={
+                    'User-Agent': 'DFS-App/1.0',
+                    'Accept': 'application/json',
+                    'Accept-Encoding': 'gzip, deflate'
+                }
+            )
+            self._owns_session = True
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.aclose()
+            self.session = None
+            self._owns_session = False
             
-    async def _rate_limit(self):
-        """Implement rate limiting between requests"""
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
-        
-        if time_since_last_request < self._min_request_interval:
-            sleep_time = self._min_request_interval - time_since_last_request
-            await asyncio.sleep(sleep_time)
-            
-        self._last_request_time = time.time()
-        
     async def get_roster(self, draft_group_id: str, entry_key: str) -> Dict[str, Any]:
         """
         Fetch roster data for a specific contest entry
@@ -66,8 +67,6 @@ class DraftKingsScoresService:
             ValueError: If roster data is invalid or cannot be parsed
         """
         try:
-            await self._rate_limit()
-            
             url = f"{self.base_url}/scores/v2/entries/{draft_group_id}/{entry_key}"
             params = {
                 'format': 'json',
@@ -79,7 +78,9 @@ class DraftKingsScoresService:
             if not self.session:
                 raise RuntimeError("Service not initialized. Use async context manager.")
                 
-            response = await self.session.get(url, params=params)
+            response = await request_with_retry(
+                self.session, "GET", url, rate_limiter=self.rate_limiter, params=params
+            )
             
             # Try to parse response even if status is not 200
             try:
@@ -298,17 +299,26 @@ class DraftKingsScoresService:
                 'error': str(e)
             }
             
-    async def batch_get_rosters(self, roster_requests: List[Dict[str, str]]) -> Dict[str, Any]:
+    async def batch_get_rosters(
+        self,
+        roster_requests: List[Dict[str, str]],
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> Dict[str, Any]:
         """
-        Fetch roster data for multiple entries with rate limiting
+        Fetch roster data for multiple entries concurrently
+        
+        Requests share the DraftKings rate limiter, so at most max_concurrency are in
+        flight and the overall request rate stays within the API budget.
         
         Args:
             roster_requests: List of dicts with 'draft_group_id' and 'entry_key'
+            max_concurrency: Maximum number of requests in flight at once
             
         Returns:
             Dict mapping entry_key to roster data or error
         """
         results = {}
+        valid_requests = []
         
         for request in roster_requests:
             draft_group_id = request.get('draft_group_id')
@@ -320,18 +330,25 @@ class DraftKingsScoresService:
                     'error': 'Missing draft_group_id or entry_key'
                 }
                 continue
-                
-            try:
-                result = await self.get_roster(draft_group_id, entry_key)
+            valid_requests.append((draft_group_id, entry_key))
+        
+        fetched = await gather_bounded(
+            valid_requests,
+            lambda request: self.get_roster(*request),
+            max_concurrency
+        )
+        
+        for (draft_group_id, entry_key), result in zip(valid_requests, fetched):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to fetch roster for {draft_group_id}/{entry_key}: {result}")
                 results[f"{draft_group_id}_{entry_key}"] = {
-                    'success': True,
-                    'data': result
+                    'success': False,
+                    'error': str(result)
                 }
-            except Exception as e:
-                logger.error(f"Failed to fetch roster for {draft_group_id}/{entry_key}: {e}")
+            else:
                 results[f"{draft_group_id}_{entry_key}"] = {
-                    'success': False,
-                    'error': str(e)
+                    'success': True,
+                    'data': result
                 }
         
         return results
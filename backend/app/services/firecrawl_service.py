@@ -391,6 +391,10 @@ class FirecrawlService:
         """
         Process a scraping job by scraping all pending URLs.
         
+        Each URL's outcome and the job counters are committed as soon as the URL is
+        done, so a job interrupted by a restart resumes from its remaining pending URLs
+        when processed again.
+        
         Args:
             job_id: ID of the scraping job to process
             
@@ -417,8 +421,9 @@ class FirecrawlService:
                 ScrapingJobUrl.status == "pending"
             ).all()
             
-            completed_count = 0
-            failed_count = 0
+            # Counters carry over from earlier runs of an interrupted job
+            completed_count = job.completed_urls or 0
+            failed_count = job.failed_urls or 0
             
             # Process each URL
             for job_url in pending_urls:
@@ -460,10 +465,13 @@ class FirecrawlService:
                     job_url.processed_at = datetime.utcnow()
                     failed_count += 1
                     logger.error(f"Error processing URL {job_url.url}: {e}")
+                
+                # Checkpoint the URL and the job counters
+                job.completed_urls = completed_count
+                job.failed_urls = failed_count
+                db_session.commit()
             
             # Update job status
-            job.completed_urls = completed_count
-            job.failed_urls = failed_count
             job.status = "completed" if failed_count == 0 else "completed"  # Still completed even with some failures
             job.completed_at = datetime.utcnow()
             
@@ -0,0 +1,191 @@
+"""
+Shared HTTP client helpers for outbound API calls (DraftKings, Odds-API, etc.)
+
+Creating a new httpx.AsyncClient per request throws away the connection pool and
+forces a fresh TCP/TLS handshake every time. These helpers build one pooled client
+per import run and fan requests out over it with bounded concurrency. Requests to
+rate-limited APIs go through a shared per-API token bucket and are retried with
+exponential backoff on throttling, 5xx responses and transport errors.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Connection pool limits shared by all import clients
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_TIMEOUT_SECONDS = 30.0
+
+# Retry policy for transient failures
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 10.0
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def create_async_client(
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE,
+    **kwargs: Any,
+) -> httpx.AsyncClient:
+    """
+    Create a pooled httpx.AsyncClient for a batch of outbound requests.
+
+    Callers own the client and should use it as an async context manager so the
+    pool is closed when the batch is done.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+    )
+    return httpx.AsyncClient(timeout=timeout, limits=limits, **kwargs)
+
+
+async def gather_bounded(
+    items: Iterable[T],
+    worker: Callable[[T], Awaitable[R]],
+    concurrency: int,
+    return_exceptions: bool = True,
+) -> List[Any]:
+    """
+    Run ``worker`` for every item with at most ``concurrency`` calls in flight.
+
+    Results are returned in the same order as ``items``. With return_exceptions=True
+    a failing item yields its exception instead of cancelling the whole batch.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _run(item: T) -> R:
+        async with semaphore:
+            return await worker(item)
+
+    return await asyncio.gather(
+        *(_run(item) for item in items),
+        return_exceptions=return_exceptions,
+    )
+
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket limiting requests per second across every coroutine that shares it.
+
+    ``rate`` tokens are added per second up to ``burst``; each request takes one token
+    and waits for the next one when the bucket is empty.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst if burst is not None else rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Limiters are process-wide, but an asyncio.Lock only works on one event loop;
+        # scripts that call asyncio.run() more than once get a fresh lock per loop
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    async def acquire(self) -> None:
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_rate_limiters: Dict[str, AsyncRateLimiter] = {}
+
+
+def get_rate_limiter(name: str, rate: float, burst: Optional[int] = None) -> AsyncRateLimiter:
+    """
+    Process-wide rate limiter for one upstream API.
+
+    Every import hitting the same API shares the bucket, so concurrent requests and
+    overlapping imports together stay under the API's limit.
+    """
+    limiter = _rate_limiters.get(name)
+    if limiter is None:
+        limiter = AsyncRateLimiter(rate, burst)
+        _rate_limiters[name] = limiter
+    return limiter
+
+
+def _retry_delay(attempt: int, backoff: float, response: Optional[httpx.Response] = None) -> float:
+    """Exponential backoff with jitter, honouring a numeric Retry-After header"""
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(MAX_BACKOFF_SECONDS, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+    delay = backoff * (2 ** attempt)
+    return min(MAX_BACKOFF_SECONDS, delay + random.uniform(0, delay / 2))
+
+
+async def request_with_retry(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    rate_limiter: Optional[AsyncRateLimiter] = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF_SECONDS,
+    retry_statuses: Iterable[int] = RETRY_STATUS_CODES,
+    **kwargs: Any,
+) -> httpx.Response:
+    """
+    Send a request, retrying throttled (429), 5xx and transport failures.
+
+    Each attempt waits for a token from ``rate_limiter`` when one is given. The last
+    response is returned as-is once retries run out, so callers still decide how to
+    handle error statuses (usually via ``raise_for_status``).
+    """
+    retry_statuses = frozenset(retry_statuses)
+    attempt = 0
+    while True:
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            if attempt >= max_retries:
+                raise
+            delay = _retry_delay(attempt, backoff)
+            logger.warning(f"{method} {url} failed ({e!r}), retrying in {delay:.2f}s")
+        else:
+            if response.status_code not in retry_statuses or attempt >= max_retries:
+                return response
+            delay = _retry_delay(attempt, backoff, response)
+            logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.2f}s")
+        attempt += 1
+        await asyncio.sleep(delay)
@@ -0,0 +1,271 @@
+"""
+Import Job Store
+
+Durable state for long-running background imports, kept in the import_jobs table.
+
+Features:
+- Status, message, progress counters, checkpoint and results per job
+- Every write runs in its own short session and commits, so job state survives
+  restarts and is visible to every worker regardless of the import's own transaction
+- Stale detection: a pending or in-progress job that stopped updating is treated as abandoned
+  and can be resumed from its checkpoint
+- Heartbeat: a background thread keeps updated_at current while a job is busy in a long
+  phase that records no progress, so a live job is never mistaken for an abandoned one
+- Finished jobs are pruned after a retention period
+"""
+
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, delete, or_
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("completed", "failed")
+
+# An in-progress job without an update for this long is considered abandoned
+STALE_JOB_SECONDS = 10 * 60
+
+# How often heartbeat() refreshes a running job; well inside STALE_JOB_SECONDS
+HEARTBEAT_SECONDS = 60
+
+# Finished jobs are kept this long before create() prunes them
+JOB_RETENTION_DAYS = 30
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive timestamps; they are stored in UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class ImportJobStore:
+    """
+    Persists import job state in the import_jobs table.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        self.session_factory = session_factory or SessionLocal
+        if self.session_factory is None:
+            raise RuntimeError("Database not available")
+
+    def create(
+        self,
+        job_type: str,
+        params: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+        message: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Create a pending job and prune finished jobs past the retention period"""
+        now = datetime.now(timezone.utc)
+        job = ImportJob(
+            id=job_id or str(uuid.uuid4()),
+            job_type=job_type,
+            status="pending",
+            message=message,
+            params=jsonable_encoder(params or {}),
+            created_at=now,
+            updated_at=now,
+        )
+        db = self.session_factory()
+        try:
+            db.add(job)
+            db.commit()
+            created = self._to_dict(job)
+        finally:
+            db.close()
+
+        try:
+            self.prune()
+        except Exception as e:
+            logger.warning(f"Failed to prune finished import jobs: {e}")
+        return created
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        db = self.session_factory()
+        try:
+            job = db.get(ImportJob, job_id)
+            return self._to_dict(job) if job else None
+        finally:
+            db.close()
+
+    def list(
+        self,
+        job_type: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """Most recent jobs first"""
+        db = self.session_factory()
+        try:
+            query = db.query(ImportJob)
+            if job_type:
+                query = query.filter(ImportJob.job_type == job_type)
+            if status:
+                query = query.filter(ImportJob.status == status)
+            jobs = query.order_by(ImportJob.created_at.desc()).limit(limit).all()
+            return [self._to_dict(job) for job in jobs]
+        finally:
+            db.close()
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """
+        Set any of status, message, progress, checkpoint and results on a job.
+        Values are converted to JSON-safe data before they are stored.
+        """
+        values = {key: jsonable_encoder(value) for key, value in fields.items()}
+        values["updated_at"] = datetime.now(timezone.utc)
+        if values.get("status") == "in_progress":
+            values.setdefault("started_at", values["updated_at"])
+        if values.get("status") in FINISHED_STATUSES:
+            values["completed_at"] = values["updated_at"]
+
+        db = self.session_factory()
+        try:
+            db.query(ImportJob).filter(ImportJob.id == job_id).update(values, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def touch(self, job_id: str) -> None:
+        """Refresh updated_at of a pending or in-progress job without changing anything else"""
+        db = self.session_factory()
+        try:
+            db.query(ImportJob).filter(
+                ImportJob.id == job_id,
+                ImportJob.status.in_(("pending", "in_progress")),
+            ).update({"updated_at": datetime.now(timezone.utc)}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    @contextmanager
+    def heartbeat(self, job_id: str, interval_seconds: float = HEARTBEAT_SECONDS) -> Iterator[None]:
+        """
+        Touch the job every interval_seconds while the block runs.
+
+        The heartbeat stops with the worker process, so a job whose worker died still
+        goes stale and becomes resumable.
+        """
+        stopped = threading.Event()
+
+        def beat() -> None:
+            while not stopped.wait(interval_seconds):
+                try:
+                    self.touch(job_id)
+                except Exception as e:
+                    logger.warning(f"Import job {job_id} heartbeat failed: {e}")
+
+        thread = threading.Thread(target=beat, name=f"import-job-heartbeat-{job_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+    def start(self, job_id: str, message: Optional[str] = None) -> None:
+        if message is None:
+            self.update(job_id, status="in_progress")
+        else:
+            self.update(job_id, status="in_progress", message=message)
+
+    def complete(self, job_id: str, message: str, **fields: Any) -> None:
+        self.update(job_id, status="completed", message=message, **fields)
+
+    def fail(self, job_id: str, message: str, **fields: Any) -> None:
+        self.update(job_id, status="failed", message=message, **fields)
+
+    def claim(
+        self,
+        job_id: str,
+        message: Optional[str] = None,
+        stale_after_seconds: int = STALE_JOB_SECONDS,
+    ) -> bool:
+        """
+        Atomically mark a resumable job in_progress.
+
+        One conditional UPDATE checks and starts the job, so when two resume requests race
+        only one of them gets True. Same rule as is_resumable: the job failed, or it is
+        pending/in progress without an update for stale_after_seconds.
+        """
+        values: Dict[str, Any] = {"status": "in_progress", "updated_at": datetime.now(timezone.utc)}
+        values["started_at"] = values["updated_at"]
+        if message is not None:
+            values["message"] = message
+        stale_cutoff = values["updated_at"] - timedelta(seconds=stale_after_seconds)
+
+        db = self.session_factory()
+        try:
+            claimed = db.query(ImportJob).filter(
+                ImportJob.id == job_id,
+                or_(
+                    ImportJob.status == "failed",
+                    and_(
+                        ImportJob.status.in_(("pending", "in_progress")),
+                        or_(ImportJob.updated_at.is_(None), ImportJob.updated_at < stale_cutoff),
+                    ),
+                ),
+            ).update(values, synchronize_session=False)
+            db.commit()
+            return claimed == 1
+        finally:
+            db.close()
+
+    @staticmethod
+    def is_stale(job: Dict[str, Any], stale_after_seconds: int = STALE_JOB_SECONDS) -> bool:
+        """True when a pending or in-progress job has not been updated recently"""
+        if job["status"] not in ("pending", "in_progress"):
+            return False
+        updated_at = _as_utc(job.get("updated_at"))
+        if updated_at is None:
+            return True
+        return datetime.now(timezone.utc) - updated_at > timedelta(seconds=stale_after_seconds)
+
+    @classmethod
+    def is_resumable(cls, job: Dict[str, Any], stale_after_seconds: int = STALE_JOB_SECONDS) -> bool:
+        """Failed jobs and jobs abandoned by a worker that stopped (stale) can be resumed"""
+        return job["status"] == "failed" or cls.is_stale(job, stale_after_seconds)
+
+    def prune(self, retention_days: int = JOB_RETENTION_DAYS) -> int:
+        """Delete finished jobs that completed more than retention_days ago"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                delete(ImportJob).where(
+                    ImportJob.status.in_(FINISHED_STATUSES),
+                    ImportJob.completed_at < cutoff,
+                )
+            )
+            db.commit()
+            return result.rowcount or 0
+        finally:
+            db.close()
+
+    @staticmethod
+    def _to_dict(job: ImportJob) -> Dict[str, Any]:
+        return {
+            "id": job.id,
+            "job_type": job.job_type,
+            "status": job.status,
+            "message": job.message,
+            "params": job.params or {},
+            "progress": job.progress,
+            "checkpoint": job.checkpoint or {},
+            "results": job.results,
+            "started_at": _as_utc(job.started_at),
+            "completed_at": _as_utc(job.completed_at),
+            "created_at": _as_utc(job.created_at),
+            "updated_at": _as_utc(job.updated_at),
+        }
@@ -0,0 +1,128 @@
+"""
+Lineup Export Service
+
+Builds DraftKings bulk-upload CSVs for saved lineups.
+
+Features:
+- Loads only the draftableIds of the players in the exported lineups, with one query
+- Rows are written in DraftKings Classic slot order (QB, RB, RB, WR, WR, WR, TE, FLEX, DST)
+- Streams the CSV in chunks of rows
+- Marks every exported lineup with a single UPDATE
+"""
+
+import csv
+import io
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, update
+from sqlalchemy.orm import Session
+
+from ..models import Lineup, PlayerPoolEntry
+from ..utils.bulk_upsert import chunked
+
+logger = logging.getLogger(__name__)
+
+# Lineup slot name -> DraftKings upload column, in upload order
+DK_CLASSIC_SLOTS = (
+    ("QB", "QB"),
+    ("RB1", "RB"),
+    ("RB2", "RB"),
+    ("WR1", "WR"),
+    ("WR2", "WR"),
+    ("WR3", "WR"),
+    ("TE", "TE"),
+    ("FLEX", "FLEX"),
+    ("DST", "DST"),
+)
+DK_CLASSIC_HEADER = [dk_slot for _, dk_slot in DK_CLASSIC_SLOTS]
+
+
+class LineupExportService:
+    """
+    Service to export lineups as DraftKings upload CSVs.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_lineups(self, lineup_id: Optional[str] = None, week_id: Optional[int] = None) -> List[Any]:
+        """Lineups (id, name, week_id, slots) to export, oldest first"""
+        query = self.db.query(Lineup.id, Lineup.name, Lineup.week_id, Lineup.slots)
+        if lineup_id is not None:
+            query = query.filter(Lineup.id == lineup_id)
+        if week_id is not None:
+            query = query.filter(Lineup.week_id == week_id)
+        return query.order_by(Lineup.created_at, Lineup.id).all()
+
+    def get_draftable_ids(self, lineups: Iterable[Any]) -> Dict[Tuple[int, int], str]:
+        """
+        Map (week_id, playerDkId) to draftableId for the players in the lineups
+
+        When a player has pool entries in several draft groups of a week, the entry
+        with the highest id wins.
+        """
+        week_ids = set()
+        player_ids = set()
+        for lineup in lineups:
+            if isinstance(lineup.slots, dict):
+                week_ids.add(lineup.week_id)
+                player_ids.update(player_id for player_id in lineup.slots.values() if player_id)
+        if not player_ids:
+            return {}
+
+        rows = self.db.query(
+            PlayerPoolEntry.week_id,
+            PlayerPoolEntry.playerDkId,
+            PlayerPoolEntry.draftableId
+        ).filter(
+            and_(
+                PlayerPoolEntry.week_id.in_(week_ids),
+                PlayerPoolEntry.playerDkId.in_(player_ids),
+                PlayerPoolEntry.draftableId.isnot(None),
+                PlayerPoolEntry.draftableId != ""
+            )
+        ).order_by(PlayerPoolEntry.id).all()
+        return {(row.week_id, row.playerDkId): row.draftableId for row in rows}
+
+    @staticmethod
+    def lineup_row(lineup: Any, draftable_ids: Dict[Tuple[int, int], str]) -> List[str]:
+        """
+        Upload row for one lineup in DK_CLASSIC_SLOTS order; empty slots stay blank.
+        Players without a draftableId fall back to their playerDkId.
+        """
+        slots = lineup.slots if isinstance(lineup.slots, dict) else {}
+        row = []
+        for slot, _ in DK_CLASSIC_SLOTS:
+            player_id = slots.get(slot)
+            if not player_id:
+                row.append("")
+                continue
+            row.append(str(draftable_ids.get((lineup.week_id, player_id)) or player_id))
+        return row
+
+    def mark_exported(self, lineup_ids: List[str]) -> int:
+        """Set status 'exported' on the lineups with one UPDATE. Does not commit."""
+        if not lineup_ids:
+            return 0
+        result = self.db.execute(
+            update(Lineup).where(Lineup.id.in_(lineup_ids)).values(status="exported")
+        )
+        return result.rowcount or 0
+
+    @staticmethod
+    def stream_csv(header: List[str], rows: Sequence[List[str]], chunk_size: int = 500) -> Iterator[str]:
+        """
+        Yield the CSV in chunks of chunk_size rows; StreamingResponse runs a sync
+        iterator in the threadpool, one hop per chunk.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        for batch in chunked(rows, chunk_size):
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        if buffer.tell():
+            yield buffer.getvalue()
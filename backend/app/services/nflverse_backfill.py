@@ -0,0 +1,491 @@
+"""
+NFLVerse Backfill Service - loads whole seasons of nflverse data into the database
+
+The weekly import endpoints fetch, match and write one week at a time, one row per
+statement. A backfill over several seasons instead:
+
+- loads each dataset once per season from the Parquet cache, filtered to the target weeks
+- resolves every player name across all weeks with one batched matcher call
+- bulk upserts games, team stats and player actuals with INSERT ... ON CONFLICT
+- commits one week at a time and records each finished week in RecentActivity, so a
+  rerun skips weeks that already completed
+"""
+
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import polars as pl
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.models import Game, PlayerActuals, RecentActivity, Team, TeamStats, Week
+from app.services.activity_logging import ActivityLoggingService
+from app.services.cache_service import player_game_log_cache
+from app.services.dk_defense_scoring_service import DKDefenseScoringService
+from app.services.nflverse_cache import NFLVerseParquetCache, SEASON_TYPE_COLUMNS, nflverse_cache
+from app.services.nflverse_service import NFLVerseService
+from app.services.player_actuals import build_actuals_row, update_pool_entry_actuals
+from app.utils.bulk_upsert import DEFAULT_CHUNK_SIZE, bulk_upsert
+
+
+class NFLVerseBackfillService:
+    """Bulk import of nflverse games, team stats and player actuals for a season range"""
+
+    DATASETS = ("games", "team_stats", "player_actuals")
+
+    # nflverse dataset backing each backfill dataset
+    SOURCE_DATASETS = {
+        "games": "schedules",
+        "team_stats": "team_stats",
+        "player_actuals": "player_stats",
+    }
+
+    # Same confidence levels the auto import of /api/actuals/import-nflverse accepts
+    AUTO_IMPORT_CONFIDENCE = ("exact", "high")
+
+    # Recorded as the "nflverse-backfill-import" action in recent_activity
+    ACTIVITY_IMPORT_TYPE = "nflverse-backfill"
+
+    # Columns the backfill never writes (keys and bookkeeping)
+    _SKIP_COLUMNS = {"id", "created_at", "updated_at"}
+
+    def __init__(
+        self,
+        db: Session,
+        cache: Optional[NFLVerseParquetCache] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        self.db = db
+        self.cache = cache or nflverse_cache
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+    # ------------------------------------------------------------------
+    # Week selection and resume state
+    # ------------------------------------------------------------------
+
+    def get_target_weeks(
+        self,
+        start_season: int,
+        end_season: int,
+        week_numbers: Optional[Iterable[int]] = None
+    ) -> List[Week]:
+        """Database weeks in the season range, oldest first"""
+        query = self.db.query(Week).filter(
+            and_(
+                Week.year >= start_season,
+                Week.year <= end_season
+            )
+        )
+        if week_numbers:
+            query = query.filter(Week.week_number.in_(list(week_numbers)))
+        return query.order_by(Week.year, Week.week_number).all()
+
+    def get_completed_week_ids(
+        self,
+        week_ids: Iterable[int],
+        datasets: Sequence[str],
+        season_type: str = "REG"
+    ) -> Set[int]:
+        """
+        Weeks with a completed backfill activity that covered every requested dataset
+        for the same season type
+        """
+        week_ids = list(week_ids)
+        if not week_ids:
+            return set()
+
+        activities = self.db.query(RecentActivity.week_id, RecentActivity.details).filter(
+            and_(
+                RecentActivity.action == f"{self.ACTIVITY_IMPORT_TYPE}-import",
+                RecentActivity.operation_status == "completed",
+                RecentActivity.week_id.in_(week_ids)
+            )
+        ).all()
+
+        completed = set()
+        for week_id, details in activities:
+            details = details or {}
+            if details.get("season_type", "REG") != season_type:
+                continue
+            if set(datasets) <= set(details.get("datasets") or []):
+                completed.add(week_id)
+        return completed
+
+    def get_status(
+        self,
+        start_season: int,
+        end_season: int,
+        season_type: str = "REG",
+        datasets: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Backfill completion per week in the season range"""
+        datasets = self.validate_datasets(datasets)
+        weeks = self.get_target_weeks(start_season, end_season)
+        completed = self.get_completed_week_ids([w.id for w in weeks], datasets, season_type)
+        return [
+            {
+                "week_id": week.id,
+                "season": week.year,
+                "week_number": week.week_number,
+                "completed": week.id in completed
+            }
+            for week in weeks
+        ]
+
+    # ------------------------------------------------------------------
+    # Backfill
+    # ------------------------------------------------------------------
+
+    def run(
+        self,
+        start_season: int,
+        end_season: int,
+        season_type: str = "REG",
+        week_numbers: Optional[Iterable[int]] = None,
+        datasets: Optional[Sequence[str]] = None,
+        resume: bool = True,
+        backfill_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Backfill every database week between start_season and end_season
+
+        Args:
+            start_season: First NFL season year (inclusive)
+            end_season: Last NFL season year (inclusive)
+            season_type: "REG", "POST", or "PRE"
+            week_numbers: Limit to these week numbers (default: all weeks of each season)
+            datasets: Subset of DATASETS to load (default: all of them)
+            resume: Skip weeks already completed by an earlier backfill
+            backfill_id: Identifier stored with each week's activity (generated if omitted)
+
+        Returns:
+            Summary with per-week results and totals
+        """
+        if start_season > end_season:
+            raise ValueError("start_season must not be after end_season")
+        datasets = self.validate_datasets(datasets)
+
+        backfill_id = backfill_id or self.new_backfill_id()
+        started = time.time()
+        weeks = self.get_target_weeks(start_season, end_season, week_numbers)
+        skipped_week_ids = self.get_completed_week_ids([w.id for w in weeks], datasets, season_type) if resume else set()
+        pending = [week for week in weeks if week.id not in skipped_week_ids]
+
+        summary = {
+            "backfill_id": backfill_id,
+            "start_season": start_season,
+            "end_season": end_season,
+            "season_type": season_type,
+            "datasets": list(datasets),
+            "weeks_total": len(weeks),
+            "weeks_skipped": len(skipped_week_ids),
+            "weeks_completed": 0,
+            "weeks_failed": 0,
+            "totals": {},
+            "weeks": [],
+        }
+        if not pending:
+            return summary
+
+        # Each dataset is read once per season, then split by week in memory
+        frames = self._load_frames(pending, season_type, datasets)
+        team_ids = self._team_ids()
+        player_matches = self._resolve_players(frames.get("player_actuals"))
+
+        for index, week in enumerate(pending, start=1):
+            week_started = time.time()
+            try:
+                week_result = self._backfill_week(week, frames, team_ids, player_matches, datasets)
+                self.db.commit()
+                player_game_log_cache.invalidate(year=week.year)
+                week_result["status"] = "completed"
+                summary["weeks_completed"] += 1
+                for key, value in week_result["counts"].items():
+                    summary["totals"][key] = summary["totals"].get(key, 0) + value
+            except Exception as e:
+                self.db.rollback()
+                week_result = {"counts": {}, "errors": [str(e)], "status": "failed"}
+                summary["weeks_failed"] += 1
+
+            week_result.update({
+                "week_id": week.id,
+                "season": week.year,
+                "week_number": week.week_number,
+                "duration_ms": int((time.time() - week_started) * 1000),
+            })
+            summary["weeks"].append(week_result)
+            self._log_week(backfill_id, week_result, season_type, datasets, index, len(pending))
+            if self.progress:
+                self.progress({**week_result, "index": index, "total": len(pending)})
+
+        summary["duration_ms"] = int((time.time() - started) * 1000)
+        return summary
+
+    @staticmethod
+    def new_backfill_id() -> str:
+        return uuid.uuid4().hex[:12]
+
+    @classmethod
+    def validate_datasets(cls, datasets: Optional[Sequence[str]]) -> List[str]:
+        """Requested datasets in load order; raises ValueError for unknown names"""
+        if not datasets:
+            return list(cls.DATASETS)
+        unknown = [d for d in datasets if d not in cls.DATASETS]
+        if unknown:
+            raise ValueError(f"Unknown backfill datasets: {', '.join(unknown)}")
+        # Games first: team stats read points allowed from the games table
+        return [d for d in cls.DATASETS if d in datasets]
+
+    def _load_frames(self, weeks: List[Week], season_type: str, datasets: Sequence[str]) -> Dict[str, pl.DataFrame]:
+        """One filtered scan per (dataset, season), concatenated across seasons"""
+        week_numbers_by_season: Dict[int, Set[int]] = {}
+        for week in weeks:
+            week_numbers_by_season.setdefault(week.year, set()).add(week.week_number)
+
+        frames = {}
+        for dataset in datasets:
+            source = self.SOURCE_DATASETS[dataset]
+            season_type_column = SEASON_TYPE_COLUMNS.get(source, "season_type")
+            season_frames = []
+            for season, week_numbers in sorted(week_numbers_by_season.items()):
+                condition = (
+                    (pl.col("season") == season) &
+                    (pl.col(season_type_column) == season_type) &
+                    pl.col("week").is_in(sorted(week_numbers))
+                )
+                if dataset == "player_actuals":
+                    condition = condition & pl.col("position").is_in(NFLVerseService.OFFENSE_POSITIONS)
+                season_frames.append(self.cache.scan(source, season).filter(condition).collect())
+
+            df = pl.concat(season_frames, how="diagonal_relaxed")
+            if dataset == "player_actuals":
+                # Map and score every player-week of every season in one columnar pass
+                df = NFLVerseService.calculate_dk_points_frame(
+                    NFLVerseService.map_nflverse_to_actuals_frame(df)
+                ).with_columns(
+                    df.get_column("season").alias("_season"),
+                    df.get_column("week").alias("_week")
+                )
+            frames[dataset] = df
+        return frames
+
+    def _team_ids(self) -> Dict[str, int]:
+        """nflverse team abbreviation → team id, with the same LA → LAR rule as match_team"""
+        team_ids = {abbr: team_id for team_id, abbr in self.db.query(Team.id, Team.abbreviation).all() if abbr}
+        team_ids.pop("LA", None)
+        if 19 in team_ids.values():  # LAR team_id = 19
+            team_ids["LA"] = 19
+        return team_ids
+
+    def _resolve_players(self, actuals_df: Optional[pl.DataFrame]) -> Dict[Tuple[str, str, str], Tuple[Optional[int], str]]:
+        """Resolve every distinct (name, team, position) across all weeks in one batch"""
+        if actuals_df is None or actuals_df.is_empty():
+            return {}
+
+        # Import here to avoid circular dependency
+        from app.routers.projections import resolve_player_matches
+
+        keys = [
+            (row["_nflverse_player_name"] or "", row["team"] or "", row["position"] or "")
+            for row in actuals_df.select("_nflverse_player_name", "team", "position").unique(maintain_order=True).iter_rows(named=True)
+        ]
+        matches = resolve_player_matches(self.db, keys)
+        resolved = {}
+        for key, (player, confidence, _candidates) in matches.items():
+            confidence = NFLVerseService.map_match_confidence(confidence)
+            resolved[key] = (player.playerDkId if player and confidence != "none" else None, confidence)
+        return resolved
+
+    def _backfill_week(
+        self,
+        week: Week,
+        frames: Dict[str, pl.DataFrame],
+        team_ids: Dict[str, int],
+        player_matches: Dict[Tuple[str, str, str], Tuple[Optional[int], str]],
+        datasets: Sequence[str]
+    ) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        errors: List[str] = []
+
+        if "games" in datasets:
+            schedule = frames["games"].filter(
+                (pl.col("season") == week.year) & (pl.col("week") == week.week_number)
+            )
+            counts.update(self._upsert_games(week.id, schedule, team_ids, errors))
+
+        if "team_stats" in datasets:
+            team_stats = frames["team_stats"].filter(
+                (pl.col("season") == week.year) & (pl.col("week") == week.week_number)
+            )
+            counts.update(self._upsert_team_stats(week.id, team_stats, team_ids, errors))
+
+        if "player_actuals" in datasets:
+            actuals = frames["player_actuals"].filter(
+                (pl.col("_season") == week.year) & (pl.col("_week") == week.week_number)
+            )
+            counts.update(self._upsert_player_actuals(week.id, actuals, player_matches))
+
+        return {"counts": counts, "errors": errors}
+
+    # ------------------------------------------------------------------
+    # Per-dataset upserts
+    # ------------------------------------------------------------------
+
+    def _writable_columns(self, model) -> List[str]:
+        return [c.name for c in model.__table__.columns if c.name not in self._SKIP_COLUMNS]
+
+    def _existing_keys(self, model, key_column, week_id: int, keys: List[Any]) -> Set[Any]:
+        existing = set()
+        for start in range(0, len(keys), self.chunk_size):
+            chunk = keys[start:start + self.chunk_size]
+            existing.update(value for (value,) in self.db.query(key_column).filter(
+                and_(model.week_id == week_id, key_column.in_(chunk))
+            ).all())
+        return existing
+
+    def _upsert_games(self, week_id: int, schedule: pl.DataFrame, team_ids: Dict[str, int], errors: List[str]) -> Dict[str, int]:
+        """Two Game rows per nflverse game, one from each team's perspective"""
+        columns = set(self._writable_columns(Game))
+        rows: Dict[int, Dict[str, Any]] = {}
+        for nfl_game in schedule.to_dicts():
+            game_data = NFLVerseService.map_game_results_to_schema(nfl_game)
+            away_abbr = nfl_game.get("away_team", "")
+            home_abbr = nfl_game.get("home_team", "")
+            away_id = team_ids.get(away_abbr)
+            home_id = team_ids.get(home_abbr)
+            if not away_id or not home_id:
+                errors.append(f"Unmatched game {away_abbr} @ {home_abbr}")
+                continue
+
+            base = {k: v for k, v in game_data.items() if k in columns}
+            for team_id, opponent_id, homeoraway in ((away_id, home_id, "A"), (home_id, away_id, "H")):
+                rows[team_id] = {
+                    **base,
+                    "week_id": week_id,
+                    "team_id": team_id,
+                    "opponent_team_id": opponent_id,
+                    "homeoraway": homeoraway,
+                }
+
+        rows_list = list(rows.values())
+        existing = self._existing_keys(Game, Game.team_id, week_id, list(rows.keys()))
+        bulk_upsert(self.db, Game, rows_list, index_elements=["week_id", "team_id"], chunk_size=self.chunk_size)
+        return {
+            "games_created": len(rows_list) - len(existing),
+            "games_updated": len(existing),
+        }
+
+    def _upsert_team_stats(self, week_id: int, team_stats: pl.DataFrame, team_ids: Dict[str, int], errors: List[str]) -> Dict[str, int]:
+        """TeamStats rows with points allowed from the games table and DK defense scores"""
+        columns = set(self._writable_columns(TeamStats))
+        points_allowed_by_team = NFLVerseService.get_points_allowed_by_team(self.db, week_id)
+
+        rows: Dict[int, Dict[str, Any]] = {}
+        for nfl_team in team_stats.to_dicts():
+            team_abbr = nfl_team.get("team", "")
+            team_id = team_ids.get(team_abbr)
+            if not team_id:
+                errors.append(f"Unmatched team {team_abbr}")
+                continue
+            defense_data = NFLVerseService.map_team_stats_to_defense(nfl_team)
+            defense_data.update({
+                "week_id": week_id,
+                "team_id": team_id,
+                "opponent_team_id": team_ids.get(nfl_team.get("opponent_team", "")),
+                "points_allowed": points_allowed_by_team.get(team_id, 0),
+            })
+            rows[team_id] = defense_data
+
+        if rows:
+            score_columns = [column for column, _ in DKDefenseScoringService.DEFENSE_SCORING_WEIGHTS] + ["points_allowed"]
+            scores_df = DKDefenseScoringService.calculate_defense_scores(pl.DataFrame(
+                {column: [row.get(column, 0) for row in rows.values()] for column in score_columns},
+                schema={column: pl.Float64 for column in score_columns}
+            ))
+            for row, score in zip(rows.values(), scores_df["dk_defense_score"].to_list()):
+                row["dk_defense_score"] = score
+
+        rows_list = [{k: v for k, v in row.items() if k in columns} for row in rows.values()]
+        existing = self._existing_keys(TeamStats, TeamStats.team_id, week_id, list(rows.keys()))
+        bulk_upsert(self.db, TeamStats, rows_list, index_elements=["week_id", "team_id"], chunk_size=self.chunk_size)
+        return {
+            "team_stats_created": len(rows_list) - len(existing),
+            "team_stats_updated": len(existing),
+        }
+
+    def _upsert_player_actuals(
+        self,
+        week_id: int,
+        actuals: pl.DataFrame,
+        player_matches: Dict[Tuple[str, str, str], Tuple[Optional[int], str]]
+    ) -> Dict[str, int]:
+        """PlayerActuals rows for exact/high confidence matches, plus pool entry actuals"""
+        rows: Dict[int, Dict[str, Any]] = {}
+        unmatched = 0
+        for actuals_data in actuals.to_dicts():
+            key = (actuals_data.get("_nflverse_player_name") or "", actuals_data.get("team") or "", actuals_data.get("position") or "")
+            player_dk_id, confidence = player_matches.get(key, (None, "none"))
+            if not player_dk_id or confidence not in self.AUTO_IMPORT_CONFIDENCE:
+                unmatched += 1
+                continue
+            # Later rows for the same player win, as with the per-row import
+            rows[player_dk_id] = build_actuals_row(week_id, player_dk_id, actuals_data)
+
+        rows_list = list(rows.values())
+        existing = self._existing_keys(PlayerActuals, PlayerActuals.playerDkId, week_id, list(rows.keys()))
+        bulk_upsert(self.db, PlayerActuals, rows_list, index_elements=["week_id", "playerDkId"], chunk_size=self.chunk_size)
+        update_pool_entry_actuals(self.db, week_id, rows_list, chunk_size=self.chunk_size)
+
+        return {
+            "actuals_created": len(rows_list) - len(existing),
+            "actuals_updated": len(existing),
+            "players_unmatched": unmatched,
+        }
+
+    # ------------------------------------------------------------------
+    # Progress reporting
+    # ------------------------------------------------------------------
+
+    def _log_week(
+        self,
+        backfill_id: str,
+        week_result: Dict[str, Any],
+        season_type: str,
+        datasets: Sequence[str],
+        index: int,
+        total: int
+    ) -> None:
+        """Record the week in RecentActivity; completed entries are what resume checks"""
+        counts = week_result.get("counts", {})
+        errors = week_result.get("errors") or []
+        failed = week_result["status"] == "failed"
+        try:
+            ActivityLoggingService(self.db).log_import_activity(
+                import_type=self.ACTIVITY_IMPORT_TYPE,
+                file_type="API",
+                week_id=week_result["week_id"],
+                records_added=sum(v for k, v in counts.items() if k.endswith("_created")),
+                records_updated=sum(v for k, v in counts.items() if k.endswith("_updated")),
+                records_skipped=counts.get("players_unmatched", 0),
+                records_failed=len(errors) if failed else 0,
+                file_name=f"NFLVerse Backfill {week_result['season']} Week {week_result['week_number']}",
+                import_source="nflverse",
+                draft_group=None,
+                operation_status="failed" if failed else "completed",
+                duration_ms=week_result.get("duration_ms"),
+                errors=errors[:20] if errors else None,
+                details={
+                    "backfill_id": backfill_id,
+                    "season": week_result["season"],
+                    "week_number": week_result["week_number"],
+                    "season_type": season_type,
+                    "datasets": list(datasets),
+                    "progress": {"index": index, "total": total},
+                    **counts
+                }
+            )
+        except Exception as log_error:
+            print(f"⚠️ Failed to log backfill activity: {str(log_error)}")
@@ -0,0 +1,208 @@
+"""
+Local Parquet cache for nflverse season datasets.
+
+nflreadpy only loads whole seasons, so every weekly import used to download and parse
+the full season before filtering to one week. This cache keeps one Parquet file per
+(dataset, season) on disk with a small JSON sidecar recording when it was fetched.
+Reads go through polars scan_parquet, so week/season-type filters are pushed down into
+the scan and only the matching row groups are materialised.
+
+Offline use (tests, fixtures): drop ``<dataset>/season=<year>.parquet`` files into the
+cache directory and set NFLVERSE_CACHE_OFFLINE=1 (or pass offline=True). Cached files are
+then always used and no network loader is ever called.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "nflverse"
+NFLVERSE_CACHE_DIR = Path(os.getenv("NFLVERSE_CACHE_DIR", str(DEFAULT_CACHE_DIR)))
+
+# Current-season data changes as games are played; seasons fetched after they ended never expire
+DEFAULT_TTL_SECONDS = int(os.getenv("NFLVERSE_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+
+# Column holding the season type for each dataset (schedules call it game_type)
+SEASON_TYPE_COLUMNS = {
+    "player_stats": "season_type",
+    "team_stats": "season_type",
+    "schedules": "game_type",
+}
+
+
+def _load_player_stats(season: int) -> pl.DataFrame:
+    import nflreadpy as nfl
+    return nfl.load_player_stats(seasons=[season], summary_level="week")
+
+
+def _load_team_stats(season: int) -> pl.DataFrame:
+    import nflreadpy as nfl
+    return nfl.load_team_stats(seasons=[season], summary_level="week")
+
+
+def _load_schedules(season: int) -> pl.DataFrame:
+    import nflreadpy as nfl
+    return nfl.load_schedules(seasons=[season])
+
+
+DEFAULT_LOADERS: Dict[str, Callable[[int], pl.DataFrame]] = {
+    "player_stats": _load_player_stats,
+    "team_stats": _load_team_stats,
+    "schedules": _load_schedules,
+}
+
+
+def current_nfl_season(today: Optional[date] = None) -> int:
+    """NFL season year for a date; January-February games belong to the previous season."""
+    today = today or date.today()
+    return today.year if today.month >= 3 else today.year - 1
+
+
+def season_end_timestamp(season: int) -> float:
+    """Epoch time after which a season's data is final (March 1 of the following year)"""
+    return datetime(season + 1, 3, 1).timestamp()
+
+
+class NFLVerseParquetCache:
+    """On-disk Parquet cache of nflverse datasets keyed by (dataset, season)"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        loaders: Optional[Dict[str, Callable[[int], pl.DataFrame]]] = None,
+        offline: Optional[bool] = None,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else NFLVERSE_CACHE_DIR
+        self.ttl_seconds = ttl_seconds
+        self.loaders = dict(DEFAULT_LOADERS if loaders is None else loaders)
+        if offline is None:
+            offline = os.getenv("NFLVERSE_CACHE_OFFLINE", "").lower() in ("1", "true", "yes")
+        self.offline = offline
+        self._lock = threading.Lock()
+
+    def path(self, dataset: str, season: int) -> Path:
+        return self.cache_dir / dataset / f"season={season}.parquet"
+
+    def _metadata_path(self, dataset: str, season: int) -> Path:
+        return self.cache_dir / dataset / f"season={season}.json"
+
+    def metadata(self, dataset: str, season: int) -> Optional[Dict]:
+        """
+        Freshness metadata for a cached season, or None if the season is not cached.
+        Fixture files without a sidecar fall back to the Parquet file's mtime.
+        """
+        path = self.path(dataset, season)
+        if not path.exists():
+            return None
+        meta_path = self._metadata_path(dataset, season)
+        if meta_path.exists():
+            try:
+                return json.loads(meta_path.read_text())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable nflverse cache metadata {meta_path}: {e}")
+        return {"dataset": dataset, "season": season, "fetched_at": path.stat().st_mtime}
+
+    def is_fresh(self, dataset: str, season: int) -> bool:
+        """
+        A completed season is final only if it was fetched after the season ended; a copy
+        taken mid-season (missing the last weeks and playoffs) follows the TTL, so it is
+        refreshed once and then never again.
+        """
+        meta = self.metadata(dataset, season)
+        if meta is None:
+            return False
+        if self.offline:
+            return True
+        fetched_at = float(meta.get("fetched_at", 0))
+        if season < current_nfl_season() and fetched_at >= season_end_timestamp(season):
+            return True
+        return time.time() - fetched_at < self.ttl_seconds
+
+    def refresh(self, dataset: str, season: int) -> Path:
+        """Download a season through its loader and atomically replace the cached file."""
+        if dataset not in self.loaders:
+            raise ValueError(f"Unknown nflverse dataset '{dataset}'")
+
+        started = time.perf_counter()
+        df = self.loaders[dataset](season)
+        path = self.path(dataset, season)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_suffix(".parquet.tmp")
+        df.write_parquet(tmp_path)
+        os.replace(tmp_path, path)
+
+        meta = {
+            "dataset": dataset,
+            "season": season,
+            "fetched_at": time.time(),
+            "rows": df.height,
+            "columns": len(df.columns),
+        }
+        self._metadata_path(dataset, season).write_text(json.dumps(meta))
+        logger.info(f"Cached nflverse {dataset} {season}: {df.height} rows in {time.perf_counter() - started:.2f}s")
+        return path
+
+    def ensure(self, dataset: str, season: int, force_refresh: bool = False) -> Path:
+        """
+        Return the path of an up-to-date cached season, downloading it if needed.
+        If a refresh fails but an older copy exists, the stale copy is used.
+        """
+        with self._lock:
+            path = self.path(dataset, season)
+            if self.offline:
+                if not path.exists():
+                    raise FileNotFoundError(f"nflverse cache miss in offline mode: {path}")
+                return path
+            if not force_refresh and self.is_fresh(dataset, season):
+                return path
+            try:
+                return self.refresh(dataset, season)
+            except Exception as e:
+                if path.exists():
+                    logger.warning(f"Refreshing nflverse {dataset} {season} failed, using stale cache: {e}")
+                    return path
+                raise
+
+    def scan(self, dataset: str, season: int, force_refresh: bool = False) -> pl.LazyFrame:
+        """Lazy, memory-mapped scan over a cached season; filters are pushed into the read."""
+        return pl.scan_parquet(self.ensure(dataset, season, force_refresh=force_refresh))
+
+    def load_week(
+        self,
+        dataset: str,
+        season: int,
+        week: int,
+        season_type: str = "REG",
+        force_refresh: bool = False,
+    ) -> pl.DataFrame:
+        """Collect one week of a dataset from the cache"""
+        season_type_column = SEASON_TYPE_COLUMNS.get(dataset, "season_type")
+        return self.scan(dataset, season, force_refresh=force_refresh).filter(
+            (pl.col("season") == season) &
+            (pl.col(season_type_column) == season_type) &
+            (pl.col("week") == week)
+        ).collect()
+
+    def invalidate(self, dataset: Optional[str] = None, season: Optional[int] = None) -> None:
+        """Remove cached files for a dataset/season (all of them when both are None)"""
+        with self._lock:
+            datasets = [dataset] if dataset else [p.name for p in self.cache_dir.glob("*") if p.is_dir()]
+            for name in datasets:
+                pattern = f"season={season}.*" if season is not None else "season=*"
+                for file in (self.cache_dir / name).glob(pattern):
+                    file.unlink(missing_ok=True)
+
+
+# Global cache instance shared by imports and backfills
+nflverse_cache = NFLVerseParquetCache()
@@ -3,12 +3,12 @@ NFLVerse Service - Fetches player stats from nflverse and maps to PlayerActuals
 """
 
 from typing import List, Dict, Any, Optional, Tuple
-import nflreadpy as nfl
 import polars as pl
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 from app.models import Player, Week, Team, TeamStats, Game
 from app.services.dk_defense_scoring_service import DKDefenseScoringService
+from app.services.nflverse_cache import NFLVerseParquetCache, nflverse_cache
 
 
 class NFLVerseService:
@@ -23,6 +23,24 @@ class NFLVerseService:
         "HB": "RB",  # Halfbacks are RBs in DraftKings
     }
     
+    # find_player_match confidence → NFLVerse-friendly confidence levels
+    CONFIDENCE_MAP = {
+        'exact': 'exact',
+        'exact_no_team': 'high',
+        'exact_normalized': 'high',
+        'exact_normalized_no_team': 'high',
+        'partial': 'medium',
+        'partial_no_team': 'medium',
+        'partial_normalized': 'medium',
+        'suffix_agnostic': 'high',
+        'suffix_agnostic_with_team': 'high',
+        'fallback_first_last': 'low',
+        'fallback_normalized': 'low',
+        'name_only': 'low',
+        'alias': 'high',  # Alias matches should be treated as high confidence
+        'none': 'none'
+    }
+    
     # Field mapping: NFLVerse → PlayerActuals
     FIELD_MAPPING = {
         # Passing stats
@@ -80,7 +98,8 @@ class NFLVerseService:
         season: int, 
         week: int, 
         season_type: str = "REG",
-        positions: Optional[List[str]] = None
+        positions: Optional[List[str]] = None,
+        cache: Optional[NFLVerseParquetCache] = None
     ) -> pl.DataFrame:
         """
         Fetch player stats from nflverse for a specific week
@@ -90,6 +109,7 @@ class NFLVerseService:
             week: Week number (1-18)
             season_type: "REG", "POST", or "PRE"
             positions: List of positions to filter (default: offensive positions)
+            cache: Parquet cache to read the season from (default: shared nflverse cache)
         
         Returns:
             Polars DataFrame with player stats
@@ -97,18 +117,13 @@ class NFLVerseService:
         if positions is None:
             positions = NFLVerseService.OFFENSE_POSITIONS
         
-        # Load player stats
-        df = nfl.load_player_stats(seasons=[season], summary_level="week")
-        
-        # Filter to specific week and season type
-        wk_df = df.filter(
+        # Scan the cached season; week, season type and position filters are pushed into the read
+        wk_offense = (cache or nflverse_cache).scan("player_stats", season).filter(
             (pl.col("season") == season) & 
             (pl.col("season_type") == season_type) & 
-            (pl.col("week") == week)
-        )
-        
-        # Filter to specified positions
-        wk_offense = wk_df.filter(pl.col("position").is_in(positions))
+            (pl.col("week") == week) &
+            pl.col("position").is_in(positions)
+        ).collect()
         
         return wk_offense
     
@@ -170,6 +185,99 @@ class NFLVerseService:
         
         return actuals_data
     
+    @staticmethod
+    def map_nflverse_to_actuals_frame(nflverse_df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Columnar version of map_nflverse_to_actuals for a whole week frame
+        
+        Args:
+            nflverse_df: Polars DataFrame with nflverse column names
+        
+        Returns:
+            DataFrame with one row per input row and the same keys map_nflverse_to_actuals returns
+        """
+        columns = set(nflverse_df.columns)
+        
+        def stat(field: str) -> pl.Expr:
+            # Missing/null stats default to 0 for proper sorting/UI
+            if field not in columns:
+                return pl.lit(0.0)
+            return pl.col(field).cast(pl.Float64).fill_null(0.0)
+        
+        def raw(field: str) -> pl.Expr:
+            return pl.col(field) if field in columns else pl.lit(None)
+        
+        position = raw("position")
+        exprs = [
+            (raw("team") if "team" in columns else pl.lit("")).alias("team"),
+            position.replace(NFLVerseService.POSITION_MAPPING).alias("position"),
+            position.alias("_original_position"),
+        ]
+        
+        # Merged fields are summed in FIELD_MAPPING order, starting from 0 like the scalar mapper
+        merged: Dict[str, pl.Expr] = {}
+        for nflverse_field, actuals_field in NFLVerseService.FIELD_MAPPING.items():
+            if actuals_field in ["fumbles_lost", "two_pt_md"]:
+                merged[actuals_field] = merged.get(actuals_field, pl.lit(0.0)) + stat(nflverse_field)
+            else:
+                merged[actuals_field] = stat(nflverse_field)
+        exprs.extend(expr.alias(field) for field, expr in merged.items())
+        
+        # Total TDs (rushing + receiving + special teams), then raw nflverse identifiers for reference
+        exprs.extend([
+            (merged["rush_tds"] + merged["rec_tds"] + merged["special_teams_tds"]).alias("total_tds"),
+            raw("player_id").alias("_nflverse_player_id"),
+            raw("player_display_name").alias("_nflverse_player_name"),
+        ])
+        
+        return nflverse_df.select(exprs)
+    
+    @staticmethod
+    def dk_points_expr() -> pl.Expr:
+        """
+        Polars expression equivalent of calculate_dk_points over PlayerActuals-named columns,
+        before the final rounding. Terms are added in the same order as the scalar version so
+        the floating point result is identical.
+        """
+        def stat(field: str) -> pl.Expr:
+            return pl.col(field).cast(pl.Float64).fill_null(0.0)
+        
+        points = pl.lit(0.0)
+        # Passing, with 300+ yard bonus
+        points = points + stat("pass_yds") * 0.04
+        points = points + pl.when(stat("pass_yds") >= 300).then(3.0).otherwise(0.0)
+        points = points + stat("pass_tds") * 4
+        points = points - stat("interceptions") * 1
+        # Rushing, with 100+ yard bonus
+        points = points + stat("rush_yds") * 0.1
+        points = points + pl.when(stat("rush_yds") >= 100).then(3.0).otherwise(0.0)
+        points = points + stat("rush_tds") * 6
+        # Receiving (PPR), with 100+ yard bonus
+        points = points + stat("receptions") * 1
+        points = points + stat("rec_yds") * 0.1
+        points = points + pl.when(stat("rec_yds") >= 100).then(3.0).otherwise(0.0)
+        points = points + stat("rec_tds") * 6
+        # Special teams TDs, 2-point conversions, fumbles lost
+        points = points + stat("special_teams_tds") * 6
+        points = points + stat("two_pt_md") * 2
+        points = points + stat("two_pt_pass") * 2
+        points = points - stat("fumbles_lost") * 1
+        return points
+    
+    @staticmethod
+    def calculate_dk_points_frame(actuals_df: pl.DataFrame, output_column: str = "dk_actuals") -> pl.DataFrame:
+        """
+        Score every row of a PlayerActuals-shaped frame in one pass
+        
+        Gives the same values as calling calculate_dk_points per row. Rounding uses Python's
+        round() so ties resolve exactly as in the scalar version.
+        """
+        return actuals_df.with_columns(
+            NFLVerseService.dk_points_expr()
+            .map_elements(lambda points: round(points, 2), return_dtype=pl.Float64)
+            .alias(output_column)
+        )
+    
     @staticmethod
     def calculate_dk_points(stats: Dict[str, Any]) -> float:
         """
@@ -230,6 +338,13 @@ class NFLVerseService:
         
         return round(points, 2)
     
+    @staticmethod
+    def map_match_confidence(confidence: str) -> str:
+        """Map a find_player_match confidence to 'exact', 'high', 'medium', 'low' or 'none'"""
+        if confidence.startswith('ambiguous'):
+            return 'none'
+        return NFLVerseService.CONFIDENCE_MAP.get(confidence, 'low')
+    
     @staticmethod
     def match_player(
         db: Session,
@@ -266,25 +381,7 @@ class NFLVerseService:
         if confidence.startswith('ambiguous'):
             return (None, 'none', candidates)
         
-        # Map confidence levels to NFLVerse-friendly names
-        confidence_map = {
-            'exact': 'exact',
-            'exact_no_team': 'high',
-            'exact_normalized': 'high',
-            'exact_normalized_no_team': 'high',
-            'partial': 'medium',
-            'partial_no_team': 'medium',
-            'partial_normalized': 'medium',
-            'suffix_agnostic': 'high',
-            'suffix_agnostic_with_team': 'high',
-            'fallback_first_last': 'low',
-            'fallback_normalized': 'low',
-            'name_only': 'low',
-            'alias': 'high',  # Alias matches should be treated as high confidence
-            'none': 'none'
-        }
-        
-        mapped_confidence = confidence_map.get(confidence, 'low')
+        mapped_confidence = NFLVerseService.map_match_confidence(confidence)
         
         return (matched_player, mapped_confidence, candidates)
     
@@ -317,8 +414,11 @@ class NFLVerseService:
         # Fetch NFLVerse data
         nflverse_df = NFLVerseService.fetch_week_stats(season, week_number, season_type)
         
-        # Convert to list of dicts
-        nflverse_data = nflverse_df.to_dicts()
+        # Map stats and calculate DK points for the whole week in one columnar pass
+        actuals_df = NFLVerseService.calculate_dk_points_frame(
+            NFLVerseService.map_nflverse_to_actuals_frame(nflverse_df)
+        )
+        nflverse_data = actuals_df.to_dicts()
         
         matched_players = []
         unmatched_players = []
@@ -330,19 +430,12 @@ class NFLVerseService:
             'none': 0
         }
         
-        for nfl_player in nflverse_data:
-            # Map stats
-            actuals_data = NFLVerseService.map_nflverse_to_actuals(nfl_player)
-            
-            # Calculate DK points
-            actuals_data["dk_actuals"] = NFLVerseService.calculate_dk_points(actuals_data)
-            
+        for actuals_data in nflverse_data:
             # Try to match player
-            player_name = nfl_player.get("player_display_name", "")
-            team = nfl_player.get("team", "")
-            raw_position = nfl_player.get("position", "")
-            # Normalize position for matching (FB -> RB)
-            normalized_position = NFLVerseService.normalize_position(raw_position)
+            player_name = actuals_data.get("_nflverse_player_name") or ""
+            team = actuals_data.get("team") or ""
+            # Position is already normalized for matching (FB -> RB)
+            normalized_position = actuals_data.get("position") or ""
             
             matched_player, confidence, possible_matches = NFLVerseService.match_player(
                 db, player_name, team, normalized_position
@@ -379,7 +472,8 @@ class NFLVerseService:
     def fetch_team_stats(
         season: int, 
         week: int, 
-        season_type: str = "REG"
+        season_type: str = "REG",
+        cache: Optional[NFLVerseParquetCache] = None
     ) -> pl.DataFrame:
         """
         Fetch team stats from nflverse for a specific week
@@ -388,21 +482,12 @@ class NFLVerseService:
             season: NFL season year (e.g., 2025)
             week: Week number (1-18)
             season_type: "REG", "POST", or "PRE"
+            cache: Parquet cache to read the season from (default: shared nflverse cache)
         
         Returns:
             Polars DataFrame with team stats
         """
-        # Load team stats
-        df = nfl.load_team_stats(seasons=[season], summary_level="week")
-        
-        # Filter to specific week and season type
-        wk_df = df.filter(
-            (pl.col("season") == season) & 
-            (pl.col("season_type") == season_type) & 
-            (pl.col("week") == week)
-        )
-        
-        return wk_df
+        return (cache or nflverse_cache).load_week("team_stats", season, week, season_type)
     
     @staticmethod
     def map_team_stats_to_defense(nflverse_row: Dict[str, Any]) -> Dict[str, Any]:
@@ -582,6 +667,35 @@ class NFLVerseService:
             print(f"Warning: Could not get points allowed for team {team_id}, week {week_id}: {e}")
             return 0
     
+    @staticmethod
+    def points_allowed_from_game(game: Game) -> int:
+        """Points scored against a team's defense, from its own row in the games table"""
+        if game and game.away_score is not None and game.home_score is not None:
+            if game.homeoraway == 'H':
+                # Home team, so away team scored against them
+                return game.away_score
+            # Away team (or neutral site), so home team scored against them
+            return game.home_score
+        return 0
+    
+    @staticmethod
+    def get_points_allowed_by_team(db: Session, week_id: int) -> Dict[int, int]:
+        """
+        Get points allowed for every team with a game in a week, keyed by team_id.
+        
+        Args:
+            db: Database session
+            week_id: Week ID
+            
+        Returns:
+            Dictionary of team_id -> points scored against the team's defense
+        """
+        games = db.query(Game).filter(Game.week_id == week_id).order_by(Game.id).all()
+        points_allowed = {}
+        for game in games:
+            points_allowed.setdefault(game.team_id, NFLVerseService.points_allowed_from_game(game))
+        return points_allowed
+    
     @staticmethod
     def match_team(
         db: Session,
@@ -646,6 +760,9 @@ class NFLVerseService:
         # Convert to list of dicts
         nflverse_data = nflverse_df.to_dicts()
         
+        # Points allowed for every team this week, from one games query
+        points_allowed_by_team = NFLVerseService.get_points_allowed_by_team(db, week_id)
+        
         matched_teams = []
         unmatched_teams = []
         match_stats = {
@@ -680,18 +797,8 @@ class NFLVerseService:
                     defense_data["opponent_team_id"] = None
                     defense_data["opponent_name"] = opponent_abbr
                 
-                # Calculate DK defense score with points allowed from games table
-                defense_data["dk_defense_score"] = NFLVerseService.calculate_dk_defense_score(
-                    defense_data, 
-                    db=db, 
-                    team_id=matched_team.id, 
-                    week_id=week_id
-                )
-                
-                # Also store points_allowed for future reference
-                defense_data["points_allowed"] = NFLVerseService.get_points_allowed_for_team(
-                    db, matched_team.id, week_id
-                )
+                # Points allowed from games table; DK defense scores are calculated for all teams below
+                defense_data["points_allowed"] = points_allowed_by_team.get(matched_team.id, 0)
                 
                 matched_teams.append(defense_data)
             else:
@@ -702,6 +809,16 @@ class NFLVerseService:
                     "match_confidence": team_confidence
                 })
         
+        # Calculate DK defense scores for every matched team in one columnar pass
+        if matched_teams:
+            score_columns = [column for column, _ in DKDefenseScoringService.DEFENSE_SCORING_WEIGHTS] + ["points_allowed"]
+            scores_df = DKDefenseScoringService.calculate_defense_scores(pl.DataFrame(
+                {column: [team.get(column, 0) for team in matched_teams] for column in score_columns},
+                schema={column: pl.Float64 for column in score_columns}
+            ))
+            for defense_data, score in zip(matched_teams, scores_df["dk_defense_score"].to_list()):
+                defense_data["dk_defense_score"] = score
+        
         return {
             "matched_teams": matched_teams,
             "unmatched_teams": unmatched_teams,
@@ -716,7 +833,8 @@ class NFLVerseService:
     def fetch_game_results(
         season: int, 
         week: int, 
-        season_type: str = "REG"
+        season_type: str = "REG",
+        cache: Optional[NFLVerseParquetCache] = None
     ) -> pl.DataFrame:
         """
         Fetch game results from nflverse for a specific week
@@ -725,21 +843,13 @@ class NFLVerseService:
             season: NFL season year (e.g., 2025)
             week: Week number (1-18)
             season_type: "REG", "POST", or "PRE"
+            cache: Parquet cache to read the season from (default: shared nflverse cache)
         
         Returns:
             Polars DataFrame with game results
         """
-        # Load schedules data
-        df = nfl.load_schedules(seasons=[season])
-        
-        # Filter to specific week and game type (season_type maps to game_type in NFLVerse)
-        wk_df = df.filter(
-            (pl.col("season") == season) & 
-            (pl.col("game_type") == season_type) & 
-            (pl.col("week") == week)
-        )
-        
-        return wk_df
+        # season_type maps to game_type in the schedules dataset
+        return (cache or nflverse_cache).load_week("schedules", season, week, season_type)
     
     @staticmethod
     def map_game_results_to_schema(nflverse_row: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,105 @@
+"""
+PlayerActuals row building shared by the actuals imports
+
+/api/actuals/import-matched and the nflverse backfill write the same rows, so both
+build them here and update player_pool_entries.actuals the same way.
+"""
+
+from typing import Any, Dict, Iterable
+
+from sqlalchemy import and_, bindparam, update
+from sqlalchemy.orm import Session
+
+from app.models import PlayerPoolEntry
+from app.utils.bulk_upsert import DEFAULT_CHUNK_SIZE, chunked
+
+# PlayerActuals columns written by imports → type; missing values default to 0 for consistent sorting
+ACTUALS_COLUMN_MAP = {
+    # Passing
+    "completions": float,
+    "attempts": float,
+    "pass_yds": float,
+    "pass_tds": float,
+    "interceptions": float,
+    # Rushing
+    "rush_att": float,
+    "rush_yds": float,
+    "rush_tds": float,
+    # Receiving
+    "rec_tgt": float,
+    "receptions": float,
+    "rec_yds": float,
+    "rec_tds": float,
+    # Other stats
+    "fumbles": float,
+    "fumbles_lost": float,
+    "total_tds": float,
+    "two_pt_md": float,
+    "two_pt_pass": float,
+    # Advanced stats
+    "sacks_suffered": float,
+    "sack_yards_lost": float,
+    "sack_fumbles_lost": float,
+    "passing_air_yards": float,
+    "passing_yards_after_catch": float,
+    "passing_first_downs": float,
+    "passing_epa": float,
+    "passing_cpoe": float,
+    "pacr": float,
+    "rushing_first_downs": float,
+    "rushing_epa": float,
+    "receiving_air_yards": float,
+    "receiving_yards_after_catch": float,
+    "receiving_first_downs": float,
+    "receiving_epa": float,
+    "racr": float,
+    "target_share": float,
+    "air_yards_share": float,
+    "wopr": float,
+    # Fantasy
+    "dk_actuals": float,
+    "vbd": float,
+    "pos_rank": int,
+    "ov_rank": int,
+}
+
+
+def build_actuals_row(week_id: int, player_dk_id: int, player_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a PlayerActuals row from player data using ACTUALS_COLUMN_MAP"""
+    row = {
+        "week_id": week_id,
+        "playerDkId": player_dk_id,
+        "team": player_data.get("team") or "",
+        "position": player_data.get("position") or "",
+    }
+    for column, convert in ACTUALS_COLUMN_MAP.items():
+        value = player_data.get(column)
+        row[column] = convert(value) if value is not None else convert(0)
+    return row
+
+
+def update_pool_entry_actuals(
+    db: Session,
+    week_id: int,
+    rows: Iterable[Dict[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    """
+    Copy dk_actuals of PlayerActuals rows onto every pool entry of those players in the
+    week, with one executemany UPDATE per chunk. Does not commit.
+    """
+    params = [
+        {"_week_id": week_id, "_player_dk_id": row["playerDkId"], "_actuals": row["dk_actuals"]}
+        for row in rows
+    ]
+    if not params:
+        return
+    pool = PlayerPoolEntry.__table__
+    stmt = update(pool).where(
+        and_(
+            pool.c.week_id == bindparam("_week_id"),
+            pool.c.playerDkId == bindparam("_player_dk_id"),
+        )
+    ).values(actuals=bindparam("_actuals"))
+    for chunk in chunked(params, chunk_size):
+        db.execute(stmt, list(chunk))
@@ -9,14 +9,16 @@ Features:
 - Calculates hit percentages for players
 - Handles various prop types (Over/Under, totals, etc.)
 - Provides batch scoring for entire weeks
+- Scores any number of weeks in one columnar pass and one bulk UPDATE
 """
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+import polars as pl
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, text
+from sqlalchemy import and_, case, delete, func, insert, select, text, update
 
-from ..models import PlayerPropBet, PlayerActuals, Player
+from ..models import PlayerPropBet, PlayerActuals, Player, PlayerPropHitRate
 
 logger = logging.getLogger(__name__)
 
@@ -73,85 +75,43 @@ class PlayerPropsScoringService:
         """
         logger.info(f"Starting prop scoring for week {week_id}")
         
-        # Get all props for the week
-        props = self.db.query(PlayerPropBet).filter(
-            PlayerPropBet.week_id == week_id
-        ).all()
-        
-        if not props:
+        stats = self.score_weeks_props([week_id]).get(week_id)
+        if stats is None:
             logger.warning(f"No props found for week {week_id}")
-            return {
-                'total_props': 0,
-                'scored_props': 0,
-                'hits': 0,
-                'misses': 0,
-                'pushes': 0,
-                'players_with_actuals': 0,
-                'players_missing_actuals': 0
-            }
+            return self._empty_stats()
         
-        stats = {
-            'total_props': len(props),
-            'scored_props': 0,
-            'hits': 0,
-            'misses': 0,
-            'pushes': 0,
-            'players_with_actuals': 0,
-            'players_missing_actuals': 0
-        }
+        logger.info(f"Scoring completed for week {week_id}: {stats}")
+        return stats
+    
+    def score_weeks_props(self, week_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, int]]:
+        """
+        Score all props for one or many weeks at once.
         
-        # Group props by player for efficient actuals lookup
-        player_props = {}
-        for prop in props:
-            player_id = prop.playerDkId
-            if player_id not in player_props:
-                player_props[player_id] = []
-            player_props[player_id].append(prop)
-        
-        # Get actuals for all players in this week
-        actuals_query = self.db.query(PlayerActuals).filter(
-            PlayerActuals.week_id == week_id,
-            PlayerActuals.playerDkId.in_(list(player_props.keys()))
-        )
-        actuals_map = {a.playerDkId: a for a in actuals_query.all()}
+        Props and actuals are read with one join, every prop is scored as array operations
+        and all results are written with one bulk UPDATE, so rescoring a whole season is a
+        single call.
         
-        # Score props for each player
-        for player_id, player_prop_list in player_props.items():
-            actuals = actuals_map.get(player_id)
-            
-            if not actuals:
-                logger.warning(f"No actuals found for player {player_id} in week {week_id}")
-                stats['players_missing_actuals'] += len(player_prop_list)
-                continue
-            
-            stats['players_with_actuals'] += 1
+        Args:
+            week_ids: Week IDs to score (default: every week with props)
             
-            for prop in player_prop_list:
-                result = self._score_single_prop(prop, actuals)
-                if result:
-                    stats['scored_props'] += 1
-                    if result['result_status'] == 'HIT':
-                        stats['hits'] += 1
-                    elif result['result_status'] == 'MISS':
-                        stats['misses'] += 1
-                    elif result['result_status'] == 'PUSH':
-                        stats['pushes'] += 1
-                    
-                    # Update the prop in database
-                    prop.result_status = result['result_status']
-                    prop.actual_value = result['actual_value']
-                else:
-                    stats['players_missing_actuals'] += 1
+        Returns:
+            Dictionary of week_id -> scoring statistics (same keys as score_week_props);
+            weeks without props are omitted
+        """
+        frame = self._score_props_frame(week_ids=week_ids)
+        if frame.is_empty():
+            return {}
         
+        self._save_scores(frame)
+        self.refresh_hit_rates(frame['week_id'].unique().to_list())
         try:
             self.db.commit()
-            logger.info(f"Scoring completed for week {week_id}: {stats}")
         except Exception as e:
             self.db.rollback()
-            logger.error(f"Failed to commit scoring results for week {week_id}: {e}")
+            logger.error(f"Failed to commit scoring results for weeks {sorted(frame['week_id'].unique().to_list())}: {e}")
             raise
         
-        return stats
+        return self._weekly_stats(frame)
     
     def score_player_props(self, player_id: int, week_id: int) -> List[Dict]:
         """
@@ -166,46 +126,30 @@ class PlayerPropsScoringService:
         """
         logger.info(f"Scoring props for player {player_id} in week {week_id}")
         
-        # Get player's props for the week
-        props = self.db.query(PlayerPropBet).filter(
-            and_(
-                PlayerPropBet.playerDkId == player_id,
-                PlayerPropBet.week_id == week_id
-            )
-        ).all()
-        
-        if not props:
+        frame = self._score_props_frame(week_ids=[week_id], player_id=player_id)
+        if frame.is_empty():
             logger.warning(f"No props found for player {player_id} in week {week_id}")
             return []
         
-        # Get player's actuals for the week
-        actuals = self.db.query(PlayerActuals).filter(
-            and_(
-                PlayerActuals.playerDkId == player_id,
-                PlayerActuals.week_id == week_id
-            )
-        ).first()
-        
-        if not actuals:
+        if not frame['has_actuals'].any():
             logger.warning(f"No actuals found for player {player_id} in week {week_id}")
             return []
         
-        results = []
-        for prop in props:
-            result = self._score_single_prop(prop, actuals)
-            if result:
-                # Update the prop in database
-                prop.result_status = result['result_status']
-                prop.actual_value = result['actual_value']
-                
-                results.append({
-                    'prop_id': prop.id,
-                    'market': prop.market,
-                    'outcome_name': prop.outcome_name,
-                    'outcome_point': prop.outcome_point,
-                    'actual_value': result['actual_value'],
-                    'result_status': result['result_status']
-                })
+        scored = frame.filter(pl.col('result_status').is_not_null())
+        self._save_scores(scored)
+        self.refresh_hit_rates([week_id], player_id=player_id)
+        
+        results = [
+            {
+                'prop_id': row['id'],
+                'market': row['market'],
+                'outcome_name': row['outcome_name'],
+                'outcome_point': row['outcome_point'],
+                'actual_value': row['actual_value'],
+                'result_status': row['result_status']
+            }
+            for row in scored.iter_rows(named=True)
+        ]
         
         try:
             self.db.commit()
@@ -230,114 +174,292 @@ class PlayerPropsScoringService:
         """
         logger.info(f"Calculating hit percentage for player {player_id}")
         
-        # Build query for scored props
-        query = self.db.query(PlayerPropBet).filter(
-            and_(
-                PlayerPropBet.playerDkId == player_id,
-                PlayerPropBet.result_status.isnot(None)
-            )
-        )
+        # Read the maintained per-week aggregates instead of every scored prop
+        query = self.db.query(
+            func.coalesce(func.sum(PlayerPropHitRate.scored_props), 0),
+            func.coalesce(func.sum(PlayerPropHitRate.hits), 0),
+            func.coalesce(func.sum(PlayerPropHitRate.pushes), 0)
+        ).filter(PlayerPropHitRate.playerDkId == player_id)
         
-        if weeks_back:
-            # Get the most recent week and calculate cutoff
-            latest_week = self.db.query(func.max(PlayerPropBet.week_id)).scalar()
-            if latest_week:
-                cutoff_week = latest_week - weeks_back + 1
-                query = query.filter(PlayerPropBet.week_id >= cutoff_week)
+        cutoff_week = self._weeks_back_cutoff(weeks_back)
+        if cutoff_week is not None:
+            query = query.filter(PlayerPropHitRate.week_id >= cutoff_week)
         
-        scored_props = query.all()
+        scored, hits, pushes = query.one()
         
-        if not scored_props:
+        if not scored:
             logger.info(f"No scored props found for player {player_id}")
             return 0.0
         
-        hits = sum(1 for prop in scored_props if prop.result_status == 'HIT')
-        pushes = sum(1 for prop in scored_props if prop.result_status == 'PUSH')
-        
         # Calculate hit percentage (counting pushes as wins)
-        hit_percentage = (hits + pushes) / len(scored_props)
+        hit_percentage = (hits + pushes) / scored
         
-        logger.info(f"Player {player_id} hit percentage: {hit_percentage:.3f} ({hits + pushes}/{len(scored_props)})")
+        logger.info(f"Player {player_id} hit percentage: {hit_percentage:.3f} ({hits + pushes}/{scored})")
         return hit_percentage
     
-    def _score_single_prop(self, prop: PlayerPropBet, actuals: PlayerActuals) -> Optional[Dict]:
+    def get_hit_rate_leaderboard(
+        self,
+        weeks_back: Optional[int] = None,
+        market: Optional[str] = None,
+        bookmaker: Optional[str] = None,
+        position: Optional[str] = None,
+        min_scored: int = 1,
+        limit: Optional[int] = 100
+    ) -> List[Dict]:
         """
-        Score a single prop against actuals.
+        Hit percentage for every player, read from the maintained aggregates in one grouped query.
         
         Args:
-            prop: PlayerPropBet object to score
-            actuals: PlayerActuals object with actual statistics
+            weeks_back: Optional limit on how many weeks back to consider
+            market: Only count props for this market
+            bookmaker: Only count props from this bookmaker
+            position: Only include players at this position
+            min_scored: Minimum number of scored props for a player to be ranked
+            limit: Maximum number of players to return (None for all)
             
         Returns:
-            Dictionary with scoring result or None if unable to score
+            List of player rows ordered by hit percentage, then by number of scored props
         """
-        if not prop.market or not prop.outcome_name or prop.outcome_point is None:
-            logger.warning(f"Cannot score prop {prop.id}: missing market, outcome_name, or outcome_point")
-            return None
+        scored = func.sum(PlayerPropHitRate.scored_props)
+        hits = func.sum(PlayerPropHitRate.hits)
+        misses = func.sum(PlayerPropHitRate.misses)
+        pushes = func.sum(PlayerPropHitRate.pushes)
+        hit_percentage = (hits + pushes) * 1.0 / scored
+        
+        query = self.db.query(
+            PlayerPropHitRate.playerDkId,
+            Player.displayName,
+            Player.position,
+            Player.team,
+            func.sum(PlayerPropHitRate.total_props).label('total_props'),
+            scored.label('scored_props'),
+            hits.label('hits'),
+            misses.label('misses'),
+            pushes.label('pushes'),
+            func.count(func.distinct(PlayerPropHitRate.week_id)).label('weeks_with_props')
+        ).join(
+            Player, Player.playerDkId == PlayerPropHitRate.playerDkId
+        )
         
-        # Get the actual value for this prop type
-        actuals_field = self.PROP_MAPPINGS.get(prop.market)
-        if not actuals_field:
-            logger.warning(f"No mapping found for market '{prop.market}'")
-            return None
+        cutoff_week = self._weeks_back_cutoff(weeks_back)
+        if cutoff_week is not None:
+            query = query.filter(PlayerPropHitRate.week_id >= cutoff_week)
+        if market:
+            query = query.filter(PlayerPropHitRate.market == market)
+        if bookmaker:
+            query = query.filter(PlayerPropHitRate.bookmaker == bookmaker)
+        if position:
+            query = query.filter(Player.position == position)
+        
+        query = query.group_by(
+            PlayerPropHitRate.playerDkId, Player.displayName, Player.position, Player.team
+        ).having(
+            scored >= max(min_scored, 1)
+        ).order_by(
+            hit_percentage.desc(), scored.desc(), PlayerPropHitRate.playerDkId
+        )
+        if limit:
+            query = query.limit(limit)
         
-        actual_value = getattr(actuals, actuals_field, None)
-        if actual_value is None:
-            logger.warning(f"No actual value found for field '{actuals_field}' in actuals")
-            return None
+        return [
+            {
+                'player_id': row.playerDkId,
+                'player_name': row.displayName,
+                'position': row.position,
+                'team': row.team,
+                'total_props': int(row.total_props or 0),
+                'scored_props': int(row.scored_props or 0),
+                'hits': int(row.hits or 0),
+                'misses': int(row.misses or 0),
+                'pushes': int(row.pushes or 0),
+                'hit_percentage': (int(row.hits or 0) + int(row.pushes or 0)) / int(row.scored_props),
+                'weeks_with_props': row.weeks_with_props
+            }
+            for row in query.all()
+        ]
+    
+    def refresh_hit_rates(self, week_ids: Iterable[int], player_id: Optional[int] = None) -> int:
+        """
+        Rebuild the player x market x bookmaker x week aggregates for the given weeks
+        (optionally one player) from player_prop_bets with one DELETE and one INSERT ... SELECT.
+        Does not commit.
         
-        # Determine result based on outcome name and comparison
-        result_status = self._determine_result_status(
-            prop.outcome_name, 
-            prop.outcome_point, 
-            actual_value
+        Returns:
+            Number of aggregate rows written
+        """
+        week_ids = [week_id for week_id in week_ids if week_id is not None]
+        if not week_ids:
+            return 0
+        
+        prop_filters = [PlayerPropBet.week_id.in_(week_ids)]
+        rate_filters = [PlayerPropHitRate.week_id.in_(week_ids)]
+        if player_id is not None:
+            prop_filters.append(PlayerPropBet.playerDkId == player_id)
+            rate_filters.append(PlayerPropHitRate.playerDkId == player_id)
+        
+        self.db.execute(delete(PlayerPropHitRate).where(and_(*rate_filters)))
+        
+        market = func.coalesce(PlayerPropBet.market, '')
+        bookmaker = func.coalesce(PlayerPropBet.bookmaker, '')
+        aggregates = select(
+            PlayerPropBet.week_id,
+            PlayerPropBet.playerDkId,
+            market,
+            bookmaker,
+            func.count(PlayerPropBet.id),
+            func.count(PlayerPropBet.result_status),
+            func.sum(case((PlayerPropBet.result_status == 'HIT', 1), else_=0)),
+            func.sum(case((PlayerPropBet.result_status == 'MISS', 1), else_=0)),
+            func.sum(case((PlayerPropBet.result_status == 'PUSH', 1), else_=0)),
+        ).where(
+            and_(*prop_filters)
+        ).group_by(
+            PlayerPropBet.week_id, PlayerPropBet.playerDkId, market, bookmaker
         )
-        
+        result = self.db.execute(
+            insert(PlayerPropHitRate).from_select(
+                ['week_id', 'playerDkId', 'market', 'bookmaker', 'total_props', 'scored_props', 'hits', 'misses', 'pushes'],
+                aggregates
+            )
+        )
+        return result.rowcount or 0
+    
+    def _weeks_back_cutoff(self, weeks_back: Optional[int]) -> Optional[int]:
+        """First week_id inside a weeks_back window ending at the most recent week with props"""
+        if not weeks_back:
+            return None
+        latest_week = self.db.query(func.max(PlayerPropBet.week_id)).scalar()
+        if not latest_week:
+            return None
+        return latest_week - weeks_back + 1
+    
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
         return {
-            'result_status': result_status,
-            'actual_value': actual_value
+            'total_props': 0,
+            'scored_props': 0,
+            'hits': 0,
+            'misses': 0,
+            'pushes': 0,
+            'players_with_actuals': 0,
+            'players_missing_actuals': 0
         }
     
-    def _determine_result_status(self, outcome_name: str, outcome_point: float, actual_value: float) -> str:
+    def _score_props_frame(
+        self,
+        week_ids: Optional[Iterable[int]] = None,
+        player_id: Optional[int] = None
+    ) -> pl.DataFrame:
         """
-        Determine if a prop hit, missed, or pushed.
+        Load props with their actuals in one LEFT JOIN and score them all at once.
         
-        Args:
-            outcome_name: The outcome name (e.g., 'Over', 'Under')
-            outcome_point: The line/point value
-            actual_value: The actual statistic value
-            
-        Returns:
-            'HIT', 'MISS', or 'PUSH'
+        Returns a frame with one row per prop: id, week_id, playerDkId, market, outcome_name,
+        outcome_point, has_actuals, actual_value and result_status ('HIT', 'MISS', 'PUSH',
+        or null when the prop cannot be scored). Over (and any unknown outcome) hits above
+        the line, Under hits below it, and a value on the line is a PUSH.
         """
-        outcome_name_lower = outcome_name.lower()
-        
-        if outcome_name_lower == 'over':
-            if actual_value > outcome_point:
-                return 'HIT'
-            elif actual_value < outcome_point:
-                return 'MISS'
-            else:
-                return 'PUSH'  # Exact tie
-                
-        elif outcome_name_lower == 'under':
-            if actual_value < outcome_point:
-                return 'HIT'
-            elif actual_value > outcome_point:
-                return 'MISS'
-            else:
-                return 'PUSH'  # Exact tie
-                
-        else:
-            # For other outcome types, we might need more complex logic
-            # For now, default to treating as over
-            logger.warning(f"Unknown outcome name '{outcome_name}', treating as 'Over'")
-            if actual_value > outcome_point:
-                return 'HIT'
-            elif actual_value < outcome_point:
-                return 'MISS'
-            else:
-                return 'PUSH'
+        stat_columns = sorted(set(self.PROP_MAPPINGS.values()))
+        query = self.db.query(
+            PlayerPropBet.id,
+            PlayerPropBet.week_id,
+            PlayerPropBet.playerDkId,
+            PlayerPropBet.market,
+            PlayerPropBet.outcome_name,
+            PlayerPropBet.outcome_point,
+            PlayerActuals.id.label('actuals_id'),
+            *[getattr(PlayerActuals, column) for column in stat_columns]
+        ).outerjoin(
+            PlayerActuals,
+            and_(
+                PlayerActuals.week_id == PlayerPropBet.week_id,
+                PlayerActuals.playerDkId == PlayerPropBet.playerDkId
+            )
+        )
+        if week_ids is not None:
+            query = query.filter(PlayerPropBet.week_id.in_(list(week_ids)))
+        if player_id is not None:
+            query = query.filter(PlayerPropBet.playerDkId == player_id)
+        
+        schema = {
+            'id': pl.Int64,
+            'week_id': pl.Int64,
+            'playerDkId': pl.Int64,
+            'market': pl.Utf8,
+            'outcome_name': pl.Utf8,
+            'outcome_point': pl.Float64,
+            'actuals_id': pl.Int64,
+            **{column: pl.Float64 for column in stat_columns}
+        }
+        df = pl.DataFrame(query.order_by(PlayerPropBet.id).all(), schema=schema, orient='row')
+        
+        # Stat value for each prop's market; null for unmapped markets
+        actual_value = pl.lit(None, dtype=pl.Float64)
+        for market, column in reversed(list(self.PROP_MAPPINGS.items())):
+            actual_value = pl.when(pl.col('market') == market).then(pl.col(column)).otherwise(actual_value)
+        
+        outcome = pl.col('outcome_name').str.to_lowercase()
+        point = pl.col('outcome_point')
+        value = pl.col('actual_value')
+        # Over (and any unknown outcome) hits above the line; Under hits below it
+        hit = pl.when(outcome == 'under').then(value < point).otherwise(value > point)
+        miss = pl.when(outcome == 'under').then(value > point).otherwise(value < point)
+        scorable = (
+            pl.col('has_actuals') &
+            pl.col('market').fill_null('').str.len_chars().gt(0) &
+            pl.col('outcome_name').fill_null('').str.len_chars().gt(0) &
+            point.is_not_null() &
+            value.is_not_null()
+        )
+        
+        df = df.with_columns(
+            pl.col('actuals_id').is_not_null().alias('has_actuals'),
+            actual_value.alias('actual_value')
+        ).with_columns(
+            pl.when(~scorable).then(pl.lit(None, dtype=pl.Utf8))
+            .when(hit).then(pl.lit('HIT'))
+            .when(miss).then(pl.lit('MISS'))
+            .otherwise(pl.lit('PUSH'))
+            .alias('result_status')
+        )
+        
+        unmapped = df.filter(
+            pl.col('has_actuals') & pl.col('market').is_not_null() &
+            ~pl.col('market').is_in(list(self.PROP_MAPPINGS.keys()))
+        )['market'].unique().to_list()
+        if unmapped:
+            logger.warning(f"No mapping found for markets: {sorted(unmapped)}")
+        
+        return df.select(
+            'id', 'week_id', 'playerDkId', 'market', 'outcome_name', 'outcome_point',
+            'has_actuals', 'actual_value', 'result_status'
+        )
+    
+    def _save_scores(self, frame: pl.DataFrame) -> int:
+        """Write result_status/actual_value for every scored prop with one bulk UPDATE (no commit)"""
+        scored = frame.filter(pl.col('result_status').is_not_null())
+        if scored.is_empty():
+            return 0
+        self.db.execute(update(PlayerPropBet), scored.select('id', 'result_status', 'actual_value').to_dicts())
+        return scored.height
+    
+    @staticmethod
+    def _weekly_stats(frame: pl.DataFrame) -> Dict[int, Dict[str, int]]:
+        """Per-week scoring statistics with the same meaning as score_week_props has always returned"""
+        status = pl.col('result_status')
+        grouped = frame.group_by('week_id').agg(
+            pl.len().alias('total_props'),
+            status.is_not_null().sum().alias('scored_props'),
+            (status == 'HIT').sum().alias('hits'),
+            (status == 'MISS').sum().alias('misses'),
+            (status == 'PUSH').sum().alias('pushes'),
+            pl.col('playerDkId').filter(pl.col('has_actuals')).n_unique().alias('players_with_actuals'),
+            # Historically counts props that could not be scored, not players
+            status.is_null().sum().alias('players_missing_actuals'),
+        )
+        return {
+            row.pop('week_id'): {key: int(value or 0) for key, value in row.items()}
+            for row in grouped.iter_rows(named=True)
+        }
     
     def get_player_props_summary(self, player_id: int) -> Dict:
         """
@@ -351,12 +473,18 @@ class PlayerPropsScoringService:
         """
         logger.info(f"Getting props summary for player {player_id}")
         
-        # Get all props for this player
-        all_props = self.db.query(PlayerPropBet).filter(
-            PlayerPropBet.playerDkId == player_id
-        ).all()
-        
-        if not all_props:
+        # Totals come from the maintained per-week aggregates
+        totals = self.db.query(
+            func.coalesce(func.sum(PlayerPropHitRate.total_props), 0),
+            func.coalesce(func.sum(PlayerPropHitRate.scored_props), 0),
+            func.coalesce(func.sum(PlayerPropHitRate.hits), 0),
+            func.coalesce(func.sum(PlayerPropHitRate.misses), 0),
+            func.coalesce(func.sum(PlayerPropHitRate.pushes), 0),
+            func.count(func.distinct(PlayerPropHitRate.week_id))
+        ).filter(PlayerPropHitRate.playerDkId == player_id).one()
+        total_props, scored_props, hits, misses, pushes, weeks_with_props = (int(value or 0) for value in totals)
+        
+        if not total_props:
             return {
                 'total_props': 0,
                 'scored_props': 0,
@@ -368,21 +496,12 @@ class PlayerPropsScoringService:
                 'weeks_with_props': 0
             }
         
-        scored_props = [p for p in all_props if p.result_status is not None]
-        unscored_props = len(all_props) - len(scored_props)
-        
-        hits = sum(1 for p in scored_props if p.result_status == 'HIT')
-        misses = sum(1 for p in scored_props if p.result_status == 'MISS')
-        pushes = sum(1 for p in scored_props if p.result_status == 'PUSH')
-        
-        hit_percentage = (hits + pushes) / len(scored_props) if scored_props else 0.0
-        
-        weeks_with_props = len(set(p.week_id for p in all_props))
+        hit_percentage = (hits + pushes) / scored_props if scored_props else 0.0
         
         return {
-            'total_props': len(all_props),
-            'scored_props': len(scored_props),
-            'unscored_props': unscored_props,
+            'total_props': total_props,
+            'scored_props': scored_props,
+            'unscored_props': total_props - scored_props,
             'hits': hits,
             'misses': misses,
             'pushes': pushes,
@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 from app.models import WeeklyPlayerSummary, PlayerPoolEntry, Projection, OwnershipEstimate
+from app.utils.bulk_upsert import bulk_upsert
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,157 +15,154 @@ class WeeklySummaryService:
         """
         Populate weekly summary for a given week
         Returns number of records created/updated
-        """
-        # Get all players with pool entries for this week
-        players_with_entries = db.query(PlayerPoolEntry.playerDkId).filter(
-            PlayerPoolEntry.week_id == week_id
-        ).distinct().all()
-        
-        updated_count = 0
-        
-        for (playerDkId,) in players_with_entries:
-            # Get baseline salary (main slate first, then min across all slates)
-            baseline_salary = WeeklySummaryService._get_baseline_salary(
-                db, week_id, playerDkId, main_draftgroup
-            )
-            
-            # Get consensus projection from Projection table
-            consensus_projection = WeeklySummaryService._get_consensus_projection(
-                db, week_id, playerDkId
-            )
-            
-            # Get consensus ownership from OwnershipEstimate table
-            consensus_ownership = WeeklySummaryService._get_consensus_ownership(
-                db, week_id, playerDkId
-            )
-            
-            # Get OPRK data from player pool entry
-            oprk_value, oprk_quality = WeeklySummaryService._get_oprk_data(
-                db, week_id, playerDkId, main_draftgroup
-            )
-            
-            # Upsert weekly summary
-            existing = db.query(WeeklyPlayerSummary).filter(
-                and_(
-                    WeeklyPlayerSummary.week_id == week_id,
-                    WeeklyPlayerSummary.playerDkId == playerDkId
-                )
-            ).first()
-            
-            if existing:
-                existing.baseline_salary = baseline_salary
-                existing.consensus_projection = consensus_projection
-                existing.consensus_ownership = consensus_ownership
-                existing.baseline_source = main_draftgroup or "multi_slate"
-                existing.oprk_value = oprk_value
-                existing.oprk_quality = oprk_quality
-            else:
-                new_summary = WeeklyPlayerSummary(
-                    week_id=week_id,
-                    playerDkId=playerDkId,
-                    baseline_salary=baseline_salary,
-                    consensus_projection=consensus_projection,
-                    consensus_ownership=consensus_ownership,
-                    baseline_source=main_draftgroup or "multi_slate",
-                    oprk_value=oprk_value,
-                    oprk_quality=oprk_quality
-                )
-                db.add(new_summary)
-            
-            updated_count += 1
         
-        db.commit()
-        return updated_count
+        Set-based rebuild: one read of the week's pool entries, one grouped average each
+        for projections and ownership, then a single bulk upsert of every summary row.
+        """
+        return WeeklySummaryService._upsert_summaries(db, week_id, main_draftgroup)
     
     @staticmethod
-    def _get_baseline_salary(db: Session, week_id: int, playerDkId: int, main_draftgroup: str = None) -> Optional[int]:
-        """Get baseline salary - main slate first, then min across all slates"""
-        if main_draftgroup:
-            # Try main slate first
-            main_entry = db.query(PlayerPoolEntry).filter(
-                and_(
-                    PlayerPoolEntry.week_id == week_id,
-                    PlayerPoolEntry.playerDkId == playerDkId,
-                    PlayerPoolEntry.draftGroup == main_draftgroup
-                )
-            ).first()
-            
-            if main_entry:
-                return main_entry.salary
+    def refresh_players(db: Session, week_id: int, player_dk_ids: Iterable[int], main_draftgroup: str = None) -> int:
+        """
+        Recompute summary rows for only the given players in a week
+        Returns number of records created/updated
+        
+        Called after imports that touched a subset of players. When no main draft group
+        is given, the baseline source recorded by the last full rebuild is reused so the
+        refreshed rows stay consistent with the rest of the week. A different main draft
+        group changes every player's baseline, so that case falls back to a full rebuild.
+        Summary rows of given players that no longer have pool entries are deleted.
+        """
+        player_dk_ids = {pid for pid in player_dk_ids if pid is not None}
+        if not player_dk_ids:
+            return 0
         
-        # Fallback to min salary across all slates
-        min_salary = db.query(func.min(PlayerPoolEntry.salary)).filter(
-            and_(
-                PlayerPoolEntry.week_id == week_id,
-                PlayerPoolEntry.playerDkId == playerDkId
-            )
-        ).scalar()
+        current_draftgroup = WeeklySummaryService._get_baseline_draftgroup(db, week_id)
+        if main_draftgroup is None:
+            main_draftgroup = current_draftgroup
+        elif str(main_draftgroup) != current_draftgroup:
+            logger.info(f"Main draft group for week {week_id} changed to {main_draftgroup}, rebuilding full weekly summary")
+            return WeeklySummaryService._upsert_summaries(db, week_id, main_draftgroup)
         
-        return min_salary
+        return WeeklySummaryService._upsert_summaries(db, week_id, main_draftgroup, player_dk_ids)
     
     @staticmethod
-    def _get_consensus_projection(db: Session, week_id: int, playerDkId: int) -> Optional[float]:
-        """Get consensus projection from Projection table"""
-        # Get average of all projections for this player/week
-        avg_projection = db.query(func.avg(Projection.pprProjections)).filter(
-            and_(
-                Projection.week_id == week_id,
-                Projection.playerDkId == playerDkId,
-                Projection.pprProjections.isnot(None)
-            )
-        ).scalar()
+    def _get_baseline_draftgroup(db: Session, week_id: int) -> Optional[str]:
+        """Get the main draft group the week's summary rows were last built against"""
+        baseline_source = db.query(WeeklyPlayerSummary.baseline_source).filter(
+            WeeklyPlayerSummary.week_id == week_id
+        ).order_by(
+            func.coalesce(WeeklyPlayerSummary.updated_at, WeeklyPlayerSummary.created_at).desc(),
+            WeeklyPlayerSummary.id.desc()
+        ).limit(1).scalar()
         
-        return round(avg_projection, 2) if avg_projection else None
+        if not baseline_source or baseline_source == "multi_slate":
+            return None
+        return baseline_source
     
     @staticmethod
-    def _get_consensus_ownership(db: Session, week_id: int, playerDkId: int) -> Optional[float]:
-        """Get consensus ownership from OwnershipEstimate table"""
-        # Get average of all ownership estimates for this player/week
-        avg_ownership = db.query(func.avg(OwnershipEstimate.ownership)).filter(
-            and_(
-                OwnershipEstimate.week_id == week_id,
-                OwnershipEstimate.playerDkId == playerDkId
-            )
-        ).scalar()
+    def _upsert_summaries(db: Session, week_id: int, main_draftgroup: str = None, player_dk_ids: Optional[set] = None) -> int:
+        """Build and bulk upsert summary rows for a week, optionally limited to some players"""
+        pool_filter = [PlayerPoolEntry.week_id == week_id]
+        projection_filter = [Projection.week_id == week_id, Projection.pprProjections.isnot(None)]
+        ownership_filter = [OwnershipEstimate.week_id == week_id]
+        if player_dk_ids is not None:
+            ids = list(player_dk_ids)
+            pool_filter.append(PlayerPoolEntry.playerDkId.in_(ids))
+            projection_filter.append(Projection.playerDkId.in_(ids))
+            ownership_filter.append(OwnershipEstimate.playerDkId.in_(ids))
+        
+        # Pool entries for the week; ordered by id so the "any slate" fallback is stable
+        pool_rows = db.query(
+            PlayerPoolEntry.playerDkId,
+            PlayerPoolEntry.draftGroup,
+            PlayerPoolEntry.salary,
+            PlayerPoolEntry.draftStatAttributes
+        ).filter(
+            and_(*pool_filter)
+        ).order_by(PlayerPoolEntry.id).all()
         
-        return round(avg_ownership, 2) if avg_ownership else None
+        if player_dk_ids is not None:
+            # A full rebuild only has rows for players with pool entries; drop touched
+            # players that no longer have any so their old consensus values don't linger
+            stale_ids = player_dk_ids - {row.playerDkId for row in pool_rows}
+            if stale_ids:
+                db.query(WeeklyPlayerSummary).filter(
+                    WeeklyPlayerSummary.week_id == week_id,
+                    WeeklyPlayerSummary.playerDkId.in_(list(stale_ids))
+                ).delete(synchronize_session=False)
+                db.commit()
+        
+        if not pool_rows:
+            return 0
+        
+        projections = dict(db.query(
+            Projection.playerDkId,
+            func.avg(Projection.pprProjections)
+        ).filter(
+            and_(*projection_filter)
+        ).group_by(Projection.playerDkId).all())
+        
+        ownership = dict(db.query(
+            OwnershipEstimate.playerDkId,
+            func.avg(OwnershipEstimate.ownership)
+        ).filter(
+            and_(*ownership_filter)
+        ).group_by(OwnershipEstimate.playerDkId).all())
+        
+        # Pick, per player, the main slate entry (if any) and the first entry seen
+        main_entries = {}
+        first_entries = {}
+        min_salaries = {}
+        for row in pool_rows:
+            first_entries.setdefault(row.playerDkId, row)
+            if main_draftgroup and row.draftGroup == main_draftgroup:
+                main_entries.setdefault(row.playerDkId, row)
+            if row.salary is not None:
+                current = min_salaries.get(row.playerDkId)
+                min_salaries[row.playerDkId] = row.salary if current is None else min(current, row.salary)
+        
+        baseline_source = main_draftgroup or "multi_slate"
+        summary_rows = []
+        for playerDkId, first_entry in first_entries.items():
+            main_entry = main_entries.get(playerDkId)
+            
+            # Baseline salary: main slate first, then min across all slates
+            baseline_salary = main_entry.salary if main_entry else min_salaries.get(playerDkId)
+            
+            # OPRK: main slate entry first, then any entry for the player
+            oprk_entry = main_entry or first_entry
+            oprk_value, oprk_quality = WeeklySummaryService._parse_oprk(oprk_entry.draftStatAttributes, playerDkId)
+            
+            avg_projection = projections.get(playerDkId)
+            avg_ownership = ownership.get(playerDkId)
+            
+            summary_rows.append({
+                'week_id': week_id,
+                'playerDkId': playerDkId,
+                'baseline_salary': baseline_salary,
+                'consensus_projection': round(avg_projection, 2) if avg_projection else None,
+                'consensus_ownership': round(avg_ownership, 2) if avg_ownership else None,
+                'baseline_source': baseline_source,
+                'oprk_value': oprk_value,
+                'oprk_quality': oprk_quality,
+            })
+        
+        bulk_upsert(db, WeeklyPlayerSummary, summary_rows, index_elements=['week_id', 'playerDkId'])
+        db.commit()
+        return len(summary_rows)
     
     @staticmethod
-    def _get_oprk_data(db: Session, week_id: int, playerDkId: int, main_draftgroup: str = None) -> Tuple[Optional[int], Optional[str]]:
+    def _parse_oprk(draft_stats, playerDkId: int) -> Tuple[Optional[int], Optional[str]]:
         """
-        Get OPRK (Opponent Rank) data from player pool entry's draftStatAttributes
+        Parse OPRK (Opponent Rank) out of a pool entry's draftStatAttributes
         Returns: (oprk_value, oprk_quality)
-        
-        OPRK is stored in draftStatAttributes as an object with id == -2
         """
-        # Try main draft group first if provided
-        pool_entry = None
-        
-        if main_draftgroup:
-            pool_entry = db.query(PlayerPoolEntry).filter(
-                and_(
-                    PlayerPoolEntry.week_id == week_id,
-                    PlayerPoolEntry.playerDkId == playerDkId,
-                    PlayerPoolEntry.draftGroup == main_draftgroup
-                )
-            ).first()
-        
-        # Fallback to any pool entry for this player/week
-        if not pool_entry:
-            pool_entry = db.query(PlayerPoolEntry).filter(
-                and_(
-                    PlayerPoolEntry.week_id == week_id,
-                    PlayerPoolEntry.playerDkId == playerDkId
-                )
-            ).first()
-        
-        if not pool_entry or not pool_entry.draftStatAttributes:
+        if not draft_stats:
             return None, None
         
         # Extract OPRK from draftStatAttributes
         try:
-            draft_stats = pool_entry.draftStatAttributes
-            
             # Handle if it's stored as a string (shouldn't be, but just in case)
             if isinstance(draft_stats, str):
                 import json
@@ -0,0 +1,164 @@
+"""
+Bulk upsert utilities.
+
+Builds multi-row INSERT ... ON CONFLICT DO UPDATE statements so imports can write
+hundreds of rows per round trip instead of a SELECT + INSERT/UPDATE per row.
+PostgreSQL is used everywhere in production; SQLite is supported for local runs.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, literal_column, select, tuple_
+from sqlalchemy.orm import Session
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def chunked(rows: Sequence[Any], size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Sequence[Any]]:
+    """
+    Yield successive slices of rows with at most size items.
+
+    Args:
+        rows: Sequence to split
+        size: Maximum chunk length
+
+    Returns:
+        Iterator over slices of rows
+    """
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def dialect_insert(db: Session, model):
+    """
+    Return a dialect-specific INSERT construct that supports on_conflict_do_update.
+
+    Args:
+        db: Session used to detect the database dialect
+        model: Declarative model or Table to insert into
+
+    Returns:
+        postgresql or sqlite Insert for the model's table
+    """
+    table = getattr(model, "__table__", model)
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(table)
+
+
+def bulk_upsert(
+    db: Session,
+    model,
+    rows: List[Dict[str, Any]],
+    index_elements: Sequence[str],
+    update_columns: Optional[Iterable[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    where=None,
+) -> int:
+    """
+    Upsert rows with one INSERT ... ON CONFLICT DO UPDATE statement per chunk.
+
+    Does not commit; callers control the transaction.
+
+    Args:
+        db: Database session
+        model: Declarative model to write to
+        rows: Row dicts keyed by column name (every row must have the same keys)
+        index_elements: Column names of the unique index used as the conflict target
+        update_columns: Columns to overwrite on conflict (defaults to every non-key column in the rows)
+        chunk_size: Rows per statement
+        where: Optional condition restricting which conflicting rows are updated
+
+    Returns:
+        Number of rows sent to the database
+    """
+    if not rows:
+        return 0
+
+    update_columns = _resolve_update_columns(rows, index_elements, update_columns)
+    written = 0
+    for chunk in chunked(rows, chunk_size):
+        db.execute(_upsert_statement(db, model, chunk, index_elements, update_columns, where))
+        written += len(chunk)
+    return written
+
+
+def bulk_upsert_counts(
+    db: Session,
+    model,
+    rows: List[Dict[str, Any]],
+    index_elements: Sequence[str],
+    update_columns: Optional[Iterable[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[int, int]:
+    """
+    Upsert rows like bulk_upsert and report how many were inserted vs updated.
+
+    On PostgreSQL every statement returns ``xmax = 0`` per row, which is true only for
+    freshly inserted rows. SQLite has no xmax, so the keys already present are read
+    once per chunk before it is written. Rows must be unique on index_elements.
+
+    Does not commit; callers control the transaction.
+
+    Args:
+        db: Database session
+        model: Declarative model to write to
+        rows: Row dicts keyed by column name (every row must have the same keys)
+        index_elements: Column names of the unique index used as the conflict target
+        update_columns: Columns to overwrite on conflict (defaults to every non-key column in the rows)
+        chunk_size: Rows per statement
+
+    Returns:
+        (inserted, updated) row counts
+    """
+    if not rows:
+        return 0, 0
+
+    update_columns = _resolve_update_columns(rows, index_elements, update_columns)
+    table = model.__table__
+    key_columns = [table.c[name] for name in index_elements]
+    is_sqlite = db.get_bind().dialect.name == "sqlite"
+
+    inserted = 0
+    updated = 0
+    for chunk in chunked(rows, chunk_size):
+        stmt = _upsert_statement(db, model, chunk, index_elements, update_columns)
+        if is_sqlite:
+            keys = [tuple(row[name] for name in index_elements) for row in chunk]
+            existing = db.execute(select(*key_columns).where(tuple_(*key_columns).in_(keys))).all()
+            db.execute(stmt)
+            updated += len(existing)
+            inserted += len(chunk) - len(existing)
+        else:
+            for was_inserted in db.execute(stmt.returning(literal_column("(xmax = 0)"))).scalars():
+                if was_inserted:
+                    inserted += 1
+                else:
+                    updated += 1
+    return inserted, updated
+
+
+def _resolve_update_columns(
+    rows: List[Dict[str, Any]],
+    index_elements: Sequence[str],
+    update_columns: Optional[Iterable[str]],
+) -> List[str]:
+    if update_columns is None:
+        return [key for key in rows[0].keys() if key not in index_elements]
+    return list(update_columns)
+
+
+def _upsert_statement(db: Session, model, chunk: Sequence[Dict[str, Any]], index_elements: Sequence[str],
+                      update_columns: List[str], where=None):
+    """Build the INSERT ... ON CONFLICT statement for one chunk of rows"""
+    table = model.__table__
+    stmt = dialect_insert(db, model).values(list(chunk))
+    set_ = {column: stmt.excluded[column] for column in update_columns}
+    # onupdate defaults are not applied by ON CONFLICT DO UPDATE
+    if "updated_at" in table.c and "updated_at" not in set_:
+        set_["updated_at"] = func.now()
+    if set_:
+        return stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_, where=where)
+    return stmt.on_conflict_do_nothing(index_elements=list(index_elements))
@@ -27,7 +27,6 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from app.database import SessionLocal
 from app.models import TeamStats, Week, Team, Game
 from app.services.dk_defense_scoring_service import DKDefenseScoringService
-from app.services.nflverse_service import NFLVerseService
 from sqlalchemy import func
 
 class HistoricalDKScoreBackfill:
@@ -76,70 +75,46 @@ class HistoricalDKScoreBackfill:
         if self.verbose:
             print(f"Processing week ID {week_id}...")
             
-        team_stats_list = self.get_team_stats_for_week(week_id)
-        
-        if not team_stats_list:
-            return {
-                'week_id': week_id,
-                'total_teams': 0,
-                'updated_count': 0,
-                'errors': [],
-                'status': 'no_data'
-            }
-        
-        updated_count = 0
-        errors = []
-        
-        for team_stats in team_stats_list:
-            try:
-                # Get points allowed from games table
-                points_allowed = NFLVerseService.get_points_allowed_for_team(
-                    self.db, team_stats.team_id, week_id
-                )
-                
-                # Create stats dictionary for scoring calculation
-                stats_dict = {
-                    'def_sacks': float(team_stats.def_sacks or 0),
-                    'def_interceptions': float(team_stats.def_interceptions or 0),
-                    'fumble_recovery_opp': float(team_stats.fumble_recovery_opp or 0),
-                    'def_tds': float(team_stats.def_tds or 0),
-                    'special_teams_tds': float(team_stats.special_teams_tds or 0),
-                    'def_safeties': float(team_stats.def_safeties or 0),
-                }
-                
-                # Calculate new DK defense score
-                new_score = DKDefenseScoringService.calculate_defense_score_from_dict(
-                    stats_dict, points_allowed
-                )
-                
-                if self.verbose:
-                    print(f"  Team {team_stats.team_id}: DK Score {team_stats.dk_defense_score} -> {new_score}, Pts Allowed: {points_allowed}")
-                
-                if not dry_run:
-                    # Update the team stats record
-                    team_stats.dk_defense_score = new_score
-                    team_stats.points_allowed = points_allowed
-                
-                updated_count += 1
-                
-            except Exception as e:
-                error_msg = f"Error updating team {team_stats.team_id}: {str(e)}"
-                errors.append(error_msg)
-                if self.verbose:
-                    print(f"  ERROR: {error_msg}")
-                continue
+        results = self.recalculate_weeks([week_id], dry_run)
+        return results[0]
+    
+    def recalculate_weeks(self, week_ids: Optional[List[int]], dry_run: bool = False) -> List[Dict[str, Any]]:
+        """
+        Recalculate DK defense scores for several weeks at once (all weeks when week_ids is None).
+        Team stats and games are loaded in one join and written back in one bulk update.
+        """
+        week_results = DKDefenseScoringService.recalculate_week_scores(self.db, week_ids, dry_run=dry_run)
         
         if not dry_run:
             # Commit all changes
             self.db.commit()
         
-        return {
-            'week_id': week_id,
-            'total_teams': len(team_stats_list),
-            'updated_count': updated_count,
-            'errors': errors,
-            'status': 'success' if not errors else 'partial_success'
-        }
+        results = []
+        for week_id in (week_ids if week_ids is not None else sorted(week_results.keys())):
+            week_result = week_results.get(week_id)
+            if not week_result:
+                results.append({
+                    'week_id': week_id,
+                    'total_teams': 0,
+                    'updated_count': 0,
+                    'errors': [],
+                    'status': 'no_data'
+                })
+                continue
+            
+            if self.verbose:
+                for team in week_result['teams']:
+                    print(f"  Week {week_id} Team {team['team_id']}: DK Score {team['old_score']} -> {team['new_score']}, Pts Allowed: {team['points_allowed']}")
+            
+            results.append({
+                'week_id': week_id,
+                'total_teams': week_result['total_teams'],
+                'updated_count': week_result['updated_count'],
+                'errors': week_result['errors'],
+                'status': 'success' if not week_result['errors'] else 'partial_success'
+            })
+        
+        return results
     
     def backfill_all_weeks(self, dry_run: bool = False) -> Dict[str, Any]:
         """Backfill DK defense scores for all weeks with team stats"""
@@ -150,15 +125,9 @@ class HistoricalDKScoreBackfill:
             for week in weeks:
                 print(f"  Week {week['week_number']} ({week['year']}): {week['team_count']} teams")
         
-        results = []
-        total_updated = 0
-        total_errors = 0
-        
-        for week in weeks:
-            result = self.recalculate_week_dk_scores(week['week_id'], dry_run)
-            results.append(result)
-            total_updated += result['updated_count']
-            total_errors += len(result['errors'])
+        results = self.recalculate_weeks([week['week_id'] for week in weeks], dry_run)
+        total_updated = sum(result['updated_count'] for result in results)
+        total_errors = sum(len(result['errors']) for result in results)
         
         return {
             'total_weeks': len(weeks),
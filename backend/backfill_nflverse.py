@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+NFLVerse Historical Backfill Script
+
+Loads games, team stats and player actuals from nflverse for a range of seasons.
+Each dataset is read once per season from the local Parquet cache, players are
+matched in one batch across all weeks, and every week is bulk upserted and
+committed on its own. Finished weeks are recorded in recent_activity, so an
+interrupted run can simply be started again.
+
+Usage:
+    python3 backfill_nflverse.py --start-season 2022 --end-season 2024 [options]
+
+Options:
+    --start-season YEAR  First NFL season to backfill
+    --end-season YEAR    Last NFL season to backfill (default: start season)
+    --season-type TYPE   REG, POST or PRE (default: REG)
+    --weeks N [N ...]    Only backfill these week numbers
+    --datasets NAME ...  Any of games, team_stats, player_actuals (default: all)
+    --no-resume          Reprocess weeks that were already backfilled
+    --dry-run            Show which weeks would be processed without making changes
+"""
+
+import sys
+import os
+import argparse
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal
+from app.services.nflverse_backfill import NFLVerseBackfillService
+
+
+def print_progress(week_result):
+    counts = ", ".join(f"{key}={value}" for key, value in week_result["counts"].items())
+    status = "✓" if week_result["status"] == "completed" else "✗"
+    print(f"[{week_result['index']}/{week_result['total']}] {status} {week_result['season']} week "
+          f"{week_result['week_number']} ({week_result['duration_ms']}ms) {counts}")
+    for error in week_result.get("errors", [])[:5]:
+        print(f"    - {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill historical nflverse data')
+    parser.add_argument('--start-season', type=int, required=True, help='First NFL season to backfill')
+    parser.add_argument('--end-season', type=int, help='Last NFL season to backfill (default: start season)')
+    parser.add_argument('--season-type', default='REG', choices=['REG', 'POST', 'PRE'], help='Season type')
+    parser.add_argument('--weeks', type=int, nargs='+', help='Only backfill these week numbers')
+    parser.add_argument('--datasets', nargs='+', choices=list(NFLVerseBackfillService.DATASETS), help='Datasets to load')
+    parser.add_argument('--no-resume', action='store_true', help='Reprocess weeks that were already backfilled')
+    parser.add_argument('--dry-run', action='store_true', help='Show which weeks would be processed without making changes')
+
+    args = parser.parse_args()
+    end_season = args.end_season or args.start_season
+
+    db = SessionLocal()
+    try:
+        service = NFLVerseBackfillService(db, progress=print_progress)
+
+        if args.dry_run:
+            datasets = NFLVerseBackfillService.validate_datasets(args.datasets)
+            weeks = service.get_target_weeks(args.start_season, end_season, args.weeks)
+            completed = set() if args.no_resume else service.get_completed_week_ids(
+                [w.id for w in weeks], datasets, args.season_type
+            )
+            print("DRY RUN MODE - No changes will be made")
+            for week in weeks:
+                state = "skip (already backfilled)" if week.id in completed else "process"
+                print(f"  {week.year} week {week.week_number} (week_id {week.id}): {state}")
+            return
+
+        print(f"Starting nflverse backfill for {args.start_season}-{end_season} ({args.season_type})...")
+        summary = service.run(
+            args.start_season,
+            end_season,
+            season_type=args.season_type,
+            week_numbers=args.weeks,
+            datasets=args.datasets,
+            resume=not args.no_resume
+        )
+
+        print("=" * 60)
+        print(f"Backfill {summary['backfill_id']}")
+        print(f"Weeks: {summary['weeks_total']} total, {summary['weeks_completed']} completed, "
+              f"{summary['weeks_failed']} failed, {summary['weeks_skipped']} skipped")
+        for key, value in summary["totals"].items():
+            print(f"  {key}: {value}")
+        print("=" * 60)
+
+        if summary["weeks_failed"]:
+            sys.exit(1)
+
+    except Exception as e:
+        print(f"Error during backfill: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Migration: Add contest_roi_rollups aggregate table
+
+Creates the per week x contest type x game type x entry-fee bucket x lineup rollup of
+contest results that ContestAnalyticsService refreshes after every contest import, then
+populates it from the entries already in contest with ContestAnalyticsService.refresh_all(),
+so migrated rows use the same fee buckets as refreshed ones:
+- entries / cashes: entries in the group and how many had any winnings
+- entry_fees / winnings / net_profit: summed dollars (winnings = cash + ticket)
+
+Environment:
+  - Requires DATABASE_URL to point to Neon Postgres
+
+Idempotent: Uses IF NOT EXISTS for the table and index and rebuilds the rollup rows.
+"""
+
+import os
+import sys
+from textwrap import dedent
+import psycopg
+
+# Make the backend app importable when run as migrations/<script>.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main() -> int:
+    database_url = os.getenv("DATABASE_URL") or os.getenv("DATABASE_DATABASE_URL") or os.getenv("LOCAL_DATABASE_URL") or os.getenv("STORAGE_URL")
+    if not database_url:
+        print("ERROR: DATABASE_URL not set.")
+        return 1
+
+    print("Connecting to Postgres...")
+    with psycopg.connect(database_url) as conn:
+        conn.execute("SET statement_timeout TO '5min'")
+
+        print("Creating contest_roi_rollups table...")
+        conn.execute(dedent("""
+            CREATE TABLE IF NOT EXISTS contest_roi_rollups (
+                id SERIAL PRIMARY KEY,
+                week_id INTEGER NOT NULL REFERENCES weeks(id),
+                contest_type VARCHAR(50) NOT NULL DEFAULT '',
+                game_type VARCHAR(50) NOT NULL DEFAULT '',
+                fee_bucket VARCHAR(20) NOT NULL DEFAULT '',
+                lineup_id VARCHAR(50) NOT NULL DEFAULT '',
+                entries INTEGER NOT NULL DEFAULT 0,
+                cashes INTEGER NOT NULL DEFAULT 0,
+                entry_fees NUMERIC(14, 2) NOT NULL DEFAULT 0,
+                winnings NUMERIC(14, 2) NOT NULL DEFAULT 0,
+                net_profit NUMERIC(14, 2) NOT NULL DEFAULT 0,
+                created_at TIMESTAMPTZ DEFAULT now(),
+                updated_at TIMESTAMPTZ
+            );
+        """))
+
+        print("Creating indexes...")
+        conn.execute(dedent("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_contest_roi_rollups_grain
+            ON contest_roi_rollups (week_id, contest_type, game_type, fee_bucket, lineup_id);
+        """))
+
+        conn.commit()
+
+    print("Populating rollups from contest...")
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.services.contest_analytics_service import ContestAnalyticsService
+
+    engine = create_engine(database_url.replace("postgresql://", "postgresql+psycopg://", 1))
+    try:
+        with Session(engine) as db:
+            rows = ContestAnalyticsService(db).refresh_all()
+            db.commit()
+    finally:
+        engine.dispose()
+
+    print("✅ Migration completed successfully!")
+    print(f"  ✅ contest_roi_rollups rows: {rows}")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = main()
+        sys.exit(exit_code)
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        sys.exit(1)
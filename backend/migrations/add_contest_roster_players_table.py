@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Migration: Add contest_roster_players table
+
+Creates one row per player slot of each opponent roster in contest_roster_details,
+resolved to playerDkId when the roster is saved. Field ownership per player per week
+is a group-by over (week_id, playerDkId) instead of an OR across nine name columns.
+
+Existing rosters get their player rows from
+POST /api/import-opponent-roster/roster-players/rebuild after this migration.
+
+Local SQLite databases get the table from Base.metadata.create_all at startup.
+
+Environment:
+  - Requires DATABASE_URL to point to Neon Postgres
+
+Idempotent: Uses IF NOT EXISTS for the table and indexes.
+"""
+
+import os
+import sys
+from textwrap import dedent
+import psycopg
+
+
+def main() -> int:
+    database_url = os.getenv("DATABASE_URL") or os.getenv("DATABASE_DATABASE_URL") or os.getenv("LOCAL_DATABASE_URL") or os.getenv("STORAGE_URL")
+    if not database_url:
+        print("ERROR: DATABASE_URL not set.")
+        return 1
+
+    print("Connecting to Postgres...")
+    with psycopg.connect(database_url) as conn:
+        conn.execute("SET statement_timeout TO '5min'")
+        with conn.cursor() as cur:
+            sql = dedent(
+                """
+                CREATE TABLE IF NOT EXISTS "contest_roster_players" (
+                    "id" SERIAL PRIMARY KEY,
+                    "roster_id" INTEGER NOT NULL REFERENCES "contest_roster_details"("id") ON DELETE CASCADE,
+                    "contest_id" BIGINT NOT NULL,
+                    "enter_key" BIGINT NOT NULL,
+                    "week_id" INTEGER REFERENCES "weeks"("id"),
+                    "draftgroup" INTEGER,
+                    "slot" INTEGER NOT NULL,
+                    "roster_position" VARCHAR(10),
+                    "playerDkId" INTEGER REFERENCES "players"("playerDkId"),
+                    "draftable_id" VARCHAR(50),
+                    "player_name" VARCHAR(255),
+                    "fantasy_points" DOUBLE PRECISION,
+                    "created_at" TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                );
+                """
+            ).strip()
+            print(f"Applying: {sql}")
+            cur.execute(sql)
+
+            indexes = [
+                'CREATE UNIQUE INDEX IF NOT EXISTS "idx_contest_roster_players_roster_slot" ON "contest_roster_players" ("roster_id", "slot");',
+                'CREATE INDEX IF NOT EXISTS "idx_contest_roster_players_week_player" ON "contest_roster_players" ("week_id", "playerDkId");',
+                'CREATE INDEX IF NOT EXISTS "idx_contest_roster_players_player" ON "contest_roster_players" ("playerDkId");',
+                'CREATE INDEX IF NOT EXISTS "idx_contest_roster_players_contest" ON "contest_roster_players" ("contest_id");',
+            ]
+            for index_sql in indexes:
+                print(f"Applying: {index_sql}")
+                cur.execute(index_sql)
+
+        conn.commit()
+    print("\n✅ Migration complete.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Migration: Add import_jobs table
+
+Creates the durable job store that ImportJobStore uses for long-running background
+imports (opponent roster imports, NFLVerse backfills):
+- status / message: pending, in_progress, completed or failed plus a human readable note
+- params: request parameters, replayed when a job is resumed
+- progress / checkpoint / results: counters, resume state and final results as JSON
+
+Local SQLite databases get the table from Base.metadata.create_all at startup.
+
+Environment:
+  - Requires DATABASE_URL to point to Neon Postgres
+
+Idempotent: Uses IF NOT EXISTS for the table and indexes.
+"""
+
+import os
+import sys
+from textwrap import dedent
+import psycopg
+
+
+def main() -> int:
+    database_url = os.getenv("DATABASE_URL") or os.getenv("DATABASE_DATABASE_URL") or os.getenv("LOCAL_DATABASE_URL") or os.getenv("STORAGE_URL")
+    if not database_url:
+        print("ERROR: DATABASE_URL not set.")
+        return 1
+
+    print("Connecting to Postgres...")
+    with psycopg.connect(database_url) as conn:
+        conn.execute("SET statement_timeout TO '5min'")
+
+        print("Creating import_jobs table...")
+        conn.execute(dedent("""
+            CREATE TABLE IF NOT EXISTS import_jobs (
+                id VARCHAR(64) PRIMARY KEY,
+                job_type VARCHAR(50) NOT NULL,
+                status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                message TEXT,
+                params JSON,
+                progress JSON,
+                checkpoint JSON,
+                results JSON,
+                started_at TIMESTAMPTZ,
+                completed_at TIMESTAMPTZ,
+                created_at TIMESTAMPTZ DEFAULT now(),
+                updated_at TIMESTAMPTZ DEFAULT now()
+            );
+        """))
+
+        print("Creating indexes...")
+        conn.execute(dedent("""
+            CREATE INDEX IF NOT EXISTS idx_import_jobs_type_status
+            ON import_jobs (job_type, status);
+        """))
+        conn.execute(dedent("""
+            CREATE INDEX IF NOT EXISTS idx_import_jobs_completed_at
+            ON import_jobs (completed_at);
+        """))
+
+        conn.commit()
+        print("✅ Migration completed successfully!")
+
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM import_jobs;")
+            print(f"  ✅ import_jobs rows: {cur.fetchone()[0]}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = main()
+        sys.exit(exit_code)
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Migration: Add player_prop_hit_rates aggregate table
+
+Creates the per player x market x bookmaker x week aggregate of prop results that
+PlayerPropsScoringService maintains on every scoring run and props import, and
+populates it from the props already in player_prop_bets:
+- total_props / scored_props: props in the group and how many have a result_status
+- hits / misses / pushes: counts per result_status
+
+Also adds the (playerDkId, result_status) index on player_prop_bets for databases
+created before it was declared on the model.
+
+Environment:
+  - Requires DATABASE_URL to point to Neon Postgres
+
+Idempotent: Uses IF NOT EXISTS for the table and indexes and rebuilds the aggregate rows.
+"""
+
+import os
+import sys
+from textwrap import dedent
+import psycopg
+
+
+def main() -> int:
+    database_url = os.getenv("DATABASE_URL") or os.getenv("DATABASE_DATABASE_URL") or os.getenv("LOCAL_DATABASE_URL") or os.getenv("STORAGE_URL")
+    if not database_url:
+        print("ERROR: DATABASE_URL not set.")
+        return 1
+
+    print("Connecting to Postgres...")
+    with psycopg.connect(database_url) as conn:
+        conn.execute("SET statement_timeout TO '5min'")
+
+        print("Creating player_prop_hit_rates table...")
+        conn.execute(dedent("""
+            CREATE TABLE IF NOT EXISTS player_prop_hit_rates (
+                id SERIAL PRIMARY KEY,
+                week_id INTEGER NOT NULL REFERENCES weeks(id),
+                "playerDkId" INTEGER NOT NULL REFERENCES players("playerDkId"),
+                market VARCHAR(100) NOT NULL DEFAULT '',
+                bookmaker VARCHAR(100) NOT NULL DEFAULT '',
+                total_props INTEGER NOT NULL DEFAULT 0,
+                scored_props INTEGER NOT NULL DEFAULT 0,
+                hits INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0,
+                pushes INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMPTZ DEFAULT now(),
+                updated_at TIMESTAMPTZ
+            );
+        """))
+
+        print("Creating indexes...")
+        conn.execute(dedent("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_prop_hit_rates_week_player_market_bookmaker
+            ON player_prop_hit_rates (week_id, "playerDkId", market, bookmaker);
+        """))
+        conn.execute(dedent("""
+            CREATE INDEX IF NOT EXISTS idx_prop_hit_rates_player_week
+            ON player_prop_hit_rates ("playerDkId", week_id);
+        """))
+        conn.execute(dedent("""
+            CREATE INDEX IF NOT EXISTS idx_prop_hit_rates_market_week
+            ON player_prop_hit_rates (market, week_id);
+        """))
+        conn.execute(dedent("""
+            CREATE INDEX IF NOT EXISTS idx_player_prop_bets_player_result
+            ON player_prop_bets ("playerDkId", result_status);
+        """))
+
+        print("Populating aggregates from player_prop_bets...")
+        conn.execute("DELETE FROM player_prop_hit_rates;")
+        conn.execute(dedent("""
+            INSERT INTO player_prop_hit_rates
+                (week_id, "playerDkId", market, bookmaker, total_props, scored_props, hits, misses, pushes)
+            SELECT
+                week_id,
+                "playerDkId",
+                COALESCE(market, ''),
+                COALESCE(bookmaker, ''),
+                COUNT(*),
+                COUNT(result_status),
+                COUNT(*) FILTER (WHERE result_status = 'HIT'),
+                COUNT(*) FILTER (WHERE result_status = 'MISS'),
+                COUNT(*) FILTER (WHERE result_status = 'PUSH')
+            FROM player_prop_bets
+            GROUP BY week_id, "playerDkId", COALESCE(market, ''), COALESCE(bookmaker, '');
+        """))
+
+        conn.commit()
+        print("✅ Migration completed successfully!")
+
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM player_prop_hit_rates;")
+            print(f"  ✅ player_prop_hit_rates rows: {cur.fetchone()[0]}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = main()
+        sys.exit(exit_code)
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,78 @@
+"""
+Shared fixtures for backend unit tests
+
+Tests run against a throwaway SQLite database so they never touch Neon. The
+environment is set before anything imports app.database, which reads the
+connection string at import time.
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+
+import httpx
+import pytest
+
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="dfs-backend-tests-")
+for _var in ("DATABASE_URL", "DATABASE_DATABASE_URL", "STORAGE_URL"):
+    os.environ.pop(_var, None)
+os.environ["LOCAL_DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DB_DIR, 'test.db')}"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app import models  # noqa: E402  (registers every table on Base.metadata)
+from app.services import http_client  # noqa: E402
+
+# Id of the week created by the week fixture
+WEEK_ID = 1
+
+
+@pytest.fixture
+def db():
+    """Session on a freshly created schema, dropped again after the test"""
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def week(db):
+    """Week 5 of 2025, returned as its id"""
+    db.add(models.Week(id=WEEK_ID, week_number=5, year=2025,
+                       start_date=datetime.date(2025, 10, 2), end_date=datetime.date(2025, 10, 6)))
+    db.commit()
+    return WEEK_ID
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record retry and rate-limit delays instead of sleeping"""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(http_client.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+@pytest.fixture
+def mock_client_factory(monkeypatch):
+    """
+    Returns install(module, handler): the module's create_async_client then builds
+    clients that send every request to handler through an httpx.MockTransport
+    """
+    def install(module, handler):
+        monkeypatch.setattr(
+            module,
+            "create_async_client",
+            lambda **kwargs: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+    return install
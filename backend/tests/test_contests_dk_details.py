@@ -0,0 +1,123 @@
+"""
+DK contest detail backfill for contest uploads: the 404 negative cache, retries and
+per-contest fallback when a bulk insert fails, run against a stub DK API on SQLite
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.models import DKContestDetail
+from app.routers import contests
+
+
+def _detail(cid, **overrides):
+    detail = {
+        "name": f"NFL Contest {cid}",
+        "sport": "NFL",
+        "entryFee": 5,
+        "maximumEntries": 100,
+        "totalPayouts": 450,
+        "contestStartTime": "2025-10-05T17:00:00.0000000Z",
+        "attributes": {"IsDoubleUp": "true"},
+    }
+    detail.update(overrides)
+    return {"contestDetail": detail}
+
+
+class StubContestApi:
+    """Serves contest details by id; a list of responses is replayed one request at a time"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        cid = request.url.path.rsplit("/", 1)[-1]
+        self.requests.append(cid)
+        response = self.responses.get(cid, httpx.Response(404))
+        if isinstance(response, list):
+            return response.pop(0)
+        return response
+
+
+@pytest.fixture(autouse=True)
+def not_found_cache(monkeypatch):
+    cache = contests.DKContestNotFoundCache()
+    monkeypatch.setattr(contests, "dk_contest_not_found_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def stub_api(mock_client_factory):
+    api = StubContestApi({})
+    mock_client_factory(contests, api.handler)
+    return api
+
+
+def _ensure(db, contest_ids):
+    asyncio.run(contests._ensure_dk_contest_details(db, set(contest_ids)))
+
+
+def _stored(db):
+    db.expire_all()
+    return sorted(cid for (cid,) in db.query(DKContestDetail.contest_id))
+
+
+def test_not_found_contests_are_not_requested_again(db, stub_api, not_found_cache):
+    stub_api.responses = {"101": httpx.Response(200, json=_detail("101"))}
+
+    _ensure(db, ["101", "404"])
+    assert sorted(stub_api.requests) == ["101", "404"]
+    assert _stored(db) == ["101"]
+    assert not_found_cache.contains("404")
+
+    _ensure(db, ["101", "404"])
+    assert len(stub_api.requests) == 2
+
+
+def test_not_found_entries_expire(db, stub_api, not_found_cache):
+    not_found_cache.ttl_seconds = -1
+
+    _ensure(db, ["404"])
+    _ensure(db, ["404"])
+
+    assert stub_api.requests == ["404", "404"]
+
+
+def test_transient_failures_are_retried(db, stub_api, sleeps):
+    stub_api.responses = {
+        "101": [httpx.Response(503), httpx.Response(429, headers={"Retry-After": "1"}),
+                httpx.Response(200, json=_detail("101"))],
+    }
+
+    _ensure(db, ["101"])
+
+    assert stub_api.requests == ["101"] * 3
+    assert len(sleeps) == 2 and sleeps[1] == 1.0
+    assert _stored(db) == ["101"]
+
+
+def test_exhausted_retries_skip_only_that_contest(db, stub_api, sleeps, not_found_cache):
+    stub_api.responses = {
+        "101": httpx.Response(200, json=_detail("101")),
+        "500": [httpx.Response(500) for _ in range(4)],
+    }
+
+    _ensure(db, ["101", "500"])
+
+    assert _stored(db) == ["101"]
+    assert not not_found_cache.contains("500")
+
+
+def test_bad_row_does_not_drop_the_rest_of_the_batch(db, stub_api):
+    stub_api.responses = {
+        "101": httpx.Response(200, json=_detail("101")),
+        "102": httpx.Response(200, json=_detail("102", entryFee="free")),
+        "103": httpx.Response(200, json=_detail("103")),
+    }
+
+    _ensure(db, ["101", "102", "103"])
+
+    assert _stored(db) == ["101", "103"]
@@ -0,0 +1,196 @@
+"""
+DraftKingsImportService conditional fetch and per-draftable digests, run against a
+stub DraftKings API on SQLite
+"""
+
+import asyncio
+import copy
+import json
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from app.database import engine
+from app.models import Player, PlayerPoolEntry
+from app.services import draftkings_import
+from app.services.draftkings_import import DraftablesSnapshotCache, DraftKingsImportService
+
+WEEK_ID = 1  # conftest week fixture
+DRAFT_GROUP = "134675"
+
+DRAFTABLES = [
+    {"draftableId": 11, "playerDkId": 1001, "firstName": "Alpha", "lastName": "Passer", "displayName": "Alpha Passer",
+     "position": "QB", "teamAbbreviation": "AAA", "salary": 7000, "status": "None",
+     "draftStatAttributes": [{"id": 90, "value": "20.1", "sortValue": "20.1"}]},
+    {"draftableId": 21, "playerDkId": 1002, "firstName": "Bravo", "lastName": "Catcher", "displayName": "Bravo Catcher",
+     "position": "WR", "teamAbbreviation": "BBB", "salary": 6500, "status": "Q"},
+    {"draftableId": 22, "playerDkId": 1002, "firstName": "Bravo", "lastName": "Catcher", "displayName": "Bravo Catcher",
+     "position": "WR", "teamAbbreviation": "BBB", "salary": 6500, "status": "Q"},
+    {"draftableId": 31, "playerDkId": 1003, "firstName": "", "lastName": "", "displayName": "Charlie",
+     "position": "DST", "teamAbbreviation": "CCC", "salary": 3000, "status": "None"},
+]
+
+
+class StubDraftKingsApi:
+    """Serves one draftables payload and honours If-None-Match like the real API"""
+
+    def __init__(self, draftables, etag="v1"):
+        self.requests = []
+        self.publish(draftables, etag)
+
+    def publish(self, draftables, etag):
+        self.body = json.dumps({"draftables": draftables}).encode()
+        self.etag = etag
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.etag and request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304)
+        headers = {"etag": self.etag} if self.etag else {}
+        return httpx.Response(200, content=self.body, headers=headers)
+
+
+@pytest.fixture
+def stub_api(mock_client_factory):
+    api = StubDraftKingsApi(copy.deepcopy(DRAFTABLES))
+    mock_client_factory(draftkings_import, api.handler)
+    return api
+
+
+def _import(db, cache, force_refresh=False):
+    service = DraftKingsImportService(db, base_url="http://dk.test", snapshot_cache=cache)
+    return asyncio.run(service.import_player_pool(WEEK_ID, DRAFT_GROUP, force_refresh=force_refresh))
+
+
+def _pool_rows(db):
+    db.expire_all()
+    return sorted(
+        (entry.playerDkId, entry.draftableId, entry.salary, entry.status, entry.excluded, json.dumps(entry.draftStatAttributes))
+        for entry in db.query(PlayerPoolEntry).filter(PlayerPoolEntry.week_id == WEEK_ID)
+    )
+
+
+def test_reimport_with_matching_etag_is_a_no_op(db, week, stub_api):
+    cache = DraftablesSnapshotCache()
+
+    first = _import(db, cache)
+    assert first.entries_added == 3
+    rows = _pool_rows(db)
+
+    second = _import(db, cache)
+    assert stub_api.requests[-1].headers["if-none-match"] == "v1"
+    assert second.not_modified
+    assert second.entries_added == second.entries_updated == 0
+    assert second.unchanged_skipped == len(DRAFTABLES)
+    assert _pool_rows(db) == rows
+
+
+def test_identical_body_without_validators_is_skipped_by_hash(db, week, stub_api):
+    stub_api.etag = None
+    cache = DraftablesSnapshotCache()
+
+    _import(db, cache)
+    second = _import(db, cache)
+
+    assert "if-none-match" not in stub_api.requests[-1].headers
+    assert second.not_modified
+
+
+def test_changed_draftable_matches_full_import(db, week, stub_api):
+    cache = DraftablesSnapshotCache()
+    _import(db, cache)
+
+    changed = copy.deepcopy(DRAFTABLES)
+    changed[1]["salary"] = 6800
+    changed[1]["status"] = "O"
+    stub_api.publish(changed, etag="v2")
+
+    result = _import(db, cache)
+    # Both of Bravo's draftables are reprocessed; the QB and DST are skipped
+    assert result.unchanged_skipped == 2
+    assert result.entries_added == 0
+    incremental_rows = _pool_rows(db)
+    assert (1002, "21", 6800, "O") in [row[:4] for row in incremental_rows]
+
+    full = _import(db, DraftablesSnapshotCache(), force_refresh=True)
+    assert full.unchanged_skipped == 0
+    assert _pool_rows(db) == incremental_rows
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_draftable_that_failed_is_retried_on_next_import(db, week, stub_api, monkeypatch, batch):
+    cache = DraftablesSnapshotCache()
+    extract = DraftKingsImportService._extract_player_data
+    failures = {1001: 1}
+
+    def flaky_extract(self, draftable, draft_group=None):
+        if failures.get(draftable.get("playerDkId")):
+            failures[draftable["playerDkId"]] -= 1
+            return None
+        return extract(self, draftable, draft_group)
+
+    monkeypatch.setattr(DraftKingsImportService, "_extract_player_data", flaky_extract)
+
+    def run():
+        service = DraftKingsImportService(db, base_url="http://dk.test", snapshot_cache=cache)
+        if batch:
+            return asyncio.run(service.import_player_pools(WEEK_ID, [DRAFT_GROUP]))
+        return asyncio.run(service.import_player_pool(WEEK_ID, DRAFT_GROUP))
+
+    first = run()
+    assert first.errors
+    assert 1001 not in [row[0] for row in _pool_rows(db)]
+
+    # DK has not changed anything, but the failed draftable must not be skipped as unchanged
+    second = run()
+    assert "if-none-match" not in stub_api.requests[-1].headers
+    assert not second.errors
+    assert 1001 in [row[0] for row in _pool_rows(db)]
+
+    third = run()
+    assert third.draft_groups[DRAFT_GROUP].not_modified if batch else third.not_modified
+
+
+def test_snapshot_is_ignored_once_pool_entries_are_gone(db, week, stub_api):
+    cache = DraftablesSnapshotCache()
+    _import(db, cache)
+
+    db.query(PlayerPoolEntry).delete()
+    db.commit()
+
+    result = _import(db, cache)
+    assert "if-none-match" not in stub_api.requests[-1].headers
+    assert result.entries_added == 3
+
+
+@pytest.fixture
+def player_selects():
+    """Statements that read the players table"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM players" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_existing_players_are_loaded_with_one_query(db, week, stub_api, player_selects, batch):
+    _import(db, DraftablesSnapshotCache())
+    db.expunge_all()
+    player_selects.clear()
+
+    service = DraftKingsImportService(db, base_url="http://dk.test", snapshot_cache=DraftablesSnapshotCache())
+    if batch:
+        result = asyncio.run(service.import_player_pools(WEEK_ID, [DRAFT_GROUP], force_refresh=True))
+    else:
+        result = asyncio.run(service.import_player_pool(WEEK_ID, DRAFT_GROUP, force_refresh=True))
+
+    assert result.players_updated == 3
+    # One preload query instead of a lookup per player
+    assert len(player_selects) == 1
+    assert db.query(Player).count() == 3
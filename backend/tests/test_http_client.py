@@ -0,0 +1,176 @@
+"""
+request_with_retry retry/Retry-After handling and shared rate limiters, run against
+an httpx.MockTransport
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import http_client
+from app.services.http_client import AsyncRateLimiter, get_rate_limiter, request_with_retry
+
+URL = "http://api.test/resource"
+
+
+class ScriptedApi:
+    """Replays a list of responses (or exceptions to raise) one request at a time"""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        step = self.script.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        return step
+
+
+class CountingLimiter(AsyncRateLimiter):
+    def __init__(self):
+        super().__init__(rate=1000, burst=1000)
+        self.acquired = 0
+
+    async def acquire(self) -> None:
+        self.acquired += 1
+        await super().acquire()
+
+
+def _request(api, **kwargs):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(api.handler)) as client:
+            return await request_with_retry(client, "GET", URL, **kwargs)
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+def test_retries_throttling_and_server_errors(sleeps, status):
+    api = ScriptedApi(httpx.Response(status), httpx.Response(200, json={"ok": True}))
+
+    response = _request(api)
+
+    assert response.json() == {"ok": True}
+    assert len(api.requests) == 2
+    assert len(sleeps) == 1
+
+
+def test_client_errors_are_returned_without_retrying(sleeps):
+    api = ScriptedApi(httpx.Response(404))
+
+    assert _request(api).status_code == 404
+    assert len(api.requests) == 1
+    assert sleeps == []
+
+
+def test_retry_after_header_sets_the_delay(sleeps):
+    api = ScriptedApi(
+        httpx.Response(429, headers={"Retry-After": "2"}),
+        httpx.Response(429, headers={"Retry-After": "120"}),
+        httpx.Response(200),
+    )
+
+    assert _request(api).status_code == 200
+    assert sleeps == [2.0, http_client.MAX_BACKOFF_SECONDS]
+
+
+def test_backoff_grows_exponentially_without_retry_after(sleeps):
+    api = ScriptedApi(httpx.Response(503), httpx.Response(503), httpx.Response(200))
+
+    _request(api, backoff=1.0)
+
+    assert 1.0 <= sleeps[0] <= 1.5
+    assert 2.0 <= sleeps[1] <= 3.0
+
+
+def test_transport_errors_are_retried_then_raised(sleeps):
+    api = ScriptedApi(httpx.ConnectError("refused"), httpx.Response(200))
+    assert _request(api).status_code == 200
+
+    failing = ScriptedApi(*[httpx.ReadTimeout("slow") for _ in range(3)])
+    with pytest.raises(httpx.ReadTimeout):
+        _request(failing, max_retries=2)
+    assert len(failing.requests) == 3
+
+
+def test_last_response_is_returned_when_retries_run_out(sleeps):
+    api = ScriptedApi(*[httpx.Response(503) for _ in range(3)])
+
+    response = _request(api, max_retries=2)
+
+    assert response.status_code == 503
+    assert len(api.requests) == 3
+    assert len(sleeps) == 2
+
+
+def test_every_attempt_takes_a_rate_limiter_token(sleeps):
+    limiter = CountingLimiter()
+    api = ScriptedApi(httpx.Response(429), httpx.Response(500), httpx.Response(200))
+
+    _request(api, rate_limiter=limiter)
+
+    assert limiter.acquired == 3
+
+
+def test_rate_limiter_throttles_past_the_burst(monkeypatch):
+    clock = [100.0]
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+        clock[0] += delay
+
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(http_client.asyncio, "sleep", fake_sleep)
+    limiter = AsyncRateLimiter(rate=2, burst=2)
+
+    async def run():
+        for _ in range(3):
+            await limiter.acquire()
+
+    asyncio.run(run())
+
+    # The burst is spent after two tokens, so the third waits half a second for a refill
+    assert delays == [pytest.approx(0.5)]
+
+
+def test_rate_limiters_are_shared_per_api_name(monkeypatch):
+    monkeypatch.setattr(http_client, "_rate_limiters", {})
+
+    limiter = get_rate_limiter("test-api", 5, 10)
+
+    assert get_rate_limiter("test-api", 1, 1) is limiter
+    assert get_rate_limiter("other-api", 5, 10) is not limiter
+    assert (limiter.rate, limiter.burst) == (5.0, 10)
+
+
+def test_rate_limiter_is_reusable_across_event_loops():
+    limiter = AsyncRateLimiter(rate=1000, burst=1000)
+
+    asyncio.run(limiter.acquire())
+    asyncio.run(limiter.acquire())
+
+    assert limiter._tokens < 1000
+
+
+def test_odds_api_services_share_one_limiter_and_retry(monkeypatch, sleeps):
+    from app.routers import odds_api
+
+    monkeypatch.setenv("ODDS_API_KEY", "test-key")
+    monkeypatch.setattr(http_client, "_rate_limiters", {})
+    api = ScriptedApi(httpx.Response(429, headers={"Retry-After": "1"}), httpx.Response(200, json=[{"id": "e1"}]))
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+        async with odds_api.OddsApiService(client=client) as service:
+            other = odds_api.OddsApiService()
+            assert service.rate_limiter is other.rate_limiter
+            events = await service.get_events("americanfootball_nfl")
+        await client.aclose()
+        return events
+
+    assert asyncio.run(run()) == [{"id": "e1"}]
+    assert sleeps == [1.0]
+    assert api.requests[-1].url.params["apiKey"] == "test-key"
@@ -0,0 +1,110 @@
+"""
+ImportJobStore stale detection and heartbeat on SQLite
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import ImportJob
+from app.services.import_job_store import STALE_JOB_SECONDS, ImportJobStore
+
+
+@pytest.fixture
+def store(db):
+    return ImportJobStore()
+
+
+def _age(db, job_id, seconds):
+    db.query(ImportJob).filter(ImportJob.id == job_id).update(
+        {"updated_at": datetime.now(timezone.utc) - timedelta(seconds=seconds)}
+    )
+    db.commit()
+
+
+def test_job_without_updates_becomes_resumable(db, store):
+    job = store.create("test", job_id="job-1")
+    store.start(job["id"])
+    assert not ImportJobStore.is_resumable(store.get(job["id"]))
+
+    _age(db, job["id"], STALE_JOB_SECONDS + 60)
+
+    assert ImportJobStore.is_resumable(store.get(job["id"]))
+
+
+def test_touch_keeps_a_running_job_fresh(db, store):
+    store.create("test", job_id="job-1")
+    store.start("job-1", message="loading")
+    _age(db, "job-1", STALE_JOB_SECONDS + 60)
+
+    store.touch("job-1")
+
+    job = store.get("job-1")
+    assert not ImportJobStore.is_stale(job)
+    assert (job["status"], job["message"]) == ("in_progress", "loading")
+
+
+def test_touch_leaves_finished_jobs_alone(db, store):
+    store.create("test", job_id="job-1")
+    store.complete("job-1", "done")
+    completed = store.get("job-1")
+
+    store.touch("job-1")
+
+    assert store.get("job-1")["updated_at"] == completed["updated_at"]
+
+
+def test_heartbeat_refreshes_the_job_during_a_long_phase(db, store):
+    store.create("test", job_id="job-1")
+    store.start("job-1")
+    _age(db, "job-1", STALE_JOB_SECONDS + 60)
+
+    with store.heartbeat("job-1", interval_seconds=0.01):
+        deadline = time.monotonic() + 5
+        while ImportJobStore.is_stale(store.get("job-1")) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert not ImportJobStore.is_resumable(store.get("job-1"))
+
+
+def test_heartbeat_stops_when_the_block_exits(db, store):
+    store.create("test", job_id="job-1")
+    store.start("job-1")
+
+    with store.heartbeat("job-1", interval_seconds=0.01):
+        pass
+    _age(db, "job-1", STALE_JOB_SECONDS + 60)
+    time.sleep(0.05)
+
+    assert ImportJobStore.is_resumable(store.get("job-1"))
+
+
+def test_only_one_claim_wins_for_a_failed_job(db, store):
+    store.create("test", job_id="job-1")
+    store.fail("job-1", "boom")
+
+    assert store.claim("job-1", message="Resume requested")
+    assert not store.claim("job-1")
+
+    job = store.get("job-1")
+    assert (job["status"], job["message"]) == ("in_progress", "Resume requested")
+
+
+def test_running_job_cannot_be_claimed_until_it_goes_stale(db, store):
+    store.create("test", job_id="job-1")
+    store.start("job-1")
+    assert not store.claim("job-1")
+
+    _age(db, "job-1", STALE_JOB_SECONDS + 60)
+
+    assert store.claim("job-1")
+    assert not ImportJobStore.is_stale(store.get("job-1"))
+
+
+def test_finished_and_missing_jobs_cannot_be_claimed(db, store):
+    store.create("test", job_id="job-1")
+    store.complete("job-1", "done")
+
+    assert not store.claim("job-1")
+    assert not store.claim("missing")
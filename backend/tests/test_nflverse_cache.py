@@ -0,0 +1,121 @@
+"""
+NFLVerseParquetCache freshness, atomic refresh and offline mode, with a stub loader
+and a temporary cache directory
+"""
+
+import json
+import time
+from datetime import datetime
+
+import polars as pl
+import pytest
+
+from app.services.nflverse_cache import NFLVerseParquetCache, current_nfl_season, season_end_timestamp
+
+PAST_SEASON = current_nfl_season() - 2
+CURRENT_SEASON = current_nfl_season()
+
+
+class StubLoader:
+    """Returns a small player_stats frame per season and counts calls"""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+        self.version = 1
+
+    def __call__(self, season: int) -> pl.DataFrame:
+        self.calls.append(season)
+        if self.fail:
+            raise ConnectionError("nflverse unavailable")
+        return pl.DataFrame({
+            "season": [season] * 3,
+            "season_type": ["REG", "REG", "POST"],
+            "week": [1, 2, 19],
+            "player_id": ["a", "b", "a"],
+            "fantasy_points_ppr": [10.0 * self.version, 20.0, 30.0],
+        })
+
+
+@pytest.fixture
+def loader():
+    return StubLoader()
+
+
+@pytest.fixture
+def cache(tmp_path, loader):
+    return NFLVerseParquetCache(cache_dir=tmp_path, ttl_seconds=3600, loaders={"player_stats": loader}, offline=False)
+
+
+def _set_fetched_at(cache, season, fetched_at):
+    meta_path = cache.path("player_stats", season).with_suffix(".json")
+    meta = json.loads(meta_path.read_text())
+    meta["fetched_at"] = fetched_at
+    meta_path.write_text(json.dumps(meta))
+
+
+def test_missing_season_is_not_fresh(cache):
+    assert not cache.is_fresh("player_stats", CURRENT_SEASON)
+
+
+def test_current_season_follows_ttl(cache):
+    cache.refresh("player_stats", CURRENT_SEASON)
+    assert cache.is_fresh("player_stats", CURRENT_SEASON)
+
+    _set_fetched_at(cache, CURRENT_SEASON, time.time() - 7200)
+    assert not cache.is_fresh("player_stats", CURRENT_SEASON)
+
+
+def test_past_season_fetched_after_it_ended_never_expires(cache):
+    cache.refresh("player_stats", PAST_SEASON)
+    _set_fetched_at(cache, PAST_SEASON, season_end_timestamp(PAST_SEASON) + 60)
+
+    assert cache.is_fresh("player_stats", PAST_SEASON)
+
+
+def test_past_season_fetched_mid_season_is_refreshed_once(cache, loader):
+    cache.refresh("player_stats", PAST_SEASON)
+    _set_fetched_at(cache, PAST_SEASON, datetime(PAST_SEASON, 12, 15).timestamp())
+    assert not cache.is_fresh("player_stats", PAST_SEASON)
+
+    cache.ensure("player_stats", PAST_SEASON)
+    cache.ensure("player_stats", PAST_SEASON)
+
+    assert loader.calls == [PAST_SEASON, PAST_SEASON]
+    assert cache.is_fresh("player_stats", PAST_SEASON)
+
+
+def test_refresh_atomically_replaces_the_cached_file(cache, loader):
+    path = cache.refresh("player_stats", CURRENT_SEASON)
+    loader.version = 2
+    assert cache.refresh("player_stats", CURRENT_SEASON) == path
+
+    assert pl.read_parquet(path)["fantasy_points_ppr"][0] == 20.0
+    assert sorted(p.name for p in path.parent.iterdir()) == [f"season={CURRENT_SEASON}.json", f"season={CURRENT_SEASON}.parquet"]
+    meta = cache.metadata("player_stats", CURRENT_SEASON)
+    assert (meta["rows"], meta["columns"]) == (3, 5)
+
+
+def test_failed_refresh_keeps_the_previous_copy(cache, loader):
+    path = cache.refresh("player_stats", CURRENT_SEASON)
+    loader.fail = True
+
+    assert cache.ensure("player_stats", CURRENT_SEASON, force_refresh=True) == path
+    assert pl.read_parquet(path).height == 3
+    assert not list(path.parent.glob("*.tmp"))
+
+
+def test_offline_mode_reads_fixture_files_without_loading(tmp_path, loader):
+    fixture = loader(PAST_SEASON)
+    loader.calls.clear()
+    (tmp_path / "player_stats").mkdir()
+    fixture.write_parquet(tmp_path / "player_stats" / f"season={PAST_SEASON}.parquet")
+    cache = NFLVerseParquetCache(cache_dir=tmp_path, loaders={"player_stats": loader}, offline=True)
+
+    week = cache.load_week("player_stats", PAST_SEASON, 2)
+
+    assert week["player_id"].to_list() == ["b"]
+    assert cache.is_fresh("player_stats", PAST_SEASON)
+    with pytest.raises(FileNotFoundError):
+        cache.ensure("player_stats", CURRENT_SEASON)
+    assert loader.calls == []
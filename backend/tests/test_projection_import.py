@@ -0,0 +1,85 @@
+"""
+Chunked projection CSV import on SQLite: the result must not depend on the chunk size
+"""
+
+import io
+
+import pytest
+
+from app.models import Player, PlayerPoolEntry, Projection
+from app.routers import projections
+from app.utils.name_normalization import normalize_for_matching
+
+WEEK_ID = 1  # conftest week fixture
+SOURCE = "Test Source"
+
+CSV_TEXT = """Player,Pos,Projections,Actuals
+Alpha Passer,QB,21.5,
+Bravo Catcher,WR,14.2,12.0
+Zulu Nobody,TE,9.9,
+Alpha Passer,QB,22.0,
+Charlie Runner,RB,11.0,
+"""
+
+PLAYERS = [
+    (1001, "Alpha", "Passer", "QB"),
+    (1002, "Bravo", "Catcher", "WR"),
+    (1003, "Charlie", "Runner", "RB"),
+]
+
+
+@pytest.fixture
+def players(db, week):
+    for player_dk_id, first, last, position in PLAYERS:
+        display = f"{first} {last}"
+        db.add(Player(playerDkId=player_dk_id, firstName=first, lastName=last, displayName=display,
+                      normalized_display_name=normalize_for_matching(display), position=position, team="AAA"))
+    db.flush()
+    for player_dk_id, *_ in PLAYERS:
+        for draft_group in ("100", "200"):
+            db.add(PlayerPoolEntry(week_id=week, draftGroup=draft_group, playerDkId=player_dk_id, salary=5000))
+    db.commit()
+    return [player_dk_id for player_dk_id, *_ in PLAYERS]
+
+
+def _import(db):
+    rows = projections.iter_projection_rows(io.StringIO(CSV_TEXT), SOURCE)
+    return projections.process_projections(db, WEEK_ID, SOURCE, rows)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 500])
+def test_chunked_import_matches_single_pass(db, players, monkeypatch, chunk_size):
+    monkeypatch.setattr(projections, "IMPORT_CHUNK_SIZE", chunk_size)
+
+    result = _import(db)
+
+    assert result.total_processed == 5
+    assert result.successful_matches == 4
+    assert result.failed_matches == 1
+    assert [p["csv_data"]["name"] for p in result.unmatched_players] == ["Zulu Nobody"]
+    # The repeated Alpha row counts as an update, whether or not it lands in the same chunk
+    assert (result.projections_created, result.projections_updated) == (3, 1)
+    assert not result.errors
+
+    stored = {
+        p.playerDkId: (p.pprProjections, p.actuals)
+        for p in db.query(Projection).filter(Projection.week_id == WEEK_ID, Projection.source == SOURCE)
+    }
+    assert stored == {1001: (22.0, 0.0), 1002: (14.2, 12.0), 1003: (11.0, 0.0)}
+
+    pool = {
+        (e.draftGroup, e.playerDkId): e.projectedPoints
+        for e in db.query(PlayerPoolEntry).filter(PlayerPoolEntry.week_id == WEEK_ID)
+    }
+    assert pool[("100", 1001)] == pool[("200", 1001)] == 22.0
+    assert pool[("200", 1003)] == 11.0
+
+
+def test_reimport_updates_existing_rows(db, players, monkeypatch):
+    monkeypatch.setattr(projections, "IMPORT_CHUNK_SIZE", 2)
+    _import(db)
+
+    result = _import(db)
+
+    assert (result.projections_created, result.projections_updated) == (0, 4)
+    assert db.query(Projection).filter(Projection.week_id == WEEK_ID).count() == 3